@@ -0,0 +1,355 @@
+"""Streaming hiring-bias analytics.
+
+Hiring events are ingested one at a time or in batches and folded into
+running per-group counts (events, decisions and hires) for gender,
+age bucket and any configured attribute. Queries read the counts directly,
+so hire rates and their variance cost O(groups) no matter how much history
+has been ingested.
+
+Time windows (for example the last 30, 90 and 365 days) keep their own
+running counts. Events are also bucketed by day; when the clock moves on,
+the days that fall out of a window are subtracted from it.
+
+Results match the pandas implementation this replaces: hire rate is the
+mean of ``hired`` per group, ages are bucketed into (0, 30], (30, 40],
+(40, 50] and (50, 100], and the variance is the sample variance (ddof=1)
+of the group hire rates.
+"""
+import json
+import math
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+AGE_BUCKETS = [(0, 30, '<30'), (30, 40, '30-40'), (40, 50, '40-50'), (50, 100, '50+')]
+SECONDS_PER_DAY = 86400
+
+
+def age_bucket(age: Any) -> Optional[str]:
+    """Label of the (low, high] age bucket, or None outside 0-100"""
+    try:
+        age = float(age)
+    except (TypeError, ValueError):
+        return None
+    for low, high, label in AGE_BUCKETS:
+        if low < age <= high:
+            return label
+    return None
+
+
+def age_bucket_codes(ages: np.ndarray) -> Tuple[np.ndarray, List[str]]:
+    """Vectorized age_bucket: bucket index per age (-1 outside 0-100 or NaN) and the labels"""
+    edges = np.array([AGE_BUCKETS[0][0]] + [high for _, high, _ in AGE_BUCKETS], dtype=np.float64)
+    codes = np.searchsorted(edges, ages, side='left') - 1
+    codes[(codes < 0) | (codes >= len(AGE_BUCKETS)) | np.isnan(ages)] = -1
+    return codes, [label for _, _, label in AGE_BUCKETS]
+
+
+def event_day(value: Any, now: float) -> int:
+    """Day number (days since the epoch, UTC) of an event timestamp"""
+    if value is None:
+        return int(now // SECONDS_PER_DAY)
+    if isinstance(value, (int, float)):
+        return int(value // SECONDS_PER_DAY)
+    parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp() // SECONDS_PER_DAY)
+
+
+def sample_variance(values: List[float]) -> float:
+    """Sample variance (ddof=1) of the non-NaN values; NaN with fewer than two"""
+    values = [value for value in values if not math.isnan(value)]
+    if len(values) < 2:
+        return float('nan')
+    mean = sum(values) / len(values)
+    return sum((value - mean) ** 2 for value in values) / (len(values) - 1)
+
+
+# Counts are {attribute: {group: [hired_sum, decisions, events]}}
+Counts = Dict[str, Dict[Any, List[float]]]
+
+
+def bump_counts(target: Counts, groups: List[Tuple[str, Any]], hired: float, decided: int):
+    """Count one event in each of its (attribute, group) pairs"""
+    for attribute, group in groups:
+        counts = target.setdefault(attribute, {}).get(group)
+        if counts is None:
+            target[attribute][group] = [hired, decided, 1]
+        else:
+            counts[0] += hired
+            counts[1] += decided
+            counts[2] += 1
+
+
+def add_counts(target: Counts, source: Counts, sign: int = 1):
+    for attribute, groups in source.items():
+        target_groups = target.setdefault(attribute, {})
+        for group, (hired, decisions, events) in groups.items():
+            counts = target_groups.setdefault(group, [0.0, 0, 0])
+            counts[0] += sign * hired
+            counts[1] += sign * decisions
+            counts[2] += sign * events
+
+
+class BiasAnalyticsEngine:
+    """Running per-group hire counts, all-time and over sliding day windows"""
+
+    def __init__(
+        self,
+        attributes: Iterable[str] = (),
+        windows: Iterable[int] = (),
+        timestamp_field: str = 'timestamp',
+        clock=time.time
+    ):
+        # gender and age are always analysed; age is bucketed before counting
+        self.attributes = ['gender', 'age'] + [name for name in attributes if name not in ('gender', 'age')]
+        self.windows = sorted(set(int(days) for days in windows if int(days) > 0))
+        self.timestamp_field = timestamp_field
+        self.clock = clock
+        self.totals: Counts = {}
+        self.daily: Dict[int, Counts] = {}
+        self.window_counts: Dict[int, Counts] = {days: {} for days in self.windows}
+        self.today = int(clock() // SECONDS_PER_DAY)
+        self.columns = set()
+        self.events = 0
+        self._lock = threading.Lock()
+
+    def _group_key(self, attribute: str, value: Any) -> Optional[Any]:
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            return None
+        if attribute == 'age':
+            return age_bucket(value)
+        return value
+
+    def _event_groups(self, event: Dict[str, Any]) -> List[Tuple[str, Any]]:
+        groups = []
+        for attribute in self.attributes:
+            if attribute in event:
+                group = self._group_key(attribute, event[attribute])
+                if group is not None:
+                    groups.append((attribute, group))
+        return groups
+
+    def _advance(self, today: int):
+        """Drop days that have left each window, and buckets older than every window"""
+        if today <= self.today:
+            return
+        for days in self.windows:
+            old_start, new_start = self.today - days + 1, today - days + 1
+            for day, counts in self.daily.items():
+                if old_start <= day < new_start:
+                    add_counts(self.window_counts[days], counts, -1)
+        self.today = today
+        oldest = today - (self.windows[-1] if self.windows else 0) + 1
+        for day in [day for day in self.daily if day < oldest]:
+            del self.daily[day]
+
+    def ingest(self, event: Dict[str, Any]):
+        self.ingest_many([event])
+
+    def ingest_many(self, events: Iterable[Dict[str, Any]]) -> int:
+        """Fold hiring events into the running counts; returns how many were ingested.
+
+        The whole batch is parsed first, so an invalid event raises before any
+        count changes, and the lock is only held while the parsed batch is applied.
+        """
+        now = self.clock()
+        parsed = []
+        columns = set()
+        # Keys already checked for new columns
+        tracked = {self.timestamp_field}
+        for event in events:
+            if not tracked.issuperset(event):
+                columns.update(key for key in event if key in self.attributes or key == 'hired')
+                tracked.update(event)
+            hired = event.get('hired')
+            decided = 0 if hired is None or (isinstance(hired, float) and math.isnan(hired)) else 1
+            hired = float(hired) if decided else 0.0
+            day = event_day(event.get(self.timestamp_field), now) if self.windows else None
+            parsed.append((self._event_groups(event), hired, decided, day))
+
+        with self._lock:
+            self._advance(int(now // SECONDS_PER_DAY))
+            oldest = self.today - (self.windows[-1] if self.windows else 0) + 1
+            self.columns.update(columns)
+            for groups, hired, decided, day in parsed:
+                bump_counts(self.totals, groups, hired, decided)
+                if day is not None and day >= oldest:
+                    bump_counts(self.daily.setdefault(day, {}), groups, hired, decided)
+                    for days in self.windows:
+                        if day > self.today - days:
+                            bump_counts(self.window_counts[days], groups, hired, decided)
+            self.events += len(parsed)
+        return len(parsed)
+
+    def ingest_arrays(
+        self,
+        length: int,
+        columns: Iterable[str],
+        groups: Dict[str, Tuple[np.ndarray, List[Any]]],
+        hired: Optional[np.ndarray] = None,
+        days: Optional[np.ndarray] = None
+    ) -> int:
+        """Vectorized ingest of a columnar batch.
+
+        ``groups`` maps each attribute to integer group codes per row (-1 for
+        missing) and the group labels; ``age`` must already be bucketed with
+        age_bucket_codes. ``hired`` holds NaN where there is no decision and
+        ``days`` the day number of each row.
+        """
+        now = self.clock()
+        if hired is None:
+            hired = np.full(length, np.nan)
+        decided = ~np.isnan(hired)
+        hired = np.where(decided, hired, 0.0)
+        decided = decided.astype(np.float64)
+        if days is None:
+            days = np.full(length, int(now // SECONDS_PER_DAY), dtype=np.int64)
+
+        with self._lock:
+            self._advance(int(now // SECONDS_PER_DAY))
+            oldest = self.today - (self.windows[-1] if self.windows else 0) + 1
+            self.columns.update(name for name in columns if name in self.attributes or name == 'hired')
+            in_windows = days >= oldest if self.windows else np.zeros(length, dtype=bool)
+            window_days = np.unique(days[in_windows])
+
+            for attribute, (codes, labels) in groups.items():
+                if attribute not in self.attributes:
+                    continue
+                valid = codes >= 0
+                self._add_grouped(self.totals, attribute, labels, codes[valid], hired[valid], decided[valid])
+                rows = valid & in_windows
+                if not rows.any():
+                    continue
+                # One bincount per attribute over (day, group) pairs
+                day_index = np.searchsorted(window_days, days[rows])
+                keys = day_index * len(labels) + codes[rows]
+                size = len(window_days) * len(labels)
+                events = np.bincount(keys, minlength=size).reshape(len(window_days), len(labels))
+                hires = np.bincount(keys, weights=hired[rows], minlength=size).reshape(events.shape)
+                decisions = np.bincount(keys, weights=decided[rows], minlength=size).reshape(events.shape)
+                for position, day in enumerate(window_days.tolist()):
+                    day_counts = (events[position], hires[position], decisions[position])
+                    self._add_bucket(self.daily.setdefault(day, {}), attribute, labels, *day_counts)
+                    for window in self.windows:
+                        if day > self.today - window:
+                            self._add_bucket(self.window_counts[window], attribute, labels, *day_counts)
+            self.events += length
+        return length
+
+    def _add_grouped(self, target: Counts, attribute: str, labels: List[Any], codes, hired, decided):
+        events = np.bincount(codes, minlength=len(labels))
+        hires = np.bincount(codes, weights=hired, minlength=len(labels))
+        decisions = np.bincount(codes, weights=decided, minlength=len(labels))
+        self._add_bucket(target, attribute, labels, events, hires, decisions)
+
+    @staticmethod
+    def _add_bucket(target: Counts, attribute: str, labels: List[Any], events, hires, decisions):
+        groups = target.setdefault(attribute, {})
+        for code in np.flatnonzero(events).tolist():
+            counts = groups.setdefault(labels[code], [0.0, 0, 0])
+            counts[0] += float(hires[code])
+            counts[1] += int(decisions[code])
+            counts[2] += int(events[code])
+
+    def _rates(self, attribute: str, counts: Counts) -> Dict[Any, float]:
+        groups = counts.get(attribute, {})
+        if attribute == 'age':
+            # Every bucket is reported, like a pandas groupby over a categorical
+            keys = [label for _, _, label in AGE_BUCKETS]
+        else:
+            keys = sorted(group for group, (_, _, events) in groups.items() if events)
+        rates = {}
+        for key in keys:
+            hired, decisions, _ = groups.get(key, (0.0, 0, 0))
+            rates[key] = hired / decisions if decisions else float('nan')
+        return rates
+
+    def indicators(self, window_days: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """Hire rates and variance per attribute, all-time or over a configured window"""
+        with self._lock:
+            if window_days is None:
+                counts = self.totals
+            else:
+                if window_days not in self.window_counts:
+                    raise ValueError(f"window_days must be one of {self.windows}")
+                self._advance(int(self.clock() // SECONDS_PER_DAY))
+                counts = self.window_counts[window_days]
+
+            indicators = {}
+            if 'hired' not in self.columns:
+                return indicators
+            for attribute in self.attributes:
+                if attribute not in self.columns:
+                    continue
+                rates = self._rates(attribute, counts)
+                indicators[f'{attribute}_bias'] = {
+                    'hire_rates': rates,
+                    'variance': sample_variance(list(rates.values()))
+                }
+            return indicators
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "events": self.events,
+                "attributes": self.attributes,
+                "windows": self.windows,
+                "groups": sum(len(groups) for groups in self.totals.values()),
+                "retainedDays": len(self.daily)
+            }
+
+    # Persistence
+
+    def save(self, path: str):
+        with self._lock:
+            state = {
+                'today': self.today,
+                'events': self.events,
+                'columns': sorted(self.columns),
+                'totals': self._encode(self.totals),
+                'daily': {str(day): self._encode(counts) for day, counts in self.daily.items()}
+            }
+        with open(path + '.tmp', 'w') as state_file:
+            json.dump(state, state_file)
+        os.replace(path + '.tmp', path)
+
+    def load(self, path: str) -> bool:
+        """Restore counts saved by save(); window counts are rebuilt from the daily buckets"""
+        try:
+            with open(path) as state_file:
+                state = json.load(state_file)
+        except (OSError, ValueError):
+            return False
+        with self._lock:
+            self.events = state['events']
+            self.columns = set(state['columns'])
+            self.totals = self._decode(state['totals'])
+            self.daily = {int(day): self._decode(counts) for day, counts in state['daily'].items()}
+            self.today = state['today']
+            self.window_counts = {days: {} for days in self.windows}
+            for day, counts in self.daily.items():
+                for days in self.windows:
+                    if day > self.today - days:
+                        add_counts(self.window_counts[days], counts)
+            self._advance(int(self.clock() // SECONDS_PER_DAY))
+        return True
+
+    @staticmethod
+    def _encode(counts: Counts) -> Dict[str, List[Tuple[Any, float, int, int]]]:
+        return {
+            attribute: [[group, *group_counts] for group, group_counts in groups.items()]
+            for attribute, groups in counts.items()
+        }
+
+    @staticmethod
+    def _decode(data: Dict[str, List]) -> Counts:
+        return {
+            attribute: {group: list(group_counts) for group, *group_counts in groups}
+            for attribute, groups in data.items()
+        }
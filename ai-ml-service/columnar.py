@@ -0,0 +1,191 @@
+"""Arrow IPC and Parquet request and response bodies.
+
+Bulk endpoints accept, besides JSON, an Arrow IPC stream/file or a Parquet
+body chosen by Content-Type. The body is read into a pyarrow Table and
+handed to the scoring code as NumPy arrays, so a million-row export never
+becomes a million Python dicts. pyarrow is optional; without it these
+content types are rejected with 415.
+"""
+import io
+import json
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from bias_analytics import SECONDS_PER_DAY, age_bucket_codes
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - depends on the deployment
+    pa = None
+
+ARROW_STREAM = 'application/vnd.apache.arrow.stream'
+ARROW_FILE = 'application/vnd.apache.arrow.file'
+PARQUET = 'application/vnd.apache.parquet'
+# Older clients still send the unregistered Parquet type
+PARQUET_TYPES = (PARQUET, 'application/x-parquet')
+COLUMNAR_TYPES = (ARROW_STREAM, ARROW_FILE) + PARQUET_TYPES
+
+
+class UnsupportedBodyError(Exception):
+    """A columnar body was sent but cannot be read here"""
+
+
+def media_type(header: Optional[str]) -> str:
+    return (header or '').split(';')[0].strip().lower()
+
+
+def is_columnar(content_type: Optional[str]) -> bool:
+    return media_type(content_type) in COLUMNAR_TYPES
+
+
+def response_format(accept: Optional[str]) -> Optional[str]:
+    """The columnar type requested in an Accept header, if any"""
+    for part in (accept or '').split(','):
+        wanted = media_type(part)
+        if wanted in COLUMNAR_TYPES:
+            return PARQUET if wanted in PARQUET_TYPES else wanted
+    return None
+
+
+def read_table(body: bytes, content_type: str):
+    """Read an Arrow IPC or Parquet body into a pyarrow Table"""
+    if pa is None:
+        raise UnsupportedBodyError("pyarrow is not installed; send JSON instead")
+    kind = media_type(content_type)
+    try:
+        if kind == ARROW_STREAM:
+            return ipc.open_stream(pa.BufferReader(body)).read_all()
+        if kind == ARROW_FILE:
+            return ipc.open_file(pa.BufferReader(body)).read_all()
+        return pq.read_table(pa.BufferReader(body))
+    except pa.ArrowInvalid as e:
+        raise ValueError(f"Invalid {kind} body: {e}")
+
+
+def write_table(table, content_type: str) -> bytes:
+    sink = io.BytesIO()
+    if content_type == ARROW_STREAM:
+        with ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    elif content_type == ARROW_FILE:
+        with ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    else:
+        pq.write_table(table, sink)
+    return sink.getvalue()
+
+
+def table_metadata(table, key: str) -> Optional[Any]:
+    """A JSON value stored under key in the schema metadata"""
+    metadata = table.schema.metadata or {}
+    value = metadata.get(key.encode('utf-8'))
+    return json.loads(value) if value is not None else None
+
+
+def float_column(table, name: str, fill: Optional[float] = None) -> Optional[np.ndarray]:
+    """A numeric or boolean column as float64, nulls as NaN (or fill)"""
+    if name not in table.column_names:
+        return None
+    column = pc.cast(table.column(name), pa.float64())
+    if fill is not None:
+        column = pc.fill_null(column, fill)
+    return column.to_numpy()
+
+
+def group_codes(table, name: str) -> Tuple[np.ndarray, List[Any]]:
+    """Dictionary-encode a column into int codes (-1 for null) and labels"""
+    encoded = pc.dictionary_encode(table.column(name)).combine_chunks()
+    codes = pc.fill_null(encoded.indices, -1).to_numpy(zero_copy_only=False).astype(np.int64)
+    return codes, encoded.dictionary.to_pylist()
+
+
+def day_numbers(table, name: str, now: float) -> Optional[np.ndarray]:
+    """Day number of each row from epoch seconds, timestamps or ISO strings; null rows count as now"""
+    if name not in table.column_names:
+        return None
+    column = table.column(name)
+    if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+        column = pc.cast(column, pa.timestamp('s', tz='UTC'))
+    if pa.types.is_timestamp(column.type):
+        column = pc.cast(pc.cast(column, pa.timestamp('s', tz=column.type.tz)), pa.int64())
+    seconds = pc.fill_null(pc.cast(column, pa.float64()), now).to_numpy(zero_copy_only=False)
+    return np.floor(seconds / SECONDS_PER_DAY).astype(np.int64)
+
+
+def ingest_bias_table(engine, table) -> int:
+    """Feed a hiring-events table into a BiasAnalyticsEngine without per-row objects"""
+    groups = {}
+    for attribute in engine.attributes:
+        if attribute not in table.column_names:
+            continue
+        if attribute == 'age':
+            groups[attribute] = age_bucket_codes(float_column(table, attribute))
+        else:
+            groups[attribute] = group_codes(table, attribute)
+    days = day_numbers(table, engine.timestamp_field, engine.clock()) if engine.windows else None
+    return engine.ingest_arrays(
+        table.num_rows,
+        table.column_names,
+        groups,
+        hired=float_column(table, 'hired'),
+        days=days
+    )
+
+
+def ranking_columns(table, job_requirements: Dict) -> Dict[str, Any]:
+    """Inputs to score_columns from a candidates table with skills, experience_years and education_level"""
+    n = table.num_rows
+    required_skills = job_requirements.get("required_skills", [])
+    vocab = list(dict.fromkeys(required_skills))
+
+    if "skills" in table.column_names and vocab:
+        skills = table.column("skills").combine_chunks()
+        flat = pc.list_flatten(skills)
+        rows = pc.list_parent_indices(skills)
+        cols = pc.index_in(flat, value_set=pa.array(vocab, type=flat.type))
+        matched = pc.is_valid(cols)
+        rows = pc.filter(rows, matched).to_numpy().astype(np.int64)
+        cols = pc.filter(cols, matched).to_numpy().astype(np.int64)
+    else:
+        rows = cols = np.zeros(0, dtype=np.int64)
+
+    experience = float_column(table, "experience_years", fill=0.0)
+    if experience is None:
+        experience = np.zeros(n)
+
+    education_level = job_requirements.get("education_level")
+    if "education_level" not in table.column_names:
+        education_match = np.full(n, education_level is None)
+    elif education_level is None:
+        education_match = pc.is_null(table.column("education_level")).to_numpy(zero_copy_only=False)
+    else:
+        education_match = pc.fill_null(
+            pc.equal(table.column("education_level"), education_level), False
+        ).to_numpy(zero_copy_only=False)
+
+    return {
+        "rows": rows,
+        "cols": cols,
+        "vocab_size": len(vocab),
+        "experience": experience,
+        "education_match": education_match,
+        "required_skill_count": len(required_skills),
+        "min_experience": job_requirements.get("min_experience", 0)
+    }
+
+
+def ranked_table(table, indices: np.ndarray, scores: np.ndarray, metadata: Dict[str, Any]):
+    """The ranked page as a table with an ai_score column and JSON schema metadata"""
+    page = table.take(pa.array(indices, type=pa.int64()))
+    page = page.append_column("ai_score", pa.array(scores[indices], type=pa.float64()))
+    return page.replace_schema_metadata({key: json.dumps(value) for key, value in metadata.items()})
+
+
+def table_rows(table, batch_rows: int = 1024) -> Iterator[Dict[str, Any]]:
+    """Rows of a table as dicts, converted one record batch at a time"""
+    for batch in table.to_batches(max_chunksize=batch_rows):
+        yield from batch.to_pylist()
@@ -0,0 +1,164 @@
+"""LLM-written resume summaries with a deadline, a concurrency cap and a cache.
+
+Summaries come from the async OpenAI client, so waiting on the model never
+blocks the event loop. Each completion, including any wait for one of the
+max_concurrency slots, must finish within timeout seconds or the fallback
+summary is used; the client does not retry. Results are cached by a hash of
+the model and prompt, and concurrent requests for the same prompt share one
+completion, so an identical resume/job pair is only billed once.
+"""
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import httpx
+
+try:
+    from openai import AsyncOpenAI
+except ImportError:  # pragma: no cover - openai<1.0
+    AsyncOpenAI = None
+
+logger = logging.getLogger(__name__)
+
+NO_KEY_SUMMARY = "Professional candidate with relevant experience and skills matching the job requirements."
+FALLBACK_SUMMARY = "Experienced professional with strong technical skills and relevant background for this position."
+
+
+def summary_prompt(resume_text: str, job_description: str) -> str:
+    return f"""
+        Analyze this resume against the job description and provide a concise professional summary:
+
+        Resume: {resume_text[:1000]}
+        Job Description: {job_description[:500]}
+
+        Provide a 2-sentence professional summary focusing on key strengths and job fit.
+        """
+
+
+def prompt_key(model: str, prompt: str) -> str:
+    return hashlib.sha256(f"{model}\0{prompt}".encode('utf-8')).hexdigest()
+
+
+class SummaryClient:
+    """Resume summaries from a chat completion model"""
+
+    def __init__(
+        self,
+        api_key: Optional[str],
+        base_url: Optional[str] = None,
+        model: str = "gpt-3.5-turbo",
+        timeout: float = 10.0,
+        max_concurrency: int = 8,
+        cache_size: int = 4096,
+        cache_ttl: float = 86400.0,
+        max_tokens: int = 100
+    ):
+        self.model = model
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.max_tokens = max_tokens
+        self.client = None
+        if api_key and AsyncOpenAI is not None:
+            # Connection pool sized to the concurrency cap
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency)
+            )
+            self.client = AsyncOpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                timeout=timeout,
+                max_retries=0,
+                http_client=http_client
+            )
+        # Created on first use: on Python 3.9 a semaphore binds to the loop current when it is made
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._cache: 'OrderedDict[str, Tuple[float, str]]' = OrderedDict()
+        self._pending = {}
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    def _cached(self, key: str) -> Optional[str]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        stored_at, summary = entry
+        if time.monotonic() - stored_at > self.cache_ttl:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return summary
+
+    def _remember(self, key: str, summary: str):
+        self._cache[key] = (time.monotonic(), summary)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def _complete(self, prompt: str) -> str:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=self.max_tokens
+            )
+        return response.choices[0].message.content.strip()
+
+    async def _summarize(self, key: str, prompt: str) -> Optional[str]:
+        try:
+            summary = await asyncio.wait_for(self._complete(prompt), self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            logger.warning(f"Summary completion exceeded {self.timeout}s")
+            return None
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Summary completion failed: {e}")
+            return None
+        self._remember(key, summary)
+        return summary
+
+    async def summarize(self, resume_text: str, job_description: str) -> str:
+        """A summary of the resume against the job, or a fixed fallback"""
+        if self.client is None:
+            return NO_KEY_SUMMARY
+        prompt = summary_prompt(resume_text, job_description)
+        key = prompt_key(self.model, prompt)
+        summary = self._cached(key)
+        if summary is not None:
+            self.hits += 1
+            return summary
+
+        task = self._pending.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(self._summarize(key, prompt))
+            self._pending[key] = task
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+        else:
+            self.shared += 1
+        # A cancelled request must not cancel a completion other requests are waiting on
+        summary = await asyncio.shield(task)
+        return summary if summary is not None else FALLBACK_SUMMARY
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.client is not None,
+            "model": self.model,
+            "cached": len(self._cache),
+            "inFlight": len(self._pending),
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared": self.shared,
+            "timeouts": self.timeouts,
+            "errors": self.errors
+        }
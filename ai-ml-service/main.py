@@ -1,22 +1,97 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
 from typing import List, Dict, Optional
-import numpy as np
-import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import openai
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import logging
 import os
 from dotenv import load_dotenv
-import json
-import re
+
+import columnar
+import sentiment
+from llm_summary import SummaryClient
+import serialization
+from bias_analytics import BiasAnalyticsEngine
+
+from scoring_core import extract_experience, get_skill_matcher, get_tfidf_model, metrics, pair_similarity
+from scoring_core.ranking import (
+    RANKING_CRITERIA,
+    count_required_skills,
+    page_indices,
+    score_candidates,
+    score_columns,
+)
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+class FastJSONResponse(Response):
+    """JSON response encoded with orjson when it is installed.
+
+    Only the endpoints that build large bodies themselves return it; the
+    others keep FastAPI's default JSONResponse.
+    """
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return serialization.dumps(content)
+
 app = FastAPI(title="AI Hiring ML Service", version="1.0.0")
 
-# Initialize OpenAI
-openai.api_key = os.getenv("OPENAI_API_KEY")
+# Per-stage latency histograms and input counters on /metrics, plus a Server-Timing
+# header on every response. METRICS_ENABLED=0 removes all of it.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+METRICS_SERVER_TIMING = os.getenv("METRICS_SERVER_TIMING", "true").strip().lower() in ("1", "true", "yes", "on")
+service_metrics = metrics.ServiceMetrics("ai_service", inputs={
+    "resume_characters": "Characters of resume text analyzed",
+    "candidates": "Candidates ranked"
+})
+if METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware, metrics=service_metrics, server_timing=METRICS_SERVER_TIMING)
+
+# LLM summaries for /analyze-resume. OPENAI_BASE_URL points at a compatible
+# server (or a local fake in development); each summary must finish within
+# OPENAI_TIMEOUT_SECONDS, with at most OPENAI_MAX_CONCURRENCY in flight
+summary_client = SummaryClient(
+    api_key=os.getenv("OPENAI_API_KEY"),
+    base_url=os.getenv("OPENAI_BASE_URL") or None,
+    model=os.getenv("OPENAI_MODEL", "gpt-3.5-turbo"),
+    timeout=float(os.getenv("OPENAI_TIMEOUT_SECONDS", "10")),
+    max_concurrency=int(os.getenv("OPENAI_MAX_CONCURRENCY", "8")),
+    cache_size=int(os.getenv("SUMMARY_CACHE_SIZE", "4096")),
+    cache_ttl=float(os.getenv("SUMMARY_CACHE_TTL_SECONDS", "86400"))
+)
+
+# Skill matcher compiled once from this service's set in the skill taxonomy (SKILL_TAXONOMY_PATH)
+skill_matcher = get_skill_matcher(skill_set='ai-ml-service')
+
+# Corpus-fitted TF-IDF model (TFIDF_MODEL_PATH); without one, match scores
+# fall back to fitting a vectorizer on each resume/job pair
+tfidf_model = get_tfidf_model()
+
+# Running hiring-bias counts fed by POST /bias/events. BIAS_ATTRIBUTES adds
+# attributes beyond gender and age; BIAS_STATE_PATH keeps counts across restarts,
+# saved every BIAS_SAVE_INTERVAL_SECONDS while new events arrive and at shutdown.
+BIAS_STATE_PATH = os.getenv("BIAS_STATE_PATH")
+BIAS_SAVE_INTERVAL_SECONDS = float(os.getenv("BIAS_SAVE_INTERVAL_SECONDS", "30"))
+bias_engine = BiasAnalyticsEngine(
+    attributes=[name.strip() for name in os.getenv("BIAS_ATTRIBUTES", "").split(",") if name.strip()],
+    windows=[int(days) for days in os.getenv("BIAS_WINDOWS_DAYS", "30,90,365").split(",") if days.strip()],
+    timestamp_field=os.getenv("BIAS_TIMESTAMP_FIELD", "timestamp")
+)
+if BIAS_STATE_PATH:
+    bias_engine.load(BIAS_STATE_PATH)
+
+# /analyze-sentiment/batch spreads batches of at least SENTIMENT_POOL_MIN_TEXTS
+# texts over SENTIMENT_PROCESSES worker processes; 0 scores them in-process
+SENTIMENT_PROCESSES = int(os.getenv("SENTIMENT_PROCESSES", "0"))
+SENTIMENT_POOL_MIN_TEXTS = int(os.getenv("SENTIMENT_POOL_MIN_TEXTS", "2000"))
+SENTIMENT_BATCH_MAX_TEXTS = int(os.getenv("SENTIMENT_BATCH_MAX_TEXTS", "100000"))
+sentiment_pool: Optional[ProcessPoolExecutor] = None
 
 class ResumeAnalysisRequest(BaseModel):
     resume_text: str
@@ -25,14 +100,29 @@ class ResumeAnalysisRequest(BaseModel):
 class CandidateRankingRequest(BaseModel):
     candidates: List[Dict]
     job_requirements: Dict
+    top_k: Optional[int] = Field(None, ge=0)
+    offset: int = Field(0, ge=0)
+    limit: Optional[int] = Field(None, ge=0)
 
 class BiasAnalysisRequest(BaseModel):
     hiring_data: List[Dict]
 
+class BiasEventsRequest(BaseModel):
+    events: List[Dict]
+
 class SentimentAnalysisRequest(BaseModel):
     text: str
     context: str
 
+class SentimentBatchItem(BaseModel):
+    text: str
+    # Falls back to the batch context
+    context: Optional[str] = None
+
+class SentimentBatchRequest(BaseModel):
+    items: List[SentimentBatchItem] = Field(..., max_length=SENTIMENT_BATCH_MAX_TEXTS)
+    context: str = ""
+
 class ResumeAnalysisResponse(BaseModel):
     match_score: float
     key_skills: List[str]
@@ -44,6 +134,7 @@ class ResumeAnalysisResponse(BaseModel):
 class CandidateRankingResponse(BaseModel):
     ranked_candidates: List[Dict]
     ranking_criteria: Dict
+    total_candidates: int
 
 class BiasAnalysisResponse(BaseModel):
     bias_score: float
@@ -56,70 +147,185 @@ class SentimentAnalysisResponse(BaseModel):
     emotions: Dict
     engagement_score: float
 
+class SentimentBatchResponse(BaseModel):
+    results: List[SentimentAnalysisResponse]
+    count: int
+
+def json_or_columnar_body(model) -> dict:
+    """OpenAPI request body for endpoints that take JSON or an Arrow/Parquet table"""
+    content = {"application/json": {"schema": model.model_json_schema()}}
+    for content_type in columnar.COLUMNAR_TYPES:
+        content[content_type] = {"schema": {"type": "string", "format": "binary"}}
+    return {"requestBody": {"required": True, "content": content}}
+
+async def read_json_body(http_request: Request, model):
+    try:
+        return model.model_validate_json(await http_request.body())
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+
+async def read_table_body(http_request: Request):
+    try:
+        return columnar.read_table(await http_request.body(), http_request.headers.get("content-type"))
+    except columnar.UnsupportedBodyError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+service_metrics.gauge("tfidf_model_loaded", "Whether a fitted TF-IDF model is loaded", lambda: tfidf_model is not None)
+service_metrics.gauge(
+    "tfidf_vocabulary_size",
+    "Terms in the fitted TF-IDF model",
+    lambda: tfidf_model.vocabulary_size if tfidf_model is not None else None
+)
+service_metrics.gauge("llm_summaries_cached", "LLM summaries in the cache", lambda: summary_client.stats()["cached"])
+service_metrics.gauge("llm_summaries_in_flight", "LLM summary completions in flight", lambda: summary_client.stats()["inFlight"])
+
+if METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def prometheus_metrics():
+        return Response(service_metrics.render(), media_type=metrics.CONTENT_TYPE)
+
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "service": "ai-ml-service"}
+    return {"status": "healthy", "service": "ai-ml-service", "llmSummaries": summary_client.stats()}
 
 @app.post("/analyze-resume", response_model=ResumeAnalysisResponse)
 async def analyze_resume(request: ResumeAnalysisRequest):
+    metrics.count_input("resume_characters", len(request.resume_text))
+    # The LLM summary is awaited alongside the local analysis, which runs off the event loop
+    summary_task = asyncio.ensure_future(
+        summary_client.summarize(request.resume_text, request.job_description)
+    )
     try:
-        # Extract skills using NLP
-        skills = extract_skills(request.resume_text)
-        
-        # Calculate match score
-        match_score = calculate_match_score(request.resume_text, request.job_description)
-        
-        # Extract experience
-        experience_years = extract_experience(request.resume_text)
-        
-        # Generate AI summary
-        summary = await generate_ai_summary(request.resume_text, request.job_description)
+        analysis = await run_in_threadpool(analyze_resume_locally, request.resume_text, request.job_description)
+        # Only the wait left once the local analysis is done
+        with metrics.stage("summary"):
+            summary = await summary_task
         
-        # Identify strengths and weaknesses
-        strengths, weaknesses = analyze_strengths_weaknesses(request.resume_text, request.job_description)
-        
-        return ResumeAnalysisResponse(
-            match_score=match_score,
-            key_skills=skills,
-            experience_years=experience_years,
-            strengths=strengths,
-            weaknesses=weaknesses,
-            summary=summary
-        )
+        return ResumeAnalysisResponse(summary=summary, **analysis)
     except Exception as e:
+        summary_task.cancel()
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/rank-candidates", response_model=CandidateRankingResponse)
-async def rank_candidates(request: CandidateRankingRequest):
+@app.post(
+    "/rank-candidates",
+    response_model=CandidateRankingResponse,
+    response_class=FastJSONResponse,
+    openapi_extra=json_or_columnar_body(CandidateRankingRequest)
+)
+async def rank_candidates(http_request: Request):
+    """Rank candidates from JSON, or from an Arrow/Parquet table of candidates.
+    
+    A table body carries job_requirements (and optionally top_k, offset, limit)
+    as JSON values in its schema metadata. If the Accept header asks for a
+    columnar type the ranked page is returned in that format; if it asks for
+    application/x-ndjson the page is streamed one candidate per line, with the
+    pool size in X-Total-Candidates. The ranked page is built here and is not
+    validated again against the response model.
+    """
+    if columnar.is_columnar(http_request.headers.get("content-type")):
+        return await rank_candidates_table(http_request)
+    with metrics.stage("parse"):
+        request = await read_json_body(http_request, CandidateRankingRequest)
+    metrics.count_input("candidates", len(request.candidates))
     try:
-        ranked_candidates = []
-        
-        for candidate in request.candidates:
-            score = calculate_candidate_score(candidate, request.job_requirements)
-            candidate_with_score = {**candidate, "ai_score": score}
-            ranked_candidates.append(candidate_with_score)
-        
-        # Sort by score
-        ranked_candidates.sort(key=lambda x: x["ai_score"], reverse=True)
-        
-        ranking_criteria = {
-            "skills_weight": 0.4,
-            "experience_weight": 0.3,
-            "education_weight": 0.2,
-            "cultural_fit_weight": 0.1
-        }
-        
-        return CandidateRankingResponse(
-            ranked_candidates=ranked_candidates,
-            ranking_criteria=ranking_criteria
+        # Score the whole pool with array operations, then only build the requested page
+        with metrics.stage("score"):
+            scores = score_candidates(request.candidates, request.job_requirements)
+        with metrics.stage("rank"):
+            indices = page_indices(scores, request.top_k, request.offset, request.limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    ranked_candidates = (
+        {**request.candidates[index], "ai_score": float(scores[index])}
+        for index in indices
+    )
+    return ranked_response(http_request, ranked_candidates, len(request.candidates))
+
+def ranked_response(http_request: Request, ranked_candidates, total_candidates: int) -> Response:
+    """The ranked page as NDJSON when the client asks for it, otherwise as one JSON document"""
+    if serialization.wants_ndjson(http_request.headers.get("accept")):
+        return StreamingResponse(
+            serialization.ndjson_chunks(ranked_candidates),
+            media_type=serialization.NDJSON,
+            headers={"X-Total-Candidates": str(total_candidates)}
+        )
+    with metrics.stage("serialize"):
+        return FastJSONResponse({
+            "ranked_candidates": list(ranked_candidates),
+            "ranking_criteria": RANKING_CRITERIA,
+            "total_candidates": total_candidates
+        })
+
+async def rank_candidates_table(http_request: Request):
+    with metrics.stage("parse"):
+        table = await read_table_body(http_request)
+    metrics.count_input("candidates", table.num_rows)
+    job_requirements = columnar.table_metadata(table, "job_requirements")
+    if not isinstance(job_requirements, dict):
+        raise HTTPException(status_code=400, detail="job_requirements schema metadata is required")
+    try:
+        paging = CandidateRankingRequest(
+            candidates=[],
+            job_requirements=job_requirements,
+            top_k=columnar.table_metadata(table, "top_k"),
+            offset=columnar.table_metadata(table, "offset") or 0,
+            limit=columnar.table_metadata(table, "limit")
         )
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+    
+    try:
+        with metrics.stage("score"):
+            columns = columnar.ranking_columns(table, job_requirements)
+            scores = score_columns(
+                count_required_skills(columns["rows"], columns["cols"], columns["vocab_size"], table.num_rows),
+                columns["experience"],
+                columns["education_match"],
+                columns["required_skill_count"],
+                columns["min_experience"]
+            )
+        with metrics.stage("rank"):
+            indices = page_indices(scores, paging.top_k, paging.offset, paging.limit)
+            page = columnar.ranked_table(
+                table,
+                indices,
+                scores,
+                {"ranking_criteria": RANKING_CRITERIA, "total_candidates": table.num_rows}
+            )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    
+    output_format = columnar.response_format(http_request.headers.get("accept"))
+    if output_format:
+        with metrics.stage("serialize"):
+            content = columnar.write_table(page, output_format)
+        return Response(
+            content=content,
+            media_type=output_format,
+            headers={"X-Total-Candidates": str(table.num_rows)}
+        )
+    return ranked_response(http_request, columnar.table_rows(page), table.num_rows)
 
-@app.post("/analyze-bias", response_model=BiasAnalysisResponse)
-async def analyze_bias(request: BiasAnalysisRequest):
+@app.post(
+    "/analyze-bias",
+    response_model=BiasAnalysisResponse,
+    openapi_extra=json_or_columnar_body(BiasAnalysisRequest)
+)
+async def analyze_bias(http_request: Request):
+    """Bias analysis of posted hiring data, as JSON or an Arrow/Parquet table of events"""
+    if columnar.is_columnar(http_request.headers.get("content-type")):
+        table = await read_table_body(http_request)
+        hiring_data = None
+    else:
+        hiring_data = (await read_json_body(http_request, BiasAnalysisRequest)).hiring_data
     try:
-        bias_indicators = detect_bias_patterns(request.hiring_data)
+        if hiring_data is None:
+            bias_indicators = detect_bias_patterns_table(table)
+        else:
+            bias_indicators = detect_bias_patterns(hiring_data)
         bias_score = calculate_bias_score(bias_indicators)
         recommendations = generate_bias_recommendations(bias_indicators)
         
@@ -131,86 +337,131 @@ async def analyze_bias(request: BiasAnalysisRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/bias/events", openapi_extra=json_or_columnar_body(BiasEventsRequest))
+async def ingest_bias_events(http_request: Request):
+    """Add hiring events, as JSON or an Arrow/Parquet table, to the running bias counts"""
+    if columnar.is_columnar(http_request.headers.get("content-type")):
+        table = await read_table_body(http_request)
+        events = None
+    else:
+        events = (await read_json_body(http_request, BiasEventsRequest)).events
+    try:
+        if events is None:
+            ingested = await run_in_threadpool(columnar.ingest_bias_table, bias_engine, table)
+        else:
+            ingested = await run_in_threadpool(bias_engine.ingest_many, events)
+        return {"ingested": ingested, "total_events": bias_engine.events}
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/bias/analysis", response_model=BiasAnalysisResponse)
+async def get_bias_analysis(window_days: Optional[int] = None):
+    """Bias analysis over every ingested event, or the last window_days days"""
+    try:
+        bias_indicators = bias_engine.indicators(window_days)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return BiasAnalysisResponse(
+        bias_score=calculate_bias_score(bias_indicators),
+        bias_indicators=bias_indicators,
+        recommendations=generate_bias_recommendations(bias_indicators)
+    )
+
+@app.get("/bias/stats")
+async def get_bias_stats():
+    return bias_engine.stats()
+
+bias_save_task: Optional[asyncio.Task] = None
+
+async def save_bias_state_periodically():
+    saved_events = bias_engine.events
+    while True:
+        await asyncio.sleep(BIAS_SAVE_INTERVAL_SECONDS)
+        if bias_engine.events == saved_events:
+            continue
+        saved_events = bias_engine.events
+        try:
+            await run_in_threadpool(bias_engine.save, BIAS_STATE_PATH)
+        except OSError as e:
+            logger.error(f"Failed to save bias state to {BIAS_STATE_PATH}: {e}")
+
+@app.on_event("startup")
+async def start_bias_state_saver():
+    global bias_save_task
+    if BIAS_STATE_PATH and BIAS_SAVE_INTERVAL_SECONDS > 0:
+        bias_save_task = asyncio.create_task(save_bias_state_periodically())
+
+@app.on_event("shutdown")
+async def save_bias_state():
+    if bias_save_task is not None:
+        bias_save_task.cancel()
+    if BIAS_STATE_PATH:
+        bias_engine.save(BIAS_STATE_PATH)
+
 @app.post("/analyze-sentiment", response_model=SentimentAnalysisResponse)
 async def analyze_sentiment(request: SentimentAnalysisRequest):
     try:
-        sentiment_result = analyze_text_sentiment(request.text)
-        emotions = extract_emotions(request.text)
-        engagement_score = calculate_engagement_score(request.text, request.context)
-        
-        return SentimentAnalysisResponse(
-            sentiment=sentiment_result["sentiment"],
-            confidence=sentiment_result["confidence"],
-            emotions=emotions,
-            engagement_score=engagement_score
-        )
+        return SentimentAnalysisResponse(**sentiment.analyze(request.text, request.context))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/analyze-sentiment/batch", response_model=SentimentBatchResponse, response_class=FastJSONResponse)
+async def analyze_sentiment_batch(request: SentimentBatchRequest):
+    """Sentiment of many texts in one call, each scored as /analyze-sentiment would"""
+    items = [
+        (item.text, item.context if item.context is not None else request.context)
+        for item in request.items
+    ]
+    try:
+        if SENTIMENT_PROCESSES > 0 and items and len(items) >= SENTIMENT_POOL_MIN_TEXTS:
+            results = await analyze_sentiment_in_pool(items)
+        else:
+            results = await run_in_threadpool(sentiment.analyze_batch, items)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return FastJSONResponse({"results": results, "count": len(results)})
+
+async def analyze_sentiment_in_pool(items) -> List[Dict]:
+    """Split a batch into one chunk per worker process and score the chunks concurrently"""
+    global sentiment_pool
+    if sentiment_pool is None:
+        sentiment_pool = ProcessPoolExecutor(max_workers=SENTIMENT_PROCESSES)
+    loop = asyncio.get_running_loop()
+    chunk_size = -(-len(items) // SENTIMENT_PROCESSES)
+    chunks = await asyncio.gather(*[
+        loop.run_in_executor(sentiment_pool, sentiment.analyze_batch, items[start:start + chunk_size])
+        for start in range(0, len(items), chunk_size)
+    ])
+    return [result for chunk in chunks for result in chunk]
+
+@app.on_event("shutdown")
+async def stop_sentiment_pool():
+    if sentiment_pool is not None:
+        sentiment_pool.shutdown(wait=False, cancel_futures=True)
+
 # Helper functions
+def analyze_resume_locally(resume_text: str, job_description: str) -> Dict:
+    """Skills, match score, experience, strengths and weaknesses of a resume against a job"""
+    strengths, weaknesses = analyze_strengths_weaknesses(resume_text, job_description)
+    return {
+        "match_score": calculate_match_score(resume_text, job_description),
+        "key_skills": extract_skills(resume_text),
+        "experience_years": extract_experience(resume_text),
+        "strengths": strengths,
+        "weaknesses": weaknesses
+    }
+
 def extract_skills(resume_text: str) -> List[str]:
-    """Extract skills from resume text using pattern matching and NLP"""
-    common_skills = [
-        "Python", "JavaScript", "Java", "React", "Node.js", "SQL", "AWS", "Docker",
-        "Kubernetes", "Machine Learning", "Data Science", "Project Management",
-        "Leadership", "Communication", "Problem Solving", "Teamwork"
-    ]
-    
-    found_skills = []
-    resume_lower = resume_text.lower()
-    
-    for skill in common_skills:
-        if skill.lower() in resume_lower:
-            found_skills.append(skill)
-    
-    return found_skills[:10]  # Return top 10 skills
+    """Extract skills from resume text using the shared single-pass skill matcher"""
+    with metrics.stage("skills"):
+        return skill_matcher.extract_names(resume_text)[:10]  # Return top 10 skills
 
 def calculate_match_score(resume_text: str, job_description: str) -> float:
     """Calculate similarity score between resume and job description"""
-    vectorizer = TfidfVectorizer(stop_words='english')
-    tfidf_matrix = vectorizer.fit_transform([resume_text, job_description])
-    similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])
-    return float(similarity[0][0] * 100)
-
-def extract_experience(resume_text: str) -> int:
-    """Extract years of experience from resume"""
-    patterns = [
-        r'(\d+)\+?\s*years?\s*(?:of\s*)?experience',
-        r'(\d+)\+?\s*years?\s*in',
-        r'experience\s*:\s*(\d+)\+?\s*years?'
-    ]
-    
-    for pattern in patterns:
-        matches = re.findall(pattern, resume_text.lower())
-        if matches:
-            return int(matches[0])
-    
-    return 0
-
-async def generate_ai_summary(resume_text: str, job_description: str) -> str:
-    """Generate AI-powered summary using OpenAI"""
-    try:
-        if not openai.api_key:
-            return "Professional candidate with relevant experience and skills matching the job requirements."
-        
-        prompt = f"""
-        Analyze this resume against the job description and provide a concise professional summary:
-        
-        Resume: {resume_text[:1000]}
-        Job Description: {job_description[:500]}
-        
-        Provide a 2-sentence professional summary focusing on key strengths and job fit.
-        """
-        
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=100
-        )
-        
-        return response.choices[0].message.content.strip()
-    except:
-        return "Experienced professional with strong technical skills and relevant background for this position."
+    with metrics.stage("tfidf"):
+        if tfidf_model is not None:
+            return tfidf_model.similarity(job_description, resume_text) * 100
+        return pair_similarity(resume_text, job_description, stop_words='english') * 100
 
 def analyze_strengths_weaknesses(resume_text: str, job_description: str) -> tuple:
     """Analyze candidate strengths and potential gaps"""
@@ -222,55 +473,23 @@ def analyze_strengths_weaknesses(resume_text: str, job_description: str) -> tupl
     
     return strengths[:5], weaknesses[:3]
 
-def calculate_candidate_score(candidate: Dict, job_requirements: Dict) -> float:
-    """Calculate overall candidate score based on multiple factors"""
-    score = 0.0
-    
-    # Skills matching (40% weight)
-    candidate_skills = candidate.get("skills", [])
-    required_skills = job_requirements.get("required_skills", [])
-    skill_match = len(set(candidate_skills).intersection(set(required_skills)))
-    skill_score = (skill_match / max(len(required_skills), 1)) * 40
-    
-    # Experience (30% weight)
-    candidate_exp = candidate.get("experience_years", 0)
-    required_exp = job_requirements.get("min_experience", 0)
-    exp_score = min(candidate_exp / max(required_exp, 1), 1.0) * 30
-    
-    # Education (20% weight)
-    education_score = 20 if candidate.get("education_level") == job_requirements.get("education_level") else 10
-    
-    # Cultural fit (10% weight) - simplified
-    cultural_score = 10
-    
-    return score + skill_score + exp_score + education_score + cultural_score
-
 def detect_bias_patterns(hiring_data: List[Dict]) -> Dict:
     """Detect potential bias patterns in hiring data"""
     if not hiring_data:
         return {}
     
-    df = pd.DataFrame(hiring_data)
-    bias_indicators = {}
-    
-    # Gender bias analysis
-    if 'gender' in df.columns and 'hired' in df.columns:
-        gender_hire_rate = df.groupby('gender')['hired'].mean()
-        bias_indicators['gender_bias'] = {
-            'hire_rates': gender_hire_rate.to_dict(),
-            'variance': float(gender_hire_rate.var())
-        }
-    
-    # Age bias analysis
-    if 'age' in df.columns and 'hired' in df.columns:
-        age_groups = pd.cut(df['age'], bins=[0, 30, 40, 50, 100], labels=['<30', '30-40', '40-50', '50+'])
-        age_hire_rate = df.groupby(age_groups)['hired'].mean()
-        bias_indicators['age_bias'] = {
-            'hire_rates': age_hire_rate.to_dict(),
-            'variance': float(age_hire_rate.var())
-        }
-    
-    return bias_indicators
+    # Same counting engine as /bias/events, over just the posted data
+    engine = BiasAnalyticsEngine()
+    engine.ingest_many(hiring_data)
+    return engine.indicators()
+
+def detect_bias_patterns_table(table) -> Dict:
+    """detect_bias_patterns for an Arrow table of hiring events"""
+    if table.num_rows == 0:
+        return {}
+    engine = BiasAnalyticsEngine()
+    columnar.ingest_bias_table(engine, table)
+    return engine.indicators()
 
 def calculate_bias_score(bias_indicators: Dict) -> float:
     """Calculate overall bias score (0-100, lower is better)"""
@@ -313,53 +532,6 @@ def generate_bias_recommendations(bias_indicators: Dict) -> List[str]:
     
     return recommendations
 
-def analyze_text_sentiment(text: str) -> Dict:
-    """Analyze sentiment of text (simplified implementation)"""
-    positive_words = ["excellent", "great", "good", "positive", "excited", "enthusiastic", "motivated"]
-    negative_words = ["bad", "poor", "negative", "concerned", "worried", "disappointed"]
-    
-    text_lower = text.lower()
-    positive_count = sum(1 for word in positive_words if word in text_lower)
-    negative_count = sum(1 for word in negative_words if word in text_lower)
-    
-    if positive_count > negative_count:
-        sentiment = "positive"
-        confidence = min(positive_count / (positive_count + negative_count + 1), 0.95)
-    elif negative_count > positive_count:
-        sentiment = "negative"
-        confidence = min(negative_count / (positive_count + negative_count + 1), 0.95)
-    else:
-        sentiment = "neutral"
-        confidence = 0.5
-    
-    return {"sentiment": sentiment, "confidence": confidence}
-
-def extract_emotions(text: str) -> Dict:
-    """Extract emotional indicators from text"""
-    emotions = {
-        "enthusiasm": len(re.findall(r'excited|enthusiastic|passionate|love', text.lower())),
-        "confidence": len(re.findall(r'confident|sure|certain|believe', text.lower())),
-        "concern": len(re.findall(r'concerned|worried|unsure|doubt', text.lower()))
-    }
-    
-    total = sum(emotions.values()) or 1
-    return {k: v/total for k, v in emotions.items()}
-
-def calculate_engagement_score(text: str, context: str) -> float:
-    """Calculate engagement score based on text analysis"""
-    # Length factor
-    length_score = min(len(text) / 500, 1.0) * 0.3
-    
-    # Question asking (shows engagement)
-    question_score = min(text.count('?') / 3, 1.0) * 0.3
-    
-    # Specific mentions (shows research)
-    context_words = context.lower().split()
-    specific_mentions = sum(1 for word in context_words if word in text.lower())
-    mention_score = min(specific_mentions / 5, 1.0) * 0.4
-    
-    return (length_score + question_score + mention_score) * 100
-
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
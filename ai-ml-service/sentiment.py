@@ -0,0 +1,89 @@
+"""Keyword sentiment, emotion and engagement scoring.
+
+Each text is lowercased once and matched against patterns compiled at
+import; an emotion pattern only runs when one of its words occurs in the
+text. A context shared by many texts (the usual case in nightly transcript
+jobs) is split once per batch. Scores are the same as scoring the texts one
+request at a time.
+"""
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+POSITIVE_WORDS = ("excellent", "great", "good", "positive", "excited", "enthusiastic", "motivated")
+NEGATIVE_WORDS = ("bad", "poor", "negative", "concerned", "worried", "disappointed")
+
+EMOTION_WORDS = {
+    "enthusiasm": ("excited", "enthusiastic", "passionate", "love"),
+    "confidence": ("confident", "sure", "certain", "believe"),
+    "concern": ("concerned", "worried", "unsure", "doubt")
+}
+EMOTION_PATTERNS = {name: re.compile('|'.join(words)) for name, words in EMOTION_WORDS.items()}
+
+
+def text_sentiment(text_lower: str) -> Dict:
+    """Sentiment and confidence from keyword counts in a lowercased text"""
+    positive_count = sum(1 for word in POSITIVE_WORDS if word in text_lower)
+    negative_count = sum(1 for word in NEGATIVE_WORDS if word in text_lower)
+
+    if positive_count > negative_count:
+        sentiment = "positive"
+        confidence = min(positive_count / (positive_count + negative_count + 1), 0.95)
+    elif negative_count > positive_count:
+        sentiment = "negative"
+        confidence = min(negative_count / (positive_count + negative_count + 1), 0.95)
+    else:
+        sentiment = "neutral"
+        confidence = 0.5
+
+    return {"sentiment": sentiment, "confidence": confidence}
+
+
+def text_emotions(text_lower: str) -> Dict:
+    """Share of each emotion among the emotional indicators in a lowercased text"""
+    emotions = {}
+    for name, pattern in EMOTION_PATTERNS.items():
+        # Substring checks are much cheaper than a regex scan and rule most texts out
+        if any(word in text_lower for word in EMOTION_WORDS[name]):
+            emotions[name] = len(pattern.findall(text_lower))
+        else:
+            emotions[name] = 0
+    total = sum(emotions.values()) or 1
+    return {k: v / total for k, v in emotions.items()}
+
+
+def engagement_score(text: str, text_lower: str, context_words: Sequence[str]) -> float:
+    """Engagement from length, questions asked and context words mentioned"""
+    # Length factor
+    length_score = min(len(text) / 500, 1.0) * 0.3
+
+    # Question asking (shows engagement)
+    question_score = min(text.count('?') / 3, 1.0) * 0.3
+
+    # Specific mentions (shows research)
+    specific_mentions = sum(1 for word in context_words if word in text_lower)
+    mention_score = min(specific_mentions / 5, 1.0) * 0.4
+
+    return (length_score + question_score + mention_score) * 100
+
+
+def analyze(text: str, context: str, context_words: Optional[Sequence[str]] = None) -> Dict:
+    """Sentiment, confidence, emotions and engagement score of one text"""
+    text_lower = text.lower()
+    if context_words is None:
+        context_words = context.lower().split()
+    result = text_sentiment(text_lower)
+    result["emotions"] = text_emotions(text_lower)
+    result["engagement_score"] = engagement_score(text, text_lower, context_words)
+    return result
+
+
+def analyze_batch(items: Iterable[Tuple[str, str]]) -> List[Dict]:
+    """analyze() over (text, context) pairs, splitting each distinct context once"""
+    context_words = {}
+    results = []
+    for text, context in items:
+        words = context_words.get(context)
+        if words is None:
+            words = context_words[context] = context.lower().split()
+        results.append(analyze(text, context, words))
+    return results
@@ -0,0 +1,87 @@
+"""JSON and NDJSON encoding for response bodies.
+
+Ranked candidate pages are built by the service itself, so they are encoded
+straight to bytes instead of being validated again against a response model.
+orjson is used when installed, falling back to the standard library; both
+write NaN and infinities as null, since JSON has no way to express them. Large
+rankings can also be sent as NDJSON, one candidate per line, written in
+chunks as they are produced so the whole body never sits in memory at once.
+"""
+import json
+import math
+from typing import Any, Iterable, Iterator, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the deployment
+    orjson = None
+
+NDJSON = 'application/x-ndjson'
+# Some clients ask for JSON Lines under its own name
+NDJSON_TYPES = (NDJSON, 'application/jsonl')
+
+# Rows per write when streaming NDJSON
+NDJSON_CHUNK_ROWS = 256
+
+
+def _default(value: Any):
+    # NumPy scalars and arrays, for the standard library encoder
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _finite(value: Any) -> Any:
+    """Copy of value with NaN and infinities replaced by None, as orjson writes them"""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    if hasattr(value, 'tolist'):
+        return _finite(value.tolist())
+    return value
+
+
+def _json_dumps(value: Any) -> bytes:
+    return json.dumps(
+        value, separators=(',', ':'), ensure_ascii=False, allow_nan=False, default=_default
+    ).encode('utf-8')
+
+
+def stdlib_dumps(value: Any) -> bytes:
+    """dumps without orjson"""
+    try:
+        return _json_dumps(value)
+    except ValueError:
+        # Only bodies that hold non-finite floats pay for the extra pass
+        return _json_dumps(_finite(value))
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps(value: Any) -> bytes:
+        return orjson.dumps(value, option=_ORJSON_OPTIONS)
+else:
+    dumps = stdlib_dumps
+
+
+def wants_ndjson(accept: Optional[str]) -> bool:
+    """Whether an Accept header asks for newline-delimited JSON"""
+    return any(part.split(';')[0].strip().lower() in NDJSON_TYPES for part in (accept or '').split(','))
+
+
+def ndjson_chunks(rows: Iterable[Any], chunk_rows: int = NDJSON_CHUNK_ROWS) -> Iterator[bytes]:
+    """Encode rows as NDJSON, yielding a chunk every chunk_rows rows"""
+    lines = []
+    for row in rows:
+        lines.append(dumps(row))
+        if len(lines) >= chunk_rows:
+            lines.append(b'')
+            yield b'\n'.join(lines)
+            lines = []
+    if lines:
+        lines.append(b'')
+        yield b'\n'.join(lines)
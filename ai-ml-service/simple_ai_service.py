@@ -1,9 +1,39 @@
+import argparse
 import json
-import re
-import math
+import os
+import signal
+import socket
+from concurrent.futures import ThreadPoolExecutor
 from http.server import HTTPServer, BaseHTTPRequestHandler
-from urllib.parse import urlparse, parse_qs
 import threading
+import traceback
+
+from scoring_core import (
+    RANKING_CRITERIA,
+    extract_experience,
+    get_skill_matcher,
+    rank_candidates,
+    word_overlap_score,
+)
+from serialization import NDJSON, dumps, ndjson_chunks, wants_ndjson
+
+# Skill matcher compiled once from this service's set in the skill taxonomy (SKILL_TAXONOMY_PATH)
+skill_matcher = get_skill_matcher(skill_set='simple-ai-service')
+
+# Serving: 'threaded' handles connections on a pool of AI_SERVICE_THREADS threads,
+# 'prefork' forks AI_SERVICE_WORKERS processes with such a pool each, and
+# 'single' is the original one-request-at-a-time server
+SERVER_MODES = ('single', 'threaded', 'prefork')
+SERVER_MODE = os.getenv("AI_SERVICE_MODE", "threaded")
+WORKERS = int(os.getenv("AI_SERVICE_WORKERS", str(os.cpu_count() or 1)))
+# A keep-alive connection holds its thread until it closes or idles out
+THREADS = int(os.getenv("AI_SERVICE_THREADS", "32"))
+HOST = os.getenv("AI_SERVICE_HOST", "")
+PORT = int(os.getenv("AI_SERVICE_PORT", "8000"))
+# Larger request bodies are refused with 413
+MAX_BODY_BYTES = int(os.getenv("AI_SERVICE_MAX_BODY_BYTES", str(10 * 1024 * 1024)))
+# Idle keep-alive connections are closed after this many seconds
+KEEPALIVE_SECONDS = float(os.getenv("AI_SERVICE_KEEPALIVE_SECONDS", "15"))
 
 class AIService:
     def analyze_resume(self, resume_text, job_description):
@@ -34,24 +64,15 @@ class AIService:
         }
     
     def rank_candidates(self, candidates, job_requirements):
-        """Rank candidates based on job requirements"""
-        ranked = []
-        
-        for candidate in candidates:
-            score = self.calculate_candidate_score(candidate, job_requirements)
-            candidate_with_score = {**candidate, "ai_score": score}
-            ranked.append(candidate_with_score)
-        
-        ranked.sort(key=lambda x: x["ai_score"], reverse=True)
-        
+        """Rank candidates based on job requirements, scored like /rank-candidates.
+
+        As there, a min_experience below one year counts as one year; this
+        service used to give no experience points for 0 and divide by the
+        fraction for values between 0 and 1.
+        """
         return {
-            "ranked_candidates": ranked,
-            "ranking_criteria": {
-                "skills_weight": 0.4,
-                "experience_weight": 0.3,
-                "education_weight": 0.2,
-                "cultural_fit_weight": 0.1
-            }
+            "ranked_candidates": rank_candidates(candidates, job_requirements),
+            "ranking_criteria": RANKING_CRITERIA
         }
     
     def analyze_bias(self, hiring_data):
@@ -107,95 +128,73 @@ class AIService:
     
     def extract_skills(self, text):
         """Extract skills from text"""
-        common_skills = [
-            "Python", "JavaScript", "Java", "React", "Node.js", "SQL", "AWS", "Docker",
-            "Kubernetes", "Machine Learning", "Data Science", "Project Management",
-            "Leadership", "Communication", "Problem Solving", "Teamwork", "Git",
-            "HTML", "CSS", "TypeScript", "Angular", "Vue", "MongoDB", "PostgreSQL"
-        ]
-        
-        found_skills = []
-        text_lower = text.lower()
-        
-        for skill in common_skills:
-            if skill.lower() in text_lower:
-                found_skills.append(skill)
-        
-        return found_skills[:8]
+        return skill_matcher.extract_names(text)[:8]
     
     def calculate_match_score(self, resume_text, job_description):
         """Calculate similarity score between resume and job description"""
-        resume_words = set(resume_text.lower().split())
-        job_words = set(job_description.lower().split())
-        
-        intersection = resume_words.intersection(job_words)
-        union = resume_words.union(job_words)
-        
-        if len(union) == 0:
-            return 0
-        
-        similarity = len(intersection) / len(union)
-        return min(similarity * 100, 95)
+        return word_overlap_score(resume_text, job_description)
     
     def extract_experience(self, text):
         """Extract years of experience from text"""
-        patterns = [
-            r'(\d+)\+?\s*years?\s*(?:of\s*)?experience',
-            r'(\d+)\+?\s*years?\s*in',
-            r'experience\s*:\s*(\d+)\+?\s*years?'
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text.lower())
-            if matches:
-                return int(matches[0])
-        
-        return 2  # Default experience
-    
-    def calculate_candidate_score(self, candidate, job_requirements):
-        """Calculate overall candidate score"""
-        score = 0.0
-        
-        # Skills matching (40% weight)
-        candidate_skills = candidate.get("skills", [])
-        required_skills = job_requirements.get("required_skills", [])
-        if required_skills:
-            skill_match = len(set(candidate_skills).intersection(set(required_skills)))
-            skill_score = (skill_match / len(required_skills)) * 40
-            score += skill_score
-        
-        # Experience (30% weight)
-        candidate_exp = candidate.get("experience_years", 0)
-        required_exp = job_requirements.get("min_experience", 0)
-        if required_exp > 0:
-            exp_score = min(candidate_exp / required_exp, 1.0) * 30
-            score += exp_score
-        
-        # Education (20% weight)
-        score += 20 if candidate.get("education_level") == job_requirements.get("education_level") else 10
-        
-        # Cultural fit (10% weight)
-        score += 10
-        
-        return min(score, 100)
+        return extract_experience(text, default=2)  # Default experience
 
 class AIRequestHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps connections open between requests; every response carries
+    # a Content-Length (or is chunked) so clients can find its end
+    protocol_version = 'HTTP/1.1'
+    timeout = KEEPALIVE_SECONDS
+    # Headers and body go out in separate writes; without this, Nagle's algorithm
+    # and delayed ACKs add ~40ms to each request on a reused connection
+    disable_nagle_algorithm = True
     ai_service = AIService()
     
+    def parse_request(self):
+        if not super().parse_request():
+            return False
+        self.server.mark_busy(self.connection, True)
+        return True
+    
+    def handle_one_request(self):
+        try:
+            super().handle_one_request()
+        finally:
+            self.server.mark_busy(self.connection, False)
+            if self.server.draining:
+                self.close_connection = True
+    
+    def end_headers(self):
+        # Give the thread up when shutting down or when connections are waiting for one
+        if self.server.draining or self.server.waiting:
+            self.close_connection = True
+        if self.close_connection and self.request_version == 'HTTP/1.1':
+            self.send_header('Connection', 'close')
+        super().end_headers()
+    
     def do_GET(self):
         if self.path == '/health':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            response = {"status": "healthy", "service": "ai-ml-service"}
-            self.wfile.write(json.dumps(response).encode())
+            self.send_json(200, {"status": "healthy", "service": "ai-ml-service"})
         else:
-            self.send_response(404)
-            self.end_headers()
+            self.send_empty(404)
+    
+    def read_body(self):
+        """The request body, or None after sending an error for a missing or oversized one"""
+        try:
+            content_length = int(self.headers['Content-Length'])
+        except (TypeError, ValueError):
+            self.close_connection = True
+            self.send_json(411, {"error": "Content-Length is required"})
+            return None
+        if content_length < 0 or content_length > MAX_BODY_BYTES:
+            # The body is left unread, so the connection cannot be reused
+            self.close_connection = True
+            self.send_json(413, {"error": f"Request body exceeds {MAX_BODY_BYTES} bytes"})
+            return None
+        return self.rfile.read(content_length)
     
     def do_POST(self):
-        content_length = int(self.headers['Content-Length'])
-        post_data = self.rfile.read(content_length)
+        post_data = self.read_body()
+        if post_data is None:
+            return
         
         try:
             data = json.loads(post_data.decode('utf-8'))
@@ -218,38 +217,200 @@ class AIRequestHandler(BaseHTTPRequestHandler):
                     data.get('context', '')
                 )
             else:
-                self.send_response(404)
-                self.end_headers()
+                self.send_empty(404)
                 return
             
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Access-Control-Allow-Methods', 'POST, GET, OPTIONS')
-            self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-            self.end_headers()
-            self.wfile.write(json.dumps(result).encode())
+            if self.path == '/rank-candidates' and wants_ndjson(self.headers.get('Accept')):
+                self.send_ndjson(result["ranked_candidates"])
+            else:
+                self.send_json(200, result, cors=True)
             
         except Exception as e:
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            error_response = {"error": str(e)}
-            self.wfile.write(json.dumps(error_response).encode())
+            self.send_json(500, {"error": str(e)})
     
-    def do_OPTIONS(self):
-        self.send_response(200)
+    def send_cors_headers(self):
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'POST, GET, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+    
+    def send_empty(self, status, cors=False):
+        self.send_response(status)
+        self.send_header('Content-Length', '0')
+        if cors:
+            self.send_cors_headers()
+        self.end_headers()
+    
+    def send_json(self, status, payload, cors=False):
+        body = dumps(payload)
+        self.send_response(status)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if cors:
+            self.send_cors_headers()
         self.end_headers()
+        self.wfile.write(body)
+    
+    def send_ndjson(self, rows):
+        """Stream rows one JSON document per line, chunked when the client speaks HTTP/1.1"""
+        chunked = self.protocol_version == 'HTTP/1.1' and self.request_version == 'HTTP/1.1'
+        self.send_response(200)
+        self.send_header('Content-type', NDJSON)
+        if chunked:
+            self.send_header('Transfer-Encoding', 'chunked')
+        else:
+            # Without chunked encoding the body ends when the connection closes
+            self.close_connection = True
+        self.send_cors_headers()
+        self.end_headers()
+        for chunk in ndjson_chunks(rows):
+            self.wfile.write(b'%x\r\n%s\r\n' % (len(chunk), chunk) if chunked else chunk)
+        if chunked:
+            self.wfile.write(b'0\r\n\r\n')
+    
+    def do_OPTIONS(self):
+        self.send_empty(200, cors=True)
+
+class SingleRequestHandler(AIRequestHandler):
+    """The original one-request-per-connection behaviour, for the single server mode"""
+    protocol_version = 'HTTP/1.0'
+    parse_request = BaseHTTPRequestHandler.parse_request
+    handle_one_request = BaseHTTPRequestHandler.handle_one_request
+    end_headers = BaseHTTPRequestHandler.end_headers
+
+class AIHTTPServer(HTTPServer):
+    """HTTPServer that handles connections on a fixed pool of threads and shuts down gracefully"""
+    request_queue_size = 128
+    
+    def __init__(self, server_address, handler_class, threads):
+        super().__init__(server_address, handler_class)
+        self.threads = threads
+        self.draining = False
+        # Accepted connections not yet picked up by a thread
+        self.waiting = 0
+        self._pool = None
+        self._connections = {}
+        self._lock = threading.Lock()
+    
+    def mark_busy(self, connection, busy):
+        with self._lock:
+            if connection in self._connections:
+                self._connections[connection] = busy
+    
+    def process_request(self, request, client_address):
+        if self._pool is None:
+            # Created on first use so pre-forked workers each get their own threads
+            self._pool = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix='ai-http')
+        with self._lock:
+            self._connections[request] = False
+            self.waiting += 1
+        self._pool.submit(self.process_request_thread, request, client_address)
+    
+    def process_request_thread(self, request, client_address):
+        with self._lock:
+            self.waiting -= 1
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            with self._lock:
+                self._connections.pop(request, None)
+            self.shutdown_request(request)
+    
+    def drain(self):
+        """Finish in-flight requests and close idle keep-alive connections; call after serve_forever returns"""
+        self.draining = True
+        with self._lock:
+            idle = [connection for connection, busy in self._connections.items() if not busy]
+        for connection in idle:
+            try:
+                # Wakes the handler waiting for the next request line, which then sees EOF
+                connection.shutdown(socket.SHUT_RD)
+            except OSError:
+                pass
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+        self.server_close()
+
+def stop_on_signals(server):
+    """Stop serve_forever on SIGTERM/SIGINT; shutdown() must run outside the serving thread"""
+    def handle(signum, frame):
+        threading.Thread(target=server.shutdown, daemon=True).start()
+    signal.signal(signal.SIGTERM, handle)
+    signal.signal(signal.SIGINT, handle)
+
+def serve_worker(server):
+    stop_on_signals(server)
+    server.serve_forever()
+    server.drain()
+
+def run_prefork(server, workers):
+    """Fork workers that accept on the shared listening socket, restarting any that die"""
+    children = set()
+    stopping = False
+    
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                serve_worker(server)
+            except BaseException:
+                traceback.print_exc()
+                code = 1
+            finally:
+                os._exit(code)
+        children.add(pid)
+    
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+    
+    for _ in range(workers):
+        spawn()
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        children.discard(pid)
+        if not stopping:
+            print(f"Worker {pid} exited with status {status}, restarting")
+            spawn()
+    server.server_close()
 
-def run_server():
-    server_address = ('', 8000)
-    httpd = HTTPServer(server_address, AIRequestHandler)
-    print("AI ML Service running on http://localhost:8000")
-    print("Health check: http://localhost:8000/health")
-    httpd.serve_forever()
+def run_server(mode=SERVER_MODE, workers=WORKERS, threads=THREADS, host=HOST, port=PORT):
+    if mode not in SERVER_MODES:
+        raise ValueError(f"Unknown server mode {mode!r}; expected one of {', '.join(SERVER_MODES)}")
+    if mode == 'prefork' and not hasattr(os, 'fork'):
+        print("Pre-forking is not available on this platform, using threaded mode")
+        mode = 'threaded'
+    server_address = (host, port)
+    print(f"AI ML Service running on http://localhost:{port} ({mode} mode)")
+    print(f"Health check: http://localhost:{port}/health")
+    if mode == 'single':
+        httpd = HTTPServer(server_address, SingleRequestHandler)
+        httpd.serve_forever()
+    elif mode == 'threaded':
+        serve_worker(AIHTTPServer(server_address, AIRequestHandler, threads))
+    else:
+        run_prefork(AIHTTPServer(server_address, AIRequestHandler, threads), workers)
 
 if __name__ == '__main__':
-    run_server()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Lightweight AI ML service")
+    parser.add_argument('--mode', choices=SERVER_MODES, default=SERVER_MODE)
+    parser.add_argument('--workers', type=int, default=WORKERS, help="processes in prefork mode")
+    parser.add_argument('--threads', type=int, default=THREADS, help="threads per process")
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    args = parser.parse_args()
+    run_server(args.mode, args.workers, args.threads, args.host, args.port)
@@ -0,0 +1,94 @@
+"""Convert the ml-service models to ONNX Runtime artifacts.
+
+Exports the sentence-transformer and the NER model to ONNX and, for the
+onnx-int8 backend, applies dynamic int8 quantization. Artifacts are written
+to ML_MODEL_DIR/<embeddings|ner>-<backend>/ with a backend.json manifest that
+models.py reads when ML_INFERENCE_BACKEND selects that backend.
+
+    python convert_models.py --backend onnx
+    python convert_models.py --backend onnx-int8 --quantization avx2
+
+Needs the ONNX dependencies pinned in requirements.txt
+(sentence-transformers>=3.2 and optimum[onnxruntime]), which the service
+also uses to load the artifacts.
+"""
+import argparse
+import json
+import logging
+import os
+
+from models import (
+    BACKEND_MANIFEST,
+    EMBEDDING_MODEL_NAME,
+    ML_MODEL_DIR,
+    NER_MODEL_NAME,
+    artifact_dir,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Instruction sets supported by the dynamic quantization configs
+QUANTIZATION_TARGETS = ('avx2', 'avx512', 'avx512_vnni', 'arm64')
+
+
+def write_manifest(path: str, source: str, backend: str, file_name: str):
+    with open(os.path.join(path, BACKEND_MANIFEST), 'w') as manifest_file:
+        json.dump({'source': source, 'backend': backend, 'file_name': file_name}, manifest_file, indent=2)
+
+
+def convert_embeddings(backend: str, quantization: str) -> str:
+    from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+    path = artifact_dir('embeddings', backend)
+    # Loading with backend='onnx' exports the model when no ONNX file exists yet
+    model = SentenceTransformer(EMBEDDING_MODEL_NAME, backend='onnx')
+    model.save(path)
+    file_name = 'onnx/model.onnx'
+
+    if backend == 'onnx-int8':
+        export_dynamic_quantized_onnx_model(model, quantization, path)
+        file_name = f'onnx/model_qint8_{quantization}.onnx'
+
+    write_manifest(path, EMBEDDING_MODEL_NAME, backend, file_name)
+    return path
+
+
+def convert_ner(backend: str, quantization: str) -> str:
+    from optimum.onnxruntime import ORTModelForTokenClassification, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+
+    path = artifact_dir('ner', backend)
+    model = ORTModelForTokenClassification.from_pretrained(NER_MODEL_NAME, export=True)
+    tokenizer = AutoTokenizer.from_pretrained(NER_MODEL_NAME)
+    model.save_pretrained(path)
+    tokenizer.save_pretrained(path)
+    file_name = 'model.onnx'
+
+    if backend == 'onnx-int8':
+        quantizer = ORTQuantizer.from_pretrained(path, file_name=file_name)
+        config = getattr(AutoQuantizationConfig, quantization)(is_static=False, per_channel=False)
+        quantizer.quantize(save_dir=path, quantization_config=config)
+        file_name = 'model_quantized.onnx'
+
+    write_manifest(path, NER_MODEL_NAME, backend, file_name)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backend', choices=['onnx', 'onnx-int8'], default='onnx-int8')
+    parser.add_argument('--quantization', choices=QUANTIZATION_TARGETS, default='avx2')
+    parser.add_argument('--models', choices=['all', 'embeddings', 'ner'], default='all')
+    args = parser.parse_args()
+
+    os.makedirs(ML_MODEL_DIR, exist_ok=True)
+    if args.models in ('all', 'embeddings'):
+        logger.info(f"Embedding model written to {convert_embeddings(args.backend, args.quantization)}")
+    if args.models in ('all', 'ner'):
+        logger.info(f"NER model written to {convert_ner(args.backend, args.quantization)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,306 @@
+"""Content-addressed cache for sentence embeddings.
+
+Embeddings are keyed by a SHA-256 hash of the model name and the
+whitespace-normalized text. Lookups go through an in-memory LRU tier bounded
+by a byte budget and, when a directory is configured, an on-disk tier that
+survives restarts: a memory-mapped float32 matrix plus an append-only index.
+A row is on disk before the index line that points at it, and a reused row
+is tombstoned in the index before it is overwritten, so after a crash the
+index never maps a key to a vector written for another key. A batch of
+puts pays for one tombstone fsync and one msync per contiguous run of rows,
+not one of each per vector.
+"""
+import hashlib
+import json
+import logging
+import mmap
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so formatting-only differences share a cache entry"""
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+def make_cache_key(text: str, model_name: str) -> str:
+    """Build the cache key for a text encoded with the given model"""
+    digest = hashlib.sha256()
+    digest.update(model_name.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(normalize_text(text).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class DiskEmbeddingStore:
+    """Fixed-capacity ring of embeddings stored in a memory-mapped float32 matrix"""
+
+    MATRIX_FILE = 'embeddings.f32'
+    INDEX_FILE = 'index.log'
+    META_FILE = 'meta.json'
+    # Index line key marking a row as about to be overwritten
+    TOMBSTONE = '-'
+
+    def __init__(self, directory: str, dim: int, capacity: int, model_name: str):
+        self.directory = directory
+        self.dim = dim
+        self.capacity = capacity
+        self.model_name = model_name
+        self.index: Dict[str, int] = {}
+        self.row_keys = [None] * capacity
+        self.next_row = 0
+        self._log_lines = 0
+
+        os.makedirs(directory, exist_ok=True)
+        matrix_path = os.path.join(directory, self.MATRIX_FILE)
+        meta = {'dim': dim, 'capacity': capacity, 'model': model_name}
+
+        if self._read_meta() == meta and os.path.exists(matrix_path):
+            self.matrix = np.memmap(matrix_path, dtype=np.float32, mode='r+', shape=(capacity, dim))
+            self._load_index()
+        else:
+            # Layout changed or first start: begin with an empty store
+            self.matrix = np.memmap(matrix_path, dtype=np.float32, mode='w+', shape=(capacity, dim))
+            with open(os.path.join(directory, self.INDEX_FILE), 'w'):
+                pass
+            with open(os.path.join(directory, self.META_FILE), 'w') as meta_file:
+                json.dump(meta, meta_file)
+
+        self._index_file = open(os.path.join(directory, self.INDEX_FILE), 'a')
+
+    def _read_meta(self) -> Optional[dict]:
+        try:
+            with open(os.path.join(self.directory, self.META_FILE)) as meta_file:
+                return json.load(meta_file)
+        except (OSError, ValueError):
+            return None
+
+    def _load_index(self):
+        """Replay the index log; later lines win over earlier ones for the same row, '-' clears a row"""
+        with open(os.path.join(self.directory, self.INDEX_FILE)) as index_file:
+            for line in index_file:
+                parts = line.split()
+                if len(parts) != 2:
+                    continue
+                key, row = parts[0], int(parts[1])
+                if row >= self.capacity:
+                    continue
+                previous = self.row_keys[row]
+                if previous is not None:
+                    self.index.pop(previous, None)
+                if key == self.TOMBSTONE:
+                    self.row_keys[row] = None
+                    self.next_row = row
+                    self._log_lines += 1
+                    continue
+                self.row_keys[row] = key
+                self.index[key] = row
+                self.next_row = (row + 1) % self.capacity
+                self._log_lines += 1
+
+    def _compact_index(self):
+        """Rewrite the index log so it only holds live entries"""
+        path = os.path.join(self.directory, self.INDEX_FILE)
+        self._index_file.close()
+        # Write rows in ring order so replay restores next_row correctly
+        order = [(row - self.next_row) % self.capacity for row in range(self.capacity)]
+        rows = sorted(self.index.values(), key=lambda row: order[row])
+        with open(path + '.tmp', 'w') as tmp_file:
+            for row in rows:
+                tmp_file.write(f"{self.row_keys[row]} {row}\n")
+            tmp_file.flush()
+            os.fsync(tmp_file.fileno())
+        os.replace(path + '.tmp', path)
+        self._log_lines = len(rows)
+        self._index_file = open(path, 'a')
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        row = self.index.get(key)
+        if row is None:
+            return None
+        return np.array(self.matrix[row])
+
+    def _append_index(self, key: str, row: int):
+        self._index_file.write(f"{key} {row}\n")
+        self._index_file.flush()
+        self._log_lines += 1
+
+    def _flush_rows(self, start_row: int, stop_row: int):
+        """Write the pages of rows [start_row, stop_row) to disk; msync of the whole matrix would cost far more"""
+        row_bytes = self.dim * self.matrix.itemsize
+        start = start_row * row_bytes
+        page_start = start - start % mmap.ALLOCATIONGRANULARITY
+        self.matrix.base.flush(page_start, stop_row * row_bytes - page_start)
+
+    def put(self, key: str, vector: np.ndarray):
+        self.put_many([key], [vector])
+
+    def put_many(self, keys: Sequence[str], vectors: Sequence[np.ndarray]):
+        """Store new vectors in consecutive ring rows with one sync of each kind for the batch"""
+        batch: Dict[str, np.ndarray] = {}
+        for key, vector in zip(keys, vectors):
+            if key not in self.index:
+                batch.setdefault(key, vector)
+        # More new keys than rows: only the last capacity of them would survive anyway
+        items = list(batch.items())[-self.capacity:]
+        if not items:
+            return
+        start = self.next_row
+        rows = [(start + offset) % self.capacity for offset in range(len(items))]
+
+        # Old keys' index lines must not outlive their vectors
+        reused = [row for row in rows if self.row_keys[row] is not None]
+        for row in reused:
+            self.index.pop(self.row_keys[row], None)
+            self.row_keys[row] = None
+            self._append_index(self.TOMBSTONE, row)
+        if reused:
+            os.fsync(self._index_file.fileno())
+
+        # The vectors reach disk before the index entries that point at them
+        for row, (_, vector) in zip(rows, items):
+            self.matrix[row] = vector
+        stop = start + len(items)
+        self._flush_rows(start, min(stop, self.capacity))
+        if stop > self.capacity:
+            self._flush_rows(0, stop - self.capacity)
+
+        for row, (key, _) in zip(rows, items):
+            self.row_keys[row] = key
+            self.index[key] = row
+            self._append_index(key, row)
+        self.next_row = stop % self.capacity
+
+        if self._log_lines > 2 * self.capacity:
+            self._compact_index()
+
+    def flush(self):
+        self.matrix.flush()
+        self._index_file.flush()
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+
+class EmbeddingCache:
+    """Two-tier embedding cache: in-memory LRU with a byte budget, optional disk tier"""
+
+    def __init__(
+        self,
+        model_name: str,
+        max_bytes: int,
+        directory: Optional[str] = None,
+        disk_capacity: int = 200_000
+    ):
+        self.model_name = model_name
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.disk_capacity = disk_capacity
+        self.disk: Optional[DiskEmbeddingStore] = None
+        self._entries: 'OrderedDict[str, np.ndarray]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        # Reopen a disk tier left by a previous run so it serves hits before the first put
+        if directory:
+            try:
+                with open(os.path.join(directory, DiskEmbeddingStore.META_FILE)) as meta_file:
+                    self._open_disk(int(json.load(meta_file)['dim']))
+            except (OSError, ValueError, KeyError):
+                pass
+
+    def key(self, text: str) -> str:
+        return make_cache_key(text, self.model_name)
+
+    def _remember(self, key: str, vector: np.ndarray):
+        """Insert into the memory tier and evict least recently used entries over budget"""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return
+        self._entries[key] = vector
+        self._bytes += vector.nbytes
+        while self._bytes > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
+
+    def _open_disk(self, dim: int):
+        """Open the disk tier lazily, once the embedding dimension is known"""
+        if self.disk is None and self.directory:
+            try:
+                self.disk = DiskEmbeddingStore(self.directory, dim, self.disk_capacity, self.model_name)
+                logger.info(f"Embedding disk cache opened with {len(self.disk)} entries")
+            except Exception as e:
+                logger.error(f"Failed to open embedding disk cache: {e}")
+                self.directory = None
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return vector
+
+            if self.disk is not None:
+                vector = self.disk.get(key)
+                if vector is not None:
+                    self.disk_hits += 1
+                    self._remember(key, vector)
+                    return vector
+
+            self.misses += 1
+            return None
+
+    @property
+    def uses_disk(self) -> bool:
+        """Whether get/put may touch the disk tier; async callers then run them in a thread"""
+        return self.directory is not None
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[np.ndarray]]:
+        return [self.get(key) for key in keys]
+
+    def put(self, key: str, vector: np.ndarray):
+        self.put_many([key], [vector])
+
+    def put_many(self, keys: Sequence[str], vectors: Sequence[np.ndarray]):
+        vectors = [np.asarray(vector, dtype=np.float32) for vector in vectors]
+        if not vectors:
+            return
+        with self._lock:
+            for key, vector in zip(keys, vectors):
+                self._remember(key, vector)
+            self._open_disk(vectors[0].shape[0])
+            if self.disk is not None:
+                self.disk.put_many(keys, vectors)
+
+    def flush(self):
+        with self._lock:
+            if self.disk is not None:
+                self.disk.flush()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memoryHits": self.memory_hits,
+                "diskHits": self.disk_hits,
+                "misses": self.misses,
+                "hitRate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                "memoryEntries": len(self._entries),
+                "memoryBytes": self._bytes,
+                "memoryBudgetBytes": self.max_bytes,
+                "diskEntries": len(self.disk) if self.disk is not None else 0,
+                "diskEnabled": self.directory is not None
+            }
@@ -0,0 +1,135 @@
+"""Dynamic micro-batching for sentence-transformer encode calls.
+
+Concurrent handlers submit texts to an EncodeBatcher. A dispatcher collects
+submissions for up to ``max_wait_ms`` milliseconds or until ``max_batch_size``
+texts are waiting, runs one batched encode, and hands each caller back the
+rows for its own texts. At most ``max_in_flight`` batches run at once; while
+all of them are busy, new submissions wait in the queue and join the next
+batch.
+"""
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, List, Optional, Set, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+EncodeFn = Callable[[List[str]], Awaitable[np.ndarray]]
+
+
+class EncodeBatcher:
+    """Coalesces concurrent encode requests into batched encode calls"""
+
+    def __init__(
+        self,
+        encode_fn: EncodeFn,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        max_in_flight: int = 4
+    ):
+        self.encode_fn = encode_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_in_flight = max_in_flight
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        # The loop keeps only weak references to tasks, so running batches are held here
+        self._batches: Set[asyncio.Task] = set()
+        self.batches = 0
+        self.texts = 0
+
+    def _ensure_dispatcher(self):
+        # Started lazily so the queue and task belong to the running event loop
+        if self._dispatcher is None or self._dispatcher.done():
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def encode(self, texts: List[str]) -> np.ndarray:
+        """Encode texts as part of the next batch and return their embeddings"""
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        self._ensure_dispatcher()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((texts, future))
+        return await future
+
+    async def _dispatch(self):
+        # Batches release slots of the semaphore they took, even if a new dispatcher replaced it
+        slots = self._slots
+        while True:
+            await slots.acquire()
+            try:
+                pending = [await self._queue.get()]
+            except BaseException:
+                slots.release()
+                raise
+            size = len(pending[0][0])
+            deadline = time.monotonic() + self.max_wait
+
+            while size < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                pending.append(item)
+                size += len(item[0])
+
+            # Run the batch in the background so the next one can start collecting
+            batch = asyncio.create_task(self._run_batch(pending))
+            self._batches.add(batch)
+            batch.add_done_callback(lambda done: self._batch_done(done, slots))
+
+    def _batch_done(self, batch: asyncio.Task, slots: asyncio.Semaphore):
+        self._batches.discard(batch)
+        slots.release()
+
+    async def _run_batch(self, pending: List[Tuple[List[str], asyncio.Future]]):
+        texts = [text for item_texts, _ in pending for text in item_texts]
+        self.batches += 1
+        self.texts += len(texts)
+        try:
+            embeddings = await self.encode_fn(texts)
+        except BaseException as e:
+            for _, future in pending:
+                if not future.done():
+                    if isinstance(e, asyncio.CancelledError):
+                        future.cancel()
+                    else:
+                        future.set_exception(e)
+            if isinstance(e, Exception):
+                return
+            raise
+
+        offset = 0
+        for item_texts, future in pending:
+            if not future.done():
+                future.set_result(embeddings[offset:offset + len(item_texts)])
+            offset += len(item_texts)
+
+    def stats(self) -> dict:
+        return {
+            "maxBatchSize": self.max_batch_size,
+            "maxWaitMs": self.max_wait * 1000,
+            "maxInFlight": self.max_in_flight,
+            "inFlight": len(self._batches),
+            "batches": self.batches,
+            "texts": self.texts,
+            "avgBatchSize": self.texts / self.batches if self.batches else 0.0
+        }
+
+    async def close(self):
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            self._dispatcher = None
+        # Cancelling a batch cancels its callers' futures rather than leaving them waiting
+        batches = list(self._batches)
+        for batch in batches:
+            batch.cancel()
+        await asyncio.gather(*batches, return_exceptions=True)
@@ -0,0 +1,109 @@
+"""Bounded executor for CPU-bound inference and parsing.
+
+Model inference and document parsing run on a thread or process pool instead
+of the event loop. The number of tasks admitted at once is capped at
+``workers + max_queue``; past that, submissions fail fast with
+PoolSaturatedError so the API can answer 503 instead of piling up requests.
+"""
+import asyncio
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class PoolSaturatedError(Exception):
+    """Raised when the inference queue is full"""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Inference queue is full")
+        self.retry_after = retry_after
+
+
+def _run_timed(fn: Callable, args: Tuple) -> Tuple[float, Any]:
+    """Run fn in a worker and report when it started, so queue wait can be measured"""
+    started = time.time()
+    return started, fn(*args)
+
+
+class InferencePool:
+    """Thread or process pool with a bounded admission queue and wait-time stats"""
+
+    def __init__(self, mode: str = 'thread', workers: int = 4, max_queue: int = 64, retry_after: int = 1):
+        if mode not in ('thread', 'process'):
+            raise ValueError(f"Unknown inference executor mode: {mode}")
+        self.mode = mode
+        self.workers = workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self._executor: Executor = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.mode == 'process':
+                # spawn avoids forking a parent that already holds torch threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='inference')
+            logger.info(f"Inference pool started: {self.mode} x{self.workers}, queue {self.max_queue}")
+        return self._executor
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.max_queue
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """Run fn(*args) on the pool, or raise PoolSaturatedError if the queue is full"""
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self.rejected += 1
+                raise PoolSaturatedError(self.retry_after)
+            self._in_flight += 1
+
+        submitted = time.time()
+        try:
+            loop = asyncio.get_running_loop()
+            started, result = await loop.run_in_executor(self.executor, _run_timed, fn, args)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+        wait = max(0.0, started - submitted)
+        with self._lock:
+            self.completed += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "workers": self.workers,
+                "maxQueue": self.max_queue,
+                "inFlight": self._in_flight,
+                "queueDepth": max(0, self._in_flight - self.workers),
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avgWaitMs": (self.total_wait / self.completed * 1000) if self.completed else 0.0,
+                "maxWaitMs": self.max_wait * 1000
+            }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,205 @@
+"""Precompiled job profiles.
+
+Screening the same job against many candidates used to rebuild the job text,
+re-extract its skills and re-encode it on every call. A compiled profile
+keeps that job-side work: the job text and embedding, the taxonomy skill
+ids, the experience requirement and any custom scoring weights. Profiles
+are persisted as one .npz file per job, holding the profile JSON and the
+embedding so both are replaced atomically, and kept in memory once loaded.
+The directory can be shared by several replicas: a cached profile is only
+served while its file is unchanged, so a profile recompiled or deleted by
+another replica is reloaded or dropped.
+
+The TF-IDF vector is derived from the job skills when a profile is loaded
+rather than stored, so refitting the TF-IDF model never leaves stale vectors.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class JobProfile:
+    """Job-side inputs to screening, computed once per job"""
+
+    def __init__(
+        self,
+        job_id: Optional[str],
+        job: Dict[str, Any],
+        text: str,
+        embedding: np.ndarray,
+        skill_ids: Optional[List[str]],
+        experience: float,
+        weights: Optional[Dict[str, float]],
+        embedding_model: str,
+        compiled_at: Optional[float] = None
+    ):
+        self.job_id = job_id
+        self.job = job
+        self.text = text
+        self.embedding = embedding
+        # None when a job skill is not in the taxonomy
+        self.skill_ids = skill_ids
+        self.experience = experience
+        # None means each endpoint's default weights
+        self.weights = weights
+        self.embedding_model = embedding_model
+        self.compiled_at = compiled_at if compiled_at is not None else time.time()
+        self.tfidf: Optional[Dict[int, float]] = None
+
+    @property
+    def skills(self) -> List[str]:
+        return self.job.get('skills', [])
+
+    def to_json(self) -> dict:
+        return {
+            "jobId": self.job_id,
+            "job": self.job,
+            "text": self.text,
+            "skillIds": self.skill_ids,
+            "experience": self.experience,
+            "weights": self.weights,
+            "embeddingModel": self.embedding_model,
+            "compiledAt": self.compiled_at
+        }
+
+    @classmethod
+    def from_json(cls, data: dict, embedding: np.ndarray) -> 'JobProfile':
+        return cls(
+            data['jobId'],
+            data['job'],
+            data['text'],
+            embedding,
+            data['skillIds'],
+            data['experience'],
+            data['weights'],
+            data['embeddingModel'],
+            data['compiledAt']
+        )
+
+    def summary(self) -> dict:
+        """Profile fields that are useful to return to clients"""
+        return {
+            "jobId": self.job_id,
+            "skills": self.skills,
+            "skillIds": self.skill_ids,
+            "experience": self.experience,
+            "weights": self.weights,
+            "embeddingModel": self.embedding_model,
+            "embeddingDimension": int(self.embedding.shape[0]),
+            "compiledAt": self.compiled_at
+        }
+
+
+class JobProfileStore:
+    """Compiled job profiles on disk, with the most recently used kept in memory"""
+
+    def __init__(self, directory: str, max_cached: int = 4096):
+        self.directory = directory
+        self.max_cached = max_cached
+        # Cached profiles with the (inode, mtime, size) of the file they were read from
+        self._profiles: 'OrderedDict[str, Tuple[JobProfile, Tuple[int, int, int]]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, job_id: str, suffix: str) -> str:
+        # Job ids come from clients, so they are hashed rather than used as file names
+        name = hashlib.sha256(job_id.encode('utf-8')).hexdigest()[:32]
+        return os.path.join(self.directory, name + suffix)
+
+    @staticmethod
+    def _stamp(path: str) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _remember(self, profile: JobProfile, stamp: Tuple[int, int, int]):
+        self._profiles[profile.job_id] = (profile, stamp)
+        self._profiles.move_to_end(profile.job_id)
+        while len(self._profiles) > self.max_cached:
+            self._profiles.popitem(last=False)
+
+    def _read(self, job_id: str) -> Optional[JobProfile]:
+        try:
+            with np.load(self._path(job_id, '.npz')) as data:
+                return JobProfile.from_json(json.loads(str(data['profile'])), data['embedding'])
+        except FileNotFoundError:
+            pass
+        # Profiles written before the single-file format
+        with open(self._path(job_id, '.json')) as profile_file:
+            data = json.load(profile_file)
+        return JobProfile.from_json(data, np.load(self._path(job_id, '.npy')))
+
+    def get(self, job_id: str) -> Optional[JobProfile]:
+        """The profile for job_id, re-read if its file changed since it was cached; blocking file I/O"""
+        path = self._path(job_id, '.npz')
+        stamp = self._stamp(path)
+        with self._lock:
+            cached = self._profiles.get(job_id)
+            if cached is not None and cached[1] == stamp:
+                self._profiles.move_to_end(job_id)
+                self.hits += 1
+                return cached[0]
+            self._profiles.pop(job_id, None)
+            self.misses += 1
+
+        try:
+            profile = self._read(job_id)
+        except (OSError, ValueError, KeyError) as e:
+            if not isinstance(e, FileNotFoundError):
+                logger.warning(f"Could not load job profile {job_id}: {e}")
+            return None
+        if stamp is not None:
+            with self._lock:
+                self._remember(profile, stamp)
+        return profile
+
+    def put(self, profile: JobProfile):
+        path = self._path(profile.job_id, '.npz')
+        with open(path + '.tmp', 'wb') as profile_file:
+            np.savez(
+                profile_file,
+                profile=np.array(json.dumps(profile.to_json())),
+                embedding=profile.embedding.astype(np.float32, copy=False)
+            )
+        os.replace(path + '.tmp', path)
+        for suffix in ('.json', '.npy'):
+            try:
+                os.remove(self._path(profile.job_id, suffix))
+            except FileNotFoundError:
+                pass
+        stamp = self._stamp(path)
+        with self._lock:
+            self._remember(profile, stamp)
+
+    def delete(self, job_id: str) -> bool:
+        with self._lock:
+            self._profiles.pop(job_id, None)
+        removed = False
+        for suffix in ('.npz', '.json', '.npy'):
+            try:
+                os.remove(self._path(job_id, suffix))
+                removed = True
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "cachedProfiles": len(self._profiles),
+                "hits": self.hits,
+                "misses": self.misses
+            }
@@ -1,21 +1,35 @@
+import time
+_import_started = time.perf_counter()
+
 from fastapi import FastAPI, HTTPException, Depends, Header
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
-import requests
-import PyPDF2
-import docx
-import io
-import re
+from pydantic import BaseModel, Field, StrictFloat, ValidationError
+from typing import List, Dict, Any, Literal, Optional
+import asyncio
+import math
 import os
 import openai
-from transformers import pipeline
-from sentence_transformers import SentenceTransformer, util
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 import logging
+import tempfile
+from embedding_cache import EmbeddingCache
+from resume_fetcher import ResumeFetcher, ResumeFetchError
+from inference_pool import InferencePool, PoolSaturatedError
+from encode_batcher import EncodeBatcher
+from text_cache import ExtractedTextStore, hash_bytes
+from pdf_extract import shutdown_page_pool
+from vector_index import CandidateVectorIndex
+from job_profiles import JobProfile, JobProfileStore
+from screening_queue import ScreeningQueue, TaskDeferred, TaskRejected
+# Functions run on the inference pool live in pool_tasks so process workers never import main
+from pool_tasks import (
+    PDF_MAX_CHARS, PDF_MAX_PAGES, parse_docx_text, parse_pdf_text, run_model_encode, run_ner
+)
+from models import EMBEDDING_MODEL_NAME, ML_INFERENCE_BACKEND, current_rss_bytes, embedding_model, env_flag, ner_model
+
+from scoring_core import get_skill_matcher, get_tfidf_model, matching, metrics, pair_similarity
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -36,24 +50,159 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-stage latency histograms, input counters and model gauges on /metrics, plus a
+# Server-Timing header on every response. METRICS_ENABLED=0 removes all of it.
+METRICS_ENABLED = env_flag('METRICS_ENABLED', True)
+METRICS_SERVER_TIMING = env_flag('METRICS_SERVER_TIMING', True)
+service_metrics = metrics.ServiceMetrics('ml_service', inputs={
+    'resume_characters': "Characters of resume text screened",
+    'candidates': "Candidates screened"
+})
+if METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware, metrics=service_metrics, server_timing=METRICS_SERVER_TIMING)
+
 # Security
 security = HTTPBearer()
 
-# Load ML models
-try:
-    model = SentenceTransformer('all-MiniLM-L6-v2')
-    ner_pipeline = pipeline("ner", model="dbmdz/bert-large-cased-finetuned-conll03-english", aggregation_strategy="simple")
-    logger.info("ML models loaded successfully")
-except Exception as e:
-    logger.error(f"Failed to load ML models: {e}")
-    model = None
-    ner_pipeline = None
+# ML models are loaded lazily on first use (see models.py).
+# With ML_WARMUP set they are loaded in the background right after startup,
+# and /ready reports not ready until that finishes.
+ML_WARMUP = env_flag('ML_WARMUP', False)
+warmup_done = not ML_WARMUP
 
 # OpenAI configuration
 openai.api_key = os.getenv('OPENAI_API_KEY')
 
+# Largest /screen-batch request; bigger batches are rejected with 422
+SCREEN_BATCH_MAX_CANDIDATES = int(os.getenv('SCREEN_BATCH_MAX_CANDIDATES', '2000'))
+
+# Embedding cache: in-memory LRU tier plus optional on-disk tier.
+# Quantized backends produce slightly different vectors, so they get their own keys.
+embedding_cache = EmbeddingCache(
+    EMBEDDING_MODEL_NAME if ML_INFERENCE_BACKEND == 'torch' else f"{EMBEDDING_MODEL_NAME}:{ML_INFERENCE_BACKEND}",
+    max_bytes=int(os.getenv('EMBEDDING_CACHE_MAX_BYTES', str(64 * 1024 * 1024))),
+    directory=os.getenv('EMBEDDING_CACHE_DIR') or None,
+    disk_capacity=int(os.getenv('EMBEDDING_CACHE_DISK_ROWS', '200000'))
+)
+
+# Shared connection pool for resume downloads
+resume_fetcher = ResumeFetcher(
+    max_connections=int(os.getenv('RESUME_FETCH_MAX_CONNECTIONS', '100')),
+    per_host_limit=int(os.getenv('RESUME_FETCH_PER_HOST', '16')),
+    connect_timeout=float(os.getenv('RESUME_FETCH_CONNECT_TIMEOUT', '5')),
+    read_timeout=float(os.getenv('RESUME_FETCH_READ_TIMEOUT', '20')),
+    total_timeout=float(os.getenv('RESUME_FETCH_TOTAL_TIMEOUT', '30')),
+    max_bytes=int(os.getenv('RESUME_FETCH_MAX_BYTES', str(20 * 1024 * 1024)))
+)
+
+# Extracted resume text, keyed by content hash, plus URL validators for conditional GET
+resume_text_store = ExtractedTextStore(
+    os.getenv('RESUME_TEXT_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'ai-hiring-resume-text')),
+    max_bytes=int(os.getenv('RESUME_TEXT_CACHE_MAX_BYTES', str(256 * 1024 * 1024)))
+)
+
+# Skip NER when the skill matcher already found every job skill in the resume
+NER_SKIP_WHEN_COVERED = env_flag('NER_SKIP_WHEN_COVERED', True)
+
+# Skill matcher compiled once from this service's set in the skill taxonomy (SKILL_TAXONOMY_PATH)
+skill_matcher = get_skill_matcher(skill_set='ml-service')
+
+# Corpus-fitted TF-IDF model (TFIDF_MODEL_PATH); without one, skill similarity
+# falls back to fitting a vectorizer on each pair
+tfidf_model = get_tfidf_model()
+
+# Replicas must share persistent state, or each one serves a different subset of it.
+# With ML_ENV=production every state path has to be set, directly or under ML_STATE_DIR
+# on a volume all replicas mount; elsewhere paths default to the local temp directory.
+ML_ENV = os.getenv('ML_ENV', 'development')
+ML_STATE_DIR = os.getenv('ML_STATE_DIR')
+
+def shared_state_path(variable: str, name: str) -> str:
+    """Path of shared state from its own variable, ML_STATE_DIR, or (outside production) the temp dir"""
+    path = os.getenv(variable)
+    if path:
+        return path
+    if ML_STATE_DIR:
+        return os.path.join(ML_STATE_DIR, name)
+    if ML_ENV == 'production':
+        raise RuntimeError(f"Set {variable} or ML_STATE_DIR to storage shared by all replicas (ML_ENV=production)")
+    path = os.path.join(tempfile.gettempdir(), f"ai-hiring-{name}")
+    logger.warning(f"{variable} is not set; using {path}, which is not shared with other replicas")
+    return path
+
+# Persistent index of candidate embeddings for job-to-candidate search
+candidate_index = CandidateVectorIndex(shared_state_path('VECTOR_INDEX_DIR', 'vector-index'))
+
+# Compiled job profiles (POST /jobs/{job_id}/compile)
+job_profiles = JobProfileStore(shared_state_path('JOB_PROFILE_DIR', 'job-profiles'))
+
+# Persistent queue for POST /screening-tasks, worked by SCREENING_QUEUE_WORKERS coroutines.
+# Failed tasks are retried with exponential backoff; identical submissions within
+# SCREENING_QUEUE_DEDUP_SECONDS share one task. Callbacks are signed with
+# SCREENING_QUEUE_WEBHOOK_SECRET when it is set, and go only to SCREENING_QUEUE_CALLBACK_HOSTS
+# (comma-separated) or, when that is empty, to public addresses.
+# The SQLite file must be on local storage, never the ML_STATE_DIR network volume, so each
+# replica queues the tasks it accepted; see kubernetes/ml-service.yaml for request routing.
+SCREENING_QUEUE_PATH = os.getenv(
+    'SCREENING_QUEUE_PATH', os.path.join(tempfile.gettempdir(), 'ai-hiring-screening-queue.sqlite3')
+)
+if ML_STATE_DIR and os.path.abspath(SCREENING_QUEUE_PATH).startswith(os.path.abspath(ML_STATE_DIR) + os.sep):
+    raise RuntimeError("SCREENING_QUEUE_PATH must be on local storage, not under the shared ML_STATE_DIR")
+
+screening_queue = ScreeningQueue(
+    SCREENING_QUEUE_PATH,
+    workers=int(os.getenv('SCREENING_QUEUE_WORKERS', '4')),
+    max_attempts=int(os.getenv('SCREENING_QUEUE_MAX_ATTEMPTS', '3')),
+    retry_base=float(os.getenv('SCREENING_QUEUE_RETRY_BASE_SECONDS', '2')),
+    lease_seconds=float(os.getenv('SCREENING_QUEUE_LEASE_SECONDS', '300')),
+    dedup_seconds=float(os.getenv('SCREENING_QUEUE_DEDUP_SECONDS', '3600')),
+    retention_seconds=float(os.getenv('SCREENING_QUEUE_RETENTION_SECONDS', str(7 * 86400))),
+    webhook_secret=os.getenv('SCREENING_QUEUE_WEBHOOK_SECRET') or None,
+    allowed_callback_hosts=os.getenv('SCREENING_QUEUE_CALLBACK_HOSTS', '').split(',')
+)
+
+# Default /screen and /advanced-screen weights; a compiled job may override both
+SCREENING_WEIGHTS = {
+    'semantic': 0.4,
+    'skills': 0.4,
+    'experience': 0.2
+}
+ADVANCED_SCREENING_WEIGHTS = {
+    'semantic': 0.35,
+    'skills': 0.45,
+    'experience': 0.20
+}
+
+# Worker pool for model inference and document parsing
+inference_pool = InferencePool(
+    mode=os.getenv('INFERENCE_EXECUTOR', 'thread'),
+    workers=int(os.getenv('INFERENCE_WORKERS', str(os.cpu_count() or 1))),
+    max_queue=int(os.getenv('INFERENCE_MAX_QUEUE', '64')),
+    retry_after=int(os.getenv('INFERENCE_RETRY_AFTER', '1'))
+)
+
+@app.on_event("shutdown")
+async def close_resume_fetcher():
+    # Queue workers use the fetcher and inference pool, so they stop first
+    await screening_queue.stop()
+    await resume_fetcher.close()
+    await encode_batcher.close()
+    embedding_cache.flush()
+    inference_pool.shutdown()
+    shutdown_page_pool()
+    candidate_index.flush()
+
+@app.exception_handler(PoolSaturatedError)
+async def pool_saturated_handler(request, exc: PoolSaturatedError):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Service is busy, retry later"},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
 class ScreeningRequest(BaseModel):
-    job: Dict[str, Any]
+    job: Optional[Dict[str, Any]] = None
+    jobId: Optional[str] = None
     candidate: Dict[str, Any]
     coverLetter: str = None
 
@@ -61,169 +210,396 @@ class ScreeningResponse(BaseModel):
     fitScore: float
     details: Dict[str, Any]
 
-def extract_text_from_pdf(url: str) -> str:
+class BatchScreeningRequest(BaseModel):
+    job: Optional[Dict[str, Any]] = None
+    jobId: Optional[str] = None
+    candidates: List[Dict[str, Any]] = Field(..., max_length=SCREEN_BATCH_MAX_CANDIDATES)
+
+class BatchScreeningResult(BaseModel):
+    candidateId: Optional[Any] = None
+    fitScore: Optional[float] = None
+    details: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+class BatchScreeningResponse(BaseModel):
+    results: List[BatchScreeningResult]
+    screened: int
+    failed: int
+
+async def extract_text_cached(url: str, parser, variant: str) -> str:
+    """Download a resume and extract its text, reusing previously extracted text.
+    
+    A conditional GET skips the download when the URL is unchanged, and text is
+    looked up by the SHA-256 of the file bytes before parsing. Cache file I/O
+    runs in a thread so it never blocks the event loop.
+    """
+    validators = await asyncio.to_thread(resume_text_store.get_validators, url)
+    with metrics.stage('download'):
+        if validators:
+            resource = await resume_fetcher.fetch_resource(url, validators.etag, validators.last_modified)
+            if resource.not_modified:
+                text = await asyncio.to_thread(
+                    resume_text_store.get, resume_text_store.key(validators.content_hash, variant)
+                )
+                if text is not None:
+                    resume_text_store.record_not_modified()
+                    return text
+                resource = await resume_fetcher.fetch_resource(url)
+        else:
+            resource = await resume_fetcher.fetch_resource(url)
+    
+    content_hash = hash_bytes(resource.body)
+    key = resume_text_store.key(content_hash, variant)
+    text = await asyncio.to_thread(resume_text_store.get, key)
+    if text is None:
+        with metrics.stage('parse'):
+            text = await inference_pool.run(parser, resource.body)
+        await asyncio.to_thread(resume_text_store.put, key, text)
+    await asyncio.to_thread(
+        resume_text_store.put_validators, url, resource.etag, resource.last_modified, content_hash
+    )
+    return text
+
+async def extract_text_from_pdf(url: str) -> str:
     """Extract text from PDF file"""
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        
-        with io.BytesIO(response.content) as pdf_file:
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            return text
+        # Limits are part of the cache variant since they change the extracted text
+        variant = f"pdf-p{PDF_MAX_PAGES}-c{PDF_MAX_CHARS}"
+        return await extract_text_cached(url, parse_pdf_text, variant)
+    except PoolSaturatedError:
+        raise
+    except ResumeFetchError as e:
+        raise HTTPException(status_code=e.status_code, detail=f"Failed to extract text from PDF: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to extract text from PDF: {str(e)}")
 
-def extract_text_from_docx(url: str) -> str:
+async def extract_text_from_docx(url: str) -> str:
     """Extract text from DOCX file"""
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        
-        with io.BytesIO(response.content) as docx_file:
-            doc = docx.Document(docx_file)
-            text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
-            return text
+        return await extract_text_cached(url, parse_docx_text, 'docx')
+    except PoolSaturatedError:
+        raise
+    except ResumeFetchError as e:
+        raise HTTPException(status_code=e.status_code, detail=f"Failed to extract text from DOCX: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to extract text from DOCX: {str(e)}")
 
 def extract_skills(text: str) -> List[str]:
-    """Extract skills from text using pattern matching"""
-    skills_patterns = {
-        'python': r'\bpython\b',
-        'javascript': r'\bjavascript\b|\bjs\b',
-        'java': r'\bjava\b',
-        'react': r'\breact\b',
-        'node': r'\bnode\.?js\b',
-        'sql': r'\bsql\b',
-        'aws': r'\baws\b',
-        'docker': r'\bdocker\b',
-        'kubernetes': r'\bkubernetes\b|\bk8s\b',
-        'typescript': r'\btypescript\b|\bts\b',
-        'angular': r'\bangular\b',
-        'vue': r'\bvue\b',
-        'django': r'\bdjango\b',
-        'flask': r'\bflask\b',
-        'fastapi': r'\bfastapi\b',
-        'spring': r'\bspring\b',
-        'mongodb': r'\bmongodb\b',
-        'postgresql': r'\bpostgresql\b|\bpostgres\b',
-        'redis': r'\bredis\b',
-        'git': r'\bgit\b',
-        'linux': r'\blinux\b',
-        'azure': r'\bazure\b',
-        'gcp': r'\bgcp\b|\bgoogle cloud\b',
-    }
+    """Extract skills from text using the shared single-pass skill matcher"""
+    with metrics.stage('skills'):
+        return skill_matcher.extract_ids(text)
+
+# Coalesces encode calls from concurrent requests into batched encodes, at most
+# ENCODE_BATCH_MAX_IN_FLIGHT of them running at once
+encode_batcher = EncodeBatcher(
+    lambda texts: inference_pool.run(run_model_encode, texts),
+    max_batch_size=int(os.getenv('ENCODE_BATCH_MAX_SIZE', '32')),
+    max_wait_ms=float(os.getenv('ENCODE_BATCH_MAX_WAIT_MS', '5')),
+    max_in_flight=int(os.getenv('ENCODE_BATCH_MAX_IN_FLIGHT', '4'))
+)
+
+async def encode_texts(texts: List[str]) -> np.ndarray:
+    """Encode texts into L2-normalized embeddings.
     
-    found_skills = []
-    text_lower = text.lower()
+    Cached embeddings are reused; only texts missing from the cache are encoded,
+    coalesced with other requests' texts by the encode batcher.
+    """
+    keys = [embedding_cache.key(text) for text in texts]
+    # The disk tier reads the memory map and syncs writes, so it stays off the event loop
+    if embedding_cache.uses_disk:
+        vectors = await asyncio.to_thread(embedding_cache.get_many, keys)
+    else:
+        vectors = embedding_cache.get_many(keys)
     
-    for skill, pattern in skills_patterns.items():
-        if re.search(pattern, text_lower, re.IGNORECASE):
-            found_skills.append(skill)
+    missing: Dict[str, str] = {}
+    for key, text, vector in zip(keys, texts, vectors):
+        if vector is None:
+            missing.setdefault(key, text)
     
-    return list(set(found_skills))
+    if missing:
+        with metrics.stage('embedding'):
+            encoded = await encode_batcher.encode(list(missing.values()))
+        if embedding_cache.uses_disk:
+            await asyncio.to_thread(embedding_cache.put_many, list(missing.keys()), encoded)
+        else:
+            embedding_cache.put_many(list(missing.keys()), encoded)
+        encoded_by_key = dict(zip(missing.keys(), encoded))
+        vectors = [encoded_by_key[key] if vector is None else vector for key, vector in zip(keys, vectors)]
+    
+    return np.vstack(vectors).astype(np.float32, copy=False)
 
-def calculate_semantic_similarity(text1: str, text2: str) -> float:
+async def calculate_semantic_similarities(job_text: str, candidate_texts: List[str]) -> np.ndarray:
+    """Calculate semantic similarity between one job text and many candidate texts"""
+    job_embedding = (await encode_texts([job_text]))[0]
+    candidate_embeddings = await encode_texts(candidate_texts)
+    # Embeddings are normalized, so the dot product is the cosine similarity
+    return candidate_embeddings @ job_embedding
+
+async def calculate_semantic_similarity(text1: str, text2: str) -> float:
     """Calculate semantic similarity between two texts"""
-    embedding1 = model.encode(text1, convert_to_tensor=True)
-    embedding2 = model.encode(text2, convert_to_tensor=True)
-    similarity = util.pytorch_cos_sim(embedding1, embedding2)
-    return similarity.item()
-
-def calculate_skill_similarity(job_skills: List[str], candidate_skills: List[str]) -> float:
-    """Calculate skill similarity using TF-IDF"""
-    all_skills = list(set(job_skills + candidate_skills))
-    
+    return float((await calculate_semantic_similarities(text1, [text2]))[0])
+
+def calculate_skill_similarity(
+    job_skills: List[str],
+    candidate_skills: List[str],
+    job_weights: Optional[Dict[int, float]] = None
+) -> float:
+    """Calculate skill similarity using TF-IDF; job_weights are precomputed job skill weights"""
     # Create skill vectors
     job_text = " ".join(job_skills)
     candidate_text = " ".join(candidate_skills)
     
-    vectorizer = TfidfVectorizer()
-    tfidf_matrix = vectorizer.fit_transform([job_text, candidate_text])
+    with metrics.stage('tfidf'):
+        if tfidf_model is not None:
+            if job_weights is not None:
+                return tfidf_model.similarity_to(job_weights, candidate_text)
+            return tfidf_model.similarity(job_text, candidate_text)
+        return pair_similarity(job_text, candidate_text)
+
+async def extract_resume_text(resume_url: Optional[str]) -> str:
+    """Extract resume text based on the file extension of the resume URL"""
+    if not resume_url:
+        raise HTTPException(status_code=400, detail="Resume URL is required")
+    
+    if resume_url.endswith('.pdf'):
+        return await extract_text_from_pdf(resume_url)
+    elif resume_url.endswith('.docx') or resume_url.endswith('.doc'):
+        return await extract_text_from_docx(resume_url)
+    else:
+        raise HTTPException(status_code=400, detail="Unsupported file format")
+
+def build_job_text(job: Dict[str, Any]) -> str:
+    """Build the text used to embed a job"""
+    return f"{job['title']} {job['description']} {' '.join(job['skills'])}"
+
+def build_candidate_text(candidate_skills: List[str], resume_text: str, cover_letter: Optional[str] = None) -> str:
+    """Build the text used to embed a candidate"""
+    candidate_text = f"{' '.join(candidate_skills)} {resume_text}"
+    if cover_letter:
+        candidate_text += f" {cover_letter}"
+    return candidate_text
+
+def job_skill_ids(job_skills: List[str]) -> Optional[List[str]]:
+    """Taxonomy ids of the job skills; None if any job skill is not in the taxonomy"""
+    skill_ids = set()
+    for skill in job_skills:
+        ids = skill_matcher.extract_ids(skill)
+        if not ids:
+            return None
+        skill_ids.update(ids)
+    return sorted(skill_ids)
+
+def attach_tfidf(profile: JobProfile):
+    if tfidf_model is not None and profile.tfidf is None:
+        profile.tfidf = tfidf_model.weights(" ".join(profile.skills))
+
+async def compile_job_profile(
+    job: Dict[str, Any],
+    job_id: Optional[str] = None,
+    weights: Optional[Dict[str, float]] = None
+) -> JobProfile:
+    """Compute the job-side screening inputs once"""
+    job_text = build_job_text(job)
+    profile = JobProfile(
+        job_id,
+        job,
+        job_text,
+        (await encode_texts([job_text]))[0],
+        job_skill_ids(job['skills']),
+        job.get('experience', 0),
+        weights,
+        embedding_cache.model_name
+    )
+    attach_tfidf(profile)
+    return profile
+
+async def resolve_job_profile(job: Optional[Dict[str, Any]], job_id: Optional[str]) -> JobProfile:
+    """The compiled profile for job_id, or a one-off profile for an inline job"""
+    if job_id is None:
+        if job is None:
+            raise HTTPException(status_code=400, detail="job or jobId is required")
+        try:
+            return await compile_job_profile(job)
+        except KeyError as e:
+            raise HTTPException(status_code=400, detail=f"job is missing {e}")
     
-    similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])
-    return similarity[0][0]
+    profile = await asyncio.to_thread(job_profiles.get, job_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} has not been compiled")
+    if profile.embedding_model != embedding_cache.model_name:
+        # Compiled under another embedding model or inference backend
+        profile = await compile_job_profile(profile.job, job_id, profile.weights)
+        await asyncio.to_thread(job_profiles.put, profile)
+    attach_tfidf(profile)
+    return profile
+
+async def calculate_job_similarities(profile: JobProfile, candidate_texts: List[str]) -> np.ndarray:
+    """Semantic similarity between a compiled job and many candidate texts"""
+    # Embeddings are normalized, so the dot product is the cosine similarity
+    return (await encode_texts(candidate_texts)) @ profile.embedding
+
+def score_screening(
+    profile: JobProfile,
+    candidate: Dict[str, Any],
+    resume_text: str,
+    extracted_skills: List[str],
+    all_candidate_skills: List[str],
+    semantic_similarity: float
+) -> ScreeningResponse:
+    """Combine semantic, skill and experience similarity into a screening result"""
+    skill_similarity = calculate_skill_similarity(profile.skills, all_candidate_skills, profile.tfidf)
+    
+    # Experience match
+    experience_match = matching.experience_match(candidate.get('yearsExp', 0), profile.experience)
+    
+    # Calculate final fit score (weighted average)
+    weights = profile.weights or SCREENING_WEIGHTS
+    
+    fit_score = (
+        semantic_similarity * weights['semantic'] +
+        skill_similarity * weights['skills'] +
+        experience_match * weights['experience']
+    )
+    
+    # Ensure score is between 0 and 1
+    fit_score = max(0, min(1, fit_score))
+    
+    return ScreeningResponse(
+        fitScore=fit_score,
+        details={
+            "semanticSimilarity": semantic_similarity,
+            "skillSimilarity": skill_similarity,
+            "experienceMatch": experience_match,
+            "extractedSkills": extracted_skills,
+            "allCandidateSkills": all_candidate_skills,
+            "jobSkills": profile.skills,
+            "resumeLength": len(resume_text),
+            "weights": weights
+        }
+    )
 
 @app.post("/screen", response_model=ScreeningResponse)
 async def screen_application(request: ScreeningRequest):
+    profile = await resolve_job_profile(request.job, request.jobId)
+    metrics.count_input('candidates')
     try:
         # Extract text from resume
-        resume_url = request.candidate.get('resumeUrl')
-        if not resume_url:
-            raise HTTPException(status_code=400, detail="Resume URL is required")
-        
-        if resume_url.endswith('.pdf'):
-            resume_text = extract_text_from_pdf(resume_url)
-        elif resume_url.endswith('.docx') or resume_url.endswith('.doc'):
-            resume_text = extract_text_from_docx(resume_url)
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported file format")
+        resume_text = await extract_resume_text(request.candidate.get('resumeUrl'))
+        metrics.count_input('resume_characters', len(resume_text))
         
         # Extract skills from resume
         extracted_skills = extract_skills(resume_text)
         all_candidate_skills = list(set(request.candidate.get('skills', []) + extracted_skills))
         
         # Prepare texts for similarity calculation
-        job_text = f"{request.job['title']} {request.job['description']} {' '.join(request.job['skills'])}"
-        candidate_text = f"{' '.join(all_candidate_skills)} {resume_text}"
-        if request.coverLetter:
-            candidate_text += f" {request.coverLetter}"
+        candidate_text = build_candidate_text(all_candidate_skills, resume_text, request.coverLetter)
         
-        # Calculate similarities
-        semantic_similarity = calculate_semantic_similarity(job_text, candidate_text)
-        skill_similarity = calculate_skill_similarity(request.job['skills'], all_candidate_skills)
+        semantic_similarity = float((await calculate_job_similarities(profile, [candidate_text]))[0])
         
-        # Experience match
-        experience_match = min(request.candidate.get('yearsExp', 0) / max(request.job['experience'], 1), 1.0)
+        return score_screening(
+            profile,
+            request.candidate,
+            resume_text,
+            extracted_skills,
+            all_candidate_skills,
+            semantic_similarity
+        )
         
-        # Calculate final fit score (weighted average)
-        weights = {
-            'semantic': 0.4,
-            'skills': 0.4,
-            'experience': 0.2
-        }
+    except (PoolSaturatedError, HTTPException):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Screening failed: {str(e)}")
+
+@app.post("/screen-batch", response_model=BatchScreeningResponse)
+async def screen_batch(request: BatchScreeningRequest):
+    """Screen many candidates against one job, encoding the job text only once"""
+    profile = await resolve_job_profile(request.job, request.jobId)
+    metrics.count_input('candidates', len(request.candidates))
+    try:
+        results: List[BatchScreeningResult] = [
+            BatchScreeningResult(candidateId=candidate.get('id')) for candidate in request.candidates
+        ]
         
-        fit_score = (
-            semantic_similarity * weights['semantic'] +
-            skill_similarity * weights['skills'] +
-            experience_match * weights['experience']
+        # Download and extract resumes concurrently, then embed them in one pass.
+        # Extraction is capped so one batch cannot take over the whole inference queue.
+        extraction_slots = asyncio.Semaphore(max(inference_pool.workers, resume_fetcher.per_host_limit))
+        
+        async def extract_limited(resume_url: Optional[str]) -> str:
+            async with extraction_slots:
+                return await extract_resume_text(resume_url)
+        
+        resume_texts = await asyncio.gather(
+            *[extract_limited(candidate.get('resumeUrl')) for candidate in request.candidates],
+            return_exceptions=True
         )
         
-        # Ensure score is between 0 and 1
-        fit_score = max(0, min(1, fit_score))
+        prepared = []
+        for index, (candidate, resume_text) in enumerate(zip(request.candidates, resume_texts)):
+            if isinstance(resume_text, HTTPException):
+                results[index].error = resume_text.detail
+                continue
+            if isinstance(resume_text, Exception):
+                results[index].error = str(resume_text)
+                continue
+            try:
+                metrics.count_input('resume_characters', len(resume_text))
+                extracted_skills = extract_skills(resume_text)
+                all_candidate_skills = list(set(candidate.get('skills', []) + extracted_skills))
+                prepared.append((index, resume_text, extracted_skills, all_candidate_skills))
+            except Exception as e:
+                results[index].error = str(e)
         
-        return ScreeningResponse(
-            fitScore=fit_score,
-            details={
-                "semanticSimilarity": semantic_similarity,
-                "skillSimilarity": skill_similarity,
-                "experienceMatch": experience_match,
-                "extractedSkills": extracted_skills,
-                "allCandidateSkills": all_candidate_skills,
-                "jobSkills": request.job['skills'],
-                "resumeLength": len(resume_text),
-                "weights": weights
-            }
+        if prepared:
+            candidate_texts = [
+                build_candidate_text(skills, resume_text, request.candidates[index].get('coverLetter'))
+                for index, resume_text, _, skills in prepared
+            ]
+            similarities = await calculate_job_similarities(profile, candidate_texts)
+            
+            for (index, resume_text, extracted_skills, all_candidate_skills), similarity in zip(prepared, similarities):
+                try:
+                    screening = score_screening(
+                        profile,
+                        request.candidates[index],
+                        resume_text,
+                        extracted_skills,
+                        all_candidate_skills,
+                        float(similarity)
+                    )
+                    results[index].fitScore = screening.fitScore
+                    results[index].details = screening.details
+                except Exception as e:
+                    results[index].error = str(e)
+        
+        failed = sum(1 for result in results if result.error is not None)
+        return BatchScreeningResponse(
+            results=results,
+            screened=len(results) - failed,
+            failed=failed
         )
         
+    except PoolSaturatedError:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Screening failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Batch screening failed: {str(e)}")
 
-def extract_skills_with_ner(text: str) -> List[str]:
+async def extract_skills_with_ner(text: str) -> List[str]:
     """Extract skills using NER pipeline"""
-    if not ner_pipeline:
+    if not ner_model.enabled or ner_model.error:
         return extract_skills(text)
     
     try:
-        entities = ner_pipeline(text)
+        with metrics.stage('ner'):
+            entities = await inference_pool.run(run_ner, text)
+        if entities is None:
+            return extract_skills(text)
         skills = []
         for entity in entities:
             if entity['entity_group'] in ['MISC', 'ORG'] and len(entity['word']) > 2:
                 skills.append(entity['word'].lower())
         return list(set(skills))
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         logger.error(f"NER extraction failed: {e}")
         return extract_skills(text)
@@ -247,12 +623,13 @@ Focus on:
 
 Return only the questions, numbered 1-5."""
 
-        response = await openai.ChatCompletion.acreate(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=500,
-            temperature=0.7
-        )
+        with metrics.stage('openai'):
+            response = await openai.ChatCompletion.acreate(
+                model="gpt-3.5-turbo",
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=500,
+                temperature=0.7
+            )
         
         questions = response.choices[0].message.content.split('\n')
         return [q.strip() for q in questions if q.strip() and any(char.isdigit() for char in q[:3])]
@@ -261,7 +638,8 @@ Return only the questions, numbered 1-5."""
         return []
 
 class AdvancedScreeningRequest(BaseModel):
-    job: Dict[str, Any]
+    job: Optional[Dict[str, Any]] = None
+    jobId: Optional[str] = None
     candidate: Dict[str, Any]
     coverLetter: Optional[str] = None
     generateQuestions: bool = False
@@ -274,53 +652,40 @@ class AdvancedScreeningResponse(BaseModel):
 @app.post("/advanced-screen", response_model=AdvancedScreeningResponse)
 async def advanced_screen_application(request: AdvancedScreeningRequest):
     """Advanced screening with AI-powered analysis"""
+    profile = await resolve_job_profile(request.job, request.jobId)
+    metrics.count_input('candidates')
     try:
         # Extract text from resume
-        resume_url = request.candidate.get('resumeUrl')
-        if not resume_url:
-            raise HTTPException(status_code=400, detail="Resume URL is required")
-        
-        if resume_url.endswith('.pdf'):
-            resume_text = extract_text_from_pdf(resume_url)
-        elif resume_url.endswith('.docx') or resume_url.endswith('.doc'):
-            resume_text = extract_text_from_docx(resume_url)
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported file format")
+        resume_text = await extract_resume_text(request.candidate.get('resumeUrl'))
+        metrics.count_input('resume_characters', len(resume_text))
         
         # Extract skills using both methods
         pattern_skills = extract_skills(resume_text)
-        ner_skills = extract_skills_with_ner(resume_text)
+        ner_skipped = (
+            NER_SKIP_WHEN_COVERED
+            and profile.skill_ids is not None
+            and set(pattern_skills).issuperset(profile.skill_ids)
+        )
+        ner_skills = [] if ner_skipped else await extract_skills_with_ner(resume_text)
         all_extracted_skills = list(set(pattern_skills + ner_skills))
         
         all_candidate_skills = list(set(request.candidate.get('skills', []) + all_extracted_skills))
         
         # Prepare texts for similarity calculation
-        job_text = f"{request.job['title']} {request.job['description']} {' '.join(request.job['skills'])}"
-        candidate_text = f"{' '.join(all_candidate_skills)} {resume_text}"
-        if request.coverLetter:
-            candidate_text += f" {request.coverLetter}"
+        candidate_text = build_candidate_text(all_candidate_skills, resume_text, request.coverLetter)
         
         # Calculate similarities
-        semantic_similarity = calculate_semantic_similarity(job_text, candidate_text)
-        skill_similarity = calculate_skill_similarity(request.job['skills'], all_candidate_skills)
+        semantic_similarity = float((await calculate_job_similarities(profile, [candidate_text]))[0])
+        skill_similarity = calculate_skill_similarity(profile.skills, all_candidate_skills, profile.tfidf)
         
         # Experience match with better scoring
-        required_exp = request.job.get('experience', 0)
+        required_exp = profile.experience
         candidate_exp = request.candidate.get('yearsExp', 0)
         
-        if required_exp == 0:
-            experience_match = 1.0
-        elif candidate_exp >= required_exp:
-            experience_match = min(1.0, candidate_exp / required_exp)
-        else:
-            experience_match = max(0.3, candidate_exp / required_exp)
+        experience_match = matching.graded_experience_match(candidate_exp, required_exp)
         
-        # Calculate final fit score with improved weights
-        weights = {
-            'semantic': 0.35,
-            'skills': 0.45,
-            'experience': 0.20
-        }
+        # Calculate final fit score with improved weights, unless the compiled job sets its own
+        weights = profile.weights or ADVANCED_SCREENING_WEIGHTS
         
         fit_score = (
             semantic_similarity * weights['semantic'] +
@@ -334,8 +699,8 @@ async def advanced_screen_application(request: AdvancedScreeningRequest):
         interview_questions = None
         if request.generateQuestions:
             interview_questions = await generate_interview_questions_openai(
-                request.job['title'],
-                request.job['description'],
+                profile.job['title'],
+                profile.job['description'],
                 all_candidate_skills
             )
         
@@ -347,8 +712,9 @@ async def advanced_screen_application(request: AdvancedScreeningRequest):
                 "experienceMatch": experience_match,
                 "patternSkills": pattern_skills,
                 "nerSkills": ner_skills,
+                "nerSkipped": ner_skipped,
                 "allCandidateSkills": all_candidate_skills,
-                "jobSkills": request.job['skills'],
+                "jobSkills": profile.skills,
                 "resumeLength": len(resume_text),
                 "weights": weights,
                 "candidateExperience": candidate_exp,
@@ -357,15 +723,203 @@ async def advanced_screen_application(request: AdvancedScreeningRequest):
             interviewQuestions=interview_questions
         )
         
+    except (PoolSaturatedError, HTTPException):
+        raise
     except Exception as e:
         logger.error(f"Advanced screening failed: {e}")
         raise HTTPException(status_code=500, detail=f"Advanced screening failed: {str(e)}")
 
+class IndexedCandidate(BaseModel):
+    id: str
+    text: Optional[str] = None
+    resumeUrl: Optional[str] = None
+    skills: List[str] = []
+
+class IndexCandidatesRequest(BaseModel):
+    candidates: List[IndexedCandidate]
+
+class BuildIvfRequest(BaseModel):
+    nlist: int = 256
+    iterations: int = 10
+
+class CandidateSearchRequest(BaseModel):
+    job: Optional[Dict[str, Any]] = None
+    jobId: Optional[str] = None
+    jobText: Optional[str] = None
+    topK: int = 10
+    approximate: bool = False
+    nprobe: int = 8
+
+@app.post("/index/candidates")
+async def index_candidates(request: IndexCandidatesRequest):
+    """Add or update candidate embeddings in the vector index"""
+    try:
+        async def candidate_text(candidate: IndexedCandidate) -> str:
+            if candidate.text:
+                return candidate.text
+            resume_text = await extract_resume_text(candidate.resumeUrl)
+            skills = list(set(candidate.skills + extract_skills(resume_text)))
+            return build_candidate_text(skills, resume_text)
+        
+        texts = await asyncio.gather(*[candidate_text(candidate) for candidate in request.candidates])
+        vectors = await encode_texts(list(texts))
+        await asyncio.to_thread(
+            candidate_index.upsert,
+            [candidate.id for candidate in request.candidates],
+            vectors
+        )
+        return {"indexed": len(request.candidates), "total": len(candidate_index)}
+        
+    except (HTTPException, PoolSaturatedError):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Indexing failed: {str(e)}")
+
+@app.delete("/index/candidates/{candidate_id}")
+async def delete_indexed_candidate(candidate_id: str):
+    """Remove a candidate from the vector index"""
+    if not await asyncio.to_thread(candidate_index.delete, candidate_id):
+        raise HTTPException(status_code=404, detail="Candidate not found in index")
+    return {"deleted": candidate_id, "total": len(candidate_index)}
+
+@app.post("/index/ivf")
+async def build_ivf_index(request: BuildIvfRequest):
+    """Train the approximate (IVF) index over the current candidates"""
+    try:
+        return await asyncio.to_thread(candidate_index.build_ivf, request.nlist, request.iterations)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/search")
+async def search_candidates(request: CandidateSearchRequest):
+    """Return the top-K indexed candidates for a job"""
+    if request.jobText:
+        query = (await encode_texts([request.jobText]))[0]
+    elif request.job or request.jobId:
+        query = (await resolve_job_profile(request.job, request.jobId)).embedding
+    else:
+        raise HTTPException(status_code=400, detail="job, jobId or jobText is required")
+    
+    matches = await asyncio.to_thread(
+        candidate_index.search,
+        query,
+        request.topK,
+        request.approximate,
+        request.nprobe
+    )
+    return {
+        "results": [{"candidateId": candidate_id, "score": score} for candidate_id, score in matches],
+        "total": len(candidate_index),
+        "approximate": request.approximate and candidate_index.centroids is not None
+    }
+
+class CompileJobRequest(BaseModel):
+    job: Dict[str, Any]
+    # Strict, so strings and booleans are rejected rather than coerced
+    weights: Optional[Dict[str, StrictFloat]] = None
+
+@app.post("/jobs/{job_id}/compile")
+async def compile_job(job_id: str, request: CompileJobRequest):
+    """Precompute and store a job profile so screening can reference it by jobId"""
+    missing = [field for field in ('title', 'description', 'skills') if field not in request.job]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"job is missing {', '.join(missing)}")
+    if request.weights is not None:
+        if set(request.weights) != set(SCREENING_WEIGHTS):
+            raise HTTPException(status_code=400, detail=f"weights must set {', '.join(SCREENING_WEIGHTS)}")
+        if not all(math.isfinite(weight) and weight >= 0 for weight in request.weights.values()):
+            raise HTTPException(status_code=400, detail="weights must be finite and non-negative")
+        if sum(request.weights.values()) <= 0:
+            raise HTTPException(status_code=400, detail="weights must not all be zero")
+    
+    profile = await compile_job_profile(request.job, job_id, request.weights)
+    await asyncio.to_thread(job_profiles.put, profile)
+    return profile.summary()
+
+@app.get("/jobs/{job_id}/profile")
+async def get_job_profile(job_id: str):
+    profile = await asyncio.to_thread(job_profiles.get, job_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} has not been compiled")
+    return profile.summary()
+
+@app.delete("/jobs/{job_id}/profile")
+async def delete_job_profile(job_id: str):
+    if not await asyncio.to_thread(job_profiles.delete, job_id):
+        raise HTTPException(status_code=404, detail=f"Job {job_id} has not been compiled")
+    return {"deleted": job_id}
+
+class ScreeningTaskRequest(AdvancedScreeningRequest):
+    # Run /advanced-screen instead of /screen
+    advanced: bool = False
+    priority: Literal['low', 'normal', 'high'] = 'normal'
+    callbackUrl: Optional[str] = None
+    maxAttempts: Optional[int] = Field(None, ge=1, le=10)
+
+async def run_queued_screening(endpoint, request_model, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Run a screening endpoint for a queued task, classifying failures for the queue"""
+    try:
+        request = request_model(**payload)
+    except ValidationError as e:
+        raise TaskRejected(str(e))
+    try:
+        response = await endpoint(request)
+    except PoolSaturatedError as e:
+        raise TaskDeferred(e.retry_after)
+    except HTTPException as e:
+        if e.status_code < 500:
+            raise TaskRejected(e.detail)
+        raise
+    return response.model_dump()
+
+async def run_screen_task(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return await run_queued_screening(screen_application, ScreeningRequest, payload)
+
+async def run_advanced_screen_task(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return await run_queued_screening(advanced_screen_application, AdvancedScreeningRequest, payload)
+
+@app.on_event("startup")
+async def start_screening_queue():
+    screening_queue.start({"screen": run_screen_task, "advanced-screen": run_advanced_screen_task})
+
+@app.post("/screening-tasks", status_code=202)
+async def submit_screening_task(request: ScreeningTaskRequest):
+    """Queue a /screen or /advanced-screen request and return its task id at once"""
+    if request.job is None and request.jobId is None:
+        raise HTTPException(status_code=400, detail="job or jobId is required")
+    if request.callbackUrl is not None:
+        error = await asyncio.to_thread(screening_queue.callback_error, request.callbackUrl)
+        if error is not None:
+            raise HTTPException(status_code=400, detail=error)
+    
+    fields = ['job', 'jobId', 'candidate', 'coverLetter'] + (['generateQuestions'] if request.advanced else [])
+    task = await asyncio.to_thread(
+        screening_queue.submit,
+        "advanced-screen" if request.advanced else "screen",
+        request.model_dump(include=set(fields), exclude_none=True),
+        request.priority,
+        request.callbackUrl,
+        request.maxAttempts
+    )
+    return JSONResponse(
+        status_code=200 if task["deduplicated"] else 202,
+        content=task,
+        headers={"Location": f"/screening-tasks/{task['id']}"}
+    )
+
+@app.get("/screening-tasks/{task_id}")
+async def get_screening_task(task_id: str):
+    """Status of a queued screening task, with its result once it has finished"""
+    task = await asyncio.to_thread(screening_queue.get, task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail=f"Screening task {task_id} not found")
+    return task
+
 @app.post("/extract-skills")
 async def extract_skills_endpoint(text: str):
     """Extract skills from text using multiple methods"""
     pattern_skills = extract_skills(text)
-    ner_skills = extract_skills_with_ner(text)
+    ner_skills = await extract_skills_with_ner(text)
     
     return {
         "patternSkills": pattern_skills,
@@ -378,13 +932,77 @@ async def health_check():
     return {
         "status": "healthy",
         "models": {
-            "sentence_transformer": model is not None,
-            "ner_pipeline": ner_pipeline is not None,
+            "sentence_transformer": embedding_model.loaded,
+            "ner_pipeline": ner_model.loaded,
             "openai_configured": openai.api_key is not None
         },
+        "modelStatus": {
+            embedding_model.name: embedding_model.status(),
+            ner_model.name: ner_model.status()
+        },
+        "startup": startup_stats,
+        "embeddingCache": embedding_cache.stats(),
+        "inferencePool": inference_pool.stats(),
+        "encodeBatcher": encode_batcher.stats(),
+        "resumeTextCache": resume_text_store.stats(),
+        "candidateIndex": candidate_index.stats(),
+        "tfidfModel": tfidf_model.stats() if tfidf_model is not None else None,
+        "jobProfiles": job_profiles.stats(),
+        "screeningQueue": await asyncio.to_thread(screening_queue.stats),
         "version": "1.0.0"
     }
 
+def model_status_gauge(field: str):
+    def read():
+        return {(model.name,): getattr(model, field) for model in (embedding_model, ner_model)}
+    return read
+
+service_metrics.gauge('model_loaded', "Whether each model is loaded", model_status_gauge('loaded'), ('model',))
+service_metrics.gauge(
+    'model_load_seconds', "Time each model took to load", model_status_gauge('load_seconds'), ('model',)
+)
+service_metrics.gauge('inference_in_flight', "Inference pool jobs running or queued", lambda: inference_pool.stats()['inFlight'])
+service_metrics.gauge(
+    'embedding_cache_entries', "Embeddings held in memory", lambda: embedding_cache.stats()['memoryEntries']
+)
+
+if METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def prometheus_metrics():
+        return Response(service_metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+@app.get("/ready")
+async def readiness_check():
+    """Readiness probe: ready once warm-up (if enabled) has finished"""
+    models = {
+        model.name: model.status()
+        for model in (embedding_model, ner_model)
+        if model.enabled
+    }
+    if not warmup_done:
+        return JSONResponse(status_code=503, content={"ready": False, "models": models})
+    return {"ready": True, "models": models}
+
+def warm_up_models():
+    """Load enabled models and run one tiny inference so first requests are fast"""
+    global warmup_done
+    try:
+        model = embedding_model.get()
+        if model is not None:
+            model.encode(["warm up"], convert_to_numpy=True)
+        ner_pipeline = ner_model.get()
+        if ner_pipeline is not None:
+            ner_pipeline("Warm up with Python at Google")
+    finally:
+        warmup_done = True
+        startup_stats["rssBytesAfterWarmup"] = current_rss_bytes()
+        logger.info(f"Model warm-up finished, RSS {startup_stats['rssBytesAfterWarmup']} bytes")
+
+@app.on_event("startup")
+async def start_warm_up():
+    if ML_WARMUP:
+        asyncio.get_running_loop().run_in_executor(None, warm_up_models)
+
 @app.get("/")
 async def root():
     return {
@@ -392,13 +1010,29 @@ async def root():
         "version": "1.0.0",
         "endpoints": [
             "/screen",
-            "/advanced-screen", 
+            "/screen-batch",
+            "/advanced-screen",
+            "/screening-tasks",
             "/extract-skills",
+            "/index/candidates",
+            "/search",
             "/health",
+            "/ready",
+            "/metrics",
             "/docs"
         ]
     }
 
+# Import time and memory footprint before any model is loaded
+startup_stats = {
+    "importSeconds": time.perf_counter() - _import_started,
+    "rssBytesAtImport": current_rss_bytes()
+}
+logger.info(
+    f"ML service imported in {startup_stats['importSeconds']:.2f}s, "
+    f"RSS {startup_stats['rssBytesAtImport']} bytes"
+)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -0,0 +1,204 @@
+"""Lazily loaded ML models.
+
+Heavy libraries (torch, transformers, sentence-transformers) are imported
+and models are loaded on first use, not at import time. Each model can be
+disabled with an environment flag, so replicas that only serve /screen never
+load the NER pipeline.
+
+ML_INFERENCE_BACKEND selects how models run on CPU:
+
+  * torch      - the original PyTorch models
+  * onnx       - ONNX Runtime exports of the same models
+  * onnx-int8  - ONNX Runtime with dynamic int8 quantization
+
+ONNX artifacts are produced ahead of time by convert_models.py into
+ML_MODEL_DIR. The ONNX backends need sentence-transformers>=3.2,
+onnxruntime and, for NER, optimum (all pinned in requirements.txt). If a
+dependency or the artifacts are missing, the model loads with torch and a
+warning says why; /health reports the backend each model actually uses.
+"""
+import json
+import logging
+import os
+import re
+import threading
+import time
+from importlib import metadata, util
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL_NAME = 'all-MiniLM-L6-v2'
+NER_MODEL_NAME = 'dbmdz/bert-large-cased-finetuned-conll03-english'
+
+INFERENCE_BACKENDS = ('torch', 'onnx', 'onnx-int8')
+ML_INFERENCE_BACKEND = os.getenv('ML_INFERENCE_BACKEND', 'torch')
+ML_MODEL_DIR = os.getenv('ML_MODEL_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models'))
+
+# Written next to converted artifacts; names the ONNX file to load
+BACKEND_MANIFEST = 'backend.json'
+
+
+def env_flag(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+class LazyModel:
+    """Loads a model once, on first use, from whichever thread asks first"""
+
+    def __init__(self, name: str, loader: Callable[[], Any], enabled: bool = True, backend: str = 'torch'):
+        self.name = name
+        self.loader = loader
+        self.enabled = enabled
+        self.backend = backend
+        self.load_seconds: Optional[float] = None
+        self.error: Optional[str] = None
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    def get(self) -> Optional[Any]:
+        """Return the model, loading it if needed; None if disabled or failed to load"""
+        if self._model is not None or not self.enabled or self.error is not None:
+            return self._model
+        with self._lock:
+            if self._model is None and self.error is None:
+                started = time.perf_counter()
+                try:
+                    self._model = self.loader()
+                    self.load_seconds = time.perf_counter() - started
+                    logger.info(f"Loaded {self.name} in {self.load_seconds:.2f}s")
+                except Exception as e:
+                    self.error = str(e)
+                    logger.error(f"Failed to load {self.name}: {e}")
+        return self._model
+
+    def status(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "backend": self.backend,
+            "loaded": self.loaded,
+            "loadSeconds": self.load_seconds,
+            "error": self.error
+        }
+
+
+def artifact_dir(kind: str, backend: str) -> str:
+    """Directory holding converted artifacts for 'embeddings' or 'ner'"""
+    return os.path.join(ML_MODEL_DIR, f"{kind}-{backend}")
+
+
+def read_manifest(kind: str, backend: str) -> Optional[dict]:
+    try:
+        with open(os.path.join(artifact_dir(kind, backend), BACKEND_MANIFEST)) as manifest_file:
+            return json.load(manifest_file)
+    except (OSError, ValueError):
+        return None
+
+
+def _version(package: str) -> Optional[tuple]:
+    try:
+        return tuple(int(part) for part in re.findall(r'\d+', metadata.version(package))[:2])
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def onnx_support_error(kind: str) -> Optional[str]:
+    """Why ONNX models of this kind ('embeddings' or 'ner') cannot load here, or None if they can"""
+    if util.find_spec('onnxruntime') is None:
+        return "onnxruntime is not installed"
+    if kind == 'embeddings':
+        version = _version('sentence-transformers')
+        if version is None or version < (3, 2):
+            return "sentence-transformers>=3.2 is not installed"
+    elif util.find_spec('optimum') is None:
+        return "optimum[onnxruntime] is not installed"
+    return None
+
+
+def resolve_backend(kind: str, backend: Optional[str] = None) -> str:
+    """The backend a model actually loads with: torch when ONNX dependencies or artifacts are missing"""
+    backend = backend or ML_INFERENCE_BACKEND
+    if backend == 'torch':
+        return backend
+    missing = onnx_support_error(kind)
+    if missing:
+        logger.warning(f"{backend} backend unavailable for {kind}: {missing}; falling back to torch")
+        return 'torch'
+    if read_manifest(kind, backend) is None:
+        logger.warning(f"No {backend} {kind} artifacts in {ML_MODEL_DIR}, falling back to torch")
+        return 'torch'
+    return backend
+
+
+def load_sentence_transformer(backend: Optional[str] = None):
+    from sentence_transformers import SentenceTransformer
+
+    backend = resolve_backend('embeddings', backend)
+    if backend != 'torch':
+        return SentenceTransformer(
+            artifact_dir('embeddings', backend),
+            backend='onnx',
+            model_kwargs={'file_name': read_manifest('embeddings', backend)['file_name']}
+        )
+    return SentenceTransformer(EMBEDDING_MODEL_NAME)
+
+
+def load_ner_pipeline(backend: Optional[str] = None):
+    from transformers import pipeline
+
+    backend = resolve_backend('ner', backend)
+    if backend != 'torch':
+        from optimum.onnxruntime import ORTModelForTokenClassification
+        from transformers import AutoTokenizer
+
+        path = artifact_dir('ner', backend)
+        model = ORTModelForTokenClassification.from_pretrained(
+            path, file_name=read_manifest('ner', backend)['file_name']
+        )
+        tokenizer = AutoTokenizer.from_pretrained(path)
+        return pipeline("ner", model=model, tokenizer=tokenizer, aggregation_strategy="simple")
+    return pipeline("ner", model=NER_MODEL_NAME, aggregation_strategy="simple")
+
+
+if ML_INFERENCE_BACKEND not in INFERENCE_BACKENDS:
+    raise ValueError(f"ML_INFERENCE_BACKEND must be one of {INFERENCE_BACKENDS}, got {ML_INFERENCE_BACKEND!r}")
+
+def _load_embedding_model():
+    # Report the backend the model really loads with
+    embedding_model.backend = resolve_backend('embeddings')
+    return load_sentence_transformer(embedding_model.backend)
+
+
+def _load_ner_model():
+    ner_model.backend = resolve_backend('ner')
+    return load_ner_pipeline(ner_model.backend)
+
+
+embedding_model = LazyModel(
+    'sentence_transformer',
+    _load_embedding_model,
+    enabled=env_flag('ML_ENABLE_EMBEDDINGS', True),
+    backend=ML_INFERENCE_BACKEND
+)
+ner_model = LazyModel(
+    'ner_pipeline',
+    _load_ner_model,
+    enabled=env_flag('ML_ENABLE_NER', True),
+    backend=ML_INFERENCE_BACKEND
+)
+
+
+def current_rss_bytes() -> Optional[int]:
+    """Resident set size of this process, or None where /proc is unavailable"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
@@ -0,0 +1,119 @@
+"""Windowed NER over long texts.
+
+The NER pipeline truncates its input at the model's sequence limit, so
+skills near the end of a long resume were silently dropped, and a single
+huge sequence is slow. Here the text is split into token-limited windows
+that overlap by ``stride`` tokens, the windows go through the pipeline as
+one batch, and entities are mapped back to text offsets and deduplicated
+where windows overlap.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+# Tokens reserved for [CLS]/[SEP]
+SPECIAL_TOKENS = 2
+
+
+def token_offsets(tokenizer, text: str) -> Optional[List[Tuple[int, int]]]:
+    """Character offsets of each token, or None if the tokenizer cannot provide them"""
+    if tokenizer is None or not getattr(tokenizer, 'is_fast', False):
+        return None
+    encoding = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)
+    return [tuple(offset) for offset in encoding['offset_mapping']]
+
+
+def word_offsets(text: str) -> List[Tuple[int, int]]:
+    """Whitespace word offsets, used when token offsets are unavailable"""
+    offsets = []
+    start = None
+    for index, char in enumerate(text):
+        if char.isspace():
+            if start is not None:
+                offsets.append((start, index))
+                start = None
+        elif start is None:
+            start = index
+    if start is not None:
+        offsets.append((start, len(text)))
+    return offsets
+
+
+def split_windows(offsets: List[Tuple[int, int]], max_tokens: int, stride: int) -> List[Tuple[int, int]]:
+    """Character spans of overlapping windows of at most max_tokens tokens.
+
+    Window edges are moved back to word boundaries so no window starts or
+    ends in the middle of a word split into sub-tokens.
+    """
+    n = len(offsets)
+    if n == 0:
+        return []
+    if n <= max_tokens:
+        return [(offsets[0][0], offsets[-1][1])]
+
+    step = max(max_tokens - stride, 1)
+    windows = []
+    start = 0
+    while True:
+        end = min(start + max_tokens, n)
+        # Do not cut a word whose next sub-token directly continues it
+        while end < n and end - start > step and offsets[end][0] == offsets[end - 1][1]:
+            end -= 1
+        windows.append((offsets[start][0], offsets[end - 1][1]))
+        if end >= n:
+            break
+        next_start = max(end - stride, start + 1)
+        while next_start > start + 1 and offsets[next_start][0] == offsets[next_start - 1][1]:
+            next_start -= 1
+        start = next_start
+    return windows
+
+
+def merge_entities(window_entities: List[List[Dict[str, Any]]], windows: List[Tuple[int, int]]) -> List[Dict[str, Any]]:
+    """Shift entities to text offsets and keep one entity per overlapping span.
+
+    Where windows overlap the same entity is found twice, or once whole and
+    once cut at a window edge; the longest span (then highest score) wins.
+    """
+    positioned = []
+    unpositioned = {}
+    for (window_start, _), entities in zip(windows, window_entities):
+        for entity in entities:
+            if entity.get('start') is None:
+                unpositioned.setdefault((entity['entity_group'], entity['word'].lower()), entity)
+                continue
+            positioned.append({
+                **entity,
+                'start': entity['start'] + window_start,
+                'end': entity['end'] + window_start
+            })
+
+    positioned.sort(key=lambda entity: (entity['start'], -(entity['end'] - entity['start'])))
+    merged: List[Dict[str, Any]] = []
+    for entity in positioned:
+        if merged and entity['start'] < merged[-1]['end']:
+            previous = merged[-1]
+            if (entity['end'] - entity['start'], entity['score']) > (previous['end'] - previous['start'], previous['score']):
+                merged[-1] = entity
+            continue
+        merged.append(entity)
+    return merged + list(unpositioned.values())
+
+
+def windowed_ner(ner_pipeline, text: str, max_tokens: int = 256, stride: int = 32, batch_size: int = 8) -> List[Dict[str, Any]]:
+    """Run an aggregated NER pipeline over overlapping windows of the text"""
+    tokenizer = getattr(ner_pipeline, 'tokenizer', None)
+    model_limit = getattr(tokenizer, 'model_max_length', None)
+    if model_limit and model_limit < 100_000:
+        max_tokens = min(max_tokens, model_limit - SPECIAL_TOKENS)
+    stride = min(stride, max_tokens // 2)
+
+    offsets = token_offsets(tokenizer, text)
+    if offsets is None:
+        # Words are usually more than one token; keep windows well inside the limit
+        offsets = word_offsets(text)
+        max_tokens, stride = max(max_tokens // 2, 1), stride // 2
+
+    windows = split_windows(offsets, max_tokens, stride)
+    if not windows:
+        return []
+    results = ner_pipeline([text[start:end] for start, end in windows], batch_size=batch_size)
+    return merge_entities(results, windows)
@@ -0,0 +1,129 @@
+"""PDF text extraction with page and character limits.
+
+Scoring only looks at the first few thousand characters of a resume, so
+extraction stops once ``max_pages`` pages or ``max_chars`` characters have
+been collected. Page text is gathered in a list and joined once. Large
+documents can be split into page ranges that are extracted in parallel by a
+process pool, since PyPDF2 is pure Python and does not scale across threads.
+Each worker receives a small PDF holding only its own pages and stops at
+``max_chars`` like the sequential path; ranges are merged in page order and
+the ones past the character limit are cancelled.
+"""
+import io
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional
+
+import PyPDF2
+
+logger = logging.getLogger(__name__)
+
+_page_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_page_pool(workers: int) -> ProcessPoolExecutor:
+    global _page_pool
+    if _page_pool is None:
+        _page_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+    return _page_pool
+
+
+def shutdown_page_pool():
+    global _page_pool
+    if _page_pool is not None:
+        _page_pool.shutdown(wait=False, cancel_futures=True)
+        _page_pool = None
+
+
+def _extract_pages(pages, max_chars: int) -> List[str]:
+    """Extract page text in order, stopping once max_chars characters are collected"""
+    texts = []
+    collected = 0
+    for page in pages:
+        page_text = page.extract_text() or ""
+        texts.append(page_text)
+        collected += len(page_text) + 1
+        if max_chars and collected >= max_chars:
+            break
+    return texts
+
+
+def _extract_page_range(data: bytes, max_chars: int) -> List[str]:
+    """Extract the text of a PDF holding one page range; runs in a page-pool worker"""
+    return _extract_pages(PyPDF2.PdfReader(io.BytesIO(data)).pages, max_chars)
+
+
+def _page_range_pdf(reader: PyPDF2.PdfReader, start: int, stop: int) -> bytes:
+    """Serialize pages [start, stop) as a standalone PDF"""
+    writer = PyPDF2.PdfWriter()
+    for index in range(start, stop):
+        writer.add_page(reader.pages[index])
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def _join_pages(pages: List[str], max_chars: int) -> str:
+    text = "".join(f"{page}\n" for page in pages)
+    return text[:max_chars] if max_chars else text
+
+
+def extract_pdf_text(
+    data: bytes,
+    max_pages: int = 0,
+    max_chars: int = 0,
+    parallel_min_pages: int = 0,
+    workers: int = 0
+) -> str:
+    """Extract text from PDF bytes, stopping at max_pages pages or max_chars characters.
+
+    A limit of 0 means unlimited. Documents with at least parallel_min_pages pages
+    are extracted in parallel page ranges when workers > 1.
+    """
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    page_count = len(reader.pages)
+    if max_pages:
+        page_count = min(page_count, max_pages)
+
+    parallel = (
+        workers > 1
+        and parallel_min_pages
+        and page_count >= parallel_min_pages
+        # Pool workers are daemonic and cannot start a nested pool
+        and not multiprocessing.current_process().daemon
+    )
+    if parallel:
+        try:
+            return _join_pages(_extract_parallel(reader, page_count, workers, max_chars), max_chars)
+        except BrokenProcessPool as e:
+            shutdown_page_pool()
+            logger.warning(f"PDF page pool broke, falling back to sequential extraction: {e}")
+        except Exception as e:
+            logger.warning(f"Parallel PDF extraction failed, falling back to sequential: {e}")
+
+    pages = _extract_pages((reader.pages[index] for index in range(page_count)), max_chars)
+    return _join_pages(pages, max_chars)
+
+
+def _extract_parallel(reader: PyPDF2.PdfReader, page_count: int, workers: int, max_chars: int) -> List[str]:
+    pool = _get_page_pool(workers)
+    step = -(-page_count // workers)
+    futures = [
+        pool.submit(_extract_page_range, _page_range_pdf(reader, start, min(start + step, page_count)), max_chars)
+        for start in range(0, page_count, step)
+    ]
+    pages = []
+    collected = 0
+    try:
+        for future in futures:
+            for page_text in future.result():
+                pages.append(page_text)
+                collected += len(page_text) + 1
+                if max_chars and collected >= max_chars:
+                    return pages
+        return pages
+    finally:
+        for future in futures:
+            future.cancel()
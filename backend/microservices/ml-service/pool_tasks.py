@@ -0,0 +1,77 @@
+"""Functions run on the inference pool.
+
+With INFERENCE_EXECUTOR=process, spawned workers unpickle submitted functions
+by importing the module that defines them. Keeping them here, away from
+main, means a worker imports only the parsers and the lazy model holders
+instead of building the app, caches, index and queue again. Importing this
+module has no side effects; models load on first use in each worker.
+"""
+import io
+import os
+from typing import Any, Dict, List, Optional
+
+import docx
+import numpy as np
+
+from models import embedding_model, ner_model
+from ner_windows import windowed_ner
+from pdf_extract import extract_pdf_text
+
+# Number of texts passed to SentenceTransformer.encode at once
+SCREEN_BATCH_SIZE = int(os.getenv('SCREEN_BATCH_SIZE', '64'))
+
+# PDF extraction limits; 0 disables a limit
+PDF_MAX_PAGES = int(os.getenv('PDF_MAX_PAGES', '20'))
+PDF_MAX_CHARS = int(os.getenv('PDF_MAX_CHARS', '100000'))
+PDF_PARALLEL_MIN_PAGES = int(os.getenv('PDF_PARALLEL_MIN_PAGES', '16'))
+PDF_PARALLEL_WORKERS = int(os.getenv('PDF_PARALLEL_WORKERS', '0'))
+
+# NER runs over overlapping token windows so long resumes are not truncated
+NER_WINDOW_TOKENS = int(os.getenv('NER_WINDOW_TOKENS', '256'))
+NER_WINDOW_STRIDE = int(os.getenv('NER_WINDOW_STRIDE', '32'))
+NER_BATCH_SIZE = int(os.getenv('NER_BATCH_SIZE', '8'))
+
+
+def parse_pdf_text(data: bytes) -> str:
+    """Extract text from PDF bytes within the configured page and character limits"""
+    return extract_pdf_text(
+        data,
+        max_pages=PDF_MAX_PAGES,
+        max_chars=PDF_MAX_CHARS,
+        parallel_min_pages=PDF_PARALLEL_MIN_PAGES,
+        workers=PDF_PARALLEL_WORKERS
+    )
+
+
+def parse_docx_text(data: bytes) -> str:
+    """Extract text from DOCX bytes"""
+    with io.BytesIO(data) as docx_file:
+        doc = docx.Document(docx_file)
+        return "\n".join([paragraph.text for paragraph in doc.paragraphs])
+
+
+def run_model_encode(texts: List[str]) -> np.ndarray:
+    """Run the sentence transformer"""
+    model = embedding_model.get()
+    if model is None:
+        raise RuntimeError("Sentence transformer is not available")
+    return model.encode(
+        texts,
+        batch_size=SCREEN_BATCH_SIZE,
+        convert_to_numpy=True,
+        normalize_embeddings=True
+    )
+
+
+def run_ner(text: str) -> Optional[List[Dict[str, Any]]]:
+    """Run the NER pipeline. None if NER is unavailable"""
+    ner_pipeline = ner_model.get()
+    if ner_pipeline is None:
+        return None
+    return windowed_ner(
+        ner_pipeline,
+        text,
+        max_tokens=NER_WINDOW_TOKENS,
+        stride=NER_WINDOW_STRIDE,
+        batch_size=NER_BATCH_SIZE
+    )
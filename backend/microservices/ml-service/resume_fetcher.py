@@ -0,0 +1,143 @@
+"""Non-blocking download layer for resume files.
+
+All downloads share one pooled httpx.AsyncClient. Each host gets its own
+concurrency limit, every request has connect/read timeouts plus a deadline
+for the whole download, and bodies are streamed with a hard size cap so a
+large or slow file cannot stall the event loop or exhaust memory.
+
+Failures carry the status to answer with: 504 when the resume host is too
+slow, 502 when it fails or cannot be reached, 400 when it rejects the URL
+or the file is too large.
+"""
+import asyncio
+import logging
+from typing import Dict, NamedTuple, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class ResumeFetchError(Exception):
+    """Raised when a resume cannot be downloaded"""
+
+    def __init__(self, message: str, status_code: int = 502):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class FetchedResource(NamedTuple):
+    body: Optional[bytes]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    not_modified: bool = False
+
+
+class ResumeFetcher:
+    """Shared, pooled async HTTP client with per-host concurrency limits"""
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        per_host_limit: int = 16,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 20.0,
+        total_timeout: float = 30.0,
+        max_bytes: int = 20 * 1024 * 1024,
+        chunk_size: int = 64 * 1024
+    ):
+        self.max_connections = max_connections
+        self.per_host_limit = per_host_limit
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        # Deadline for one whole download, once it has a slot for its host
+        self.total_timeout = total_timeout
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Created lazily so the client is bound to the running event loop
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                ),
+                follow_redirects=True
+            )
+        return self._client
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        limit = self._host_limits.get(host)
+        if limit is None:
+            limit = asyncio.Semaphore(self.per_host_limit)
+            self._host_limits[host] = limit
+        return limit
+
+    async def fetch(self, url: str) -> bytes:
+        """Download a resume body, enforcing the size cap while streaming"""
+        return (await self.fetch_resource(url)).body
+
+    async def fetch_resource(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> FetchedResource:
+        """Download a resume, sending a conditional GET when validators are given.
+        
+        Returns a resource with not_modified set and no body on 304.
+        """
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+        async with self._host_limit(url):
+            try:
+                return await asyncio.wait_for(self._download(url, headers, etag, last_modified), self.total_timeout)
+            except asyncio.TimeoutError as e:
+                raise ResumeFetchError(f"Timed out downloading resume after {self.total_timeout}s", 504) from e
+            except httpx.TimeoutException as e:
+                raise ResumeFetchError(f"Timed out downloading resume: {e}", 504) from e
+            except httpx.HTTPStatusError as e:
+                # A 4xx means the URL itself is wrong; a 5xx is the resume host failing
+                status_code = 400 if e.response.status_code < 500 else 502
+                raise ResumeFetchError(f"Failed to download resume: {e}", status_code) from e
+            except httpx.HTTPError as e:
+                raise ResumeFetchError(f"Failed to download resume: {e}") from e
+
+    async def _download(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        etag: Optional[str],
+        last_modified: Optional[str]
+    ) -> FetchedResource:
+        async with self.client.stream('GET', url, headers=headers) as response:
+            validators = (response.headers.get('ETag'), response.headers.get('Last-Modified'))
+            if response.status_code == 304 and headers:
+                return FetchedResource(None, validators[0] or etag, validators[1] or last_modified, True)
+            response.raise_for_status()
+
+            declared = response.headers.get('Content-Length')
+            if declared and declared.isdigit() and int(declared) > self.max_bytes:
+                raise ResumeFetchError(f"Resume is larger than {self.max_bytes} bytes", 400)
+
+            body = bytearray()
+            async for chunk in response.aiter_bytes(self.chunk_size):
+                body.extend(chunk)
+                if len(body) > self.max_bytes:
+                    raise ResumeFetchError(f"Resume is larger than {self.max_bytes} bytes", 400)
+            return FetchedResource(bytes(body), *validators)
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
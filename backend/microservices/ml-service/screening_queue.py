@@ -0,0 +1,477 @@
+"""Persistent queue of screening tasks.
+
+POST /screening-tasks stores a task in a SQLite database and returns its id
+at once; worker coroutines claim tasks by priority, run them through the
+regular screening code and keep the result for GET /screening-tasks/{id},
+optionally POSTing it to a callback URL as well.
+
+The database must be on local storage: WAL mode needs shared memory and
+file locks that network filesystems do not provide reliably. One process
+claims tasks from a database file, holding an exclusive flock on
+<path>.lock; other processes using the same file only submit and read
+tasks, and take over the claim if that process exits. A claimed task holds
+a lease; if its worker stalls or the process dies, the task is claimed
+again once the lease expires. Failures are retried with exponential backoff up to
+max_attempts; rejected input (TaskRejected) fails at once, and a busy
+inference pool (TaskDeferred) requeues the task without using an attempt.
+An identical submission with the same callback URL while the first is
+queued, running or recently succeeded returns the existing task instead of
+screening twice.
+
+Callbacks go only to allowed_callback_hosts when that is set, otherwise only
+to hosts whose addresses are all public; the URL is checked on submission
+and again before delivery. Callbacks still pending when the claiming
+process stopped are sent when the next one starts.
+
+Storage methods are synchronous and may wait on the database lock (up to
+busy_timeout), so coroutines call them through asyncio.to_thread.
+"""
+import asyncio
+import fcntl
+import hashlib
+import hmac
+import ipaddress
+import json
+import logging
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+PRIORITIES = {'low': 0, 'normal': 1, 'high': 2}
+PRIORITY_NAMES = {value: name for name, value in PRIORITIES.items()}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    dedup_key TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    lease_until REAL,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    result TEXT,
+    error TEXT,
+    callback_url TEXT,
+    callback_status TEXT,
+    callback_attempts INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS tasks_ready ON tasks (status, priority DESC, available_at, created_at);
+CREATE INDEX IF NOT EXISTS tasks_dedup ON tasks (dedup_key, created_at);
+"""
+
+
+class TaskRejected(Exception):
+    """The task can never succeed, e.g. invalid input; it fails without retries"""
+
+
+class TaskDeferred(Exception):
+    """The task should run later without counting as an attempt"""
+
+    def __init__(self, delay: float):
+        super().__init__(f"deferred for {delay}s")
+        self.delay = delay
+
+
+def dedup_key(kind: str, payload: Dict[str, Any], callback_url: Optional[str] = None) -> str:
+    canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(f"{kind}\0{callback_url or ''}\0{canonical}".encode('utf-8')).hexdigest()
+
+
+def callback_url_error(url: str, allowed_hosts: Set[str]) -> Optional[str]:
+    """Why a callback may not be sent to url, or None if it may.
+
+    With an allowlist the host must be listed (an entry starting with '.'
+    also allows subdomains); without one every address the host resolves to
+    must be public, so callbacks cannot reach internal services.
+    """
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return "callbackUrl is not a valid URL"
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
+        return "callbackUrl must be an http(s) URL"
+    host = parts.hostname.lower()
+    if allowed_hosts:
+        if host in allowed_hosts or any(entry.startswith('.') and host.endswith(entry) for entry in allowed_hosts):
+            return None
+        return f"Callback host {host} is not allowed"
+    try:
+        addresses = socket.getaddrinfo(host, port or 0, proto=socket.IPPROTO_TCP)
+    except (socket.gaierror, UnicodeError):
+        return f"Callback host {host} cannot be resolved"
+    for address in addresses:
+        ip = ipaddress.ip_address(address[4][0].split('%')[0])
+        if ip.version == 6 and ip.ipv4_mapped is not None:
+            ip = ip.ipv4_mapped
+        if not ip.is_global or ip.is_multicast:
+            return f"Callback host {host} resolves to a non-public address"
+    return None
+
+
+def sign_body(secret: str, body: bytes) -> str:
+    return 'sha256=' + hmac.new(secret.encode('utf-8'), body, hashlib.sha256).hexdigest()
+
+
+Handler = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+class ScreeningQueue:
+    """SQLite-backed task queue with worker coroutines"""
+
+    def __init__(
+        self,
+        path: str,
+        workers: int = 4,
+        max_attempts: int = 3,
+        retry_base: float = 2.0,
+        lease_seconds: float = 300.0,
+        dedup_seconds: float = 3600.0,
+        retention_seconds: float = 7 * 86400.0,
+        webhook_secret: Optional[str] = None,
+        webhook_attempts: int = 3,
+        webhook_timeout: float = 10.0,
+        allowed_callback_hosts: Iterable[str] = (),
+        poll_interval: float = 1.0
+    ):
+        self.path = path
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.lease_seconds = lease_seconds
+        self.dedup_seconds = dedup_seconds
+        self.retention_seconds = retention_seconds
+        self.webhook_secret = webhook_secret
+        self.webhook_attempts = webhook_attempts
+        self.webhook_timeout = webhook_timeout
+        self.allowed_callback_hosts = {host.strip().lower() for host in allowed_callback_hosts if host.strip()}
+        self.poll_interval = poll_interval
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("PRAGMA busy_timeout=5000")
+        self._db.executescript(SCHEMA)
+
+        self._handlers: Dict[str, Handler] = {}
+        self._tasks = []
+        self._supervisor: Optional[asyncio.Future] = None
+        self._claim_lock_file = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._http: Optional[httpx.AsyncClient] = None
+        self._last_purge = 0.0
+        self.submitted = 0
+        self.deduplicated = 0
+        self.completed = 0
+        self.failed = 0
+        self.retried = 0
+
+    # Storage
+
+    def submit(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        priority: str = 'normal',
+        callback_url: Optional[str] = None,
+        max_attempts: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Queue a task, or return the matching live task for an identical submission"""
+        key = dedup_key(kind, payload, callback_url)
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                existing = self._db.execute(
+                    "SELECT * FROM tasks WHERE dedup_key = ? AND (status IN ('queued', 'running') "
+                    "OR (status = 'succeeded' AND finished_at >= ?)) ORDER BY created_at DESC LIMIT 1",
+                    (key, now - self.dedup_seconds)
+                ).fetchone()
+                if existing is not None:
+                    self._db.execute("COMMIT")
+                    self.deduplicated += 1
+                    return {**self.describe(existing), "deduplicated": True}
+                task_id = uuid.uuid4().hex
+                self._db.execute(
+                    "INSERT INTO tasks (id, kind, payload, dedup_key, priority, status, max_attempts, "
+                    "available_at, created_at, callback_url) VALUES (?, ?, ?, ?, ?, 'queued', ?, ?, ?, ?)",
+                    (
+                        task_id, kind, json.dumps(payload, default=str), key, PRIORITIES[priority],
+                        max_attempts or self.max_attempts, now, now, callback_url
+                    )
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            row = self._db.execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        self.submitted += 1
+        if self._wakeup is not None:
+            # Called from a worker thread; asyncio.Event is not thread-safe
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        return {**self.describe(row), "deduplicated": False}
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return self.describe(row) if row is not None else None
+
+    def callback_error(self, url: str) -> Optional[str]:
+        """Why a callback may not be sent to url, or None; resolves the host, so call it off the loop"""
+        return callback_url_error(url, self.allowed_callback_hosts)
+
+    @staticmethod
+    def describe(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "id": row["id"],
+            "kind": row["kind"],
+            "status": row["status"],
+            "priority": PRIORITY_NAMES.get(row["priority"], row["priority"]),
+            "attempts": row["attempts"],
+            "maxAttempts": row["max_attempts"],
+            "createdAt": row["created_at"],
+            "startedAt": row["started_at"],
+            "finishedAt": row["finished_at"],
+            "result": json.loads(row["result"]) if row["result"] is not None else None,
+            "error": row["error"],
+            "callback": {
+                "url": row["callback_url"],
+                "status": row["callback_status"],
+                "attempts": row["callback_attempts"]
+            } if row["callback_url"] else None
+        }
+
+    def claim(self) -> Optional[sqlite3.Row]:
+        """Lease the next ready task: highest priority, then oldest"""
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    "SELECT id FROM tasks WHERE (status = 'queued' AND available_at <= ?) "
+                    "OR (status = 'running' AND lease_until < ? AND attempts < max_attempts) "
+                    "ORDER BY priority DESC, available_at, created_at LIMIT 1",
+                    (now, now)
+                ).fetchone()
+                if row is None:
+                    self._db.execute("COMMIT")
+                    return None
+                self._db.execute(
+                    "UPDATE tasks SET status = 'running', attempts = attempts + 1, lease_until = ?, "
+                    "started_at = COALESCE(started_at, ?) WHERE id = ?",
+                    (now + self.lease_seconds, now, row["id"])
+                )
+                task = self._db.execute("SELECT * FROM tasks WHERE id = ?", (row["id"],)).fetchone()
+                self._db.execute("COMMIT")
+                return task
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def _update(self, task_id: str, **fields):
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._db.execute(f"UPDATE tasks SET {assignments} WHERE id = ?", (*fields.values(), task_id))
+
+    def _requeue(self, task: sqlite3.Row, delay: float, error: Optional[str], count_attempt: bool):
+        self._update(
+            task["id"],
+            status='queued',
+            available_at=time.time() + delay,
+            lease_until=None,
+            error=error,
+            attempts=task["attempts"] if count_attempt else task["attempts"] - 1
+        )
+
+    def purge(self) -> int:
+        """Fail tasks whose last attempt's lease ran out and delete finished tasks past retention"""
+        now = time.time()
+        cutoff = now - self.retention_seconds
+        with self._lock:
+            self._db.execute(
+                "UPDATE tasks SET status = 'failed', finished_at = ?, lease_until = NULL, "
+                "error = 'Lease expired on the last attempt' "
+                "WHERE status = 'running' AND lease_until < ? AND attempts >= max_attempts",
+                (now, now)
+            )
+            deleted = self._db.execute(
+                "DELETE FROM tasks WHERE status IN ('succeeded', 'failed') AND finished_at < ?", (cutoff,)
+            ).rowcount
+        return deleted
+
+    def _pending_callbacks(self) -> List[Tuple[str, str]]:
+        with self._lock:
+            rows = self._db.execute("SELECT id, callback_url FROM tasks WHERE callback_status = 'pending'").fetchall()
+        return [(row["id"], row["callback_url"]) for row in rows]
+
+    def _try_claim_lock(self) -> bool:
+        """Take the exclusive claim lock if no other process holds it"""
+        handle = open(self.path + '.lock', 'a')
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            handle.close()
+            return False
+        self._claim_lock_file = handle
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._db.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall())
+        return {
+            "workers": len(self._tasks),
+            "claiming": self._claim_lock_file is not None,
+            "queued": counts.get('queued', 0),
+            "running": counts.get('running', 0),
+            "succeeded": counts.get('succeeded', 0),
+            "failed": counts.get('failed', 0),
+            "submitted": self.submitted,
+            "deduplicated": self.deduplicated,
+            "completed": self.completed,
+            "failedTasks": self.failed,
+            "retried": self.retried
+        }
+
+    # Workers
+
+    def start(self, handlers: Dict[str, Handler]):
+        """Start claiming tasks on the running event loop once this process holds the claim lock"""
+        self._handlers = handlers
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._http = httpx.AsyncClient(timeout=self.webhook_timeout)
+        self._supervisor = asyncio.ensure_future(self._supervise())
+
+    async def stop(self):
+        running = [self._supervisor, *self._tasks] if self._supervisor is not None else self._tasks
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+        self._supervisor = None
+        self._tasks = []
+        if self._http is not None:
+            await self._http.aclose()
+        await asyncio.to_thread(self._close)
+
+    def _close(self):
+        with self._lock:
+            self._db.close()
+        if self._claim_lock_file is not None:
+            self._claim_lock_file.close()
+            self._claim_lock_file = None
+
+    async def _supervise(self):
+        """Wait for the claim lock, then start the workers and resend pending callbacks"""
+        while not await asyncio.to_thread(self._try_claim_lock):
+            await asyncio.sleep(self.poll_interval)
+        # Read before the workers start, so only callbacks left by an earlier process are resent
+        pending = await asyncio.to_thread(self._pending_callbacks)
+        self._tasks = [asyncio.ensure_future(self._work()) for _ in range(self.workers)]
+        if pending:
+            logger.info(f"Resending {len(pending)} pending screening task callbacks")
+        for task_id, url in pending:
+            await self._deliver(task_id, url)
+
+    async def _work(self):
+        while True:
+            if time.time() - self._last_purge > 60:
+                self._last_purge = time.time()
+                await asyncio.to_thread(self.purge)
+            self._wakeup.clear()
+            task = await asyncio.to_thread(self.claim)
+            if task is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run(task)
+
+    async def _run(self, task: sqlite3.Row):
+        handler = self._handlers.get(task["kind"])
+        try:
+            if handler is None:
+                raise TaskRejected(f"Unknown task kind {task['kind']}")
+            # A task must not outlive its lease, or another worker could claim it too
+            result = await asyncio.wait_for(handler(json.loads(task["payload"])), self.lease_seconds)
+        except asyncio.CancelledError:
+            # Shutting down: put the task back without using an attempt
+            await asyncio.to_thread(self._requeue, task, 0, task["error"], False)
+            raise
+        except TaskDeferred as e:
+            await asyncio.to_thread(self._requeue, task, e.delay, task["error"], False)
+            return
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            if isinstance(e, asyncio.TimeoutError):
+                error = f"Task exceeded {self.lease_seconds}s"
+            if not isinstance(e, TaskRejected) and task["attempts"] < task["max_attempts"]:
+                self.retried += 1
+                delay = self.retry_base * 2 ** (task["attempts"] - 1)
+                await asyncio.to_thread(self._requeue, task, delay, error, True)
+                return
+            self.failed += 1
+            await asyncio.to_thread(self._finish, task, 'failed', None, error)
+            logger.warning(f"Screening task {task['id']} failed after {task['attempts']} attempts: {error}")
+        else:
+            self.completed += 1
+            await asyncio.to_thread(self._finish, task, 'succeeded', result, None)
+        if task["callback_url"]:
+            await self._deliver(task["id"], task["callback_url"])
+
+    def _finish(self, task: sqlite3.Row, status: str, result: Optional[Dict[str, Any]], error: Optional[str]):
+        self._update(
+            task["id"],
+            status=status,
+            finished_at=time.time(),
+            lease_until=None,
+            result=json.dumps(result, default=str) if result is not None else None,
+            error=error,
+            callback_status='pending' if task["callback_url"] else None
+        )
+
+    async def _deliver(self, task_id: str, url: str):
+        """POST the finished task to its callback URL, retrying with backoff"""
+        # Checked again here: the host may resolve differently than at submission
+        blocked = await asyncio.to_thread(self.callback_error, url)
+        if blocked is not None:
+            await asyncio.to_thread(self._update, task_id, callback_status='failed')
+            logger.warning(f"Callback for screening task {task_id} not sent: {blocked}")
+            return
+        body = json.dumps(await asyncio.to_thread(self.get, task_id), default=str).encode('utf-8')
+        headers = {"Content-Type": "application/json", "X-Screening-Task": task_id}
+        if self.webhook_secret:
+            headers["X-Signature"] = sign_body(self.webhook_secret, body)
+        for attempt in range(1, self.webhook_attempts + 1):
+            try:
+                response = await self._http.post(url, content=body, headers=headers)
+                if response.status_code < 300:
+                    await asyncio.to_thread(
+                        self._update, task_id, callback_status='delivered', callback_attempts=attempt
+                    )
+                    return
+                error = f"HTTP {response.status_code}"
+            except httpx.HTTPError as e:
+                error = str(e) or type(e).__name__
+            await asyncio.to_thread(self._update, task_id, callback_attempts=attempt)
+            if attempt < self.webhook_attempts:
+                await asyncio.sleep(self.retry_base * 2 ** (attempt - 1))
+        await asyncio.to_thread(self._update, task_id, callback_status='failed')
+        logger.warning(f"Callback for screening task {task_id} to {url} failed: {error}")
@@ -0,0 +1,169 @@
+"""Persistent store for text extracted from resume files.
+
+Extracted text is stored on disk under the SHA-256 of the downloaded bytes
+plus a parser variant, so re-screening the same file skips PDF/DOCX parsing.
+Each resume URL also remembers its ETag/Last-Modified validators and content
+hash, which lets the fetcher send a conditional GET and skip the download
+when storage answers 304 Not Modified. The store is bounded by the total
+size of both kinds of file; least recently used entries are evicted first.
+Every method does blocking file I/O, so async callers run them in a thread.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class UrlValidators(NamedTuple):
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content_hash: str
+
+
+def hash_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class ExtractedTextStore:
+    """Size-bounded, disk-backed cache of extracted resume text"""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.text_dir = os.path.join(directory, 'text')
+        self.url_dir = os.path.join(directory, 'urls')
+        os.makedirs(self.text_dir, exist_ok=True)
+        os.makedirs(self.url_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # Entry paths relative to directory ('text/<key>.txt', 'urls/<hash>.json') -> size
+        self._sizes: 'OrderedDict[str, int]' = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self._load()
+
+    def _load(self):
+        """Index existing entries, oldest access first, so LRU order survives restarts"""
+        entries = []
+        for subdir, suffix in (('text', '.txt'), ('urls', '.json')):
+            for entry in os.scandir(os.path.join(self.directory, subdir)):
+                if entry.is_file() and entry.name.endswith(suffix):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, f"{subdir}/{entry.name}", stat.st_size))
+        for _, name, size in sorted(entries):
+            self._sizes[name] = size
+            self._bytes += size
+        self._evict()
+        if self._sizes:
+            logger.info(f"Resume text cache loaded {len(self._sizes)} entries ({self._bytes} bytes)")
+
+    @staticmethod
+    def key(content_hash: str, variant: str) -> str:
+        return f"{content_hash}-{variant}"
+
+    @staticmethod
+    def _text_name(key: str) -> str:
+        return f"text/{key}.txt"
+
+    @staticmethod
+    def _url_name(url: str) -> str:
+        return f"urls/{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._sizes:
+            name, size = self._sizes.popitem(last=False)
+            self._bytes -= size
+            try:
+                os.remove(self._path(name))
+            except OSError:
+                pass
+
+    def _read(self, name: str) -> Optional[bytes]:
+        """Read an entry and mark it most recently used; None if it is not stored"""
+        with self._lock:
+            if name not in self._sizes:
+                return None
+            self._sizes.move_to_end(name)
+        path = self._path(name)
+        try:
+            with open(path, 'rb') as entry_file:
+                data = entry_file.read()
+            # Touch the file so access order is kept across restarts
+            os.utime(path, (time.time(), time.time()))
+        except OSError:
+            with self._lock:
+                self._bytes -= self._sizes.pop(name, 0)
+            return None
+        return data
+
+    def _write(self, name: str, data: bytes) -> bool:
+        if len(data) > self.max_bytes:
+            return False
+        path = self._path(name)
+        try:
+            with open(path + '.tmp', 'wb') as entry_file:
+                entry_file.write(data)
+            os.replace(path + '.tmp', path)
+        except OSError as e:
+            logger.error(f"Failed to write resume text cache entry {name}: {e}")
+            return False
+        with self._lock:
+            self._bytes -= self._sizes.pop(name, 0)
+            self._sizes[name] = len(data)
+            self._bytes += len(data)
+            self._evict()
+        return True
+
+    def get(self, key: str) -> Optional[str]:
+        data = self._read(self._text_name(key))
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return data.decode('utf-8')
+
+    def put(self, key: str, text: str):
+        self._write(self._text_name(key), text.encode('utf-8'))
+
+    def get_validators(self, url: str) -> Optional[UrlValidators]:
+        data = self._read(self._url_name(url))
+        if data is None:
+            return None
+        try:
+            entry = json.loads(data)
+            return UrlValidators(entry.get('etag'), entry.get('lastModified'), entry['contentHash'])
+        except (ValueError, KeyError):
+            return None
+
+    def put_validators(self, url: str, etag: Optional[str], last_modified: Optional[str], content_hash: str):
+        if not etag and not last_modified:
+            return
+        entry = {'etag': etag, 'lastModified': last_modified, 'contentHash': content_hash}
+        self._write(self._url_name(url), json.dumps(entry).encode('utf-8'))
+
+    def record_not_modified(self):
+        with self._lock:
+            self.not_modified += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "notModified": self.not_modified,
+                "entries": len(self._sizes),
+                "bytes": self._bytes,
+                "budgetBytes": self.max_bytes
+            }
@@ -0,0 +1,469 @@
+"""Persistent candidate embedding index with top-K search.
+
+Candidate embeddings live in a memory-mapped float32 matrix that grows in
+place. Row assignments are kept in an append-only log that is replayed on
+startup, so adds, updates and deletes survive restarts. Search is exact
+brute force over the matrix by default. For large pools an IVF (inverted
+file) index can be trained: rows are bucketed by their nearest k-means
+centroid and a query only scores the ``nprobe`` closest buckets.
+
+Each row's bucket is stored in a memory-mapped sidecar next to the matrix
+and written with the row, so rows added, updated or reused after the IVF was
+trained keep their bucket across restarts. The sidecar's first slot holds
+the IVF version it belongs to. If that does not match ``ivf.npz``, for
+example after a crash during training, every live row is bucketed again;
+that rewrites the sidecar, so it only happens under the exclusive lock.
+
+Several processes can open the same directory. Writers hold an exclusive
+flock on ``index.lock``, readers a shared one, and every operation first
+replays log lines and picks up matrix growth or a new IVF written by other
+processes. This relies on the processes seeing each other's writes to the
+memory-mapped files as soon as the lock changes hands, which holds when they
+run on one host and share its page cache (a local disk, or a ReadWriteOnce
+volume mounted by pods on the same node). Network filesystems such as NFS or
+SMB only guarantee close-to-open consistency and are not supported for
+processes on different hosts: give each host its own directory instead.
+"""
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process use only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class CandidateVectorIndex:
+    """Memory-mapped matrix of normalized candidate embeddings keyed by candidate id"""
+
+    MATRIX_FILE = 'vectors.f32'
+    LOG_FILE = 'rows.log'
+    META_FILE = 'meta.json'
+    IVF_FILE = 'ivf.npz'
+    ASSIGNMENTS_FILE = 'ivf-assignments.i32'
+    LOCK_FILE = 'index.lock'
+
+    def __init__(self, directory: str, initial_capacity: int = 1024, search_chunk_rows: int = 262_144):
+        self.directory = directory
+        self.initial_capacity = initial_capacity
+        self.search_chunk_rows = search_chunk_rows
+        self.dim: Optional[int] = None
+        self.capacity = 0
+        self.row_count = 0
+        self.matrix: Optional[np.memmap] = None
+        self.ids: List[Optional[str]] = []
+        self.rows_by_id: Dict[str, int] = {}
+        self.free_rows: List[int] = []
+        self.alive = np.zeros(0, dtype=bool)
+        self.centroids: Optional[np.ndarray] = None
+        self.ivf_version = 0
+        # Sidecar slot 0 is the IVF version, slots 1.. the bucket of each row
+        self._assignment_map: Optional[np.memmap] = None
+        self.assignments = np.zeros(0, dtype=np.int32)
+        self._lists: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._log_lines = 0
+        self._log_file = None
+        self._log_inode: Optional[int] = None
+        self._log_offset = 0
+        self._meta_stamp = None
+        self._ivf_stamp = None
+        self._lock = threading.RLock()
+
+        os.makedirs(directory, exist_ok=True)
+        self._lock_file = open(self._path(self.LOCK_FILE), 'a')
+        with self._lock, self._file_lock(exclusive=False):
+            self._sync()
+        if not self._assignments_current():
+            with self._lock, self._file_lock():
+                self._sync(exclusive=True)
+        if self.rows_by_id:
+            logger.info(f"Candidate vector index loaded with {len(self.rows_by_id)} candidates")
+
+    # Storage
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _stamp(self, name: str) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = os.stat(self._path(name))
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool = True):
+        """Lock the directory against other processes; writers take it exclusively"""
+        if fcntl is None:
+            yield
+            return
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _sync(self, exclusive: bool = False):
+        """Catch up with rows, growth and IVF builds from other processes sharing the directory.
+
+        Holding the exclusive lock, also bucket every row again if the sidecar does not match the IVF.
+        """
+        stamp = self._stamp(self.META_FILE)
+        if stamp != self._meta_stamp:
+            self._meta_stamp = stamp
+            meta = self._read_meta()
+            if meta and (self.matrix is None or meta['capacity'] > self.capacity):
+                self._map(meta['dim'], meta['capacity'])
+        if self.matrix is None:
+            return
+        if self._replay_log():
+            self._lists = None
+        stamp = self._stamp(self.IVF_FILE)
+        if stamp != self._ivf_stamp:
+            self._ivf_stamp = stamp
+            self._load_ivf()
+        if exclusive and not self._assignments_current():
+            self._reassign_buckets()
+
+    def _read_meta(self) -> Optional[dict]:
+        try:
+            with open(self._path(self.META_FILE)) as meta_file:
+                return json.load(meta_file)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self):
+        with open(self._path(self.META_FILE) + '.tmp', 'w') as meta_file:
+            json.dump({'dim': self.dim, 'capacity': self.capacity}, meta_file)
+        os.replace(self._path(self.META_FILE) + '.tmp', self._path(self.META_FILE))
+        self._meta_stamp = self._stamp(self.META_FILE)
+
+    @staticmethod
+    def _extend(path: str, size: int):
+        with open(path, 'ab') as data_file:
+            if data_file.tell() < size:
+                data_file.truncate(size)
+
+    def _map(self, dim: int, capacity: int):
+        """Map the matrix and assignment sidecar at capacity rows, extending the files if needed"""
+        if self.matrix is not None:
+            self.matrix.flush()
+            self._assignment_map.flush()
+        self.dim = dim
+        self.capacity = capacity
+        self._extend(self._path(self.MATRIX_FILE), capacity * dim * 4)
+        self._extend(self._path(self.ASSIGNMENTS_FILE), (capacity + 1) * 4)
+        self.matrix = np.memmap(self._path(self.MATRIX_FILE), dtype=np.float32, mode='r+', shape=(capacity, dim))
+        self._assignment_map = np.memmap(
+            self._path(self.ASSIGNMENTS_FILE), dtype=np.int32, mode='r+', shape=(capacity + 1,)
+        )
+        self.assignments = self._assignment_map[1:]
+        if self._log_file is None:
+            self._log_file = open(self._path(self.LOG_FILE), 'ab')
+            self._log_inode = os.fstat(self._log_file.fileno()).st_ino
+
+    def _grow(self, needed_rows: int):
+        """Extend the matrix file in place; existing rows are not copied"""
+        self._map(self.dim, max(self.capacity * 2, needed_rows, self.initial_capacity))
+        self._write_meta()
+
+    def _reset_rows(self):
+        self.ids = []
+        self.rows_by_id = {}
+        self.free_rows = []
+        self.alive = np.zeros(0, dtype=bool)
+        self.row_count = 0
+        self._log_lines = 0
+        self._log_offset = 0
+
+    def _replay_log(self) -> bool:
+        """Apply log lines written since the last replay; True if there were any"""
+        path = self._path(self.LOG_FILE)
+        try:
+            inode = os.stat(path).st_ino
+        except OSError:
+            return False
+        if inode != self._log_inode:
+            # First replay, or another process compacted the log
+            self._reset_rows()
+            self._log_inode = inode
+            self._log_file.close()
+            self._log_file = open(path, 'ab')
+        with open(path, 'rb') as log_file:
+            log_file.seek(self._log_offset)
+            data = log_file.read()
+        # A line is only applied once its newline is written
+        data = data[:data.rfind(b'\n') + 1]
+        if not data:
+            return False
+        for line in data.decode('utf-8').splitlines():
+            parts = line.split(' ', 2)
+            if parts[0] == 'set' and len(parts) == 3:
+                self._assign_row(int(parts[1]), parts[2])
+            elif parts[0] == 'del' and len(parts) == 2:
+                self._release_row(int(parts[1]))
+            self._log_lines += 1
+        self._log_offset += len(data)
+        self.free_rows = [row for row in range(self.row_count) if not self.alive[row]]
+        return True
+
+    def _append_log(self, line: str):
+        self._log_file.write(line.encode('utf-8') + b'\n')
+        self._log_lines += 1
+
+    def _flush_log(self):
+        self._log_file.flush()
+        # Everything up to here is this process's own writes, already applied
+        self._log_offset = self._log_file.tell()
+
+    def _compact_log(self):
+        """Rewrite the log so it only holds live rows"""
+        self._log_file.close()
+        path = self._path(self.LOG_FILE)
+        with open(path + '.tmp', 'w') as log_file:
+            for candidate_id, row in sorted(self.rows_by_id.items(), key=lambda item: item[1]):
+                log_file.write(f"set {row} {candidate_id}\n")
+        os.replace(path + '.tmp', path)
+        self._log_lines = len(self.rows_by_id)
+        self._log_file = open(path, 'ab')
+        self._log_inode = os.fstat(self._log_file.fileno()).st_ino
+        self._flush_log()
+
+    def _ensure_row_arrays(self, row: int):
+        if row >= len(self.ids):
+            grow = max(row + 1, 2 * len(self.ids), self.initial_capacity) - len(self.ids)
+            self.ids.extend([None] * grow)
+            self.alive = np.concatenate([self.alive, np.zeros(grow, dtype=bool)])
+        self.row_count = max(self.row_count, row + 1)
+
+    def _assign_row(self, row: int, candidate_id: str):
+        self._ensure_row_arrays(row)
+        previous = self.rows_by_id.get(candidate_id)
+        if previous is not None and previous != row:
+            self._release_row(previous)
+        self.ids[row] = candidate_id
+        self.alive[row] = True
+        self.rows_by_id[candidate_id] = row
+
+    def _release_row(self, row: int):
+        candidate_id = self.ids[row] if row < len(self.ids) else None
+        if candidate_id is not None and self.rows_by_id.get(candidate_id) == row:
+            del self.rows_by_id[candidate_id]
+        if row < len(self.ids):
+            self.ids[row] = None
+            self.alive[row] = False
+
+    def _load_ivf(self):
+        try:
+            with np.load(self._path(self.IVF_FILE)) as data:
+                centroids = data['centroids']
+                version = int(data['version']) if 'version' in data.files else 0
+        except (OSError, ValueError, KeyError):
+            self.centroids = None
+            return
+        self.centroids = centroids
+        self.ivf_version = version
+        self._lists = None
+
+    def _assignments_current(self) -> bool:
+        """Whether the sidecar holds buckets for the loaded IVF (read from the shared map)"""
+        return self.centroids is None or bool(self.ivf_version and self._assignment_map[0] == self.ivf_version)
+
+    def _reassign_buckets(self):
+        """Bucket every live row for the loaded IVF; callers hold the exclusive lock"""
+        # The sidecar belongs to another IVF build or predates versioning
+        logger.warning("IVF assignments do not match the trained centroids, reassigning all candidates")
+        self._assign_buckets(np.flatnonzero(self.alive[:self.row_count]))
+        if not self.ivf_version:
+            # Give an unversioned IVF a version so the sidecar can be marked as matching it
+            with open(self._path(self.IVF_FILE) + '.tmp', 'wb') as ivf_file:
+                np.savez(ivf_file, centroids=self.centroids, version=1)
+            os.replace(self._path(self.IVF_FILE) + '.tmp', self._path(self.IVF_FILE))
+            self.ivf_version = 1
+            self._ivf_stamp = self._stamp(self.IVF_FILE)
+        self._assignment_map[0] = self.ivf_version
+        self._assignment_map.flush()
+        self._lists = None
+
+    # Updates
+
+    def upsert(self, candidate_ids: List[str], vectors: np.ndarray):
+        """Add or replace candidate embeddings"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self._lock, self._file_lock():
+            self._sync(exclusive=True)
+            if self.matrix is None:
+                self._map(vectors.shape[1], self.initial_capacity)
+                self._write_meta()
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Expected {self.dim}-dimensional vectors, got {vectors.shape[1]}")
+
+            for candidate_id, vector in zip(candidate_ids, vectors):
+                candidate_id = str(candidate_id)
+                row = self.rows_by_id.get(candidate_id)
+                if row is None:
+                    row = self.free_rows.pop() if self.free_rows else self.row_count
+                if row >= self.capacity:
+                    self._grow(row + 1)
+                self.matrix[row] = vector
+                self._assign_row(row, candidate_id)
+                if self.centroids is not None:
+                    self.assignments[row] = self._nearest_centroid(vector)
+                self._append_log(f"set {row} {candidate_id}")
+
+            self._lists = None
+            # Vectors and buckets reach the shared files before the log lines that point at them
+            self.matrix.flush()
+            self._assignment_map.flush()
+            self._flush_log()
+            if self._log_lines > 2 * max(len(self.rows_by_id), self.initial_capacity):
+                self._compact_log()
+
+    def delete(self, candidate_id: str) -> bool:
+        with self._lock, self._file_lock():
+            self._sync(exclusive=True)
+            row = self.rows_by_id.get(str(candidate_id))
+            if row is None:
+                return False
+            self._release_row(row)
+            self.free_rows.append(row)
+            self._append_log(f"del {row}")
+            self._flush_log()
+            self._lists = None
+            return True
+
+    def flush(self):
+        with self._lock:
+            if self.matrix is not None:
+                self.matrix.flush()
+                self._assignment_map.flush()
+                self._log_file.flush()
+
+    # Approximate index
+
+    def _nearest_centroid(self, vector: np.ndarray) -> int:
+        return int(np.argmax(self.centroids @ vector))
+
+    def _assign_buckets(self, rows: np.ndarray):
+        for start in range(0, len(rows), self.search_chunk_rows):
+            chunk = rows[start:start + self.search_chunk_rows]
+            self.assignments[chunk] = np.argmax(np.asarray(self.matrix[chunk]) @ self.centroids.T, axis=1)
+
+    def build_ivf(self, nlist: int, iterations: int = 10, sample_size: int = 100_000, seed: int = 0) -> dict:
+        """Train spherical k-means centroids and bucket every live row"""
+        with self._lock, self._file_lock():
+            self._sync(exclusive=True)
+            live_rows = np.flatnonzero(self.alive[:self.row_count])
+            if len(live_rows) < nlist:
+                raise ValueError(f"Need at least {nlist} candidates to build {nlist} lists")
+
+            rng = np.random.default_rng(seed)
+            sample = rng.choice(live_rows, size=min(sample_size, len(live_rows)), replace=False)
+            training = np.asarray(self.matrix[np.sort(sample)])
+            centroids = training[rng.choice(len(training), size=nlist, replace=False)].copy()
+
+            for _ in range(iterations):
+                labels = np.argmax(training @ centroids.T, axis=1)
+                for index in range(nlist):
+                    members = training[labels == index]
+                    if len(members):
+                        centroid = members.sum(axis=0)
+                        centroids[index] = centroid / (np.linalg.norm(centroid) or 1.0)
+
+            # Invalidate the sidecar first, so a crash before the new centroids are saved
+            # leaves a version mismatch rather than buckets for the wrong centroids
+            version = self.ivf_version + 1
+            self._assignment_map[0] = 0
+            self.centroids = centroids
+            self.assignments[:] = -1
+            self._assign_buckets(live_rows)
+            self._assignment_map.flush()
+            with open(self._path(self.IVF_FILE) + '.tmp', 'wb') as ivf_file:
+                np.savez(ivf_file, centroids=centroids, version=version)
+            os.replace(self._path(self.IVF_FILE) + '.tmp', self._path(self.IVF_FILE))
+            self._assignment_map[0] = version
+            self._assignment_map.flush()
+            self.ivf_version = version
+            self._ivf_stamp = self._stamp(self.IVF_FILE)
+            self._lists = None
+            return {"nlist": nlist, "trainedOn": len(training), "candidates": len(live_rows)}
+
+    def _inverted_lists(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows grouped by centroid, rebuilt lazily after updates"""
+        if self._lists is None:
+            assignments = np.where(self.alive[:self.row_count], self.assignments[:self.row_count], -1)
+            order = np.argsort(assignments, kind='stable')
+            offsets = np.searchsorted(assignments[order], np.arange(len(self.centroids) + 1))
+            self._lists = (order, offsets)
+        return self._lists
+
+    # Search
+
+    def _top_k(self, rows: np.ndarray, scores: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        if len(scores) > k:
+            best = np.argpartition(-scores, k - 1)[:k]
+        else:
+            best = np.arange(len(scores))
+        best = best[np.argsort(-scores[best], kind='stable')]
+        return [(self.ids[rows[index]], float(scores[index])) for index in best]
+
+    def search(self, query: np.ndarray, k: int = 10, approximate: bool = False, nprobe: int = 8) -> List[Tuple[str, float]]:
+        """Return the k candidates most similar to the query embedding"""
+        query = np.asarray(query, dtype=np.float32)
+        with self._lock:
+            with self._file_lock(exclusive=False):
+                self._sync()
+                if not approximate or self._assignments_current():
+                    return self._search(query, k, approximate, nprobe)
+            # Probing needs matching buckets; repairing them writes the sidecar, so as a writer
+            with self._file_lock():
+                self._sync(exclusive=True)
+                return self._search(query, k, approximate, nprobe)
+
+    def _search(self, query: np.ndarray, k: int, approximate: bool, nprobe: int) -> List[Tuple[str, float]]:
+        """search() with the index synced and the file lock held"""
+        if self.matrix is None or not self.rows_by_id or k <= 0:
+            return []
+
+        if approximate and self.centroids is not None:
+            order, offsets = self._inverted_lists()
+            probes = np.argsort(-(self.centroids @ query))[:nprobe]
+            rows = np.sort(np.concatenate([order[offsets[probe]:offsets[probe + 1]] for probe in probes]))
+            if len(rows) == 0:
+                return []
+            return self._top_k(rows, np.asarray(self.matrix[rows]) @ query, k)
+
+        # Exact search, chunked so the full matrix is never copied at once
+        best_rows, best_scores = [], []
+        for start in range(0, self.row_count, self.search_chunk_rows):
+            stop = min(start + self.search_chunk_rows, self.row_count)
+            scores = np.asarray(self.matrix[start:stop]) @ query
+            scores[~self.alive[start:stop]] = -np.inf
+            keep = min(k, stop - start)
+            top = np.argpartition(-scores, keep - 1)[:keep]
+            best_rows.append(top + start)
+            best_scores.append(scores[top])
+        rows = np.concatenate(best_rows)
+        scores = np.concatenate(best_scores)
+        live = np.isfinite(scores)
+        return self._top_k(rows[live], scores[live], k)
+
+    def __len__(self) -> int:
+        return len(self.rows_by_id)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "candidates": len(self.rows_by_id),
+                "capacity": self.capacity,
+                "dimension": self.dim,
+                "ivfLists": len(self.centroids) if self.centroids is not None else 0
+            }
@@ -0,0 +1,75 @@
+"""Ingest throughput and query latency of the streaming bias engine.
+
+Ingests synthetic hiring events one at a time and in batches, then compares
+a query against the running counts with the old approach of rebuilding a
+pandas DataFrame from the full history on every /analyze-bias call.
+
+    python benchmarks/bench_bias_ingest.py --events 1000000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'ai-ml-service'))
+
+from bias_analytics import BiasAnalyticsEngine  # noqa: E402
+
+DAY = 86400
+
+
+def make_events(count: int, seed: int = 1):
+    rng = random.Random(seed)
+    now = time.time()
+    return [
+        {
+            'gender': rng.choice(['female', 'male', 'nonbinary']),
+            'age': rng.randint(20, 65),
+            'location': rng.choice(['remote', 'onsite', 'hybrid']),
+            'hired': rng.random() < 0.3,
+            'timestamp': now - rng.uniform(0, 3 * 365 * DAY)
+        }
+        for _ in range(count)
+    ]
+
+
+def pandas_indicators(events):
+    import pandas as pd
+
+    df = pd.DataFrame(events)
+    gender = df.groupby('gender')['hired'].mean()
+    ages = pd.cut(df['age'], bins=[0, 30, 40, 50, 100], labels=['<30', '30-40', '40-50', '50+'])
+    age = df.groupby(ages, observed=False)['hired'].mean()
+    return {'gender': float(gender.var()), 'age': float(age.var())}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--events', type=int, default=200_000)
+    parser.add_argument('--queries', type=int, default=1000)
+    args = parser.parse_args()
+
+    events = make_events(args.events)
+    for batch_size in (1, 100, 10_000):
+        engine = BiasAnalyticsEngine(attributes=['location'], windows=[30, 90, 365])
+        started = time.perf_counter()
+        for start in range(0, len(events), batch_size):
+            engine.ingest_many(events[start:start + batch_size])
+        elapsed = time.perf_counter() - started
+        print(f"ingest batch={batch_size:<6} {len(events) / elapsed:12,.0f} events/s")
+
+    for window in (None, 90):
+        started = time.perf_counter()
+        for _ in range(args.queries):
+            engine.indicators(window)
+        elapsed = time.perf_counter() - started
+        print(f"query window={str(window):<5} {1e6 * elapsed / args.queries:10.1f}us")
+
+    started = time.perf_counter()
+    pandas_indicators(events)
+    print(f"pandas recompute over {len(events):,} events {1000 * (time.perf_counter() - started):10.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""Latency and peak memory of JSON vs Arrow IPC vs Parquet bulk payloads.
+
+For /analyze-bias (hiring events) and /rank-candidates (candidate pools),
+measures the in-process cost from raw request bytes to result: JSON is
+validated with the endpoint's pydantic model and processed as dicts, Arrow
+and Parquet bodies are read into a table and processed as arrays. Peak
+memory is the tracemalloc high-water mark of a second, traced run; Arrow's
+own buffers are allocated outside Python and not included.
+
+    python benchmarks/bench_columnar_payloads.py --rows 1000000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'ai-ml-service'))
+
+import pyarrow as pa  # noqa: E402
+
+import columnar  # noqa: E402
+import main as service  # noqa: E402
+
+SKILLS = ["python", "java", "javascript", "react", "sql", "aws", "docker", "kubernetes", "go", "rust"]
+
+
+def hiring_rows(count: int, rng: random.Random):
+    return [
+        {
+            "gender": rng.choice(["female", "male", "nonbinary"]),
+            "age": rng.randint(20, 65),
+            "hired": rng.random() < 0.3
+        }
+        for _ in range(count)
+    ]
+
+
+def candidate_rows(count: int, rng: random.Random):
+    return [
+        {
+            "id": index,
+            "skills": rng.sample(SKILLS, rng.randint(1, 6)),
+            "experience_years": rng.randint(0, 15),
+            "education_level": rng.choice(["bachelor", "master", "phd"])
+        }
+        for index in range(count)
+    ]
+
+
+def encode(table, content_type: str) -> bytes:
+    return columnar.write_table(table, content_type)
+
+
+def measure(label: str, fn, payload: bytes):
+    started = time.perf_counter()
+    fn(payload)
+    elapsed = time.perf_counter() - started
+    # Separate run for memory, since tracing allocations slows the dict-heavy JSON path
+    tracemalloc.start()
+    fn(payload)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<34} {len(payload) / 2 ** 20:8.1f}MiB body  {1000 * elapsed:9.1f}ms  peak={peak / 2 ** 20:8.1f}MiB")
+
+
+def bias_json(payload: bytes):
+    request = service.BiasAnalysisRequest.model_validate_json(payload)
+    service.detect_bias_patterns(request.hiring_data)
+
+
+def bias_table(content_type: str):
+    def run(payload: bytes):
+        service.detect_bias_patterns_table(columnar.read_table(payload, content_type))
+    return run
+
+
+def rank_json(payload: bytes):
+    request = service.CandidateRankingRequest.model_validate_json(payload)
+    scores = service.score_candidates(request.candidates, request.job_requirements)
+    service.page_indices(scores, 100)
+
+
+def rank_table(content_type: str, job_requirements: dict):
+    def run(payload: bytes):
+        table = columnar.read_table(payload, content_type)
+        columns = columnar.ranking_columns(table, job_requirements)
+        scores = service.score_columns(
+            service.count_required_skills(columns["rows"], columns["cols"], columns["vocab_size"], table.num_rows),
+            columns["experience"],
+            columns["education_match"],
+            columns["required_skill_count"],
+            columns["min_experience"]
+        )
+        columnar.ranked_table(table, service.page_indices(scores, 100), scores, {})
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=200_000)
+    args = parser.parse_args()
+    rng = random.Random(4)
+    job_requirements = {"required_skills": ["python", "sql", "aws", "docker"], "min_experience": 5, "education_level": "master"}
+
+    hiring = hiring_rows(args.rows, rng)
+    hiring_table = pa.Table.from_pylist(hiring)
+    measure("analyze-bias json", bias_json, json.dumps({"hiring_data": hiring}).encode())
+    measure("analyze-bias arrow stream", bias_table(columnar.ARROW_STREAM), encode(hiring_table, columnar.ARROW_STREAM))
+    measure("analyze-bias parquet", bias_table(columnar.PARQUET), encode(hiring_table, columnar.PARQUET))
+    del hiring, hiring_table
+
+    candidates = candidate_rows(args.rows, rng)
+    candidate_table = pa.Table.from_pylist(candidates)
+    measure(
+        "rank-candidates json",
+        rank_json,
+        json.dumps({"candidates": candidates, "job_requirements": job_requirements}).encode()
+    )
+    measure(
+        "rank-candidates arrow stream",
+        rank_table(columnar.ARROW_STREAM, job_requirements),
+        encode(candidate_table, columnar.ARROW_STREAM)
+    )
+    measure(
+        "rank-candidates parquet",
+        rank_table(columnar.PARQUET, job_requirements),
+        encode(candidate_table, columnar.PARQUET)
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""Load test for the sentence-transformer micro-batching layer.
+
+Simulates N concurrent request handlers, each encoding one text per request,
+and compares:
+
+  * direct   - every handler calls model.encode on its own text
+  * batched  - handlers go through EncodeBatcher
+
+For each concurrency level it prints throughput (texts/s) against p50/p99
+request latency.
+
+    python benchmarks/bench_encode_batching.py --concurrency 1 4 16 64 --requests 512
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend', 'microservices', 'ml-service'))
+
+from encode_batcher import EncodeBatcher  # noqa: E402
+
+WORDS = (
+    "python java react docker kubernetes aws sql backend frontend engineer developer "
+    "team lead platform data pipeline api design testing cloud scalable services"
+).split()
+
+
+def make_texts(count: int, words_per_text: int, seed: int = 7):
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS) for _ in range(words_per_text)) for _ in range(count)]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def drive(encode_one, texts, concurrency):
+    """Run len(texts) single-text requests with `concurrency` handlers in flight"""
+    latencies = []
+    cursor = iter(texts)
+
+    async def handler():
+        for text in cursor:
+            start = time.perf_counter()
+            await encode_one(text)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[handler() for _ in range(concurrency)])
+    return latencies, time.perf_counter() - start
+
+
+async def run_direct(model, executor, texts, concurrency):
+    loop = asyncio.get_running_loop()
+
+    async def encode_one(text):
+        return await loop.run_in_executor(executor, lambda: model.encode([text], normalize_embeddings=True))
+
+    return await drive(encode_one, texts, concurrency)
+
+
+async def run_batched(model, executor, texts, concurrency, max_batch_size, max_wait_ms):
+    loop = asyncio.get_running_loop()
+
+    async def encode_many(batch):
+        return await loop.run_in_executor(
+            executor, lambda: model.encode(batch, batch_size=len(batch), normalize_embeddings=True)
+        )
+
+    batcher = EncodeBatcher(encode_many, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+
+    async def encode_one(text):
+        return (await batcher.encode([text]))[0]
+
+    try:
+        return await drive(encode_one, texts, concurrency)
+    finally:
+        await batcher.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', default='all-MiniLM-L6-v2')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16, 64])
+    parser.add_argument('--requests', type=int, default=512)
+    parser.add_argument('--words', type=int, default=120)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--max-batch-size', type=int, default=32)
+    parser.add_argument('--max-wait-ms', type=float, default=5.0)
+    args = parser.parse_args()
+
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(args.model)
+    texts = make_texts(args.requests, args.words)
+    model.encode(texts[:8])  # warm up
+
+    print(f"{'mode':<8} {'conc':>5} {'texts/s':>9} {'p50 ms':>9} {'p99 ms':>9}")
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        for concurrency in args.concurrency:
+            for mode in ('direct', 'batched'):
+                if mode == 'direct':
+                    coro = run_direct(model, executor, texts, concurrency)
+                else:
+                    coro = run_batched(model, executor, texts, concurrency, args.max_batch_size, args.max_wait_ms)
+                latencies, wall = asyncio.run(coro)
+                print(
+                    f"{mode:<8} {concurrency:>5} {len(texts) / wall:>9.1f} "
+                    f"{percentile(latencies, 50) * 1000:>9.1f} {percentile(latencies, 99) * 1000:>9.1f}"
+                )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+"""/analyze-resume under concurrent load with a fake LLM behind it.
+
+Starts benchmarks/fake_llm_server.py in-process, points the service at it
+and sends --requests concurrent /analyze-resume calls over --distinct
+resume/job pairs, so repeated pairs exercise the prompt cache and shared
+in-flight completions. While they run, /health is polled to show the event
+loop stays responsive. A second round with the fake slower than the
+deadline checks that requests fall back on time.
+
+    python benchmarks/bench_llm_summary.py --requests 200 --distinct 50 --latency 0.5
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'ai-ml-service'))
+
+import fake_llm_server  # noqa: E402
+import llm_summary  # noqa: E402
+
+
+def resume(index: int) -> str:
+    return (
+        f"Candidate {index}: backend engineer with {3 + index % 8} years of experience in Python, "
+        "PostgreSQL, Docker and AWS. Led a migration to Kubernetes and mentored two engineers. "
+    ) * 4
+
+
+JOB = "Senior backend engineer. Python, AWS, Kubernetes, PostgreSQL. 5+ years of experience."
+
+
+async def run_round(client, requests: int, distinct: int):
+    latencies = []
+    health = []
+    done = asyncio.Event()
+
+    async def one(index: int):
+        started = time.perf_counter()
+        response = await client.post('/analyze-resume', json={
+            "resume_text": resume(index % distinct),
+            "job_description": JOB
+        })
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - started)
+        return response.json()["summary"]
+
+    async def poll_health():
+        while not done.is_set():
+            started = time.perf_counter()
+            (await client.get('/health')).raise_for_status()
+            health.append(time.perf_counter() - started)
+            await asyncio.sleep(0.01)
+
+    poller = asyncio.ensure_future(poll_health())
+    started = time.perf_counter()
+    summaries = await asyncio.gather(*[one(index) for index in range(requests)])
+    elapsed = time.perf_counter() - started
+    done.set()
+    await poller
+    return elapsed, latencies, health, summaries
+
+
+def completions(port: int) -> int:
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/stats") as response:
+        return json.load(response)["completions"]
+
+
+def report(label: str, elapsed: float, latencies, health):
+    latencies = sorted(latencies)
+    print(
+        f"{label:<22} wall={elapsed:6.2f}s  p50={1000 * statistics.median(latencies):7.1f}ms  "
+        f"max={1000 * latencies[-1]:7.1f}ms  /health max={1000 * max(health):6.1f}ms"
+    )
+
+
+async def main_async(args):
+    import httpx
+    import main as service
+
+    transport = httpx.ASGITransport(app=service.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://service", timeout=60) as client:
+        elapsed, latencies, health, _ = await run_round(client, args.requests, args.distinct)
+        report("cold cache", elapsed, latencies, health)
+        print(f"  completions billed: {completions(args.port)}  (serial lower bound {args.requests * args.latency:.1f}s)")
+        elapsed, latencies, health, _ = await run_round(client, args.requests, args.distinct)
+        report("warm cache", elapsed, latencies, health)
+        print(f"  completions billed: {completions(args.port)}")
+
+        service.summary_client._cache.clear()
+        fake_llm_server.FakeLLMHandler.latency = args.timeout * 3
+        elapsed, latencies, health, summaries = await run_round(client, args.distinct, args.distinct)
+        report("upstream past deadline", elapsed, latencies, health)
+        print(f"  fallback summaries: {sum(summary == llm_summary.FALLBACK_SUMMARY for summary in summaries)}/{len(summaries)}")
+        print(f"  summary stats: {service.summary_client.stats()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--distinct', type=int, default=50)
+    parser.add_argument('--latency', type=float, default=0.5, help="fake completion latency in seconds")
+    parser.add_argument('--timeout', type=float, default=2.0, help="OPENAI_TIMEOUT_SECONDS")
+    parser.add_argument('--concurrency', type=int, default=8, help="OPENAI_MAX_CONCURRENCY")
+    parser.add_argument('--port', type=int, default=8088)
+    args = parser.parse_args()
+
+    fake_llm_server.serve(args.port, args.latency)
+    os.environ.update({
+        "OPENAI_API_KEY": "fake",
+        "OPENAI_BASE_URL": f"http://127.0.0.1:{args.port}/v1",
+        "OPENAI_TIMEOUT_SECONDS": str(args.timeout),
+        "OPENAI_MAX_CONCURRENCY": str(args.concurrency)
+    })
+    asyncio.run(main_async(args))
+
+
+if __name__ == '__main__':
+    main()
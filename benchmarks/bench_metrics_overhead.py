@@ -0,0 +1,140 @@
+"""Cost of the request metrics against the requests they measure.
+
+Times MetricsMiddleware around a do-nothing ASGI app and one stage() block,
+then runs /rank-candidates and /analyze-resume in-process (httpx ASGI
+transport) with METRICS_ENABLED on and off, each in its own subprocess, and
+reports the overhead as a share of request time.
+
+    python benchmarks/bench_metrics_overhead.py --requests 2000 --candidates 200
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from scoring_core import metrics  # noqa: E402
+
+RESUME = (
+    "Backend engineer with 6 years of experience in Python, Django, PostgreSQL, Docker and AWS. "
+    "Built billing services, led a Kubernetes migration and mentored engineers. "
+) * 20
+JOB = "Senior backend engineer: Python, AWS, Kubernetes, PostgreSQL, 5+ years of experience."
+
+
+async def noop_app(scope, receive, send):
+    await send({'type': 'http.response.start', 'status': 200, 'headers': []})
+    await send({'type': 'http.response.body', 'body': b''})
+
+
+async def time_middleware(calls: int) -> tuple:
+    """Seconds per request for the bare app and the app behind MetricsMiddleware"""
+    async def receive():
+        return {'type': 'http.request', 'body': b''}
+
+    async def send(message):
+        pass
+
+    wrapped = metrics.MetricsMiddleware(noop_app, metrics.ServiceMetrics('bench'))
+    results = []
+    for app in (noop_app, wrapped):
+        started = time.perf_counter()
+        for _ in range(calls):
+            await app({'type': 'http', 'endpoint': noop_app}, receive, send)
+        results.append((time.perf_counter() - started) / calls)
+    return tuple(results)
+
+
+def time_stage(calls: int) -> float:
+    token = metrics._current.set(metrics.RequestMetrics())
+    try:
+        started = time.perf_counter()
+        for _ in range(calls):
+            with metrics.stage('score'):
+                pass
+        return (time.perf_counter() - started) / calls
+    finally:
+        metrics._current.reset(token)
+
+
+def child(requests: int, candidates: int):
+    """Run in a subprocess: mean request seconds per endpoint, as JSON on stdout"""
+    import httpx
+
+    sys.path.insert(0, os.path.join(ROOT, 'ai-ml-service'))
+    import main as service
+
+    pool = {
+        "candidates": [
+            {"id": index, "skills": ["Python", "AWS", "Go"][:index % 4], "experience_years": index % 12}
+            for index in range(candidates)
+        ],
+        "job_requirements": {"required_skills": ["Python", "AWS"], "min_experience": 5},
+        "top_k": 50
+    }
+    endpoints = {
+        "/rank-candidates": pool,
+        "/analyze-resume": {"resume_text": RESUME, "job_description": JOB}
+    }
+
+    async def run():
+        transport = httpx.ASGITransport(app=service.app)
+        timings = {}
+        async with httpx.AsyncClient(transport=transport, base_url="http://service") as client:
+            for path, body in endpoints.items():
+                for _ in range(max(requests // 20, 5)):
+                    (await client.post(path, json=body)).raise_for_status()
+                samples = []
+                for _ in range(requests):
+                    started = time.perf_counter()
+                    (await client.post(path, json=body)).raise_for_status()
+                    samples.append(time.perf_counter() - started)
+                timings[path] = statistics.median(samples)
+        return timings
+
+    print(json.dumps(asyncio.run(run())))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--candidates', type=int, default=200)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.requests, args.candidates)
+        return
+
+    bare, wrapped = asyncio.run(time_middleware(50_000))
+    stage_cost = time_stage(200_000)
+    middleware_cost = wrapped - bare
+    print(f"middleware          {1e6 * middleware_cost:8.2f}us per request")
+    print(f"stage()             {1e6 * stage_cost:8.2f}us per stage")
+
+    runs = {}
+    for enabled in ('0', '1'):
+        output = subprocess.run(
+            [sys.executable, __file__, '--child', '--requests', str(args.requests), '--candidates', str(args.candidates)],
+            env={**os.environ, 'METRICS_ENABLED': enabled},
+            check=True,
+            capture_output=True,
+            text=True
+        ).stdout
+        runs[enabled] = json.loads(output.strip().splitlines()[-1])
+
+    print(f"{'endpoint':<20} {'off':>10} {'on':>10} {'measured':>9} {'estimated':>10}")
+    for path, off in runs['0'].items():
+        on = runs['1'][path]
+        # Each endpoint marks at most five stages
+        estimated = (middleware_cost + 5 * stage_cost) / off
+        print(f"{path:<20} {1000 * off:8.3f}ms {1000 * on:8.3f}ms {100 * (on - off) / off:8.2f}% {100 * estimated:9.2f}%")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Measure ml-service cold start: import time and RSS, with and without warm-up.
+
+Each scenario imports the service in a fresh interpreter and prints the
+startup stats the service records (also reported under "startup" on
+/health), plus the time and RSS after the first model load when warm-up is on.
+
+    python benchmarks/bench_ml_startup.py
+"""
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+SERVICE_DIR = os.path.join(ROOT, 'backend', 'microservices', 'ml-service')
+
+PROBE = """
+import json, time
+started = time.perf_counter()
+import main
+stats = dict(main.startup_stats)
+if main.ML_WARMUP:
+    main.warm_up_models()
+    stats['rssBytesAfterWarmup'] = main.startup_stats.get('rssBytesAfterWarmup')
+stats['wallSeconds'] = time.perf_counter() - started
+print('STARTUP ' + json.dumps(stats))
+"""
+
+SCENARIOS = {
+    'lazy': {},
+    'lazy, NER disabled': {'ML_ENABLE_NER': '0'},
+    'warm-up, NER disabled': {'ML_WARMUP': '1', 'ML_ENABLE_NER': '0'},
+    'warm-up, all models': {'ML_WARMUP': '1'},
+}
+
+
+def main():
+    for name, overrides in SCENARIOS.items():
+        # scoring_core from this checkout, whether or not it is installed
+        env = {**os.environ, 'PYTHONPATH': os.pathsep.join(filter(None, [ROOT, os.getenv('PYTHONPATH')])), **overrides}
+        result = subprocess.run(
+            [sys.executable, '-c', PROBE],
+            cwd=SERVICE_DIR, env=env, capture_output=True, text=True
+        )
+        line = next((line for line in result.stdout.splitlines() if line.startswith('STARTUP ')), None)
+        if line is None:
+            print(f"{name:<24} failed: {result.stderr.strip().splitlines()[-1:]}")
+            continue
+        stats = json.loads(line[len('STARTUP '):])
+        rss = stats.get('rssBytesAfterWarmup') or stats.get('rssBytesAtImport') or 0
+        print(
+            f"{name:<24} import={stats['importSeconds']:6.2f}s  "
+            f"total={stats['wallSeconds']:6.2f}s  rss={rss / 2 ** 20:8.1f}MiB"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""Latency and recall of windowed NER against single-pass NER on long resumes.
+
+Generates long resumes with known organisation and technology names planted
+throughout, including near the end where single-pass NER truncates, and
+compares:
+
+  * single    - the whole resume passed to the pipeline in one call
+  * windowed  - overlapping token windows batched through windowed_ner
+
+Recall is the share of planted names found by each mode. Also reports how
+often the skill matcher fast path would skip NER for the sample jobs.
+
+    python benchmarks/bench_ner_windows.py --resumes 20 --paragraphs 60
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend', 'microservices', 'ml-service'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from models import load_ner_pipeline  # noqa: E402
+from ner_windows import windowed_ner  # noqa: E402
+from scoring_core import get_skill_matcher  # noqa: E402
+
+PLANTED = [
+    "Microsoft", "Google", "Amazon Web Services", "Kubernetes", "TensorFlow", "Salesforce",
+    "Oracle", "Atlassian", "Shopify", "Netflix", "Spotify", "PostgreSQL", "Databricks", "Snowflake"
+]
+FILLER = (
+    "responsible for designing building and operating services used by millions of customers while "
+    "mentoring engineers improving reliability reducing latency and collaborating with product teams"
+).split()
+JOB_SKILLS = [["Python", "Docker"], ["React", "TypeScript"], ["Kubernetes", "Go"], ["Rust", "Elixir"]]
+
+
+def make_resume(rng: random.Random, paragraphs: int):
+    planted = set()
+    lines = []
+    for _ in range(paragraphs):
+        name = rng.choice(PLANTED)
+        planted.add(name.lower())
+        lines.append(f"Worked at {name} using Python and Docker. " + " ".join(rng.choice(FILLER) for _ in range(40)))
+    return "\n".join(lines), planted
+
+
+def found_names(entities):
+    return {entity['word'].lower() for entity in entities}
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--resumes', type=int, default=20)
+    parser.add_argument('--paragraphs', type=int, default=60)
+    parser.add_argument('--window-tokens', type=int, default=256)
+    parser.add_argument('--stride', type=int, default=32)
+    parser.add_argument('--batch-size', type=int, default=8)
+    parser.add_argument('--backend', default=None, help='torch, onnx or onnx-int8 (default ML_INFERENCE_BACKEND)')
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    resumes = [make_resume(rng, args.paragraphs) for _ in range(args.resumes)]
+    ner_pipeline = load_ner_pipeline(args.backend)
+    ner_pipeline(resumes[0][0][:500])
+
+    modes = {
+        'single': lambda text: ner_pipeline(text),
+        'windowed': lambda text: windowed_ner(
+            ner_pipeline, text, max_tokens=args.window_tokens, stride=args.stride, batch_size=args.batch_size
+        ),
+    }
+    for name, run in modes.items():
+        latencies, hits, total = [], 0, 0
+        for text, planted in resumes:
+            started = time.perf_counter()
+            entities = run(text)
+            latencies.append(time.perf_counter() - started)
+            found = found_names(entities)
+            hits += len(planted & found)
+            total += len(planted)
+        print(
+            f"{name:<9} p50={1000 * percentile(latencies, 50):8.1f}ms  "
+            f"p95={1000 * percentile(latencies, 95):8.1f}ms  recall={hits / max(total, 1):.3f}"
+        )
+
+    matcher = get_skill_matcher()
+    skipped = 0
+    for text, _ in resumes:
+        found = set(matcher.extract_ids(text))
+        job_skills = rng.choice(JOB_SKILLS)
+        if all(matcher.extract_ids(skill) and found.issuperset(matcher.extract_ids(skill)) for skill in job_skills):
+            skipped += 1
+    print(f"fast path would skip NER for {skipped}/{len(resumes)} screenings")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""Cost of building a /rank-candidates response body for a large pool.
+
+Compares the old path, where the ranked page was validated against the
+CandidateRankingResponse model and encoded with the standard library, with
+encoding the trusted page directly (orjson when installed) and with NDJSON
+streaming. Reports total time, time to the first byte and the tracemalloc
+peak of a second, traced run. Scoring is done once up front and not timed.
+
+    python benchmarks/bench_rank_responses.py --candidates 200000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'ai-ml-service'))
+
+import main as service  # noqa: E402
+import serialization  # noqa: E402
+
+SKILLS = ["python", "java", "javascript", "react", "sql", "aws", "docker", "kubernetes", "go", "rust"]
+
+
+def candidate_rows(count: int, rng: random.Random):
+    return [
+        {
+            "id": index,
+            "name": f"Candidate {index}",
+            "skills": rng.sample(SKILLS, rng.randint(1, 6)),
+            "experience_years": rng.randint(0, 15),
+            "education_level": rng.choice(["bachelor", "master", "phd"])
+        }
+        for index in range(count)
+    ]
+
+
+def page(candidates, scores, indices):
+    return ({**candidates[index], "ai_score": float(scores[index])} for index in indices)
+
+
+def validated_json(candidates, scores, indices):
+    response = service.CandidateRankingResponse(
+        ranked_candidates=list(page(candidates, scores, indices)),
+        ranking_criteria=service.RANKING_CRITERIA,
+        total_candidates=len(candidates)
+    )
+    body = json.dumps(response.model_dump(mode="json"), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    yield body
+
+
+def trusted_json(candidates, scores, indices):
+    yield serialization.dumps({
+        "ranked_candidates": list(page(candidates, scores, indices)),
+        "ranking_criteria": service.RANKING_CRITERIA,
+        "total_candidates": len(candidates)
+    })
+
+
+def ndjson(candidates, scores, indices):
+    return serialization.ndjson_chunks(page(candidates, scores, indices))
+
+
+def consume(chunks):
+    started = time.perf_counter()
+    first = None
+    size = 0
+    for chunk in chunks:
+        if first is None:
+            first = time.perf_counter() - started
+        size += len(chunk)
+    return first, time.perf_counter() - started, size
+
+
+def measure(label: str, build, candidates, scores, indices):
+    first, total, size = consume(build(candidates, scores, indices))
+    tracemalloc.start()
+    consume(build(candidates, scores, indices))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{label:<26} {size / 2 ** 20:7.1f}MiB  first byte {1000 * first:8.1f}ms  "
+        f"total {1000 * total:8.1f}ms  peak={peak / 2 ** 20:7.1f}MiB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--candidates', type=int, default=200_000)
+    args = parser.parse_args()
+
+    candidates = candidate_rows(args.candidates, random.Random(18))
+    job_requirements = {"required_skills": ["python", "sql", "aws", "docker"], "min_experience": 5, "education_level": "master"}
+    scores = service.score_candidates(candidates, job_requirements)
+    indices = service.page_indices(scores, None)
+    print(f"orjson: {'yes' if serialization.orjson is not None else 'no (standard library fallback)'}")
+
+    measure("validated response_model", validated_json, candidates, scores, indices)
+    measure("trusted json", trusted_json, candidates, scores, indices)
+    measure("ndjson stream", ndjson, candidates, scores, indices)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""Benchmark resume downloads under concurrency.
+
+Starts a local HTTP stand-in for resume storage that answers after a fixed
+delay, then fires N concurrent downloads from inside one event loop using:
+
+  * blocking  - requests.get called directly in a coroutine (the old path)
+  * async     - the pooled ResumeFetcher used by the ml-service
+
+and reports per-request latency percentiles for each. The fetcher gets the
+service's settings (RESUME_FETCH_* or the same defaults: 100 connections, 16
+per host) unless --per-host or --max-connections say otherwise.
+
+    python benchmarks/bench_resume_fetch.py --concurrency 100 --delay 0.05
+"""
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend', 'microservices', 'ml-service'))
+
+from resume_fetcher import ResumeFetcher  # noqa: E402
+
+
+def start_storage_stand_in(delay: float, body_size: int):
+    body = b'%PDF-1.4\n' + b'x' * body_size
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            time.sleep(delay)
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/pdf')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        daemon_threads = True
+        request_queue_size = 1024
+
+    server = Server(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_blocking(url: str, concurrency: int):
+    import requests
+
+    # Latency is measured from submission, so time spent waiting on a stalled loop counts
+    submitted = time.perf_counter()
+
+    async def one():
+        requests.get(url).content
+        return time.perf_counter() - submitted
+
+    return await asyncio.gather(*[one() for _ in range(concurrency)])
+
+
+async def run_async(url: str, concurrency: int, max_connections: int, per_host: int):
+    fetcher = ResumeFetcher(max_connections=max_connections, per_host_limit=per_host)
+
+    submitted = time.perf_counter()
+
+    async def one():
+        await fetcher.fetch(url)
+        return time.perf_counter() - submitted
+
+    try:
+        return await asyncio.gather(*[one() for _ in range(concurrency)])
+    finally:
+        await fetcher.close()
+
+
+def report(name, latencies, wall):
+    print(
+        f"{name:<24} wall={wall * 1000:8.1f}ms  "
+        f"p50={percentile(latencies, 50) * 1000:8.1f}ms  "
+        f"p99={percentile(latencies, 99) * 1000:8.1f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concurrency', type=int, default=100)
+    parser.add_argument('--delay', type=float, default=0.05, help='stand-in response delay in seconds')
+    parser.add_argument('--body-size', type=int, default=200_000)
+    # Same settings and defaults as the ml-service's fetcher
+    parser.add_argument('--max-connections', type=int, default=int(os.getenv('RESUME_FETCH_MAX_CONNECTIONS', '100')))
+    parser.add_argument('--per-host', type=int, default=int(os.getenv('RESUME_FETCH_PER_HOST', '16')))
+    parser.add_argument('--skip-blocking', action='store_true')
+    args = parser.parse_args()
+
+    server = start_storage_stand_in(args.delay, args.body_size)
+    url = f"http://127.0.0.1:{server.server_address[1]}/resume.pdf"
+
+    try:
+        if not args.skip_blocking:
+            start = time.perf_counter()
+            latencies = asyncio.run(run_blocking(url, args.concurrency))
+            report('blocking', latencies, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        latencies = asyncio.run(run_async(url, args.concurrency, args.max_connections, args.per_host))
+        report(f'async (per host {args.per_host})', latencies, time.perf_counter() - start)
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""Micro-benchmarks for each scoring_core function.
+
+Times every shared function on synthetic inputs next to the service copy it
+replaced (from check_scoring_parity.py), reporting the best of --repeat runs
+per call. Batch functions are also timed per candidate over a --pool sized
+pool. --json writes the results for tracking between runs.
+
+    python benchmarks/bench_scoring_core.py --pool 10000 --json scoring_core.json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import check_scoring_parity as previous  # noqa: E402
+from scoring_core import (  # noqa: E402
+    experience_match,
+    extract_experience,
+    get_skill_matcher,
+    graded_experience_match,
+    pair_similarity,
+    rank_candidates,
+    score_candidates,
+    word_overlap_score,
+)
+
+
+def best_time(fn, calls: int, repeat: int) -> float:
+    """Best seconds per call over repeat runs of calls calls"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        best = min(best, (time.perf_counter() - started) / calls)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pool', type=int, default=10_000, help="candidates per batch call")
+    parser.add_argument('--words', type=int, default=600, help="words per resume")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=29)
+    parser.add_argument('--json', help="write results to this file")
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    resume = " ".join(rng.choice(previous.FILLER) for _ in range(args.words)) + " 7 years of experience"
+    job = " ".join(rng.choice(previous.FILLER) for _ in range(120))
+    candidates = previous.make_candidates(rng, args.pool)
+    requirements = {"required_skills": ["Python", "AWS", "Docker", "SQL"], "min_experience": 5, "education_level": "masters"}
+    years = np.array([candidate["experience_years"] for candidate in candidates], dtype=np.float64)
+    matcher = get_skill_matcher()
+
+    benchmarks = [
+        # name, shared, previous, calls, items per call
+        ("extract_experience", lambda: extract_experience(resume),
+         lambda: previous.old_extract_experience(resume, 0), 2000, 1),
+        ("word_overlap_score", lambda: word_overlap_score(resume, job),
+         lambda: previous.old_jaccard_match_score(resume, job), 2000, 1),
+        ("pair_similarity", lambda: pair_similarity(resume, job, stop_words='english'),
+         lambda: previous.old_tfidf_match_score(resume, job, 'english'), 50, 1),
+        ("skills.extract_names", lambda: matcher.extract_names(resume), None, 500, 1),
+        ("experience_match", lambda: experience_match(7, 5),
+         lambda: previous.old_screening_experience_match(7, 5), 20000, 1),
+        ("experience_match[pool]", lambda: experience_match(years, 5),
+         lambda: [previous.old_screening_experience_match(y, 5) for y in years.tolist()], 5, args.pool),
+        ("graded_experience_match", lambda: graded_experience_match(3, 5),
+         lambda: previous.old_advanced_experience_match(3, 5), 20000, 1),
+        ("graded_experience_match[pool]", lambda: graded_experience_match(years, 5),
+         lambda: [previous.old_advanced_experience_match(y, 5) for y in years.tolist()], 5, args.pool),
+        ("score_candidates[pool]", lambda: score_candidates(candidates, requirements),
+         lambda: [previous.old_candidate_score(candidate, requirements) for candidate in candidates], 3, args.pool),
+        ("rank_candidates[pool]", lambda: rank_candidates(candidates, requirements),
+         lambda: previous.old_rank(candidates, requirements, previous.old_candidate_score), 3, args.pool),
+    ]
+
+    results = []
+    print(f"{'function':<32} {'shared':>12} {'previous':>12} {'speedup':>8}   (us per item)")
+    for name, shared, old, calls, items in benchmarks:
+        shared_us = 1e6 * best_time(shared, calls, args.repeat) / items
+        old_us = 1e6 * best_time(old, calls, args.repeat) / items if old else None
+        speedup = f"{old_us / shared_us:7.1f}x" if old_us else ""
+        print(f"{name:<32} {shared_us:12.3f} {old_us if old_us is not None else float('nan'):12.3f} {speedup:>8}")
+        results.append({"name": name, "sharedMicros": shared_us, "previousMicros": old_us})
+
+    if args.json:
+        with open(args.json, 'w') as output:
+            json.dump({"pool": args.pool, "words": args.words, "results": results}, output, indent=2)
+
+
+if __name__ == '__main__':
+    main()
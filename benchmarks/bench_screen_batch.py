@@ -0,0 +1,155 @@
+"""Throughput of /screen-batch against calling /screen once per candidate.
+
+Serves synthetic PDF and DOCX resumes (synthetic_corpus.py) from a local
+file server and screens the same candidates against one job both ways,
+in-process through httpx's ASGI transport:
+
+  * loop   - one /screen request per candidate, --concurrency at a time
+  * batch  - /screen-batch requests of --batch-size candidates
+
+Each mode runs in its own subprocess with empty resume text and embedding
+caches, after one warm-up request on a resume outside the measured set, so
+both download, parse and encode every resume. Reports candidates/s for each
+mode, the speedup against the 10x target, and the largest fitScore
+difference between the two.
+
+    python benchmarks/bench_screen_batch.py --candidates 500 --batch-size 500
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+SERVICE_DIR = os.path.join(BENCHMARK_DIR, '..', 'backend', 'microservices', 'ml-service')
+sys.path.insert(0, BENCHMARK_DIR)
+
+import synthetic_corpus  # noqa: E402
+from run_benchmark_suite import serve_files, service_env  # noqa: E402
+
+TARGET_SPEEDUP = 10
+
+
+def candidate(corpus, files_url, index):
+    resume = corpus["resumes"][index]
+    entry = corpus["candidates"][index]
+    return {
+        "id": entry["id"],
+        "resumeUrl": f"{files_url}/{resume['pdf' if index % 2 == 0 else 'docx']}",
+        "skills": entry["skills"],
+        "yearsExp": entry["experience_years"]
+    }
+
+
+def child(args):
+    """Run in a subprocess: screen the candidates one way and print seconds and scores as JSON"""
+    import httpx
+
+    sys.path.insert(0, SERVICE_DIR)
+    os.chdir(SERVICE_DIR)
+    import main
+
+    corpus = synthetic_corpus.load_corpus(args.corpus)
+    job = corpus["jobs"][0]
+    # Resume 0 is only used to warm up
+    candidates = [candidate(corpus, args.files_url, index) for index in range(1, args.candidates + 1)]
+
+    async def run():
+        for handler in main.app.router.on_startup:
+            await handler()
+        transport = httpx.ASGITransport(app=main.app)
+        scores = {}
+        errors = 0
+        async with httpx.AsyncClient(transport=transport, base_url="http://service", timeout=None) as client:
+            warmup = await client.post("/screen", json={"job": job, "candidate": candidate(corpus, args.files_url, 0)})
+            warmup.raise_for_status()
+            started = time.perf_counter()
+            if args.child == 'loop':
+                slots = asyncio.Semaphore(args.concurrency)
+
+                async def screen_one(entry):
+                    nonlocal errors
+                    async with slots:
+                        response = await client.post("/screen", json={"job": job, "candidate": entry})
+                    if response.status_code == 200:
+                        scores[entry["id"]] = response.json()["fitScore"]
+                    else:
+                        errors += 1
+
+                await asyncio.gather(*[screen_one(entry) for entry in candidates])
+            else:
+                for start in range(0, len(candidates), args.batch_size):
+                    response = await client.post(
+                        "/screen-batch", json={"job": job, "candidates": candidates[start:start + args.batch_size]}
+                    )
+                    response.raise_for_status()
+                    for result in response.json()["results"]:
+                        if result["error"] is None:
+                            scores[result["candidateId"]] = result["fitScore"]
+                        else:
+                            errors += 1
+            elapsed = time.perf_counter() - started
+        for handler in main.app.router.on_shutdown:
+            await handler()
+        return {"seconds": elapsed, "errors": errors, "scores": scores}
+
+    print(json.dumps(asyncio.run(run())))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--candidates', type=int, default=200)
+    parser.add_argument('--batch-size', type=int, default=200, help="candidates per /screen-batch request")
+    parser.add_argument('--concurrency', type=int, default=1, help="/screen requests in flight in loop mode")
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--child', choices=['loop', 'batch'], help=argparse.SUPPRESS)
+    parser.add_argument('--corpus', help=argparse.SUPPRESS)
+    parser.add_argument('--files-url', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args)
+        return
+
+    with tempfile.TemporaryDirectory(prefix='screen-batch-') as scratch:
+        corpus_dir = os.path.join(scratch, 'corpus')
+        synthetic_corpus.build_corpus(
+            corpus_dir, 'small', args.seed,
+            resumes=args.candidates + 1, pool=args.candidates + 1, jobs=1, hiring=0, transcripts=0
+        )
+        file_server = serve_files(corpus_dir)
+        files_url = f"http://127.0.0.1:{file_server.server_address[1]}"
+        runs = {}
+        try:
+            for mode in ('loop', 'batch'):
+                command = [
+                    sys.executable, os.path.abspath(__file__), '--child', mode,
+                    '--corpus', corpus_dir, '--files-url', files_url,
+                    '--candidates', str(args.candidates), '--batch-size', str(args.batch_size),
+                    '--concurrency', str(args.concurrency)
+                ]
+                # Fresh state directory per mode, so neither run starts with cached text or embeddings
+                output = subprocess.run(
+                    command, env=service_env(os.path.join(scratch, mode)), check=True, capture_output=True, text=True
+                ).stdout
+                runs[mode] = json.loads(output.strip().splitlines()[-1])
+        finally:
+            file_server.shutdown()
+
+    for mode, run in runs.items():
+        print(
+            f"{mode:<6} {args.candidates / run['seconds']:9.1f} candidates/s  "
+            f"{run['seconds']:8.2f}s  errors {run['errors']}"
+        )
+    speedup = runs['loop']['seconds'] / runs['batch']['seconds']
+    print(f"speedup {speedup:.1f}x ({'meets' if speedup >= TARGET_SPEEDUP else 'below'} the {TARGET_SPEEDUP}x target)")
+    common = runs['loop']['scores'].keys() & runs['batch']['scores'].keys()
+    difference = max((abs(runs['loop']['scores'][key] - runs['batch']['scores'][key]) for key in common), default=0.0)
+    print(f"largest fitScore difference over {len(common)} candidates: {difference:.2e}")
+
+
+if __name__ == '__main__':
+    main()
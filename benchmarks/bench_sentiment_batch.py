@@ -0,0 +1,101 @@
+"""Throughput of batch sentiment scoring.
+
+Scores synthetic interview transcripts with the previous per-request
+helpers (reproduced below: lowercasing per pattern and per context word,
+regexes looked up on every call), with sentiment.analyze_batch in one
+process, and split across a process pool as /analyze-sentiment/batch does.
+
+    python benchmarks/bench_sentiment_batch.py --texts 20000 --processes 4
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'ai-ml-service'))
+
+import sentiment  # noqa: E402
+
+# Mostly neutral interview talk with the occasional emotional word
+WORDS = (
+    "so in my last role i worked on the billing platform where we moved the ledger from a "
+    "monolith to services written in python on aws with postgres and kafka and i owned the "
+    "migration plan the rollout and the on call rotation for about two years which meant a lot "
+    "of time with product and finance to agree on how reconciliation should work what does "
+    "the team here look like and how do you split ownership between platform and product"
+).split() * 20 + ["excited", "great", "worried", "love", "believe", "sure", "?"]
+CONTEXT = "Senior backend engineer python aws kubernetes postgres distributed systems on call team roadmap"
+
+
+def per_request(text: str, context: str) -> dict:
+    positive_words = ["excellent", "great", "good", "positive", "excited", "enthusiastic", "motivated"]
+    negative_words = ["bad", "poor", "negative", "concerned", "worried", "disappointed"]
+    text_lower = text.lower()
+    positive_count = sum(1 for word in positive_words if word in text_lower)
+    negative_count = sum(1 for word in negative_words if word in text_lower)
+    if positive_count > negative_count:
+        result = {"sentiment": "positive", "confidence": min(positive_count / (positive_count + negative_count + 1), 0.95)}
+    elif negative_count > positive_count:
+        result = {"sentiment": "negative", "confidence": min(negative_count / (positive_count + negative_count + 1), 0.95)}
+    else:
+        result = {"sentiment": "neutral", "confidence": 0.5}
+
+    emotions = {
+        "enthusiasm": len(re.findall(r'excited|enthusiastic|passionate|love', text.lower())),
+        "confidence": len(re.findall(r'confident|sure|certain|believe', text.lower())),
+        "concern": len(re.findall(r'concerned|worried|unsure|doubt', text.lower()))
+    }
+    total = sum(emotions.values()) or 1
+    result["emotions"] = {k: v / total for k, v in emotions.items()}
+
+    length_score = min(len(text) / 500, 1.0) * 0.3
+    question_score = min(text.count('?') / 3, 1.0) * 0.3
+    specific_mentions = sum(1 for word in context.lower().split() if word in text.lower())
+    result["engagement_score"] = (length_score + question_score + min(specific_mentions / 5, 1.0) * 0.4) * 100
+    return result
+
+
+def make_texts(count: int, words: int, seed: int = 20):
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS) for _ in range(words)) for _ in range(count)]
+
+
+def report(label: str, count: int, elapsed: float):
+    print(f"{label:<24} {count / elapsed:12,.0f} texts/s  {1000 * elapsed:9.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--texts', type=int, default=20_000)
+    parser.add_argument('--words', type=int, default=400, help="words per transcript")
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    texts = make_texts(args.texts, args.words)
+    items = [(text, CONTEXT) for text in texts]
+
+    started = time.perf_counter()
+    baseline = [per_request(text, context) for text, context in items]
+    report("per-request helpers", len(items), time.perf_counter() - started)
+
+    started = time.perf_counter()
+    results = sentiment.analyze_batch(items)
+    report("analyze_batch", len(items), time.perf_counter() - started)
+    assert results == baseline
+
+    with ProcessPoolExecutor(max_workers=args.processes) as pool:
+        # Start the workers before timing
+        list(pool.map(sentiment.analyze_batch, [[("", "")]] * args.processes))
+        chunk_size = -(-len(items) // args.processes)
+        started = time.perf_counter()
+        chunks = pool.map(sentiment.analyze_batch, [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)])
+        pooled = [result for chunk in chunks for result in chunk]
+        report(f"process pool x{args.processes}", len(items), time.perf_counter() - started)
+    assert pooled == baseline
+
+
+if __name__ == '__main__':
+    main()
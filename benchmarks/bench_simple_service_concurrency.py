@@ -0,0 +1,118 @@
+"""Throughput and latency of simple_ai_service.py under concurrent clients.
+
+Starts the service once per server mode (single is the original
+one-request-at-a-time HTTPServer) and drives it from client processes that
+each send /analyze-resume requests back to back over one connection, reused
+when the server keeps it alive. Reports requests per second, p50/p99 latency
+and failed requests per mode and concurrency level.
+
+    python benchmarks/bench_simple_service_concurrency.py --concurrency 1 8 32 --seconds 5
+"""
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+SERVICE = os.path.join(ROOT, 'ai-ml-service', 'simple_ai_service.py')
+
+RESUME = (
+    "Senior software engineer with 7 years of experience building Python and Go services, "
+    "PostgreSQL and Redis data stores, Docker and Kubernetes deployments on AWS. "
+) * 20
+JOB = "Backend engineer: Python, Django, PostgreSQL, AWS, Kubernetes; 5+ years of experience. " * 10
+
+
+def client(port: int, seconds: float):
+    body = json.dumps({"resume_text": RESUME, "job_description": JOB})
+    headers = {"Content-Type": "application/json"}
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            connection.request('POST', '/analyze-resume', body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            if response.status != 200:
+                errors += 1
+                continue
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            connection.close()
+            continue
+        latencies.append(time.perf_counter() - started)
+    connection.close()
+    return latencies, errors
+
+
+def wait_until_up(port: int, timeout: float = 15.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            connection.request('GET', '/health')
+            connection.getresponse().read()
+            connection.close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Service did not start on port {port}")
+
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else float('nan')
+
+
+def run_mode(mode: str, args):
+    server = subprocess.Popen(
+        [sys.executable, SERVICE, '--mode', mode, '--port', str(args.port),
+         '--workers', str(args.workers), '--threads', str(args.threads)],
+        # scoring_core from this checkout, whether or not it is installed
+        env={**os.environ, 'PYTHONPATH': os.pathsep.join(filter(None, [ROOT, os.getenv('PYTHONPATH')]))},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_until_up(args.port)
+        for concurrency in args.concurrency:
+            with multiprocessing.Pool(concurrency) as pool:
+                results = pool.starmap(client, [(args.port, args.seconds)] * concurrency)
+            latencies = [latency for result in results for latency in result[0]]
+            errors = sum(result[1] for result in results)
+            print(
+                f"{mode:<9} clients={concurrency:<4} {len(latencies) / args.seconds:9.1f} req/s  "
+                f"p50={1000 * percentile(latencies, 0.5):8.1f}ms  p99={1000 * percentile(latencies, 0.99):8.1f}ms  "
+                f"errors={errors}"
+            )
+    finally:
+        server.send_signal(signal.SIGTERM)
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--modes', nargs='+', default=['single', 'threaded', 'prefork'])
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--port', type=int, default=8099)
+    args = parser.parse_args()
+    for mode in args.modes:
+        run_mode(mode, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""Benchmark skill extraction against a large synthetic taxonomy.
+
+Compares the shared single-pass SkillMatcher with the per-skill scans it
+replaced:
+
+  * regex-loop  - one re.search per skill pattern (old ml-service extract_skills)
+  * substring   - one `in` check per skill (old ai-ml-service extract_skills)
+  * matcher     - scoring_core.SkillMatcher
+
+    python benchmarks/bench_skill_matcher.py --skills 10000 --resumes 50
+"""
+import argparse
+import os
+import random
+import re
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from scoring_core import Skill, SkillMatcher, load_taxonomy  # noqa: E402
+
+FILLER = (
+    "designed built shipped maintained services for customers across teams with focus on "
+    "reliability performance and clean code while mentoring engineers and reviewing designs"
+).split()
+
+
+def synthetic_taxonomy(count: int, seed: int = 1):
+    """Real taxonomy plus generated skills with one or two aliases each"""
+    rng = random.Random(seed)
+    skills = list(load_taxonomy())
+    seen = {alias for skill in skills for alias in skill.aliases}
+    while len(skills) < count:
+        words = [''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+                 for _ in range(rng.randint(1, 3))]
+        name = ' '.join(words)
+        if name in seen:
+            continue
+        aliases = [name]
+        if len(words) > 1:
+            aliases.append(''.join(word[0] for word in words) + str(len(skills)))
+        seen.update(aliases)
+        skills.append(Skill(f"skill-{len(skills)}", name.title(), aliases))
+    return skills
+
+
+def synthetic_resumes(skills, count: int, words: int, seed: int = 2):
+    rng = random.Random(seed)
+    resumes = []
+    for _ in range(count):
+        tokens = [rng.choice(FILLER) for _ in range(words)]
+        for _ in range(rng.randint(5, 25)):
+            tokens.insert(rng.randrange(len(tokens)), rng.choice(rng.choice(skills).aliases))
+        resumes.append(' '.join(tokens))
+    return resumes
+
+
+def regex_loop_extractor(skills):
+    patterns = {
+        skill.id: re.compile('|'.join(r'\b' + re.escape(alias) + r'\b' for alias in skill.aliases), re.IGNORECASE)
+        for skill in skills
+    }
+
+    def extract(text):
+        text_lower = text.lower()
+        return [skill_id for skill_id, pattern in patterns.items() if pattern.search(text_lower)]
+
+    return extract
+
+
+def substring_extractor(skills):
+    names = [skill.name for skill in skills]
+
+    def extract(text):
+        text_lower = text.lower()
+        return [name for name in names if name.lower() in text_lower]
+
+    return extract
+
+
+def timed(label, build, resumes):
+    start = time.perf_counter()
+    extract = build()
+    built = time.perf_counter() - start
+
+    start = time.perf_counter()
+    found = 0
+    for resume in resumes:
+        found += len(extract(resume))
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<11} build={built * 1000:9.1f}ms  "
+        f"per-resume={elapsed / len(resumes) * 1000:9.3f}ms  found={found}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--skills', type=int, default=10_000)
+    parser.add_argument('--resumes', type=int, default=50)
+    parser.add_argument('--words', type=int, default=800)
+    args = parser.parse_args()
+
+    skills = synthetic_taxonomy(args.skills)
+    resumes = synthetic_resumes(skills, args.resumes, args.words)
+    print(f"{len(skills)} skills, {sum(len(s.aliases) for s in skills)} aliases, {len(resumes)} resumes")
+
+    timed('regex-loop', lambda: regex_loop_extractor(skills), resumes)
+    timed('substring', lambda: substring_extractor(skills), resumes)
+    timed('matcher', lambda: SkillMatcher(skills).extract_ids, resumes)
+
+
+if __name__ == '__main__':
+    main()
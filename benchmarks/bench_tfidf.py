@@ -0,0 +1,83 @@
+"""Per-request cost of TF-IDF similarity: per-pair fitting vs a corpus-fitted model.
+
+  * per-pair  - a new TfidfVectorizer fitted on the two documents (old behaviour)
+  * fitted    - transform only with a model fitted on a synthetic corpus,
+                with the job vector served from the cache after the first request
+
+Uses the ai-ml-service shape (resume text vs job description) and the
+ml-service shape (skill list vs skill list).
+
+    python benchmarks/bench_tfidf.py --requests 2000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sklearn.feature_extraction.text import TfidfVectorizer  # noqa: E402
+from sklearn.metrics.pairwise import cosine_similarity  # noqa: E402
+
+from scoring_core.tfidf import TfidfModel, taxonomy_documents  # noqa: E402
+
+SKILLS = [
+    "python", "java", "javascript", "react", "node", "docker", "kubernetes", "aws", "sql",
+    "postgresql", "mongodb", "tensorflow", "pytorch", "go", "rust", "graphql", "redis", "terraform"
+]
+WORDS = (
+    "built scalable services for customers led migration improved reliability mentored engineers "
+    "designed apis data pipelines platform cloud infrastructure testing automation product teams"
+).split()
+
+
+def make_text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS + SKILLS) for _ in range(words))
+
+
+def per_pair(first: str, second: str, stop_words=None) -> float:
+    vectorizer = TfidfVectorizer(stop_words=stop_words)
+    matrix = vectorizer.fit_transform([first, second])
+    return float(cosine_similarity(matrix[0:1], matrix[1:2])[0][0])
+
+
+def run(label: str, fn, pairs):
+    started = time.perf_counter()
+    for first, second in pairs:
+        fn(first, second)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {1e6 * elapsed / len(pairs):9.1f}us/request")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--corpus', type=int, default=5000)
+    parser.add_argument('--jobs', type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    corpus = [make_text(rng, 300) for _ in range(args.corpus)] + taxonomy_documents()
+    model = TfidfModel.fit(corpus)
+    path = os.path.join(tempfile.mkdtemp(), 'tfidf.joblib')
+    started = time.perf_counter()
+    model.save(path)
+    model = TfidfModel.load(path)
+    print(f"fitted {model.vocabulary_size} terms on {len(corpus)} documents, save+load {time.perf_counter() - started:.2f}s")
+
+    jobs = [make_text(rng, 200) for _ in range(args.jobs)]
+    documents = [(rng.choice(jobs), make_text(rng, 600)) for _ in range(args.requests)]
+    skill_jobs = [" ".join(rng.sample(SKILLS, 5)) for _ in range(args.jobs)]
+    skills = [(rng.choice(skill_jobs), " ".join(rng.sample(SKILLS, 8))) for _ in range(args.requests)]
+
+    run("documents per-pair", lambda job, resume: per_pair(resume, job, 'english'), documents)
+    run("documents fitted", model.similarity, documents)
+    run("skills per-pair", per_pair, skills)
+    run("skills fitted", model.similarity, skills)
+    print(model.stats())
+
+
+if __name__ == '__main__':
+    main()
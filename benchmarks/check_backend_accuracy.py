@@ -0,0 +1,163 @@
+"""Compare an ONNX / int8 inference backend against the fp32 PyTorch baseline.
+
+Runs the same job/resume pairs through both backends and reports how far the
+/advanced-screen fit score drifts, along with the semantic similarity drift,
+NER skill overlap and per-request latency of each backend. Convert the models
+first with backend/microservices/ml-service/convert_models.py.
+
+    python benchmarks/check_backend_accuracy.py --backend onnx-int8 --pairs 64
+    python benchmarks/check_backend_accuracy.py --backend onnx --input pairs.json --max-drift 0.02
+
+``--input`` takes a JSON list of {"job": {...}, "candidate": {...}, "resumeText": "..."}
+objects in the request format; without it synthetic pairs are generated.
+Exits non-zero when the largest fit score drift exceeds --max-drift.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend', 'microservices', 'ml-service'))
+
+import main as service  # noqa: E402
+from models import load_ner_pipeline, load_sentence_transformer  # noqa: E402
+
+SKILLS = [
+    "Python", "JavaScript", "React", "Node.js", "Docker", "Kubernetes", "AWS", "PostgreSQL",
+    "MongoDB", "Machine Learning", "TensorFlow", "Go", "Java", "Spring", "GraphQL", "Redis"
+]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries", "Wayne Enterprises"]
+FILLER = (
+    "designed built maintained scalable services for customers across teams and led "
+    "migration of legacy systems improving reliability latency and developer experience"
+).split()
+
+
+def make_pairs(count: int, seed: int = 11):
+    rng = random.Random(seed)
+    pairs = []
+    for _ in range(count):
+        job_skills = rng.sample(SKILLS, 4)
+        job = {
+            "title": "Software Engineer",
+            "description": " ".join(rng.choice(FILLER) for _ in range(40)),
+            "skills": job_skills,
+            "experience": rng.randint(0, 8)
+        }
+        lines = []
+        for _ in range(rng.randint(3, 8)):
+            lines.append(
+                f"At {rng.choice(COMPANIES)} I worked with {', '.join(rng.sample(SKILLS, 3))}. "
+                + " ".join(rng.choice(FILLER) for _ in range(30))
+            )
+        candidate = {"skills": rng.sample(SKILLS, 3), "yearsExp": rng.randint(0, 10)}
+        pairs.append({"job": job, "candidate": candidate, "resumeText": "\n".join(lines)})
+    return pairs
+
+
+def ner_skills(ner_pipeline, text: str):
+    """Same entity filter as extract_skills_with_ner"""
+    return sorted({
+        entity['word'].lower() for entity in ner_pipeline(text)
+        if entity['entity_group'] in ['MISC', 'ORG'] and len(entity['word']) > 2
+    })
+
+
+def experience_match(required: float, years: float) -> float:
+    if required == 0:
+        return 1.0
+    if years >= required:
+        return min(1.0, years / required)
+    return max(0.3, years / required)
+
+
+def score_pairs(embedder, ner_pipeline, pairs):
+    """Advanced-screen fit scores, semantic similarities, NER skills and latency per pair"""
+    results = []
+    for pair in pairs:
+        started = time.perf_counter()
+        job, candidate, resume_text = pair['job'], pair['candidate'], pair['resumeText']
+        extracted = list(set(service.extract_skills(resume_text) + ner_skills(ner_pipeline, resume_text)))
+        all_skills = list(set(candidate.get('skills', []) + extracted))
+        job_vec, candidate_vec = embedder.encode(
+            [service.build_job_text(job), service.build_candidate_text(all_skills, resume_text)]
+        )
+        semantic = float(
+            np.dot(job_vec, candidate_vec) / ((np.linalg.norm(job_vec) * np.linalg.norm(candidate_vec)) or 1.0)
+        )
+        skill = service.calculate_skill_similarity(job['skills'], all_skills)
+        fit = semantic * 0.35 + skill * 0.45 + experience_match(job.get('experience', 0), candidate.get('yearsExp', 0)) * 0.20
+        results.append({
+            "fitScore": max(0, min(1, fit)),
+            "semantic": semantic,
+            "skills": set(extracted),
+            "seconds": time.perf_counter() - started
+        })
+    return results
+
+
+def load_backend(backend: str):
+    started = time.perf_counter()
+    embedder = load_sentence_transformer(backend)
+    ner_pipeline = load_ner_pipeline(backend)
+    return embedder, ner_pipeline, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backend', choices=['onnx', 'onnx-int8'], default='onnx-int8')
+    parser.add_argument('--pairs', type=int, default=32)
+    parser.add_argument('--input', help='JSON file of job/candidate/resumeText pairs')
+    parser.add_argument('--max-drift', type=float, default=0.02)
+    args = parser.parse_args()
+
+    if args.input:
+        with open(args.input) as input_file:
+            pairs = json.load(input_file)
+    else:
+        pairs = make_pairs(args.pairs)
+
+    report = {}
+    runs = {}
+    for backend in ('torch', args.backend):
+        embedder, ner_pipeline, load_seconds = load_backend(backend)
+        # One warm-up pass so lazy graph initialisation is not counted as latency
+        score_pairs(embedder, ner_pipeline, pairs[:1])
+        runs[backend] = score_pairs(embedder, ner_pipeline, pairs)
+        latencies = sorted(result['seconds'] for result in runs[backend])
+        report[backend] = {
+            "loadSeconds": round(load_seconds, 2),
+            "meanMs": round(1000 * sum(latencies) / len(latencies), 1),
+            "p95Ms": round(1000 * latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))], 1)
+        }
+        del embedder, ner_pipeline
+
+    baseline, candidate = runs['torch'], runs[args.backend]
+    fit_drift = np.array([abs(a['fitScore'] - b['fitScore']) for a, b in zip(baseline, candidate)])
+    semantic_drift = np.array([abs(a['semantic'] - b['semantic']) for a, b in zip(baseline, candidate)])
+    skill_overlap = [
+        len(a['skills'] & b['skills']) / len(a['skills'] | b['skills']) if a['skills'] | b['skills'] else 1.0
+        for a, b in zip(baseline, candidate)
+    ]
+    report['drift'] = {
+        "pairs": len(pairs),
+        "fitScoreMean": float(fit_drift.mean()),
+        "fitScoreMax": float(fit_drift.max()),
+        "semanticMax": float(semantic_drift.max()),
+        "nerSkillJaccardMean": float(np.mean(skill_overlap)),
+        "speedup": round(report['torch']['meanMs'] / max(report[args.backend]['meanMs'], 1e-9), 2)
+    }
+    print(json.dumps(report, indent=2))
+
+    if fit_drift.max() > args.max_drift:
+        print(f"Fit score drift {fit_drift.max():.4f} exceeds {args.max_drift}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
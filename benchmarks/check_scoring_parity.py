@@ -0,0 +1,255 @@
+"""Check the shared scoring_core functions against the service copies they replaced.
+
+The per-service implementations of experience extraction, match scoring,
+experience matching and candidate scoring are reproduced below as they were
+before the services moved to scoring_core. Each is run against the shared
+function on synthetic inputs, and the services are checked against each
+other where they now share an implementation.
+
+    python benchmarks/check_scoring_parity.py --cases 5000
+
+One difference is intended: simple_ai_service now scores experience like
+/rank-candidates, which counts a min_experience below one year as one year.
+Before, simple_ai_service gave no experience points when min_experience was
+0, and divided by the fraction itself when it was between 0 and 1 (0.5
+required years gave full points from half a year). Pools with min_experience
+below 1 whose ranking changed are counted separately and do not fail the
+check. tests/test_scoring_parity.py runs the same checks on fewer cases.
+
+Exits non-zero on any other mismatch.
+"""
+import argparse
+import os
+import random
+import re
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'ai-ml-service'))
+
+from scoring_core import (  # noqa: E402
+    RANKING_CRITERIA,
+    experience_match,
+    extract_experience,
+    graded_experience_match,
+    pair_similarity,
+    rank_candidates,
+    score_candidates,
+)
+from simple_ai_service import AIService  # noqa: E402
+
+SKILLS = ["Python", "Java", "Go", "AWS", "Docker", "Kubernetes", "React", "SQL", "Spark", "Rust"]
+EDUCATION = ["bachelors", "masters", "phd", None]
+PHRASES = [
+    "{n} years of experience", "{n}+ years experience", "{n} years in backend", "experience: {n} years",
+    "{n} yrs experience", "Experience : {n}+ Years", "over {n} year in fintech", "",
+]
+FILLER = "built shipped maintained services for customers with python aws and docker on small teams".split()
+
+
+# Previous implementations -------------------------------------------------
+
+def old_extract_experience(text, default):
+    patterns = [
+        r'(\d+)\+?\s*years?\s*(?:of\s*)?experience',
+        r'(\d+)\+?\s*years?\s*in',
+        r'experience\s*:\s*(\d+)\+?\s*years?'
+    ]
+    for pattern in patterns:
+        matches = re.findall(pattern, text.lower())
+        if matches:
+            return int(matches[0])
+    return default
+
+
+def old_jaccard_match_score(resume_text, job_description):
+    resume_words = set(resume_text.lower().split())
+    job_words = set(job_description.lower().split())
+    intersection = resume_words.intersection(job_words)
+    union = resume_words.union(job_words)
+    if len(union) == 0:
+        return 0
+    return min(len(intersection) / len(union) * 100, 95)
+
+
+def old_tfidf_match_score(resume_text, job_description, stop_words):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    tfidf_matrix = TfidfVectorizer(stop_words=stop_words).fit_transform([resume_text, job_description])
+    return float(cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0] * 100)
+
+
+def old_screening_experience_match(years, required):
+    return min(years / max(required, 1), 1.0)
+
+
+def old_advanced_experience_match(years, required):
+    if required == 0:
+        return 1.0
+    elif years >= required:
+        return min(1.0, years / required)
+    return max(0.3, years / required)
+
+
+def old_candidate_score(candidate, job_requirements):
+    # ai-ml-service/main.py; /rank-candidates matched this bit for bit
+    candidate_skills = candidate.get("skills", [])
+    required_skills = job_requirements.get("required_skills", [])
+    skill_match = len(set(candidate_skills).intersection(set(required_skills)))
+    skill_score = (skill_match / max(len(required_skills), 1)) * 40
+    exp_score = min(candidate.get("experience_years", 0) / max(job_requirements.get("min_experience", 0), 1), 1.0) * 30
+    education_score = 20 if candidate.get("education_level") == job_requirements.get("education_level") else 10
+    return 0.0 + skill_score + exp_score + education_score + 10
+
+
+def old_simple_candidate_score(candidate, job_requirements):
+    score = 0.0
+    candidate_skills = candidate.get("skills", [])
+    required_skills = job_requirements.get("required_skills", [])
+    if required_skills:
+        score += (len(set(candidate_skills).intersection(set(required_skills))) / len(required_skills)) * 40
+    required_exp = job_requirements.get("min_experience", 0)
+    if required_exp > 0:
+        score += min(candidate.get("experience_years", 0) / required_exp, 1.0) * 30
+    score += 20 if candidate.get("education_level") == job_requirements.get("education_level") else 10
+    score += 10
+    return min(score, 100)
+
+
+def old_rank(candidates, job_requirements, score):
+    ranked = [{**candidate, "ai_score": score(candidate, job_requirements)} for candidate in candidates]
+    ranked.sort(key=lambda x: x["ai_score"], reverse=True)
+    return ranked
+
+
+# Synthetic inputs ---------------------------------------------------------
+
+def make_text(rng):
+    words = [rng.choice(FILLER) for _ in range(rng.randint(0, 60))]
+    for _ in range(rng.randint(0, 2)):
+        words.insert(rng.randint(0, len(words)), rng.choice(PHRASES).format(n=rng.randint(0, 30)))
+    return " ".join(words)
+
+
+def make_candidates(rng, count):
+    return [{
+        "id": index,
+        "skills": rng.sample(SKILLS, rng.randint(0, 6)),
+        "experience_years": rng.choice([0, 1, 2, 3, 5, 8, 12, rng.uniform(0, 15)]),
+        "education_level": rng.choice(EDUCATION)
+    } for index in range(count)]
+
+
+def make_requirements(rng):
+    return {
+        "required_skills": rng.sample(SKILLS, rng.randint(0, 5)),
+        "min_experience": rng.choice([0, 0.25, 0.5, 1, 1.5, 3, 5, 10]),
+        "education_level": rng.choice(EDUCATION)
+    }
+
+
+class Checker:
+    def __init__(self, verbose=True):
+        self.verbose = verbose
+        self.failures = 0
+        self.mismatched = []
+        # simple_ai_service pools changed by the min_experience < 1 change
+        self.intended = 0
+
+    def check(self, name, cases, mismatches):
+        self.failures += mismatches
+        if mismatches:
+            self.mismatched.append(name)
+        if self.verbose:
+            print(f"{'ok  ' if mismatches == 0 else 'FAIL'} {name:<54} {cases:>8} cases  {mismatches} mismatches")
+
+
+def run_checks(cases=5000, pools=200, seed=23, verbose=True):
+    """Run every parity check and return the Checker with its counts"""
+    rng = random.Random(seed)
+    checker = Checker(verbose)
+    service = AIService()
+
+    texts = [make_text(rng) for _ in range(cases)]
+    checker.check("extract_experience (ai-ml-service, default 0)", len(texts), sum(
+        extract_experience(text) != old_extract_experience(text, 0) for text in texts
+    ))
+    checker.check("extract_experience (simple_ai_service, default 2)", len(texts), sum(
+        service.extract_experience(text) != old_extract_experience(text, 2) for text in texts
+    ))
+
+    pairs = list(zip(texts, reversed(texts)))
+    checker.check("word_overlap_score (simple_ai_service)", len(pairs), sum(
+        service.calculate_match_score(a, b) != old_jaccard_match_score(a, b) for a, b in pairs
+    ))
+
+    # Fitting a vectorizer per pair is slow, so only a sample; empty texts have no vocabulary
+    sample = [(a, b) for a, b in pairs[:500] if a.strip() and b.strip()]
+    checker.check("pair_similarity (ai-ml-service, no fitted model)", len(sample), sum(
+        pair_similarity(a, b, stop_words='english') * 100 != old_tfidf_match_score(a, b, 'english')
+        for a, b in sample
+    ))
+    checker.check("pair_similarity (ml-service, no fitted model)", len(sample), sum(
+        pair_similarity(b, a) * 100 != old_tfidf_match_score(b, a, None) for a, b in sample
+    ))
+
+    years = np.array([rng.choice([0, 1, 2, 5, 7, 10, 15, rng.uniform(0, 20)]) for _ in range(cases)])
+    for required in [0, 1, 2, 3, 5, 10, 0.5]:
+        batch = experience_match(years, required)
+        checker.check(f"experience_match (ml-service /screen) req={required}", len(years), sum(
+            experience_match(float(y), required) != old_screening_experience_match(float(y), required)
+            or batch[i] != old_screening_experience_match(float(y), required)
+            for i, y in enumerate(years)
+        ))
+        batch = graded_experience_match(years, required)
+        checker.check(f"graded_experience_match (/advanced-screen) req={required}", len(years), sum(
+            graded_experience_match(float(y), required) != old_advanced_experience_match(float(y), required)
+            or batch[i] != old_advanced_experience_match(float(y), required)
+            for i, y in enumerate(years)
+        ))
+
+    score_mismatches = rank_mismatches = simple_mismatches = scored = 0
+    for _ in range(pools):
+        candidates = make_candidates(rng, rng.randint(0, 60))
+        requirements = make_requirements(rng)
+        scored += len(candidates)
+        scores = score_candidates(candidates, requirements)
+        score_mismatches += sum(
+            float(score) != old_candidate_score(candidate, requirements)
+            for score, candidate in zip(scores, candidates)
+        )
+        shared = rank_candidates(candidates, requirements)
+        rank_mismatches += shared != old_rank(candidates, requirements, old_candidate_score)
+
+        simple = service.rank_candidates(candidates, requirements)
+        simple_mismatches += simple["ranked_candidates"] != shared or simple["ranking_criteria"] != RANKING_CRITERIA
+        if old_rank(candidates, requirements, old_simple_candidate_score) != shared:
+            if requirements["min_experience"] < 1:
+                checker.intended += 1
+            else:
+                simple_mismatches += 1
+
+    checker.check("score_candidates (/rank-candidates)", scored, score_mismatches)
+    checker.check("rank_candidates order and scores", pools, rank_mismatches)
+    checker.check("simple_ai_service rank_candidates", pools, simple_mismatches)
+    if verbose:
+        print(f"     simple_ai_service pools changed by the min_experience < 1 change: {checker.intended}")
+    return checker
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cases', type=int, default=5000)
+    parser.add_argument('--pools', type=int, default=200, help="candidate pools to rank")
+    parser.add_argument('--seed', type=int, default=23)
+    args = parser.parse_args()
+    checker = run_checks(args.cases, args.pools, args.seed)
+    if checker.failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
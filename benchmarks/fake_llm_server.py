@@ -0,0 +1,107 @@
+"""A local stand-in for the OpenAI chat completions API.
+
+Answers POST /v1/chat/completions after a fixed delay with a canned summary,
+so the LLM path of /analyze-resume can be exercised without a key or a bill.
+Point the service at it with:
+
+    python benchmarks/fake_llm_server.py --port 8088 --latency 0.8
+    OPENAI_API_KEY=fake OPENAI_BASE_URL=http://127.0.0.1:8088/v1 uvicorn main:app
+
+GET /stats returns the number of completions served and the most that were
+in flight at once.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    latency = 0.5
+    failure_rate = 0.0
+    completions = 0
+    in_flight = 0
+    peak_in_flight = 0
+    lock = threading.Lock()
+
+    def send_json(self, status: int, payload: dict):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/stats':
+            self.send_json(200, {"completions": FakeLLMHandler.completions, "peakInFlight": FakeLLMHandler.peak_in_flight})
+        else:
+            self.send_json(404, {"error": {"message": "not found"}})
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        if not self.path.endswith('/chat/completions'):
+            self.send_json(404, {"error": {"message": "not found"}})
+            return
+        with FakeLLMHandler.lock:
+            FakeLLMHandler.in_flight += 1
+            FakeLLMHandler.peak_in_flight = max(FakeLLMHandler.peak_in_flight, FakeLLMHandler.in_flight)
+        try:
+            time.sleep(self.latency)
+        finally:
+            with FakeLLMHandler.lock:
+                FakeLLMHandler.in_flight -= 1
+        if random.random() < self.failure_rate:
+            self.send_json(500, {"error": {"message": "fake upstream failure", "type": "server_error"}})
+            return
+        with FakeLLMHandler.lock:
+            FakeLLMHandler.completions += 1
+        content = request["messages"][-1]["content"]
+        self.send_json(200, {
+            "id": f"chatcmpl-fake-{FakeLLMHandler.completions}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "fake"),
+            "choices": [{
+                "index": 0,
+                "message": {
+                    "role": "assistant",
+                    "content": f"Candidate summary generated from a {len(content)}-character prompt. Strong fit."
+                },
+                "finish_reason": "stop"
+            }],
+            "usage": {"prompt_tokens": len(content.split()), "completion_tokens": 9, "total_tokens": len(content.split()) + 9}
+        })
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port: int, latency: float, failure_rate: float = 0.0) -> ThreadingHTTPServer:
+    """Start the fake server on a background thread, with its counters reset"""
+    FakeLLMHandler.latency = latency
+    FakeLLMHandler.failure_rate = failure_rate
+    FakeLLMHandler.completions = FakeLLMHandler.peak_in_flight = 0
+    server = ThreadingHTTPServer(('127.0.0.1', port), FakeLLMHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8088)
+    parser.add_argument('--latency', type=float, default=0.5, help="seconds per completion")
+    parser.add_argument('--failure-rate', type=float, default=0.0)
+    args = parser.parse_args()
+    FakeLLMHandler.latency = args.latency
+    FakeLLMHandler.failure_rate = args.failure_rate
+    print(f"Fake LLM server on http://127.0.0.1:{args.port}/v1 ({args.latency}s per completion)")
+    ThreadingHTTPServer(('127.0.0.1', args.port), FakeLLMHandler).serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,526 @@
+"""Throughput, latency percentiles and peak RSS for every ML endpoint.
+
+Builds a seeded synthetic corpus (synthetic_corpus.py), serves its PDF and
+DOCX resumes from a local file server, and drives each endpoint of
+ai-ml-service, simple_ai_service and the ml-service with --concurrency
+clients for --requests requests after --warmup warm-up requests.
+
+  * inprocess - each endpoint runs in a fresh subprocess that imports the
+                service and calls it through httpx's ASGI transport
+                (simple_ai_service: its AIService methods), so peak RSS is
+                that endpoint's alone
+  * http      - each service is started with uvicorn (or its own server) on
+                a free port and driven over HTTP; peak RSS is the server's
+                high-water mark after each endpoint. --url SERVICE=URL
+                targets an already running service instead (no RSS).
+
+Results go to --output as JSON. With --baseline, p50/p95/p99 latency,
+throughput and peak RSS are compared against a stored results file and the
+run exits non-zero when any of them is worse by more than --tolerance. A
+baseline is just an earlier results file: keep one per machine, since the
+numbers only compare like for like.
+
+    python benchmarks/run_benchmark_suite.py --scale small --output results.json
+    python benchmarks/run_benchmark_suite.py --mode http --baseline benchmarks/baseline.json
+    python benchmarks/run_benchmark_suite.py --only ai-ml-service --requests 500 --concurrency 16
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCHMARK_DIR)
+sys.path.insert(0, BENCHMARK_DIR)
+
+import synthetic_corpus  # noqa: E402
+
+SUITE_VERSION = 1
+
+
+class Service(NamedTuple):
+    name: str
+    directory: str
+    # Command that serves the app on {port}, run from directory
+    command: List[str]
+    asgi: bool = True
+
+
+SERVICES = {
+    'ai-ml-service': Service(
+        'ai-ml-service',
+        os.path.join(ROOT, 'ai-ml-service'),
+        [sys.executable, '-m', 'uvicorn', 'main:app', '--host', '127.0.0.1', '--port', '{port}', '--log-level', 'warning']
+    ),
+    'simple-ai-service': Service(
+        'simple-ai-service',
+        os.path.join(ROOT, 'ai-ml-service'),
+        [sys.executable, 'simple_ai_service.py', '--host', '127.0.0.1', '--port', '{port}'],
+        asgi=False
+    ),
+    'ml-service': Service(
+        'ml-service',
+        os.path.join(ROOT, 'backend', 'microservices', 'ml-service'),
+        [sys.executable, '-m', 'uvicorn', 'main:app', '--host', '127.0.0.1', '--port', '{port}', '--log-level', 'warning']
+    ),
+}
+
+
+class Endpoint(NamedTuple):
+    service: str
+    path: str
+    # (corpus, files_url, request index) -> request; see request_body
+    build: Callable
+    # AIService method for simple-ai-service in-process runs
+    method: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.service} POST {self.path}"
+
+
+def pick(items: list, index: int):
+    return items[index % len(items)]
+
+
+def resume_request(corpus, files_url, index):
+    return {
+        "resume_text": pick(corpus["resumes"], index)["text"],
+        "job_description": pick(corpus["jobs"], index)["description"]
+    }
+
+
+def ranking_request(corpus, files_url, index):
+    job = pick(corpus["jobs"], index)
+    return {
+        "candidates": corpus["candidates"],
+        "job_requirements": {
+            "required_skills": job["skills"],
+            "min_experience": job["experience"],
+            "education_level": "masters"
+        }
+    }
+
+
+def bias_request(corpus, files_url, index):
+    return {"hiring_data": corpus["hiring"]}
+
+
+def sentiment_request(corpus, files_url, index):
+    return {"text": pick(corpus["transcripts"], index), "context": pick(corpus["jobs"], index)["description"]}
+
+
+def sentiment_batch_request(corpus, files_url, index):
+    return {
+        "items": [{"text": text} for text in corpus["transcripts"]],
+        "context": pick(corpus["jobs"], index)["description"]
+    }
+
+
+def screening_candidate(corpus, files_url, index, kind):
+    resume = pick(corpus["resumes"], index)
+    candidate = pick(corpus["candidates"], index)
+    return {
+        "id": candidate["id"],
+        "resumeUrl": f"{files_url}/{resume[kind]}",
+        "skills": candidate["skills"],
+        "yearsExp": candidate["experience_years"]
+    }
+
+
+def screen_request(corpus, files_url, index):
+    # Alternate PDF and DOCX resumes
+    kind = "pdf" if index % 2 == 0 else "docx"
+    return {"job": pick(corpus["jobs"], index), "candidate": screening_candidate(corpus, files_url, index, kind)}
+
+
+def screen_batch_request(corpus, files_url, index, size=20):
+    return {
+        "job": pick(corpus["jobs"], index),
+        "candidates": [
+            screening_candidate(corpus, files_url, index * size + offset, "pdf" if offset % 2 == 0 else "docx")
+            for offset in range(size)
+        ]
+    }
+
+
+ENDPOINTS = [
+    Endpoint('ai-ml-service', '/analyze-resume', resume_request),
+    Endpoint('ai-ml-service', '/rank-candidates', ranking_request),
+    Endpoint('ai-ml-service', '/analyze-bias', bias_request),
+    Endpoint('ai-ml-service', '/analyze-sentiment', sentiment_request),
+    Endpoint('ai-ml-service', '/analyze-sentiment/batch', sentiment_batch_request),
+    Endpoint('simple-ai-service', '/analyze-resume', resume_request, 'analyze_resume'),
+    Endpoint('simple-ai-service', '/rank-candidates', ranking_request, 'rank_candidates'),
+    Endpoint('simple-ai-service', '/analyze-bias', bias_request, 'analyze_bias'),
+    Endpoint('simple-ai-service', '/analyze-sentiment', sentiment_request, 'analyze_sentiment'),
+    Endpoint('ml-service', '/screen', screen_request),
+    Endpoint('ml-service', '/advanced-screen', screen_request),
+    Endpoint('ml-service', '/screen-batch', screen_batch_request),
+]
+
+# Higher is worse for these; throughput is the other way round
+LOWER_IS_BETTER = ('p50Ms', 'p95Ms', 'p99Ms', 'peakRssBytes')
+
+
+def service_env(state_dir: str) -> Dict[str, str]:
+    """Environment for the services: no paid API calls, state kept out of the real directories"""
+    return {
+        **os.environ,
+        # scoring_core from this checkout, whether or not it is installed
+        'PYTHONPATH': os.pathsep.join(filter(None, [ROOT, os.getenv('PYTHONPATH')])),
+        'OPENAI_API_KEY': '',
+        'VECTOR_INDEX_DIR': os.path.join(state_dir, 'vector-index'),
+        'JOB_PROFILE_DIR': os.path.join(state_dir, 'job-profiles'),
+        'SCREENING_QUEUE_PATH': os.path.join(state_dir, 'screening-queue.sqlite3'),
+        'EMBEDDING_CACHE_DIR': os.path.join(state_dir, 'embedding-cache'),
+        'RESUME_TEXT_CACHE_DIR': os.path.join(state_dir, 'resume-text-cache'),
+    }
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float, peak_rss: Optional[int]) -> Dict:
+    completed = len(latencies)
+    return {
+        "requests": completed + errors,
+        "errors": errors,
+        "throughput": completed / elapsed if elapsed > 0 else 0.0,
+        "p50Ms": 1000 * percentile(latencies, 50) if latencies else None,
+        "p95Ms": 1000 * percentile(latencies, 95) if latencies else None,
+        "p99Ms": 1000 * percentile(latencies, 99) if latencies else None,
+        "peakRssBytes": peak_rss
+    }
+
+
+def self_peak_rss() -> int:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def process_peak_rss(pid: int) -> Optional[int]:
+    try:
+        with open(f'/proc/{pid}/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+async def drive(send: Callable, endpoint: Endpoint, corpus: Dict, files_url: str, args) -> tuple:
+    """Run warm-up, then args.requests requests from args.concurrency workers; send returns a status code"""
+    for index in range(args.warmup):
+        await send(endpoint.build(corpus, files_url, index))
+
+    # Bodies are built up front so request building is not timed
+    bodies = [endpoint.build(corpus, files_url, args.warmup + index) for index in range(args.requests)]
+    latencies: List[float] = []
+    errors = 0
+    next_index = 0
+
+    async def worker():
+        nonlocal errors, next_index
+        while next_index < len(bodies):
+            body = bodies[next_index]
+            next_index += 1
+            started = time.perf_counter()
+            try:
+                status = await send(body)
+            except Exception:
+                status = 599
+            if status >= 400:
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(args.concurrency)])
+    return latencies, errors, time.perf_counter() - started
+
+
+async def run_asgi(service: Service, endpoint: Endpoint, corpus: Dict, files_url: str, args) -> Dict:
+    import httpx
+
+    sys.path.insert(0, service.directory)
+    os.chdir(service.directory)
+    import main
+
+    for handler in main.app.router.on_startup:
+        await handler()
+    transport = httpx.ASGITransport(app=main.app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://service", timeout=None) as client:
+            async def send(body):
+                return (await client.post(endpoint.path, json=body)).status_code
+            latencies, errors, elapsed = await drive(send, endpoint, corpus, files_url, args)
+    finally:
+        for handler in main.app.router.on_shutdown:
+            await handler()
+    return summarize(latencies, errors, elapsed, self_peak_rss())
+
+
+async def run_simple(service: Service, endpoint: Endpoint, corpus: Dict, files_url: str, args) -> Dict:
+    sys.path.insert(0, service.directory)
+    from serialization import dumps
+    from simple_ai_service import AIService
+
+    method = getattr(AIService(), endpoint.method)
+    loop = asyncio.get_running_loop()
+    # Threads stand in for the threaded server's worker pool
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        async def send(body):
+            await loop.run_in_executor(pool, lambda: dumps(method(*body.values())))
+            return 200
+        latencies, errors, elapsed = await drive(send, endpoint, corpus, files_url, args)
+    return summarize(latencies, errors, elapsed, self_peak_rss())
+
+
+async def run_http(base_url: str, endpoint: Endpoint, corpus: Dict, files_url: str, args, pid: Optional[int]) -> Dict:
+    import httpx
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=None, limits=limits) as client:
+        async def send(body):
+            return (await client.post(endpoint.path, json=body)).status_code
+        latencies, errors, elapsed = await drive(send, endpoint, corpus, files_url, args)
+    return summarize(latencies, errors, elapsed, process_peak_rss(pid) if pid else None)
+
+
+class QuietFileHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_files(directory: str) -> ThreadingHTTPServer:
+    """Serve the corpus resumes over HTTP on a free port, on a background thread"""
+    def handler(*handler_args, **kwargs):
+        return QuietFileHandler(*handler_args, directory=directory, **kwargs)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_healthy(base_url: str, process: Optional[subprocess.Popen], timeout: float):
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"{base_url} exited with status {process.returncode} before becoming healthy")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f"{base_url} was not healthy after {timeout}s")
+
+
+def run_inprocess(endpoints: List[Endpoint], corpus_dir: str, files_url: str, args, state_dir: str) -> Dict:
+    results = {}
+    for endpoint in endpoints:
+        command = [
+            sys.executable, os.path.abspath(__file__), '--child', endpoint.key,
+            '--corpus', corpus_dir, '--files-url', files_url,
+            '--requests', str(args.requests), '--warmup', str(args.warmup), '--concurrency', str(args.concurrency)
+        ]
+        completed = subprocess.run(command, env=service_env(state_dir), capture_output=True, text=True)
+        if completed.returncode != 0:
+            print(f"{endpoint.key}: failed\n{completed.stderr[-2000:]}", file=sys.stderr)
+            results[endpoint.key] = {"failed": True}
+            continue
+        results[endpoint.key] = json.loads(completed.stdout.strip().splitlines()[-1])
+        report_line(endpoint.key, results[endpoint.key])
+    return results
+
+
+def run_over_http(endpoints: List[Endpoint], corpus: Dict, files_url: str, args, state_dir: str) -> Dict:
+    urls = dict(entry.split('=', 1) for entry in args.url)
+    results = {}
+    for name, service in SERVICES.items():
+        service_endpoints = [endpoint for endpoint in endpoints if endpoint.service == name]
+        if not service_endpoints:
+            continue
+        process = None
+        base_url = urls.get(name)
+        if base_url is None:
+            port = free_port()
+            base_url = f"http://127.0.0.1:{port}"
+            process = subprocess.Popen(
+                [part.format(port=port) for part in service.command],
+                cwd=service.directory,
+                env=service_env(state_dir),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
+        try:
+            wait_until_healthy(base_url, process, args.startup_timeout)
+            for endpoint in service_endpoints:
+                result = asyncio.run(run_http(
+                    base_url, endpoint, corpus, files_url, args, process.pid if process else None
+                ))
+                results[endpoint.key] = result
+                report_line(endpoint.key, result)
+        finally:
+            if process is not None:
+                process.terminate()
+                try:
+                    process.wait(timeout=30)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+    return results
+
+
+def format_ms(value: Optional[float]) -> str:
+    return f"{value:9.2f}" if value is not None else f"{'-':>9}"
+
+
+def report_line(key: str, result: Dict):
+    rss = result.get("peakRssBytes")
+    print(
+        f"{key:<46} {result['throughput']:9.1f}/s p50 {format_ms(result['p50Ms'])} "
+        f"p95 {format_ms(result['p95Ms'])} p99 {format_ms(result['p99Ms'])} ms  "
+        f"rss {rss / 2**20 if rss else 0:7.1f}MiB  errors {result['errors']}"
+    )
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float, min_delta_ms: float) -> List[str]:
+    """Descriptions of every metric worse than the baseline by more than tolerance"""
+    regressions = []
+    for key, current in results["endpoints"].items():
+        previous = baseline.get("endpoints", {}).get(key)
+        if not previous or current.get("failed") or previous.get("failed"):
+            continue
+        for metric in (*LOWER_IS_BETTER, 'throughput'):
+            now, before = current.get(metric), previous.get(metric)
+            if now is None or not before:
+                continue
+            change = (now - before) / before
+            worse = change > tolerance if metric in LOWER_IS_BETTER else change < -tolerance
+            # Sub-millisecond latency moves are noise, whatever the ratio
+            if worse and metric.endswith('Ms') and now - before < min_delta_ms:
+                worse = False
+            if worse:
+                regressions.append(f"{key} {metric}: {before:.2f} -> {now:.2f} ({100 * change:+.1f}%)")
+    return regressions
+
+
+def child_main(args):
+    endpoint = next(endpoint for endpoint in ENDPOINTS if endpoint.key == args.child)
+    service = SERVICES[endpoint.service]
+    corpus = synthetic_corpus.load_corpus(args.corpus)
+    runner = run_asgi if service.asgi else run_simple
+    print(json.dumps(asyncio.run(runner(service, endpoint, corpus, args.files_url, args))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mode', choices=['inprocess', 'http'], default='inprocess')
+    parser.add_argument('--only', action='append', default=[], help="service name or endpoint path; repeatable")
+    parser.add_argument('--requests', type=int, default=100, help="timed requests per endpoint")
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--corpus-dir', help="where to write the corpus; a temporary directory by default")
+    parser.add_argument('--url', action='append', default=[], help="SERVICE=URL of a running service (http mode)")
+    parser.add_argument('--startup-timeout', type=float, default=180.0)
+    parser.add_argument('--output', default='benchmark-results.json')
+    parser.add_argument('--baseline', help="results file to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.15, help="allowed fractional slowdown before flagging")
+    parser.add_argument('--min-delta-ms', type=float, default=1.0, help="ignore latency changes smaller than this")
+    synthetic_corpus.add_size_arguments(parser)
+    # Internal: run one endpoint in this process and print its result
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--corpus', help=argparse.SUPPRESS)
+    parser.add_argument('--files-url', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child_main(args)
+        return
+
+    endpoints = [
+        endpoint for endpoint in ENDPOINTS
+        if not args.only or endpoint.service in args.only or endpoint.path in args.only
+    ]
+    with tempfile.TemporaryDirectory(prefix='ml-bench-') as scratch:
+        corpus_dir = args.corpus_dir or os.path.join(scratch, 'corpus')
+        started = time.perf_counter()
+        corpus = synthetic_corpus.build_corpus(
+            corpus_dir, args.scale, args.seed, **{name: getattr(args, name) for name in synthetic_corpus.SCALES['small']}
+        )
+        print(f"Corpus {json.dumps(corpus['counts'])} built in {time.perf_counter() - started:.1f}s")
+
+        file_server = serve_files(corpus_dir)
+        files_url = f"http://127.0.0.1:{file_server.server_address[1]}"
+        state_dir = os.path.join(scratch, 'state')
+        try:
+            if args.mode == 'inprocess':
+                endpoint_results = run_inprocess(endpoints, corpus_dir, files_url, args, state_dir)
+            else:
+                endpoint_results = run_over_http(endpoints, corpus, files_url, args, state_dir)
+        finally:
+            file_server.shutdown()
+
+    results = {
+        "suiteVersion": SUITE_VERSION,
+        "createdAt": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        "mode": args.mode,
+        "scale": args.scale,
+        "seed": args.seed,
+        "counts": corpus["counts"],
+        "load": {"requests": args.requests, "warmup": args.warmup, "concurrency": args.concurrency},
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count()
+        },
+        "endpoints": endpoint_results
+    }
+    with open(args.output, 'w') as output:
+        json.dump(results, output, indent=2)
+    print(f"Results written to {args.output}")
+
+    failed = [key for key, result in endpoint_results.items() if result.get("failed")]
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        for field in ("mode", "scale", "seed", "counts", "load"):
+            if baseline.get(field) != results[field]:
+                print(f"warning: baseline {field} {baseline.get(field)} differs from this run's {results[field]}")
+        regressions = compare(results, baseline, args.tolerance, args.min_delta_ms)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if not regressions:
+            print(f"No regressions against {args.baseline} (tolerance {100 * args.tolerance:.0f}%)")
+    if failed or regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
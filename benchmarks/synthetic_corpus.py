@@ -0,0 +1,243 @@
+"""Seeded synthetic data for the benchmark suite.
+
+Generates resumes (as text, PDF and DOCX files), job descriptions, candidate
+pools, hiring datasets and interview transcripts. The same seed and scale
+always give the same corpus, byte for byte for the JSON data and the PDFs.
+
+    python benchmarks/synthetic_corpus.py --output /tmp/corpus --scale medium --seed 7
+
+The output directory holds resumes/*.pdf, resumes/*.docx and corpus.json
+with everything else; run_benchmark_suite.py builds one the same way.
+"""
+import argparse
+import io
+import json
+import os
+import random
+import sys
+from datetime import datetime, timezone
+from typing import Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from scoring_core import load_taxonomy  # noqa: E402
+
+# Corpus sizes per scale; --resumes and friends override them
+SCALES = {
+    'small': {'resumes': 20, 'jobs': 5, 'pool': 1_000, 'hiring': 5_000, 'transcripts': 200},
+    'medium': {'resumes': 100, 'jobs': 20, 'pool': 10_000, 'hiring': 50_000, 'transcripts': 2_000},
+    'large': {'resumes': 500, 'jobs': 50, 'pool': 100_000, 'hiring': 500_000, 'transcripts': 20_000},
+}
+
+# Hiring timestamps count back from a fixed time so the data does not depend on the clock
+REFERENCE_TIME = 1_700_000_000
+DAY = 86400
+
+FIRST_NAMES = ["Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery", "Quinn"]
+LAST_NAMES = ["Smith", "Garcia", "Chen", "Okafor", "Novak", "Patel", "Kim", "Silva", "Müller", "Haddad"]
+TITLES = [
+    "Backend Engineer", "Frontend Engineer", "Data Scientist", "DevOps Engineer", "Machine Learning Engineer",
+    "Full Stack Developer", "Site Reliability Engineer", "Data Engineer", "Mobile Developer", "Platform Engineer"
+]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries", "Wayne Enterprises", "Hooli"]
+EDUCATION = ["bachelors", "masters", "phd", "bootcamp"]
+ACTIONS = [
+    "Designed and shipped", "Led the migration of", "Built", "Maintained", "Scaled", "Rewrote",
+    "Owned the on-call rotation for", "Cut the latency of", "Automated testing for", "Mentored engineers on"
+]
+SYSTEMS = [
+    "the billing platform", "a real-time analytics pipeline", "the customer-facing API", "an internal search service",
+    "the recommendation engine", "a payments reconciliation job", "the mobile backend", "a feature store"
+]
+TRANSCRIPT_WORDS = (
+    "so in my last role i worked on the platform team where we moved services to the cloud and i owned the "
+    "rollout plan and the on call rotation which meant a lot of time with product to agree on priorities what "
+    "does the team here look like and how do you split ownership between platform and product"
+).split() + ["excited", "great", "worried", "love", "believe", "sure", "concerned", "confident", "?"]
+
+
+def skill_names() -> List[str]:
+    return [skill.name for skill in load_taxonomy()]
+
+
+def resume_text(rng: random.Random, skills: List[str], paragraphs: int) -> str:
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    title = rng.choice(TITLES)
+    years = rng.randint(0, 20)
+    own_skills = rng.sample(skills, min(len(skills), rng.randint(4, 14)))
+    lines = [
+        name,
+        title,
+        f"Summary: {title.lower()} with {years} years of experience in {', '.join(own_skills[:3])}.",
+        f"Skills: {', '.join(own_skills)}",
+        "Experience",
+    ]
+    for _ in range(paragraphs):
+        company = rng.choice(COMPANIES)
+        start = rng.randint(2005, 2021)
+        lines.append(f"{rng.choice(TITLES)}, {company} ({start} - {start + rng.randint(1, 4)})")
+        for _ in range(rng.randint(2, 4)):
+            lines.append(
+                f"{rng.choice(ACTIONS)} {rng.choice(SYSTEMS)} using {rng.choice(own_skills)} and {rng.choice(own_skills)}."
+            )
+    lines.append("Education")
+    lines.append(f"{rng.choice(EDUCATION).title()} in Computer Science")
+    return "\n".join(lines)
+
+
+def job_description(rng: random.Random, skills: List[str]) -> Dict:
+    title = rng.choice(TITLES)
+    job_skills = rng.sample(skills, min(len(skills), rng.randint(3, 8)))
+    experience = rng.choice([0, 1, 2, 3, 5, 8])
+    description = (
+        f"We are hiring a {title.lower()} to work on {rng.choice(SYSTEMS)}. "
+        f"You will use {', '.join(job_skills)} every day. "
+        f"{experience}+ years of experience expected. "
+        f"{rng.choice(ACTIONS)} {rng.choice(SYSTEMS)} is a plus."
+    )
+    return {"title": title, "description": description, "skills": job_skills, "experience": experience}
+
+
+def candidate_pool(rng: random.Random, skills: List[str], count: int) -> List[Dict]:
+    return [
+        {
+            "id": f"c{index}",
+            "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "skills": rng.sample(skills, min(len(skills), rng.randint(1, 10))),
+            "experience_years": rng.randint(0, 20),
+            "education_level": rng.choice(EDUCATION)
+        }
+        for index in range(count)
+    ]
+
+
+def hiring_dataset(rng: random.Random, count: int) -> List[Dict]:
+    return [
+        {
+            "gender": rng.choice(["female", "male", "nonbinary"]),
+            "age": rng.randint(20, 65),
+            "location": rng.choice(["remote", "onsite", "hybrid"]),
+            "hired": rng.random() < 0.3,
+            "timestamp": REFERENCE_TIME - rng.uniform(0, 3 * 365 * DAY)
+        }
+        for _ in range(count)
+    ]
+
+
+def transcripts(rng: random.Random, count: int, words: int = 300) -> List[str]:
+    return [" ".join(rng.choice(TRANSCRIPT_WORDS) for _ in range(words)) for _ in range(count)]
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def pdf_bytes(text: str, lines_per_page: int = 48) -> bytes:
+    """A minimal text PDF (Helvetica, one text object per page) that PyPDF2 can read back"""
+    lines = text.split("\n")
+    pages = [lines[start:start + lines_per_page] for start in range(0, len(lines), lines_per_page)] or [[]]
+    # Objects: 1 catalog, 2 page tree, 3 font, then a page and its content stream per page
+    page_ids = [4 + 2 * index for index in range(len(pages))]
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: f"<< /Type /Pages /Kids [{' '.join(f'{pid} 0 R' for pid in page_ids)}] /Count {len(pages)} >>".encode(),
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    }
+    for page_id, page_lines in zip(page_ids, pages):
+        body = "BT /F1 10 Tf 14 TL 50 790 Td\n" + "".join(
+            f"({_pdf_escape(line)}) Tj T*\n" for line in page_lines
+        ) + "ET"
+        stream = body.encode('cp1252', errors='replace')
+        objects[page_id] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>"
+        ).encode()
+        objects[page_id + 1] = b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"
+
+    output = io.BytesIO()
+    output.write(b"%PDF-1.4\n")
+    offsets = {}
+    for object_id in sorted(objects):
+        offsets[object_id] = output.tell()
+        output.write(b"%d 0 obj\n" % object_id + objects[object_id] + b"\nendobj\n")
+    xref_offset = output.tell()
+    output.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for object_id in sorted(objects):
+        output.write(b"%010d 00000 n \n" % offsets[object_id])
+    output.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset))
+    return output.getvalue()
+
+
+def docx_bytes(text: str) -> bytes:
+    import docx
+
+    document = docx.Document()
+    for line in text.split("\n"):
+        document.add_paragraph(line)
+    # python-docx stamps the current time into the core properties
+    document.core_properties.created = document.core_properties.modified = datetime.fromtimestamp(
+        REFERENCE_TIME, timezone.utc
+    )
+    output = io.BytesIO()
+    document.save(output)
+    return output.getvalue()
+
+
+def build_corpus(directory: str, scale: str = 'small', seed: int = 7, **sizes) -> Dict:
+    """Write resumes/*.pdf, resumes/*.docx and corpus.json under directory and return the corpus"""
+    counts = {**SCALES[scale], **{name: value for name, value in sizes.items() if value is not None}}
+    rng = random.Random(seed)
+    skills = skill_names()
+
+    resume_dir = os.path.join(directory, 'resumes')
+    os.makedirs(resume_dir, exist_ok=True)
+    resumes = []
+    for index in range(counts['resumes']):
+        text = resume_text(rng, skills, paragraphs=rng.randint(2, 6))
+        entry = {"text": text, "pdf": f"resumes/r{index}.pdf", "docx": f"resumes/r{index}.docx"}
+        with open(os.path.join(directory, entry["pdf"]), 'wb') as pdf_file:
+            pdf_file.write(pdf_bytes(text))
+        with open(os.path.join(directory, entry["docx"]), 'wb') as docx_file:
+            docx_file.write(docx_bytes(text))
+        resumes.append(entry)
+
+    corpus = {
+        "scale": scale,
+        "seed": seed,
+        "counts": counts,
+        "resumes": resumes,
+        "jobs": [job_description(rng, skills) for _ in range(counts['jobs'])],
+        "candidates": candidate_pool(rng, skills, counts['pool']),
+        "hiring": hiring_dataset(rng, counts['hiring']),
+        "transcripts": transcripts(rng, counts['transcripts'])
+    }
+    with open(os.path.join(directory, 'corpus.json'), 'w', encoding='utf-8') as corpus_file:
+        json.dump(corpus, corpus_file)
+    return corpus
+
+
+def load_corpus(directory: str) -> Dict:
+    with open(os.path.join(directory, 'corpus.json'), encoding='utf-8') as corpus_file:
+        return json.load(corpus_file)
+
+
+def add_size_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--scale', choices=sorted(SCALES), default='small')
+    parser.add_argument('--seed', type=int, default=7)
+    for name in SCALES['small']:
+        parser.add_argument(f'--{name}', type=int, help=f"override the scale's {name} count")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', required=True, help="directory to write the corpus to")
+    add_size_arguments(parser)
+    args = parser.parse_args()
+    corpus = build_corpus(
+        args.output, args.scale, args.seed, **{name: getattr(args, name) for name in SCALES['small']}
+    )
+    print(f"Wrote {json.dumps(corpus['counts'])} to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
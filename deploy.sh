@@ -171,14 +171,15 @@ deploy_fly() {
     }
     
     # Deploy ML service
-    if [ -d "microservices/ml-service" ]; then
+    # Built from the repository root so the image can install scoring_core
+    if [ -d "backend/microservices/ml-service" ]; then
         log "Deploying ML service..."
-        cd microservices/ml-service
-        flyctl deploy --remote-only --app ai-hiring-ml || {
+        flyctl deploy --remote-only --app ai-hiring-ml \
+            --config backend/microservices/ml-service/fly.toml \
+            --dockerfile backend/microservices/ml-service/Dockerfile . || {
             error "Failed to deploy ML service"
             exit 1
         }
-        cd ../..
     fi
     
     # Deploy email service
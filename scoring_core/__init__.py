@@ -0,0 +1,30 @@
+"""Scoring logic shared by the Python ML services."""
+from .matching import (
+    EXPERIENCE_PATTERNS,
+    experience_match,
+    extract_experience,
+    graded_experience_match,
+    word_overlap_score,
+)
+from .ranking import RANKING_CRITERIA, rank_candidates, score_candidates
+from .skills import Skill, SkillMatch, SkillMatcher, get_skill_matcher, load_taxonomy
+from .tfidf import TfidfModel, get_tfidf_model, pair_similarity
+
+__all__ = [
+    "EXPERIENCE_PATTERNS",
+    "RANKING_CRITERIA",
+    "Skill",
+    "SkillMatch",
+    "SkillMatcher",
+    "TfidfModel",
+    "experience_match",
+    "extract_experience",
+    "get_skill_matcher",
+    "get_tfidf_model",
+    "graded_experience_match",
+    "load_taxonomy",
+    "pair_similarity",
+    "rank_candidates",
+    "score_candidates",
+    "word_overlap_score",
+]
@@ -0,0 +1,70 @@
+"""Experience extraction and the match scores the services combine.
+
+The experience patterns are compiled once at import. The experience match
+functions take a single number of years or a numpy array of them, so a
+batch of candidates is scored with one array operation while a single
+candidate stays on plain floats.
+"""
+import re
+from typing import Union
+
+import numpy as np
+
+# Tried in order; the first pattern found anywhere in the text wins
+EXPERIENCE_PATTERNS = [
+    re.compile(r'(\d+)\+?\s*years?\s*(?:of\s*)?experience'),
+    re.compile(r'(\d+)\+?\s*years?\s*in'),
+    re.compile(r'experience\s*:\s*(\d+)\+?\s*years?'),
+]
+
+# Floor for candidates below the required experience in graded_experience_match
+GRADED_EXPERIENCE_FLOOR = 0.3
+
+# Word overlap scores are capped below a perfect match
+WORD_OVERLAP_CAP = 95
+
+Years = Union[float, np.ndarray]
+
+
+def extract_experience(text: str, default: int = 0) -> int:
+    """Years of experience stated in the text, or default when none is stated"""
+    text_lower = text.lower()
+    if 'year' not in text_lower:
+        # Every pattern needs it, and a substring check is far cheaper than three scans
+        return default
+    for pattern in EXPERIENCE_PATTERNS:
+        match = pattern.search(text_lower)
+        if match:
+            return int(match.group(1))
+    return default
+
+
+def experience_match(years: Years, required_years: float) -> Years:
+    """min(years / required, 1), counting at least one required year"""
+    if isinstance(years, np.ndarray):
+        return np.minimum(years / max(required_years, 1), 1.0)
+    return min(years / max(required_years, 1), 1.0)
+
+
+def graded_experience_match(years: Years, required_years: float) -> Years:
+    """1 when nothing is required, otherwise years / required within [GRADED_EXPERIENCE_FLOOR, 1]"""
+    if isinstance(years, np.ndarray):
+        if required_years == 0:
+            return np.ones_like(years, dtype=np.float64)
+        ratio = years / required_years
+        return np.where(years >= required_years, np.minimum(ratio, 1.0), np.maximum(ratio, GRADED_EXPERIENCE_FLOOR))
+    if required_years == 0:
+        return 1.0
+    if years >= required_years:
+        return min(1.0, years / required_years)
+    return max(GRADED_EXPERIENCE_FLOOR, years / required_years)
+
+
+def word_overlap_score(text: str, other_text: str, cap: float = WORD_OVERLAP_CAP) -> float:
+    """Jaccard similarity of the lowercased word sets as a 0-100 score, capped at cap"""
+    words = set(text.lower().split())
+    other_words = set(other_text.lower().split())
+    union = len(words | other_words)
+    if union == 0:
+        return 0
+    return min(len(words & other_words) / union * 100, cap)
@@ -0,0 +1,275 @@
+"""Per-stage request latency metrics in the Prometheus text format.
+
+MetricsMiddleware times every request and, while it runs, collects the
+durations of the stages the handler marks with ``stage(name)`` and the input
+sizes it reports with ``count_input(name, amount)``. When the request ends
+they are folded into histograms and counters labelled by handler (the
+endpoint function's name), and the stage durations go out to the client in
+a ``Server-Timing`` header.
+
+Outside a request, or when the middleware is not installed, ``stage`` and
+``count_input`` do nothing, so instrumented code costs one context variable
+lookup when metrics are turned off.
+
+No client library is needed; ``ServiceMetrics.render()`` writes the
+exposition format for a /metrics endpoint.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Seconds; fine at the low end, where skill matching and scoring stages fall
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Labels = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, labels: Labels = ()):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels: Labels = ()) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: Labels = (), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket (non-cumulative, last is +Inf), sum]
+        self._series: Dict[Labels, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, labels: Labels = ()):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, labels: Labels = ()) -> int:
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._series.items())
+        for labels, (counts, total) in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(total)}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """A gauge read at scrape time; the callback returns a value or {labels: value}"""
+
+    def __init__(self, name: str, documentation: str, callback: Callable, labelnames: Labels = ()):
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+        self.labelnames = labelnames
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        values = self.callback()
+        if not isinstance(values, dict):
+            values = {(): values}
+        for labels, value in sorted(values.items()):
+            if value is None:
+                continue
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(float(value))}")
+        return lines
+
+
+class RequestMetrics:
+    """Stage durations and input sizes recorded during one request"""
+    __slots__ = ('stages', 'inputs')
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self.inputs: Dict[str, float] = {}
+
+
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar('request_metrics', default=None)
+
+
+class _Stage:
+    __slots__ = ('record', 'name', 'started')
+
+    def __init__(self, record: RequestMetrics, name: str):
+        self.record = record
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        stages = self.record.stages
+        # A stage entered more than once in a request (per candidate, say) adds up
+        stages[self.name] = stages.get(self.name, 0.0) + time.perf_counter() - self.started
+        return False
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+def stage(name: str):
+    """Context manager timing one stage of the current request"""
+    record = _current.get()
+    if record is None:
+        return _NULL_STAGE
+    return _Stage(record, name)
+
+
+def count_input(name: str, amount: float = 1):
+    """Add to an input size counter (resume characters, candidates) for the current request"""
+    record = _current.get()
+    if record is not None:
+        record.inputs[name] = record.inputs.get(name, 0) + amount
+
+
+def server_timing(stages: Dict[str, float], total: float) -> str:
+    entries = [f"{name};dur={1000 * seconds:.2f}" for name, seconds in stages.items()]
+    entries.append(f"total;dur={1000 * total:.2f}")
+    return ', '.join(entries)
+
+
+class ServiceMetrics:
+    """Request, stage and input metrics for one service, plus any scrape-time gauges.
+
+    inputs maps each input counter name used with count_input to its help text;
+    other names are ignored.
+    """
+
+    def __init__(self, namespace: str, inputs: Optional[Dict[str, str]] = None, buckets=DEFAULT_BUCKETS):
+        self.namespace = namespace
+        self.request_seconds = Histogram(
+            f"{namespace}_request_seconds", "Request latency by handler", ('handler',), buckets
+        )
+        self.requests = Counter(f"{namespace}_requests_total", "Requests by handler and status", ('handler', 'status'))
+        self.stage_seconds = Histogram(
+            f"{namespace}_stage_seconds", "Time spent in each stage of a request", ('handler', 'stage'), buckets
+        )
+        self.inputs = {
+            name: Counter(f"{namespace}_input_{name}_total", documentation, ('handler',))
+            for name, documentation in (inputs or {}).items()
+        }
+        self.gauges: List[Gauge] = []
+
+    def gauge(self, name: str, documentation: str, callback: Callable, labelnames: Labels = ()) -> Gauge:
+        gauge = Gauge(f"{self.namespace}_{name}", documentation, callback, labelnames)
+        self.gauges.append(gauge)
+        return gauge
+
+    def record(self, handler: str, status: int, elapsed: float, record: RequestMetrics):
+        labels = (handler,)
+        self.request_seconds.observe(elapsed, labels)
+        self.requests.inc(1, (handler, str(status)))
+        for name, seconds in record.stages.items():
+            self.stage_seconds.observe(seconds, (handler, name))
+        for name, amount in record.inputs.items():
+            counter = self.inputs.get(name)
+            if counter is not None:
+                counter.inc(amount, labels)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in [self.request_seconds, self.requests, self.stage_seconds, *self.inputs.values(), *self.gauges]:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+class MetricsMiddleware:
+    """ASGI middleware feeding ServiceMetrics and adding a Server-Timing header"""
+
+    def __init__(self, app, metrics: ServiceMetrics, server_timing: bool = True):
+        self.app = app
+        self.metrics = metrics
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        record = RequestMetrics()
+        token = _current.set(record)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                if self.server_timing:
+                    header = server_timing(record.stages, time.perf_counter() - started)
+                    message['headers'] = [*message.get('headers', []), (b'server-timing', header.encode('latin-1'))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            # The router records the matched endpoint in the shared scope
+            endpoint = scope.get('endpoint')
+            handler = getattr(endpoint, '__name__', 'unmatched')
+            self.metrics.record(handler, status, time.perf_counter() - started, record)
@@ -0,0 +1,125 @@
+"""Vectorized candidate scoring and ranking.
+
+Candidate skills are encoded as (candidate, required skill) index pairs, a
+sparse incidence matrix, so the skill, experience and education terms for a
+whole pool are computed as array operations. Scores are identical to the
+per-candidate formula:
+
+    skills (40) + experience (30) + education (20 or 10) + cultural fit (10)
+
+Ranking keeps the order of a stable descending sort, and only partitions the
+scores when a top-K slice is requested.
+"""
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .matching import experience_match
+
+SKILLS_WEIGHT = 40
+EXPERIENCE_WEIGHT = 30
+EDUCATION_MATCH_SCORE = 20
+EDUCATION_MISMATCH_SCORE = 10
+CULTURAL_FIT_SCORE = 10
+
+RANKING_CRITERIA = {
+    "skills_weight": 0.4,
+    "experience_weight": 0.3,
+    "education_weight": 0.2,
+    "cultural_fit_weight": 0.1
+}
+
+
+def count_required_skills(rows: np.ndarray, cols: np.ndarray, vocab_size: int, n_candidates: int) -> np.ndarray:
+    """Count distinct required skills per candidate from (candidate, skill) index pairs"""
+    if len(rows) == 0:
+        return np.zeros(n_candidates, dtype=np.int64)
+    pairs = np.unique(rows.astype(np.int64) * vocab_size + cols.astype(np.int64))
+    return np.bincount(pairs // vocab_size, minlength=n_candidates)
+
+
+def skill_pairs(candidate_skills: Iterable[List], vocab: Dict) -> tuple:
+    """Encode candidate skill lists as (candidate, required skill) index pairs"""
+    rows: List[int] = []
+    cols: List[int] = []
+    for row, skills in enumerate(candidate_skills):
+        for skill in skills:
+            col = vocab.get(skill)
+            if col is not None:
+                rows.append(row)
+                cols.append(col)
+    return np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64)
+
+
+def score_columns(
+    skill_counts: np.ndarray,
+    experience: np.ndarray,
+    education_match: np.ndarray,
+    required_skill_count: int,
+    min_experience: float
+) -> np.ndarray:
+    """Compute candidate scores from per-candidate columns"""
+    skill_score = (skill_counts / max(required_skill_count, 1)) * SKILLS_WEIGHT
+    exp_score = experience_match(experience, min_experience) * EXPERIENCE_WEIGHT
+    education_score = np.where(education_match, EDUCATION_MATCH_SCORE, EDUCATION_MISMATCH_SCORE)
+    # Same summation order as the scalar formula so results match bit for bit
+    return 0.0 + skill_score + exp_score + education_score + CULTURAL_FIT_SCORE
+
+
+def score_candidates(candidates: List[Dict], job_requirements: Dict) -> np.ndarray:
+    """Score a pool of candidate dicts against job requirements"""
+    required_skills = job_requirements.get("required_skills", [])
+    vocab = {skill: index for index, skill in enumerate(dict.fromkeys(required_skills))}
+    education_level = job_requirements.get("education_level")
+
+    rows, cols = skill_pairs((candidate.get("skills", []) for candidate in candidates), vocab)
+    skill_counts = count_required_skills(rows, cols, len(vocab), len(candidates))
+    experience = np.array([candidate.get("experience_years", 0) for candidate in candidates], dtype=np.float64)
+    education_match = np.array(
+        [candidate.get("education_level") == education_level for candidate in candidates], dtype=bool
+    )
+    return score_columns(
+        skill_counts,
+        experience,
+        education_match,
+        len(required_skills),
+        job_requirements.get("min_experience", 0)
+    )
+
+
+def rank_indices(scores: np.ndarray, top_k: Optional[int] = None) -> np.ndarray:
+    """Indices of the best scores, highest first, ties in original order.
+
+    Matches a stable sort on score with reverse=True. When top_k is smaller than
+    the pool only the top_k entries are selected (argpartition) and sorted.
+    """
+    n = len(scores)
+    if top_k is None or top_k >= n:
+        return np.argsort(-scores, kind='stable')
+    if top_k <= 0:
+        return np.empty(0, dtype=np.int64)
+
+    negated = -scores
+    threshold = np.partition(negated, top_k - 1)[top_k - 1]
+    # Everything strictly better than the k-th score, then ties by original position
+    better = np.flatnonzero(negated < threshold)
+    tied = np.flatnonzero(negated == threshold)[:top_k - len(better)]
+    selected = np.concatenate([better, tied])
+    return selected[np.lexsort((selected, negated[selected]))]
+
+
+def page_indices(scores: np.ndarray, top_k: Optional[int] = None, offset: int = 0, limit: Optional[int] = None) -> np.ndarray:
+    """Ranked indices restricted to top_k, then sliced by offset/limit"""
+    window = len(scores) if top_k is None else min(top_k, len(scores))
+    if limit is not None:
+        window = min(window, offset + limit)
+    return rank_indices(scores, window)[offset:]
+
+
+def rank_candidates(candidates: List[Dict], job_requirements: Dict, top_k: Optional[int] = None) -> List[Dict]:
+    """Candidate dicts with their ai_score, best first"""
+    scores = score_candidates(candidates, job_requirements)
+    return [
+        {**candidates[index], "ai_score": float(scores[index])}
+        for index in rank_indices(scores, top_k)
+    ]
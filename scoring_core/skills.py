@@ -0,0 +1,126 @@
+"""Single-pass skill matching over a loadable skill taxonomy.
+
+Every alias in the taxonomy is folded into one regular expression, built
+from a character trie so shared prefixes are only tried once, and guarded by
+word boundaries. One scan over a text finds every skill and alias along with
+its offsets, no matter how many skills the taxonomy holds.
+
+A taxonomy can also name skill sets: the skills one service reports, in the
+order it reports them, and whether aliases count or only the skill's name.
+Each service loads its own set so capped skill lists stay as they were.
+"""
+import json
+import os
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'skills.json')
+
+
+class Skill(NamedTuple):
+    id: str
+    name: str
+    aliases: List[str]
+
+
+class SkillMatch(NamedTuple):
+    skill_id: str
+    name: str
+    alias: str
+    start: int
+    end: int
+
+
+def load_taxonomy(path: str = DEFAULT_TAXONOMY_PATH, skill_set: Optional[str] = None) -> List[Skill]:
+    """Load skills from a JSON taxonomy: {"skills": [{"id", "name", "aliases"}], "sets": {...}}
+
+    With skill_set, only that set's skills are returned, in its order, and
+    when the set has "aliases": false each skill matches on its name alone.
+    A taxonomy without the named set yields every skill.
+    """
+    with open(path, encoding='utf-8') as taxonomy_file:
+        data = json.load(taxonomy_file)
+    skills = []
+    for entry in data['skills']:
+        skill_id = entry['id']
+        name = entry.get('name', skill_id)
+        aliases = entry.get('aliases') or [name]
+        skills.append(Skill(skill_id, name, list(aliases)))
+
+    selected = data.get('sets', {}).get(skill_set) if skill_set else None
+    if selected is None:
+        return skills
+    by_id = {skill.id: skill for skill in skills}
+    skills = [by_id[skill_id] for skill_id in selected['skills']]
+    if not selected.get('aliases', True):
+        skills = [Skill(skill.id, skill.name, [skill.name]) for skill in skills]
+    return skills
+
+
+def _trie_pattern(node: Dict) -> str:
+    """Turn a character trie into a regex where shared prefixes appear once"""
+    if '' in node and len(node) == 1:
+        return ''
+    optional = '' in node
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char]
+    if len(branches) == 1 and not optional:
+        return branches[0]
+    pattern = '(?:' + '|'.join(branches) + ')'
+    return pattern + '?' if optional else pattern
+
+
+def build_pattern(aliases: Iterable[str]) -> str:
+    trie: Dict = {}
+    for alias in aliases:
+        node = trie
+        for char in alias:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    return _trie_pattern(trie)
+
+
+class SkillMatcher:
+    """Finds every taxonomy skill in a text in one regex scan"""
+
+    def __init__(self, skills: List[Skill]):
+        self.skills = skills
+        self._alias_to_skill: Dict[str, int] = {}
+        for index, skill in enumerate(skills):
+            for alias in skill.aliases:
+                # First skill to claim an alias keeps it
+                self._alias_to_skill.setdefault(alias.lower(), index)
+        self.pattern = re.compile(
+            r'(?<!\w)(' + build_pattern(self._alias_to_skill) + r')(?!\w)',
+            re.IGNORECASE
+        )
+
+    @classmethod
+    def from_file(cls, path: str, skill_set: Optional[str] = None) -> 'SkillMatcher':
+        return cls(load_taxonomy(path, skill_set))
+
+    def find(self, text: str) -> List[SkillMatch]:
+        """Return every skill occurrence in the text with its character offsets"""
+        matches = []
+        for match in self.pattern.finditer(text):
+            alias = match.group(1).lower()
+            skill = self.skills[self._alias_to_skill[alias]]
+            matches.append(SkillMatch(skill.id, skill.name, alias, match.start(), match.end()))
+        return matches
+
+    def _found_indexes(self, text: str) -> List[int]:
+        """Indexes of skills present in the text, in taxonomy order"""
+        found = {self._alias_to_skill[match.group(1).lower()] for match in self.pattern.finditer(text)}
+        return sorted(found)
+
+    def extract_ids(self, text: str) -> List[str]:
+        return [self.skills[index].id for index in self._found_indexes(text)]
+
+    def extract_names(self, text: str) -> List[str]:
+        return [self.skills[index].name for index in self._found_indexes(text)]
+
+
+@lru_cache(maxsize=None)
+def get_skill_matcher(path: Optional[str] = None, skill_set: Optional[str] = None) -> SkillMatcher:
+    """Build the matcher once per taxonomy file and set; SKILL_TAXONOMY_PATH overrides the bundled one"""
+    return SkillMatcher.from_file(path or os.getenv('SKILL_TAXONOMY_PATH') or DEFAULT_TAXONOMY_PATH, skill_set)
@@ -0,0 +1,215 @@
+"""Corpus-fitted TF-IDF model for text similarity.
+
+Fitting a TfidfVectorizer on just the two documents being compared is slow
+and gives meaningless IDF weights. Instead the vectorizer is fitted once on a
+corpus of job descriptions, resumes and the skill taxonomy, persisted with
+joblib and loaded once per process; requests only transform. Job vectors are
+cached, since the same job is compared against many candidates.
+
+Single texts are weighted directly from the fitted vocabulary and IDF table
+instead of through ``TfidfVectorizer.transform``, whose per-call overhead
+dominates for short texts; the weights are the same.
+
+Refit the model with:
+
+    python -m scoring_core.tfidf --corpus jobs.jsonl resumes.jsonl --output tfidf.joblib
+
+Corpus files are JSON lines, each a string or an object whose text fields
+(text, title, description, requirements, resumeText, skills) are joined, or
+plain .txt files with one document per line.
+"""
+import argparse
+import hashlib
+import json
+import logging
+import math
+import os
+import threading
+from collections import Counter, OrderedDict
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .skills import DEFAULT_TAXONOMY_PATH, load_taxonomy
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_FIELDS = ('text', 'title', 'description', 'requirements', 'resumeText', 'skills')
+
+
+class TfidfModel:
+    """A fitted TfidfVectorizer used through transform only, with a job vector cache"""
+
+    def __init__(self, vectorizer, job_cache_size: int = 1024):
+        self.vectorizer = vectorizer
+        self.job_cache_size = job_cache_size
+        self._analyzer = vectorizer.build_analyzer()
+        self._vocabulary = vectorizer.vocabulary_
+        self._idf = vectorizer.idf_.tolist()
+        self._sublinear_tf = vectorizer.sublinear_tf
+        self._job_vectors: 'OrderedDict[str, Dict[int, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def fit(cls, documents: Iterable[str], stop_words: Optional[str] = 'english', **params) -> 'TfidfModel':
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        vectorizer = TfidfVectorizer(stop_words=stop_words, **params)
+        vectorizer.fit(documents)
+        return cls(vectorizer)
+
+    @classmethod
+    def load(cls, path: str) -> 'TfidfModel':
+        import joblib
+
+        return cls(joblib.load(path))
+
+    def save(self, path: str):
+        import joblib
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        joblib.dump(self.vectorizer, path + '.tmp')
+        os.replace(path + '.tmp', path)
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self.vectorizer.vocabulary_)
+
+    def transform(self, texts: List[str]):
+        """L2-normalized sparse TF-IDF rows"""
+        return self.vectorizer.transform(texts)
+
+    def weights(self, text: str) -> Dict[int, float]:
+        """L2-normalized TF-IDF weights of one text as {term index: weight}"""
+        counts = Counter(term for term in self._analyzer(text) if term in self._vocabulary)
+        weights = {}
+        for term, count in counts.items():
+            index = self._vocabulary[term]
+            tf = 1.0 + math.log(count) if self._sublinear_tf else count
+            weights[index] = tf * self._idf[index]
+        norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+        if norm:
+            for index in weights:
+                weights[index] /= norm
+        return weights
+
+    def job_vector(self, text: str) -> Dict[int, float]:
+        """Weights for a job text, cached by content"""
+        key = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        with self._lock:
+            vector = self._job_vectors.get(key)
+            if vector is not None:
+                self._job_vectors.move_to_end(key)
+                self.hits += 1
+                return vector
+            self.misses += 1
+        vector = self.weights(text)
+        with self._lock:
+            self._job_vectors[key] = vector
+            while len(self._job_vectors) > self.job_cache_size:
+                self._job_vectors.popitem(last=False)
+        return vector
+
+    def similarity(self, job_text: str, other_text: str) -> float:
+        """Cosine similarity between a (cached) job text and another text"""
+        return self.similarity_to(self.job_vector(job_text), other_text)
+
+    def similarity_to(self, job_vector: Dict[int, float], other_text: str) -> float:
+        """Cosine similarity between precomputed job weights and another text"""
+        other_vector = self.weights(other_text)
+        if len(other_vector) > len(job_vector):
+            job_vector, other_vector = other_vector, job_vector
+        # Both are L2-normalized, so the dot product is the cosine
+        return sum(weight * job_vector.get(index, 0.0) for index, weight in other_vector.items())
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "vocabularySize": self.vocabulary_size,
+                "jobCacheEntries": len(self._job_vectors),
+                "jobCacheHits": self.hits,
+                "jobCacheMisses": self.misses,
+                "jobCacheHitRate": self.hits / total if total else 0.0
+            }
+
+
+@lru_cache(maxsize=None)
+def load_tfidf_model(path: str) -> Optional[TfidfModel]:
+    try:
+        model = TfidfModel.load(path)
+    except (OSError, ValueError, EOFError) as e:
+        logger.warning(f"TF-IDF model not loaded from {path}: {e}")
+        return None
+    logger.info(f"Loaded TF-IDF model from {path} with {model.vocabulary_size} terms")
+    return model
+
+
+def get_tfidf_model(path: Optional[str] = None) -> Optional[TfidfModel]:
+    """The fitted model at TFIDF_MODEL_PATH, or None when no model has been fitted"""
+    path = path or os.getenv('TFIDF_MODEL_PATH')
+    if not path or not os.path.exists(path):
+        return None
+    return load_tfidf_model(path)
+
+
+def pair_similarity(text: str, other_text: str, stop_words: Optional[str] = None) -> float:
+    """Cosine similarity from a vectorizer fitted on just the two texts; the fallback without a fitted model"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    tfidf_matrix = TfidfVectorizer(stop_words=stop_words).fit_transform([text, other_text])
+    return float(cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0])
+
+
+def read_corpus(paths: List[str]) -> Iterator[str]:
+    for path in paths:
+        with open(path, encoding='utf-8') as corpus_file:
+            for line in corpus_file:
+                line = line.strip()
+                if not line:
+                    continue
+                if not path.endswith(('.jsonl', '.json')):
+                    yield line
+                    continue
+                record = json.loads(line)
+                if isinstance(record, str):
+                    yield record
+                    continue
+                parts = []
+                for field in DOCUMENT_FIELDS:
+                    value = record.get(field)
+                    if isinstance(value, list):
+                        parts.append(' '.join(str(item) for item in value))
+                    elif value:
+                        parts.append(str(value))
+                if parts:
+                    yield ' '.join(parts)
+
+
+def taxonomy_documents(path: str = DEFAULT_TAXONOMY_PATH) -> List[str]:
+    """One document per skill so every taxonomy term is in the vocabulary"""
+    return [' '.join([skill.name] + skill.aliases) for skill in load_taxonomy(path)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fit and save the TF-IDF model')
+    parser.add_argument('--corpus', nargs='+', required=True, help='JSON lines or text files')
+    parser.add_argument('--output', default=os.getenv('TFIDF_MODEL_PATH', 'tfidf.joblib'))
+    parser.add_argument('--min-df', type=int, default=1)
+    parser.add_argument('--max-features', type=int, default=None)
+    parser.add_argument('--no-taxonomy', action='store_true', help='do not add skill taxonomy terms')
+    args = parser.parse_args()
+
+    documents = list(read_corpus(args.corpus))
+    if not args.no_taxonomy:
+        documents += taxonomy_documents(os.getenv('SKILL_TAXONOMY_PATH') or DEFAULT_TAXONOMY_PATH)
+    model = TfidfModel.fit(documents, min_df=args.min_df, max_features=args.max_features)
+    model.save(args.output)
+    print(f"Fitted on {len(documents)} documents, {model.vocabulary_size} terms -> {args.output}")
+
+
+if __name__ == '__main__':
+    main()
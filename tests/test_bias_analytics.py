@@ -0,0 +1,51 @@
+"""BiasAnalyticsEngine applies an ingested batch all at once, or not at all."""
+import json
+
+import pytest
+
+from bias_analytics import BiasAnalyticsEngine
+
+NOW = 20000 * 86400.0
+
+
+def snapshot(bias, *windows):
+    # Indicators hold NaN rates, which never compare equal, so compare their JSON
+    return json.dumps([bias.stats()] + [bias.indicators(window) for window in windows], sort_keys=True)
+
+
+def engine():
+    return BiasAnalyticsEngine(windows=[30], clock=lambda: NOW)
+
+
+def test_invalid_event_leaves_counts_unchanged():
+    bias = engine()
+    bias.ingest_many([{'gender': 'F', 'hired': 1}])
+    before = snapshot(bias, None, 30)
+    with pytest.raises(ValueError):
+        bias.ingest_many([{'gender': 'M', 'hired': 0}, {'gender': 'M', 'hired': 'maybe'}])
+    with pytest.raises(ValueError):
+        bias.ingest_many([{'gender': 'M', 'hired': 0, 'age': 41}, {'gender': 'M', 'timestamp': 'yesterday'}])
+    assert snapshot(bias, None, 30) == before
+
+
+def test_batch_matches_single_events():
+    events = [
+        {'gender': 'F', 'age': 28, 'hired': 1, 'timestamp': NOW - 3 * 86400},
+        {'gender': 'M', 'age': 45, 'hired': 0, 'timestamp': NOW - 60 * 86400},
+        {'gender': 'M', 'age': 35, 'hired': 1},
+        {'gender': 'F', 'age': 52},
+    ]
+    batched, single = engine(), engine()
+    assert batched.ingest_many(events) == len(events)
+    for event in events:
+        single.ingest(event)
+    assert snapshot(batched, None, 30) == snapshot(single, None, 30)
+
+
+def test_saved_state_round_trips(tmp_path):
+    bias = engine()
+    bias.ingest_many([{'gender': 'F', 'hired': 1}, {'gender': 'M', 'hired': 0, 'timestamp': NOW}])
+    bias.save(str(tmp_path / 'bias.json'))
+    restored = engine()
+    assert restored.load(str(tmp_path / 'bias.json'))
+    assert snapshot(restored, None, 30) == snapshot(bias, None, 30)
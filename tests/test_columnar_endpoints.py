@@ -0,0 +1,111 @@
+"""JSON, Arrow IPC and Parquet bodies give the same ranking and bias results through the ai-ml-service app."""
+import asyncio
+import json
+import random
+
+import httpx
+import pytest
+
+import columnar
+import main
+from bias_analytics import BiasAnalyticsEngine
+
+# pyarrow is optional for the service; without it columnar bodies get 415
+pa = pytest.importorskip('pyarrow')
+
+CONTENT_TYPES = [columnar.ARROW_STREAM, columnar.ARROW_FILE, columnar.PARQUET, 'application/x-parquet']
+SKILLS = ["python", "sql", "aws", "docker", "go"]
+NOW = 1_700_000_000.0
+REQUIREMENTS = {"required_skills": ["python", "aws", "sql"], "min_experience": 3, "education_level": "master"}
+
+
+def post(path, body, content_type='application/json', accept=None):
+    headers = {"content-type": content_type}
+    if accept:
+        headers["accept"] = accept
+
+    async def run():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post(path, content=body, headers=headers)
+
+    return asyncio.run(run())
+
+
+def get(path):
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://test") as client:
+            return await client.get(path)
+
+    return asyncio.run(run())
+
+
+def encode(rows, content_type, metadata=None):
+    table = pa.Table.from_pylist(rows)
+    if metadata:
+        table = table.replace_schema_metadata({key: json.dumps(value) for key, value in metadata.items()})
+    return columnar.write_table(table, columnar.PARQUET if content_type in columnar.PARQUET_TYPES else content_type)
+
+
+@pytest.fixture(scope='module')
+def candidates():
+    rng = random.Random(17)
+    return [{
+        "id": index,
+        "skills": rng.sample(SKILLS, rng.randint(0, 3)),
+        "experience_years": rng.choice([0, 1, 3, 5, 8]),
+        "education_level": rng.choice(["bachelor", "master", None])
+    } for index in range(300)]
+
+
+@pytest.fixture(scope='module')
+def events():
+    rng = random.Random(18)
+    return [{
+        "gender": rng.choice(["female", "male", "nonbinary", None]),
+        "age": rng.choice([22, 29, 35, 41, 58, None]),
+        "hired": rng.random() < 0.3,
+        "timestamp": NOW - rng.randint(0, 200) * 86400
+    } for _ in range(500)]
+
+
+@pytest.mark.parametrize("content_type", CONTENT_TYPES)
+@pytest.mark.parametrize("paging", [{}, {"top_k": 50}, {"top_k": 100, "offset": 20, "limit": 30}])
+def test_ranking_matches_json(candidates, content_type, paging):
+    expected = post('/rank-candidates', json.dumps({"candidates": candidates, "job_requirements": REQUIREMENTS, **paging}))
+    assert expected.status_code == 200
+    body = encode(candidates, content_type, {"job_requirements": REQUIREMENTS, **paging})
+    response = post('/rank-candidates', body, content_type)
+    assert response.status_code == 200
+    assert response.json() == expected.json()
+
+
+@pytest.mark.parametrize("content_type", [columnar.ARROW_STREAM, columnar.ARROW_FILE, columnar.PARQUET])
+def test_columnar_ranking_response_matches_json(candidates, content_type):
+    expected = post('/rank-candidates', json.dumps({"candidates": candidates, "job_requirements": REQUIREMENTS, "top_k": 40}))
+    body = encode(candidates, columnar.ARROW_STREAM, {"job_requirements": REQUIREMENTS, "top_k": 40})
+    response = post('/rank-candidates', body, columnar.ARROW_STREAM, accept=content_type)
+    assert response.headers["content-type"] == content_type
+    table = columnar.read_table(response.content, content_type)
+    assert table.to_pylist() == expected.json()["ranked_candidates"]
+    assert columnar.table_metadata(table, "total_candidates") == len(candidates)
+
+
+@pytest.mark.parametrize("content_type", CONTENT_TYPES)
+def test_bias_analysis_matches_json(events, content_type):
+    expected = post('/analyze-bias', json.dumps({"hiring_data": events}))
+    assert expected.status_code == 200
+    response = post('/analyze-bias', encode(events, content_type), content_type)
+    assert response.status_code == 200
+    assert response.json() == expected.json()
+
+
+@pytest.mark.parametrize("content_type", CONTENT_TYPES)
+def test_bias_events_match_json(events, content_type, monkeypatch):
+    def ingest(body, body_type):
+        monkeypatch.setattr(main, 'bias_engine', BiasAnalyticsEngine(windows=[30, 90], clock=lambda: NOW))
+        assert post('/bias/events', body, body_type).json()["ingested"] == len(events)
+        return [get(f'/bias/analysis{query}').json() for query in ('', '?window_days=30', '?window_days=90')]
+
+    expected = ingest(json.dumps({"events": events}), 'application/json')
+    assert ingest(encode(events, content_type), content_type) == expected
@@ -0,0 +1,105 @@
+"""Disk tier of the embedding cache across restarts, batched writes and interrupted writes."""
+import numpy as np
+import pytest
+
+import embedding_cache
+from embedding_cache import DiskEmbeddingStore, EmbeddingCache
+
+
+def open_store(directory, capacity=4):
+    return DiskEmbeddingStore(str(directory), dim=8, capacity=capacity, model_name='test')
+
+
+def vector(value):
+    return np.full(8, value, dtype=np.float32)
+
+
+def test_reopened_store_serves_written_vectors(tmp_path):
+    store = open_store(tmp_path)
+    for index in range(6):
+        store.put(f"k{index}", vector(index))
+    store.flush()
+
+    reopened = open_store(tmp_path)
+    # Capacity 4: k0 and k1 were overwritten by k4 and k5
+    assert reopened.get("k0") is None and reopened.get("k1") is None
+    for index in range(2, 6):
+        np.testing.assert_array_equal(reopened.get(f"k{index}"), vector(index))
+    assert reopened.next_row == store.next_row
+
+
+def test_row_written_before_its_index_entry(tmp_path, monkeypatch):
+    store = open_store(tmp_path)
+    order = []
+    monkeypatch.setattr(store, '_flush_rows', lambda start, stop: order.append(('rows', start, stop)))
+    original_append = store._append_index
+    monkeypatch.setattr(store, '_append_index', lambda key, row: (
+        order.append(('index', key)), original_append(key, row)
+    ))
+    store.put("k0", vector(0))
+    assert order == [('rows', 0, 1), ('index', 'k0')]
+
+
+def test_crash_while_overwriting_a_row_forgets_its_old_key(tmp_path, monkeypatch):
+    store = open_store(tmp_path, capacity=2)
+    store.put("k0", vector(0))
+    store.put("k1", vector(1))
+
+    def crash(start, stop):
+        raise RuntimeError("crashed before the row reached disk")
+
+    monkeypatch.setattr(store, '_flush_rows', crash)
+    with pytest.raises(RuntimeError):
+        store.put("k2", vector(2))
+
+    reopened = open_store(tmp_path, capacity=2)
+    # Row 0 may hold k2's vector now; k0 must not be served from it
+    assert reopened.get("k0") is None
+    assert reopened.get("k2") is None
+    np.testing.assert_array_equal(reopened.get("k1"), vector(1))
+    assert reopened.next_row == 0
+
+
+def test_compaction_keeps_live_entries(tmp_path):
+    store = open_store(tmp_path, capacity=3)
+    for index in range(10):
+        store.put(f"k{index}", vector(index))
+
+    reopened = open_store(tmp_path, capacity=3)
+    assert sorted(reopened.index) == ["k7", "k8", "k9"]
+    assert reopened.next_row == store.next_row
+
+
+def test_batch_syncs_once_and_wraps_around_the_ring(tmp_path, monkeypatch):
+    store = open_store(tmp_path, capacity=4)
+    store.put_many(["k0", "k1", "k2"], [vector(0), vector(1), vector(2)])
+    flushed = []
+    fsyncs = []
+    original_flush = store._flush_rows
+    monkeypatch.setattr(store, '_flush_rows', lambda start, stop: (
+        flushed.append((start, stop)), original_flush(start, stop)
+    ))
+    monkeypatch.setattr(embedding_cache.os, 'fsync', lambda fd: fsyncs.append(fd))
+
+    # Rows 3, 0 and 1: two reused rows, one tombstone sync and one flush per contiguous run
+    store.put_many(["k3", "k4", "k2", "k5", "k4"], [vector(3), vector(4), vector(9), vector(5), vector(9)])
+    assert len(fsyncs) == 1
+    assert flushed == [(3, 4), (0, 2)]
+    store.flush()
+
+    reopened = open_store(tmp_path, capacity=4)
+    assert sorted(reopened.index) == ["k2", "k3", "k4", "k5"]
+    np.testing.assert_array_equal(reopened.get("k4"), vector(4))
+    np.testing.assert_array_equal(reopened.get("k2"), vector(2))
+    assert reopened.next_row == store.next_row == 2
+
+
+def test_batch_larger_than_the_ring_keeps_its_last_keys(tmp_path):
+    cache = EmbeddingCache('test', max_bytes=1 << 20, directory=str(tmp_path), disk_capacity=3)
+    keys = [f"k{index}" for index in range(5)]
+    cache.put_many(keys, [vector(index) for index in range(5)])
+    cache.flush()
+    reopened = EmbeddingCache('test', max_bytes=1 << 20, directory=str(tmp_path), disk_capacity=3)
+    hits = reopened.get_many(keys)
+    assert [hit is not None for hit in hits] == [False, False, True, True, True]
+    np.testing.assert_array_equal(hits[4], vector(4))
@@ -0,0 +1,92 @@
+"""EncodeBatcher hands every caller its own rows and caps the batches in flight."""
+import asyncio
+import random
+
+import numpy as np
+import pytest
+
+from encode_batcher import EncodeBatcher
+
+
+class FakeEncoder:
+    """Encodes text "n" as the row [n, n]; tracks how many calls overlap"""
+
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.running = 0
+        self.peak = 0
+        self.calls = []
+
+    async def __call__(self, texts):
+        self.calls.append(len(texts))
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.running -= 1
+        return np.array([[float(text)] * 2 for text in texts], dtype=np.float32)
+
+
+def test_concurrent_callers_get_their_own_rows_in_order():
+    rng = random.Random(5)
+    requests = []
+    next_text = 0
+    for _ in range(60):
+        size = rng.choice([1, 1, 2, 3, 7, 20, 45])
+        requests.append([str(next_text + offset) for offset in range(size)])
+        next_text += size
+    encoder = FakeEncoder()
+    batcher = EncodeBatcher(encoder, max_batch_size=16, max_wait_ms=2, max_in_flight=3)
+
+    async def caller(texts):
+        await asyncio.sleep(rng.random() * 0.02)
+        return await batcher.encode(texts)
+
+    async def run():
+        results = await asyncio.gather(*(caller(texts) for texts in requests))
+        stats = batcher.stats()
+        await batcher.close()
+        return results, stats
+
+    results, stats = asyncio.run(run())
+    for texts, rows in zip(requests, results):
+        expected = np.array([[float(text)] * 2 for text in texts], dtype=np.float32)
+        np.testing.assert_array_equal(rows, expected)
+    assert len(encoder.calls) < len(requests)
+    assert sum(encoder.calls) == next_text
+    assert 1 < encoder.peak <= 3
+    assert stats["inFlight"] == 0
+
+
+def test_failed_batch_fails_only_its_callers():
+    async def encode(texts):
+        if "bad" in texts:
+            raise ValueError("encode failed")
+        return np.ones((len(texts), 2), dtype=np.float32)
+
+    batcher = EncodeBatcher(encode, max_batch_size=2, max_wait_ms=50)
+
+    async def run():
+        results = await asyncio.gather(
+            batcher.encode(["bad", "a"]), batcher.encode(["b"]), return_exceptions=True
+        )
+        await batcher.close()
+        return results
+
+    failed, ok = asyncio.run(run())
+    assert isinstance(failed, ValueError)
+    assert ok.shape == (1, 2)
+
+
+def test_close_cancels_callers_of_running_batches():
+    batcher = EncodeBatcher(FakeEncoder(delay=10), max_wait_ms=1)
+
+    async def run():
+        call = asyncio.ensure_future(batcher.encode(["1"]))
+        await asyncio.sleep(0.05)
+        await batcher.close()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+
+    asyncio.run(run())
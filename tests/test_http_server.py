@@ -0,0 +1,177 @@
+"""AIHTTPServer reuses keep-alive connections and drains gracefully, threaded in-process and pre-forked."""
+import http.client
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+
+import pytest
+
+from simple_ai_service import AIHTTPServer, AIRequestHandler
+
+AI_ML_SERVICE = os.path.join(os.path.dirname(__file__), '..', 'ai-ml-service')
+
+
+class SlowHandler(AIRequestHandler):
+    """Adds GET /slow, which holds its request until the test releases it"""
+    release = threading.Event()
+    started = threading.Event()
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        type(self).connections += 1
+
+    def do_GET(self):
+        if self.path == '/slow':
+            type(self).started.set()
+            type(self).release.wait(10)
+            self.send_json(200, {"slow": True})
+        else:
+            super().do_GET()
+
+
+@pytest.fixture
+def threaded_server():
+    SlowHandler.release = threading.Event()
+    SlowHandler.started = threading.Event()
+    SlowHandler.connections = 0
+    server = AIHTTPServer(('127.0.0.1', 0), SlowHandler, threads=4)
+    serving = threading.Thread(target=server.serve_forever, daemon=True)
+    serving.start()
+    yield server
+    SlowHandler.release.set()
+    if serving.is_alive():
+        server.shutdown()
+        server.drain()
+
+
+def connect(port):
+    return http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+
+
+def get(connection, path='/health'):
+    connection.request('GET', path)
+    response = connection.getresponse()
+    return response.status, response.getheader('Connection'), response.read()
+
+
+def closed_by_server(connection):
+    """True once the server has closed the connection's socket"""
+    connection.sock.settimeout(10)
+    try:
+        return connection.sock.recv(1) == b''
+    except ConnectionResetError:
+        return True
+
+
+def test_threaded_requests_reuse_one_connection(threaded_server):
+    connection = connect(threaded_server.server_address[1])
+    results = [get(connection) for _ in range(5)]
+    sock = connection.sock
+    results.append(get(connection, '/missing'))
+
+    assert [status for status, _, _ in results] == [200] * 5 + [404]
+    assert all(header is None for _, header, _ in results)
+    assert connection.sock is sock and SlowHandler.connections == 1
+    connection.close()
+
+
+def test_threaded_drain_finishes_in_flight_requests_and_closes_idle_connections(threaded_server):
+    port = threaded_server.server_address[1]
+    idle = connect(port)
+    assert get(idle)[0] == 200
+    busy = connect(port)
+    busy.request('GET', '/slow')
+    assert SlowHandler.started.wait(5)
+
+    def stop():
+        threaded_server.shutdown()
+        threaded_server.drain()
+
+    stopping = threading.Thread(target=stop)
+    stopping.start()
+    # The idle connection is closed without waiting for its keep-alive timeout
+    assert closed_by_server(idle)
+    time.sleep(0.1)
+    assert stopping.is_alive()
+
+    SlowHandler.release.set()
+    response = busy.getresponse()
+    assert (response.status, response.getheader('Connection')) == (200, 'close')
+    assert json.loads(response.read()) == {"slow": True}
+    stopping.join(5)
+    assert not stopping.is_alive()
+    with pytest.raises(OSError):
+        connect(port).request('GET', '/health')
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+PREFORK_SERVER = textwrap.dedent('''
+    import sys
+    import time
+
+    from simple_ai_service import AIHTTPServer, AIRequestHandler, run_prefork
+
+    class SlowHandler(AIRequestHandler):
+        def do_GET(self):
+            if self.path == '/slow':
+                time.sleep(1.0)
+                self.send_json(200, {"slow": True})
+            else:
+                super().do_GET()
+
+    run_prefork(AIHTTPServer(('127.0.0.1', int(sys.argv[1])), SlowHandler, 4), 2)
+''')
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason="pre-forking needs os.fork")
+def test_prefork_keep_alive_and_graceful_drain(tmp_path):
+    script = tmp_path / 'prefork_server.py'
+    script.write_text(PREFORK_SERVER)
+    port = free_port()
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join([AI_ML_SERVICE, os.path.join(AI_ML_SERVICE, '..')])}
+    process = subprocess.Popen([sys.executable, str(script), str(port)], env=env)
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                connection = connect(port)
+                get(connection)
+                break
+            except OSError:
+                connection.close()
+                if time.monotonic() > deadline or process.poll() is not None:
+                    raise
+                time.sleep(0.05)
+
+        sock = connection.sock
+        results = [get(connection) for _ in range(5)]
+        assert [status for status, _, _ in results] == [200] * 5
+        assert all(header is None for _, header, _ in results) and connection.sock is sock
+
+        busy = connect(port)
+        busy.request('GET', '/slow')
+        time.sleep(0.3)
+        process.send_signal(signal.SIGTERM)
+
+        # The idle connection is closed by its worker; the slow request still completes
+        assert closed_by_server(connection)
+        response = busy.getresponse()
+        assert (response.status, response.getheader('Connection')) == (200, 'close')
+        assert json.loads(response.read()) == {"slow": True}
+        assert process.wait(10) == 0
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
@@ -0,0 +1,39 @@
+"""InferencePool in process mode runs pool_tasks functions without importing the service's main."""
+import asyncio
+import io
+import sys
+
+import docx
+
+import pool_tasks
+from inference_pool import InferencePool
+
+
+def loaded_modules(names):
+    return {name: name in sys.modules for name in names}
+
+
+def docx_bytes(*paragraphs):
+    document = docx.Document()
+    for paragraph in paragraphs:
+        document.add_paragraph(paragraph)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def test_process_pool_parses_documents_without_importing_main():
+    pool = InferencePool(mode='process', workers=1, max_queue=4)
+
+    async def run():
+        text = await pool.run(pool_tasks.parse_docx_text, docx_bytes("Python developer", "Docker and AWS"))
+        modules = await pool.run(loaded_modules, ['main', 'pool_tasks', 'fastapi', 'torch'])
+        return text, modules
+
+    try:
+        text, modules = asyncio.run(run())
+    finally:
+        pool.shutdown()
+    assert text == "Python developer\nDocker and AWS"
+    assert modules == {'main': False, 'pool_tasks': True, 'fastapi': False, 'torch': False}
+    assert pool.stats()["completed"] == 2
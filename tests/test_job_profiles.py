@@ -0,0 +1,42 @@
+"""JobProfileStore serves cached profiles only while their file is unchanged, so replicas can share it."""
+import json
+
+import numpy as np
+
+from job_profiles import JobProfile, JobProfileStore
+
+
+def profile(job_id, weights=None):
+    job = {'title': 'Engineer', 'description': 'Python services', 'skills': ['python']}
+    return JobProfile(job_id, job, 'Engineer Python services', np.ones(4, dtype=np.float32), ['python'], 3, weights, 'model')
+
+
+def test_profile_recompiled_by_another_replica_is_reloaded(tmp_path):
+    first, second = JobProfileStore(str(tmp_path)), JobProfileStore(str(tmp_path))
+    first.put(profile('job-1'))
+    assert second.get('job-1').weights is None
+    first.put(profile('job-1', {'semantic': 1.0, 'skills': 0.0, 'experience': 0.0}))
+    assert second.get('job-1').weights == {'semantic': 1.0, 'skills': 0.0, 'experience': 0.0}
+    assert second.get('job-1') is second.get('job-1')
+    assert second.stats()['hits'] >= 1
+
+
+def test_profile_deleted_by_another_replica_is_not_served(tmp_path):
+    first, second = JobProfileStore(str(tmp_path)), JobProfileStore(str(tmp_path))
+    first.put(profile('job-1'))
+    assert second.get('job-1') is not None
+    assert first.delete('job-1')
+    assert second.get('job-1') is None
+
+
+def test_profiles_in_the_previous_two_file_format_still_load(tmp_path):
+    store = JobProfileStore(str(tmp_path))
+    legacy = profile('job-1', {'semantic': 0.4, 'skills': 0.4, 'experience': 0.2})
+    with open(store._path('job-1', '.json'), 'w') as profile_file:
+        json.dump(legacy.to_json(), profile_file)
+    np.save(store._path('job-1', '.npy'), legacy.embedding)
+    loaded = store.get('job-1')
+    assert loaded.weights == legacy.weights
+    assert np.array_equal(loaded.embedding, legacy.embedding)
+    store.put(loaded)
+    assert sorted(path.suffix for path in tmp_path.iterdir()) == ['.npz']
@@ -0,0 +1,79 @@
+"""SummaryClient against benchmarks/fake_llm_server.py: deadline, cache, shared completions and the cap."""
+import asyncio
+import time
+
+import pytest
+
+import fake_llm_server
+import llm_summary
+from fake_llm_server import FakeLLMHandler
+
+JOB = "Senior backend engineer. Python, AWS, Kubernetes."
+
+
+@pytest.fixture
+def base_url():
+    server = fake_llm_server.serve(0, latency=0.05)
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    # Completions abandoned at a deadline still finish on the server; keep them out of the next test
+    deadline = time.monotonic() + 5
+    while FakeLLMHandler.in_flight and time.monotonic() < deadline:
+        time.sleep(0.05)
+    server.shutdown()
+    server.server_close()
+
+
+def summarize_all(client, resumes):
+    async def run():
+        return await asyncio.gather(*(client.summarize(resume, JOB) for resume in resumes))
+    return asyncio.run(run())
+
+
+def test_without_a_key_no_completion_is_requested():
+    client = llm_summary.SummaryClient(api_key=None)
+    assert summarize_all(client, ["Python developer"]) == [llm_summary.NO_KEY_SUMMARY]
+    assert client.stats()["enabled"] is False
+
+
+def test_slow_completion_falls_back_at_the_deadline(base_url):
+    FakeLLMHandler.latency = 1.0
+    client = llm_summary.SummaryClient(api_key="fake", base_url=base_url, timeout=0.2)
+    started = time.monotonic()
+    assert summarize_all(client, ["Python developer"]) == [llm_summary.FALLBACK_SUMMARY]
+    assert time.monotonic() - started < 0.8
+    assert client.stats()["timeouts"] == 1
+    assert client.stats()["cached"] == 0
+
+
+def test_repeated_pair_is_served_from_the_cache(base_url):
+    client = llm_summary.SummaryClient(api_key="fake", base_url=base_url)
+
+    async def run():
+        first = await client.summarize("Python developer", JOB)
+        second = await client.summarize("Python developer", JOB)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first == second
+    assert first.startswith("Candidate summary generated")
+    assert FakeLLMHandler.completions == 1
+    assert (client.stats()["misses"], client.stats()["hits"]) == (1, 1)
+
+
+def test_concurrent_identical_requests_share_one_completion(base_url):
+    FakeLLMHandler.latency = 0.3
+    client = llm_summary.SummaryClient(api_key="fake", base_url=base_url)
+    summaries = summarize_all(client, ["Python developer"] * 5)
+    assert len(set(summaries)) == 1
+    assert summaries[0] != llm_summary.FALLBACK_SUMMARY
+    assert FakeLLMHandler.completions == 1
+    assert (client.stats()["misses"], client.stats()["shared"]) == (1, 4)
+
+
+def test_concurrency_cap_limits_completions_in_flight(base_url):
+    FakeLLMHandler.latency = 0.2
+    client = llm_summary.SummaryClient(api_key="fake", base_url=base_url, max_concurrency=2, timeout=5.0)
+    summaries = summarize_all(client, [f"Python developer {index}" for index in range(6)])
+    assert llm_summary.FALLBACK_SUMMARY not in summaries
+    assert FakeLLMHandler.completions == 6
+    assert FakeLLMHandler.peak_in_flight == 2
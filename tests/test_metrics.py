@@ -0,0 +1,169 @@
+"""MetricsMiddleware labels requests by handler and renders valid Prometheus exposition text."""
+import asyncio
+import re
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+
+from scoring_core import metrics
+
+SAMPLE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{[^}]*\})? \S+$')
+
+
+def build_app(server_timing=True):
+    service_metrics = metrics.ServiceMetrics('test_service', inputs={
+        'candidates': "Candidates screened",
+        'resume_characters': "Characters of resume text screened"
+    })
+    service_metrics.gauge('model_loaded', "Whether each model is loaded", lambda: {('ner',): 1, ('embeddings',): 0}, ('model',))
+    service_metrics.gauge('unset', "Reported only once known", lambda: None)
+    app = FastAPI()
+    app.add_middleware(metrics.MetricsMiddleware, metrics=service_metrics, server_timing=server_timing)
+
+    @app.get("/candidates/{candidate_id}")
+    async def get_candidate(candidate_id: int):
+        metrics.count_input('candidates')
+        metrics.count_input('resume_characters', 120)
+        metrics.count_input('not_declared', 5)
+        with metrics.stage('skills'):
+            pass
+        for _ in range(3):
+            with metrics.stage('scoring'):
+                await asyncio.sleep(0.001)
+        return {"id": candidate_id}
+
+    @app.get("/rejected")
+    async def rejected():
+        raise HTTPException(status_code=400, detail="bad input")
+
+    @app.get("/broken")
+    async def broken():
+        raise RuntimeError("handler failed")
+
+    return app, service_metrics
+
+
+def request_all(app, paths):
+    async def run():
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return [await client.get(path) for path in paths]
+
+    return asyncio.run(run())
+
+
+def samples(text):
+    values = {}
+    for line in text.splitlines():
+        if line.startswith('#'):
+            continue
+        name, value = line.rsplit(' ', 1)
+        values[name] = value
+    return values
+
+
+def test_requests_are_labelled_by_handler_not_path():
+    app, service_metrics = build_app()
+    responses = request_all(app, ["/candidates/1", "/candidates/2", "/rejected", "/broken", "/missing"])
+    assert [response.status_code for response in responses] == [200, 200, 400, 500, 404]
+
+    values = samples(service_metrics.render())
+    assert values['test_service_requests_total{handler="get_candidate",status="200"}'] == '2'
+    assert values['test_service_requests_total{handler="rejected",status="400"}'] == '1'
+    assert values['test_service_requests_total{handler="broken",status="500"}'] == '1'
+    assert values['test_service_requests_total{handler="unmatched",status="404"}'] == '1'
+    # Path parameters never become label values
+    assert not any('/candidates' in name for name in values)
+    assert values['test_service_request_seconds_count{handler="get_candidate"}'] == '2'
+
+
+def test_stages_and_inputs_are_recorded_per_handler():
+    app, service_metrics = build_app()
+    request_all(app, ["/candidates/1", "/candidates/2", "/rejected"])
+
+    values = samples(service_metrics.render())
+    # A stage entered three times in one request is one observation of the summed time
+    assert values['test_service_stage_seconds_count{handler="get_candidate",stage="scoring"}'] == '2'
+    assert float(values['test_service_stage_seconds_sum{handler="get_candidate",stage="scoring"}']) >= 0.006
+    assert values['test_service_stage_seconds_count{handler="get_candidate",stage="skills"}'] == '2'
+    assert values['test_service_input_candidates_total{handler="get_candidate"}'] == '2'
+    assert values['test_service_input_resume_characters_total{handler="get_candidate"}'] == '240'
+    assert not any('not_declared' in name for name in values)
+    assert not any('handler="rejected",stage=' in name for name in values)
+
+
+def test_exposition_format():
+    app, service_metrics = build_app()
+    request_all(app, ["/candidates/1", "/candidates/2"])
+    text = service_metrics.render()
+    lines = text.splitlines()
+
+    assert text.endswith('\n')
+    for line in lines:
+        if line.startswith('#'):
+            assert re.match(r'^# (HELP \S+ .+|TYPE \S+ (counter|gauge|histogram))$', line), line
+        else:
+            assert SAMPLE.match(line), line
+    # Every metric family is declared before its samples
+    declared = set()
+    for line in lines:
+        if line.startswith('# TYPE '):
+            declared.add(line.split()[2])
+        elif not line.startswith('#'):
+            family = re.sub(r'_(bucket|sum|count)$', '', re.split(r'[{ ]', line)[0])
+            assert family in declared or re.split(r'[{ ]', line)[0] in declared, line
+
+    buckets = [
+        (re.search(r'le="([^"]+)"', line).group(1), int(line.rsplit(' ', 1)[1]))
+        for line in lines if line.startswith('test_service_request_seconds_bucket{handler="get_candidate"')
+    ]
+    assert [bound for bound, _ in buckets] == [metrics._format_value(b) for b in metrics.DEFAULT_BUCKETS] + ['+Inf']
+    counts = [count for _, count in buckets]
+    assert counts == sorted(counts) and counts[-1] == 2
+
+    values = samples(text)
+    assert values['test_service_model_loaded{model="embeddings"}'] == '0.0'
+    assert values['test_service_model_loaded{model="ner"}'] == '1.0'
+    assert '# TYPE test_service_unset gauge' in lines
+    assert not any(name.startswith('test_service_unset') for name in values)
+
+
+def test_histogram_buckets_are_cumulative_and_label_values_escaped():
+    histogram = metrics.Histogram('latency_seconds', "Latency", ('handler',), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value, ('say "hi"\\\n',))
+    lines = histogram.render()
+    label = 'handler="say \\"hi\\"\\\\\\n"'
+    assert lines[2:] == [
+        f'latency_seconds_bucket{{{label},le="0.1"}} 2',
+        f'latency_seconds_bucket{{{label},le="1.0"}} 3',
+        f'latency_seconds_bucket{{{label},le="+Inf"}} 4',
+        f'latency_seconds_sum{{{label}}} 2.65',
+        f'latency_seconds_count{{{label}}} 4',
+    ]
+
+
+def test_server_timing_header():
+    app, _ = build_app()
+    response = request_all(app, ["/candidates/1"])[0]
+    entries = [entry.strip() for entry in response.headers['server-timing'].split(',')]
+    assert [entry.split(';')[0] for entry in entries] == ['skills', 'scoring', 'total']
+    for entry in entries:
+        assert re.fullmatch(r'\w+;dur=\d+\.\d{2}', entry)
+
+    app, service_metrics = build_app(server_timing=False)
+    response = request_all(app, ["/candidates/1"])[0]
+    assert 'server-timing' not in response.headers
+    assert samples(service_metrics.render())['test_service_requests_total{handler="get_candidate",status="200"}'] == '1'
+
+
+def test_stage_and_count_input_do_nothing_outside_a_request():
+    with metrics.stage('scoring') as timed:
+        metrics.count_input('candidates')
+    assert timed is metrics._NULL_STAGE
+
+
+@pytest.mark.parametrize("value, text", [(3, '3'), (0.25, '0.25'), (float('inf'), '+Inf')])
+def test_value_formatting(value, text):
+    assert metrics._format_value(value) == text
@@ -0,0 +1,93 @@
+"""ONNX backends fall back to torch when their dependencies or artifacts are missing; LazyModel loads once."""
+import json
+import logging
+import threading
+import time
+
+import pytest
+
+import models
+
+
+def test_missing_dependencies_fall_back_to_torch(monkeypatch, caplog):
+    monkeypatch.setattr(models, 'onnx_support_error', lambda kind: "onnxruntime is not installed")
+    with caplog.at_level(logging.WARNING, logger='models'):
+        assert models.resolve_backend('embeddings', 'onnx-int8') == 'torch'
+    assert "onnxruntime is not installed" in caplog.text
+
+
+def test_missing_artifacts_fall_back_to_torch(monkeypatch, tmp_path, caplog):
+    monkeypatch.setattr(models, 'onnx_support_error', lambda kind: None)
+    monkeypatch.setattr(models, 'ML_MODEL_DIR', str(tmp_path))
+    with caplog.at_level(logging.WARNING, logger='models'):
+        assert models.resolve_backend('ner', 'onnx') == 'torch'
+    assert "No onnx ner artifacts" in caplog.text
+
+    (tmp_path / 'ner-onnx').mkdir()
+    (tmp_path / 'ner-onnx' / models.BACKEND_MANIFEST).write_text(json.dumps({'file_name': 'model.onnx'}))
+    assert models.resolve_backend('ner', 'onnx') == 'onnx'
+
+
+def test_torch_needs_no_onnx_dependencies(monkeypatch):
+    monkeypatch.setattr(models, 'onnx_support_error', lambda kind: "unused")
+    assert models.resolve_backend('embeddings', 'torch') == 'torch'
+
+
+def test_old_sentence_transformers_is_rejected(monkeypatch):
+    monkeypatch.setattr(models.util, 'find_spec', lambda name: object())
+    monkeypatch.setattr(models, '_version', lambda package: (2, 2))
+    assert models.onnx_support_error('embeddings') == "sentence-transformers>=3.2 is not installed"
+    assert models.onnx_support_error('ner') is None
+
+
+def concurrent_gets(model, threads=16):
+    start = threading.Barrier(threads)
+    results = [None] * threads
+
+    def get(index):
+        start.wait()
+        results[index] = model.get()
+
+    workers = [threading.Thread(target=get, args=(index,)) for index in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=10)
+    return results
+
+
+def test_concurrent_first_use_loads_once():
+    calls = []
+
+    def loader():
+        calls.append(threading.get_ident())
+        # Slow enough that every thread arrives while the first load is running
+        time.sleep(0.2)
+        return object()
+
+    model = models.LazyModel('test', loader)
+    results = concurrent_gets(model)
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results) and results[0] is not None
+    assert model.loaded and model.load_seconds >= 0.2
+    assert model.get() is results[0] and len(calls) == 1
+
+
+def test_failed_load_is_not_retried_by_concurrent_callers():
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.1)
+        raise RuntimeError("no weights")
+
+    model = models.LazyModel('test', loader)
+    assert concurrent_gets(model) == [None] * 16
+    assert len(calls) == 1
+    assert model.status()["error"] == "no weights" and not model.loaded
+
+
+def test_disabled_model_never_loads():
+    model = models.LazyModel('test', lambda: pytest.fail("loader called"), enabled=False)
+    assert concurrent_gets(model, threads=4) == [None] * 4
@@ -0,0 +1,133 @@
+"""Windowed NER covers the whole text, never cuts a word, and reports each entity once across overlaps."""
+import re
+
+from ner_windows import merge_entities, split_windows, windowed_ner, word_offsets
+
+SKILLS = {"Kubernetes", "PostgreSQL", "TensorFlow", "Terraform"}
+
+
+def subword_offsets(text):
+    """Offsets of a tokenizer that splits every word into pieces of at most three characters"""
+    offsets = []
+    for start, end in word_offsets(text):
+        offsets.extend((piece, min(piece + 3, end)) for piece in range(start, end, 3))
+    return offsets
+
+
+class SubwordTokenizer:
+    is_fast = True
+    model_max_length = 512
+
+    def __call__(self, text, add_special_tokens, return_offsets_mapping):
+        return {'offset_mapping': subword_offsets(text)}
+
+
+class SkillPipeline:
+    """Aggregated NER stand-in: every SKILLS word is an entity, with offsets into its input"""
+
+    def __init__(self, tokenizer=None):
+        self.tokenizer = tokenizer
+        self.calls = []
+
+    def find(self, text):
+        return [
+            {'entity_group': 'MISC', 'word': match.group(), 'score': 0.9, 'start': match.start(), 'end': match.end()}
+            for match in re.finditer(r'\S+', text) if match.group() in SKILLS
+        ]
+
+    def __call__(self, texts, batch_size):
+        self.calls.append(len(texts))
+        return [self.find(text) for text in texts]
+
+
+def long_resume(words=400):
+    skills = sorted(SKILLS)
+    return " ".join(skills[index % len(skills)] if index % 37 == 5 else f"word{index}" for index in range(words))
+
+
+def test_windows_cover_the_text_and_overlap_by_the_stride():
+    text = " ".join(f"w{index}" for index in range(100))
+    offsets = word_offsets(text)
+    windows = split_windows(offsets, max_tokens=30, stride=10)
+
+    assert windows[0][0] == 0 and windows[-1][1] == len(text)
+    token_at = {start: index for index, (start, _) in enumerate(offsets)}
+    token_after = {end: index + 1 for index, (_, end) in enumerate(offsets)}
+    starts = [token_at[start] for start, _ in windows]
+    ends = [token_after[end] for _, end in windows]
+    for start, end in zip(starts, ends):
+        assert end - start <= 30
+    for previous_end, start in zip(ends, starts[1:]):
+        assert previous_end - start == 10
+
+
+def test_short_text_is_one_window():
+    text = "Kubernetes and Terraform"
+    assert split_windows(word_offsets(text), max_tokens=30, stride=10) == [(0, len(text))]
+    assert split_windows([], max_tokens=30, stride=10) == []
+
+
+def test_windows_never_start_or_end_inside_a_word():
+    text = long_resume(120)
+    offsets = subword_offsets(text)
+    word_starts = {start for start, _ in word_offsets(text)}
+    word_ends = {end for _, end in word_offsets(text)}
+
+    for max_tokens, stride in [(16, 4), (25, 8), (40, 12)]:
+        windows = split_windows(offsets, max_tokens, stride)
+        assert windows[0][0] == 0 and windows[-1][1] == len(text)
+        for start, end in windows:
+            assert start in word_starts and end in word_ends
+            assert sum(1 for offset in offsets if start <= offset[0] and offset[1] <= end) <= max_tokens
+        # Consecutive windows overlap, so nothing between them is skipped
+        for (_, previous_end), (start, _) in zip(windows, windows[1:]):
+            assert start < previous_end
+
+
+def test_entity_found_in_both_windows_is_reported_once():
+    windows = [(0, 30), (20, 50)]
+    window_entities = [
+        [{'entity_group': 'MISC', 'word': 'Terraform', 'score': 0.8, 'start': 21, 'end': 30}],
+        [{'entity_group': 'MISC', 'word': 'Terraform', 'score': 0.9, 'start': 1, 'end': 10}],
+    ]
+    merged = merge_entities(window_entities, windows)
+    assert [(entity['start'], entity['end'], entity['score']) for entity in merged] == [(21, 30, 0.9)]
+
+
+def test_entity_cut_at_a_window_edge_loses_to_the_whole_one():
+    windows = [(0, 25), (20, 50)]
+    window_entities = [
+        [{'entity_group': 'MISC', 'word': 'Terra', 'score': 0.99, 'start': 20, 'end': 25}],
+        [{'entity_group': 'MISC', 'word': 'Terraform', 'score': 0.7, 'start': 0, 'end': 9}],
+    ]
+    merged = merge_entities(window_entities, windows)
+    assert [(entity['word'], entity['start'], entity['end']) for entity in merged] == [('Terraform', 20, 29)]
+
+
+def test_entities_without_offsets_are_deduplicated_by_word():
+    windows = [(0, 30), (20, 50)]
+    window_entities = [
+        [{'entity_group': 'ORG', 'word': 'Acme', 'score': 0.9, 'start': None, 'end': None}],
+        [{'entity_group': 'ORG', 'word': 'ACME', 'score': 0.8, 'start': None, 'end': None},
+         {'entity_group': 'MISC', 'word': 'Go', 'score': 0.8, 'start': 2, 'end': 4}],
+    ]
+    merged = merge_entities(window_entities, windows)
+    assert [entity['word'] for entity in merged] == ['Go', 'Acme']
+    assert merged[0]['start'] == 22
+
+
+def test_windowed_ner_matches_ner_over_the_whole_text():
+    text = long_resume()
+    for tokenizer in (SubwordTokenizer(), None):
+        pipeline = SkillPipeline(tokenizer)
+        entities = windowed_ner(pipeline, text, max_tokens=48, stride=12, batch_size=4)
+
+        expected = pipeline.find(text)
+        assert [(entity['start'], entity['end']) for entity in entities] == [
+            (entity['start'], entity['end']) for entity in expected
+        ]
+        assert all(text[entity['start']:entity['end']] == entity['word'] for entity in entities)
+        # The last skill is far past one window's length
+        assert entities[-1]['end'] > len(text) * 0.9
+        # All windows went through the pipeline in a single call
+        assert len(pipeline.calls) == 1 and pipeline.calls[0] > 1
@@ -0,0 +1,48 @@
+"""Parallel PDF extraction returns what sequential extraction returns, within the same limits."""
+import io
+
+import PyPDF2
+import pytest
+
+import pdf_extract
+from synthetic_corpus import pdf_bytes
+
+PAGES = 24
+LINES_PER_PAGE = 10
+
+
+@pytest.fixture(scope='module')
+def document():
+    lines = [
+        f"page {index // LINES_PER_PAGE} line {index % LINES_PER_PAGE} python docker"
+        for index in range(PAGES * LINES_PER_PAGE)
+    ]
+    yield pdf_bytes("\n".join(lines), lines_per_page=LINES_PER_PAGE)
+    pdf_extract.shutdown_page_pool()
+
+
+@pytest.mark.parametrize("max_pages, max_chars", [(0, 0), (20, 0), (0, 1500), (20, 100000)])
+def test_parallel_matches_sequential(document, max_pages, max_chars, caplog):
+    sequential = pdf_extract.extract_pdf_text(document, max_pages=max_pages, max_chars=max_chars)
+    parallel = pdf_extract.extract_pdf_text(
+        document, max_pages=max_pages, max_chars=max_chars, parallel_min_pages=4, workers=3
+    )
+    assert parallel == sequential
+    assert not max_chars or len(parallel) <= max_chars
+    # No fallback to the sequential path
+    assert not caplog.records
+
+
+def test_workers_receive_only_their_page_range(document):
+    reader = PyPDF2.PdfReader(io.BytesIO(document))
+    part = pdf_extract._page_range_pdf(reader, 8, 12)
+    assert len(part) < len(document)
+    texts = pdf_extract._extract_page_range(part, 0)
+    assert len(texts) == 4
+    assert texts[0].startswith("page 8 line 0")
+
+
+def test_page_range_stops_at_max_chars(document):
+    reader = PyPDF2.PdfReader(io.BytesIO(document))
+    part = pdf_extract._page_range_pdf(reader, 0, 8)
+    assert len(pdf_extract._extract_page_range(part, 500)) < 8
@@ -0,0 +1,66 @@
+"""Vectorized ranking returns what the old per-candidate loop returned, ties and paging included."""
+import random
+
+import numpy as np
+import pytest
+
+from check_scoring_parity import old_candidate_score
+from scoring_core import rank_candidates, score_candidates
+from scoring_core.ranking import page_indices, rank_indices
+
+SKILLS = ["Python", "AWS", "Docker", "SQL", "Go"]
+
+
+def tied_pool(rng, size):
+    # Few distinct skill sets, years and degrees, so many candidates share a score
+    return [{
+        "id": index,
+        "skills": rng.sample(SKILLS, rng.randint(0, 2)),
+        "experience_years": rng.choice([0, 2, 5]),
+        "education_level": rng.choice(["bachelors", "masters"])
+    } for index in range(size)]
+
+
+def old_ranking(candidates, requirements):
+    ranked = [{**candidate, "ai_score": old_candidate_score(candidate, requirements)} for candidate in candidates]
+    ranked.sort(key=lambda x: x["ai_score"], reverse=True)
+    return ranked
+
+
+@pytest.fixture(params=[0, 1, 2, 3])
+def pool(request):
+    rng = random.Random(request.param)
+    candidates = tied_pool(rng, rng.choice([0, 1, 7, 40, 120]))
+    requirements = {"required_skills": ["Python", "AWS", "SQL"], "min_experience": 3, "education_level": "masters"}
+    return candidates, requirements
+
+
+def test_pools_contain_ties(pool):
+    candidates, requirements = pool
+    scores = score_candidates(candidates, requirements)
+    assert len(candidates) < 40 or len(np.unique(scores)) < len(scores) // 2
+
+
+@pytest.mark.parametrize("top_k", [None, 0, 1, 5, 39, 40, 200])
+def test_rank_candidates_matches_the_old_loop(pool, top_k):
+    candidates, requirements = pool
+    expected = old_ranking(candidates, requirements)
+    assert rank_candidates(candidates, requirements, top_k) == expected[:top_k]
+
+
+@pytest.mark.parametrize("top_k", [None, 0, 3, 25, 200])
+@pytest.mark.parametrize("offset, limit", [(0, None), (0, 10), (5, 10), (10, 0), (3, None), (30, 20), (500, 5)])
+def test_pages_match_slices_of_the_old_ranking(pool, top_k, offset, limit):
+    candidates, requirements = pool
+    expected = old_ranking(candidates, requirements)[:top_k]
+    expected = expected[offset:None if limit is None else offset + limit]
+    scores = score_candidates(candidates, requirements)
+    page = [{**candidates[index], "ai_score": float(scores[index])} for index in page_indices(scores, top_k, offset, limit)]
+    assert page == expected
+
+
+def test_top_k_keeps_the_first_of_tied_candidates():
+    scores = np.array([1.0, 3.0, 2.0, 3.0, 2.0, 2.0, 3.0])
+    assert rank_indices(scores).tolist() == [1, 3, 6, 2, 4, 5, 0]
+    assert rank_indices(scores, 2).tolist() == [1, 3]
+    assert rank_indices(scores, 4).tolist() == [1, 3, 6, 2]
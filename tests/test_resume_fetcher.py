@@ -0,0 +1,93 @@
+"""Status codes ResumeFetcher reports for failing resume hosts, and its overall deadline."""
+import asyncio
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from resume_fetcher import ResumeFetcher, ResumeFetchError
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if self.path == '/missing.pdf':
+            self.send_error(404)
+            return
+        if self.path == '/broken.pdf':
+            self.send_error(500)
+            return
+        body = b'%PDF-1.4\n' + b'x' * 1000
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.path == '/trickle.pdf':
+            # Every chunk arrives within the read timeout, the whole body does not
+            for offset in range(0, len(body), 100):
+                self.wfile.write(body[offset:offset + 100])
+                self.wfile.flush()
+                time.sleep(0.1)
+            return
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope='module')
+def server_url():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def fetch(url, **settings):
+    async def run():
+        fetcher = ResumeFetcher(**settings)
+        try:
+            return await fetcher.fetch(url)
+        finally:
+            await fetcher.close()
+
+    return asyncio.run(run())
+
+
+def fetch_error(url, **settings) -> ResumeFetchError:
+    with pytest.raises(ResumeFetchError) as error:
+        fetch(url, **settings)
+    return error.value
+
+
+def test_downloads_resume(server_url):
+    assert fetch(f"{server_url}/resume.pdf").startswith(b'%PDF')
+
+
+def test_missing_resume_is_a_client_error(server_url):
+    assert fetch_error(f"{server_url}/missing.pdf").status_code == 400
+
+
+def test_failing_resume_host_is_a_bad_gateway(server_url):
+    assert fetch_error(f"{server_url}/broken.pdf").status_code == 502
+
+
+def test_unreachable_resume_host_is_a_bad_gateway():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    assert fetch_error(f"http://127.0.0.1:{port}/resume.pdf").status_code == 502
+
+
+def test_whole_download_has_a_deadline(server_url):
+    started = time.perf_counter()
+    error = fetch_error(f"{server_url}/trickle.pdf", read_timeout=1.0, total_timeout=0.3)
+    assert error.status_code == 504
+    assert time.perf_counter() - started < 0.9
+
+
+def test_oversized_resume_is_a_client_error(server_url):
+    assert fetch_error(f"{server_url}/resume.pdf", max_bytes=100).status_code == 400
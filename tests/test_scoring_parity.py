@@ -0,0 +1,21 @@
+"""scoring_core matches the service implementations it replaced (benchmarks/check_scoring_parity.py)."""
+import pytest
+
+import check_scoring_parity
+from simple_ai_service import AIService
+
+
+def test_shared_scoring_matches_previous_implementations():
+    checker = check_scoring_parity.run_checks(cases=400, pools=60, verbose=False)
+    assert checker.mismatched == []
+    # Fractional and zero min_experience pools are generated and take the intended path
+    assert checker.intended > 0
+
+
+@pytest.mark.parametrize("min_experience, expected", [(0, 15.0), (0.5, 15.0), (1.5, 10.0), (3, 5.0)])
+def test_simple_service_counts_at_least_one_required_year(min_experience, expected):
+    candidate = {"skills": [], "experience_years": 0.5, "education_level": None}
+    requirements = {"required_skills": [], "min_experience": min_experience, "education_level": "masters"}
+    ranked = AIService().rank_candidates([candidate], requirements)["ranked_candidates"]
+    # No skills (0), education mismatch (10) and cultural fit (10) around the experience points
+    assert ranked[0]["ai_score"] == pytest.approx(20 + expected)
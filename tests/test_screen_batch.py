@@ -0,0 +1,125 @@
+"""/screen-batch gives each candidate the same result as screening it alone through /screen."""
+import asyncio
+import hashlib
+import importlib.util
+import os
+import sys
+
+import httpx
+import numpy as np
+import pytest
+
+import models
+
+ML_SERVICE_MAIN = os.path.join(
+    os.path.dirname(__file__), '..', 'backend', 'microservices', 'ml-service', 'main.py'
+)
+JOB = {
+    "title": "Backend Engineer",
+    "description": "Build Python services on AWS with PostgreSQL and Docker",
+    "skills": ["Python", "AWS", "Docker", "SQL"],
+    "experience": 4
+}
+RESUMES = {
+    "https://files.test/ada.pdf": "Senior Python engineer, eight years of AWS, Docker and SQL tuning",
+    "https://files.test/bo.docx": "Frontend developer working in React and TypeScript",
+    "https://files.test/cy.pdf": "Data engineer with Python, Spark and Kubernetes",
+}
+CANDIDATES = [
+    {"id": 1, "resumeUrl": "https://files.test/ada.pdf", "skills": ["python"], "yearsExp": 8},
+    {"id": 2, "resumeUrl": "https://files.test/bo.docx", "skills": [], "yearsExp": 2,
+     "coverLetter": "I am keen to learn Python"},
+    {"id": 3, "resumeUrl": "https://files.test/cy.pdf", "skills": ["spark"], "yearsExp": 5},
+]
+
+
+class HashingModel:
+    """Deterministic stand-in for the sentence transformer: hashed bag of words, normalized"""
+
+    def encode(self, texts, batch_size, convert_to_numpy, normalize_embeddings):
+        vectors = np.zeros((len(texts), 64), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                vectors[row, hashlib.sha256(word.encode()).digest()[0] % 64] += 1.0
+        return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+
+@pytest.fixture
+def ml_main(tmp_path, monkeypatch):
+    for variable, name in [
+        ('VECTOR_INDEX_DIR', 'vector-index'),
+        ('JOB_PROFILE_DIR', 'job-profiles'),
+        ('SCREENING_QUEUE_PATH', 'queue.sqlite3'),
+        ('RESUME_TEXT_CACHE_DIR', 'resume-text'),
+    ]:
+        monkeypatch.setenv(variable, str(tmp_path / name))
+    monkeypatch.delenv('EMBEDDING_CACHE_DIR', raising=False)
+    monkeypatch.delenv('ML_STATE_DIR', raising=False)
+    monkeypatch.setattr(models.embedding_model, '_model', HashingModel())
+
+    spec = importlib.util.spec_from_file_location('ml_service_main', ML_SERVICE_MAIN)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    async def extract_resume_text(resume_url):
+        return RESUMES[resume_url]
+
+    monkeypatch.setattr(module, 'extract_resume_text', extract_resume_text)
+    yield module
+    module.inference_pool.shutdown()
+    sys.modules.pop('ml_service_main', None)
+
+
+def screen_each_and_batch(ml_main, candidates):
+    async def run():
+        transport = httpx.ASGITransport(app=ml_main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            single = []
+            for candidate in candidates:
+                body = {"job": JOB, "candidate": candidate}
+                if candidate.get('coverLetter'):
+                    body["coverLetter"] = candidate['coverLetter']
+                single.append(await client.post("/screen", json=body))
+            batch = await client.post("/screen-batch", json={"job": JOB, "candidates": candidates})
+        await ml_main.encode_batcher.close()
+        return single, batch
+
+    return asyncio.run(run())
+
+
+def assert_same_screening(single, batched):
+    assert batched["fitScore"] == pytest.approx(single["fitScore"], abs=1e-6)
+    for field in ("semanticSimilarity", "skillSimilarity", "experienceMatch"):
+        assert batched["details"][field] == pytest.approx(single["details"][field], abs=1e-6)
+    for field in ("extractedSkills", "allCandidateSkills", "jobSkills"):
+        assert sorted(batched["details"][field]) == sorted(single["details"][field])
+    assert batched["details"]["resumeLength"] == single["details"]["resumeLength"]
+    assert batched["details"]["weights"] == single["details"]["weights"]
+
+
+def test_batch_matches_single_screening_per_candidate(ml_main):
+    single, batch = screen_each_and_batch(ml_main, CANDIDATES)
+
+    assert [response.status_code for response in single] == [200] * len(CANDIDATES)
+    assert batch.status_code == 200
+    body = batch.json()
+    assert (body["screened"], body["failed"]) == (len(CANDIDATES), 0)
+    assert [result["candidateId"] for result in body["results"]] == [1, 2, 3]
+    for response, result in zip(single, body["results"]):
+        assert result["error"] is None
+        assert_same_screening(response.json(), result)
+    # The candidates differ, so equal scores would mean the comparison proves nothing
+    assert len({round(result["fitScore"], 6) for result in body["results"]}) == len(CANDIDATES)
+
+
+def test_failed_candidate_does_not_change_the_others(ml_main):
+    candidates = CANDIDATES[:1] + [{"id": 9, "resumeUrl": "https://files.test/missing.pdf"}] + CANDIDATES[1:]
+    single, batch = screen_each_and_batch(ml_main, CANDIDATES)
+    _, with_failure = screen_each_and_batch(ml_main, candidates)
+
+    body = with_failure.json()
+    assert (body["screened"], body["failed"]) == (len(CANDIDATES), 1)
+    assert body["results"][1]["candidateId"] == 9 and body["results"][1]["error"]
+    kept = body["results"][:1] + body["results"][2:]
+    for response, result in zip(single, kept):
+        assert_same_screening(response.json(), result)
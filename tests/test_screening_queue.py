@@ -0,0 +1,171 @@
+"""ScreeningQueue runs tasks off the event loop, claims from one process and sends callbacks safely."""
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from screening_queue import ScreeningQueue, callback_url_error
+
+
+async def echo(payload):
+    return {"echo": payload["value"]}
+
+
+async def wait_for_status(queue, task_id, status, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        task = await asyncio.to_thread(queue.get, task_id)
+        if task["status"] == status:
+            return task
+        await asyncio.sleep(0.02)
+    raise AssertionError(f"task {task_id} did not reach {status}")
+
+
+def test_submission_from_a_thread_wakes_a_worker(tmp_path):
+    # The poll interval is longer than the test, so only the wakeup can start the task
+    queue = ScreeningQueue(str(tmp_path / 'queue.sqlite3'), workers=1, poll_interval=60)
+
+    async def run():
+        queue.start({"echo": echo})
+        await asyncio.sleep(0.05)
+        try:
+            submitted = await asyncio.to_thread(queue.submit, "echo", {"value": 1})
+            return await wait_for_status(queue, submitted["id"], 'succeeded')
+        finally:
+            await queue.stop()
+
+    task = asyncio.run(run())
+    assert task["result"] == {"echo": 1}
+    assert task["attempts"] == 1
+
+
+def test_workers_wait_for_a_locked_database_off_the_event_loop(tmp_path):
+    path = str(tmp_path / 'queue.sqlite3')
+    queue = ScreeningQueue(path, workers=2, poll_interval=0.01)
+    other = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    locked = threading.Event()
+
+    def hold_lock():
+        # Another replica holding the write lock for a while
+        other.execute("BEGIN IMMEDIATE")
+        locked.set()
+        time.sleep(0.5)
+        other.execute("COMMIT")
+
+    async def run():
+        queue.start({"echo": echo})
+        holder = threading.Thread(target=hold_lock)
+        holder.start()
+        longest_gap = 0.0
+        last = time.monotonic()
+        while holder.is_alive():
+            await asyncio.sleep(0.01)
+            now = time.monotonic()
+            longest_gap = max(longest_gap, now - last)
+            last = now
+        await queue.stop()
+        return longest_gap
+
+    longest_gap = asyncio.run(run())
+    other.close()
+    assert locked.is_set()
+    # Claims waiting on the lock must not stall the loop for the whole 0.5s
+    assert longest_gap < 0.25
+
+
+def test_submissions_with_different_callbacks_are_separate_tasks(tmp_path):
+    queue = ScreeningQueue(str(tmp_path / 'queue.sqlite3'))
+    first = queue.submit("echo", {"value": 1}, callback_url="https://a.example/hook")
+    again = queue.submit("echo", {"value": 1}, callback_url="https://a.example/hook")
+    other = queue.submit("echo", {"value": 1}, callback_url="https://b.example/hook")
+    assert again["deduplicated"] and again["id"] == first["id"]
+    assert not other["deduplicated"] and other["id"] != first["id"]
+
+
+@pytest.mark.parametrize("url", [
+    "http://127.0.0.1/hook", "http://10.1.2.3/hook", "http://169.254.169.254/latest", "http://[::1]/hook",
+    "http://[::ffff:192.168.0.1]/hook", "http://localhost:8000/hook", "ftp://93.184.216.34/hook", "http://:80/",
+])
+def test_callbacks_to_internal_addresses_are_refused(url):
+    assert callback_url_error(url, set()) is not None
+
+
+def test_callback_allowlist():
+    allowed = {"hooks.internal", ".example.com"}
+    assert callback_url_error("https://93.184.216.34/hook", set()) is None
+    assert callback_url_error("http://hooks.internal/done", allowed) is None
+    assert callback_url_error("https://ats.example.com/done", allowed) is None
+    assert callback_url_error("https://93.184.216.34/hook", allowed) is not None
+
+
+class CallbackHandler(BaseHTTPRequestHandler):
+    received = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.received.append((self.headers["X-Screening-Task"], json.loads(body)))
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def test_pending_callbacks_are_resent_by_the_next_claiming_process(tmp_path):
+    server = HTTPServer(('127.0.0.1', 0), CallbackHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    path = str(tmp_path / 'queue.sqlite3')
+    url = f"http://127.0.0.1:{server.server_port}/hook"
+
+    # A process that finished the task but stopped before delivering the callback
+    crashed = ScreeningQueue(path)
+    submitted = crashed.submit("echo", {"value": 1}, callback_url=url)
+    crashed._finish(crashed.claim(), 'succeeded', {"echo": 1}, None)
+    assert crashed.get(submitted["id"])["callback"]["status"] == 'pending'
+
+    queue = ScreeningQueue(path, allowed_callback_hosts=["127.0.0.1"], poll_interval=0.05)
+
+    async def run():
+        queue.start({"echo": echo})
+        try:
+            deadline = time.monotonic() + 10
+            while time.monotonic() < deadline:
+                task = await asyncio.to_thread(queue.get, submitted["id"])
+                if task["callback"]["status"] != 'pending':
+                    return task
+                await asyncio.sleep(0.02)
+        finally:
+            await queue.stop()
+
+    try:
+        task = asyncio.run(run())
+    finally:
+        server.shutdown()
+    assert task["callback"] == {"url": url, "status": 'delivered', "attempts": 1}
+    assert [(task_id, body["result"]) for task_id, body in CallbackHandler.received] == [(submitted["id"], {"echo": 1})]
+
+
+def test_only_one_process_claims_tasks_from_a_database(tmp_path):
+    path = str(tmp_path / 'queue.sqlite3')
+    first = ScreeningQueue(path, workers=1, poll_interval=0.02)
+    second = ScreeningQueue(path, workers=1, poll_interval=0.02)
+
+    async def run():
+        first.start({"echo": echo})
+        second.start({"echo": echo})
+        await asyncio.sleep(0.2)
+        claiming = (first.stats()["claiming"], second.stats()["claiming"])
+        await first.stop()
+        # The other process takes over once the claim lock is released
+        submitted = await asyncio.to_thread(second.submit, "echo", {"value": 2})
+        task = await wait_for_status(second, submitted["id"], 'succeeded')
+        await second.stop()
+        return claiming, task
+
+    claiming, task = asyncio.run(run())
+    assert claiming == (True, False)
+    assert task["result"] == {"echo": 2}
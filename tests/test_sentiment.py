@@ -0,0 +1,85 @@
+"""sentiment.analyze_batch scores every text as the previous per-request helpers did."""
+import random
+import re
+
+import pytest
+
+import sentiment
+
+WORDS = (
+    "i worked on the billing platform with Python and AWS on call team roadmap what does the team look like "
+    "Excited GREAT good worried Concerned love believe sure unsure doubt passionate bad poor certain ? ?? İstanbul"
+).split()
+CONTEXTS = [
+    "Senior backend engineer python aws kubernetes postgres on call team roadmap",
+    "Data engineer spark SQL",
+    "",
+]
+
+
+# Previous implementations from ai-ml-service/main.py
+
+def old_analyze_text_sentiment(text):
+    positive_words = ["excellent", "great", "good", "positive", "excited", "enthusiastic", "motivated"]
+    negative_words = ["bad", "poor", "negative", "concerned", "worried", "disappointed"]
+    text_lower = text.lower()
+    positive_count = sum(1 for word in positive_words if word in text_lower)
+    negative_count = sum(1 for word in negative_words if word in text_lower)
+    if positive_count > negative_count:
+        return {"sentiment": "positive", "confidence": min(positive_count / (positive_count + negative_count + 1), 0.95)}
+    if negative_count > positive_count:
+        return {"sentiment": "negative", "confidence": min(negative_count / (positive_count + negative_count + 1), 0.95)}
+    return {"sentiment": "neutral", "confidence": 0.5}
+
+
+def old_extract_emotions(text):
+    emotions = {
+        "enthusiasm": len(re.findall(r'excited|enthusiastic|passionate|love', text.lower())),
+        "confidence": len(re.findall(r'confident|sure|certain|believe', text.lower())),
+        "concern": len(re.findall(r'concerned|worried|unsure|doubt', text.lower()))
+    }
+    total = sum(emotions.values()) or 1
+    return {k: v / total for k, v in emotions.items()}
+
+
+def old_calculate_engagement_score(text, context):
+    length_score = min(len(text) / 500, 1.0) * 0.3
+    question_score = min(text.count('?') / 3, 1.0) * 0.3
+    context_words = context.lower().split()
+    specific_mentions = sum(1 for word in context_words if word in text.lower())
+    mention_score = min(specific_mentions / 5, 1.0) * 0.4
+    return (length_score + question_score + mention_score) * 100
+
+
+def old_analyze(text, context):
+    return {
+        **old_analyze_text_sentiment(text),
+        "emotions": old_extract_emotions(text),
+        "engagement_score": old_calculate_engagement_score(text, context)
+    }
+
+
+@pytest.fixture(scope='module')
+def transcripts():
+    rng = random.Random(20)
+    items = [("", CONTEXTS[0]), ("?", ""), ("Great!", CONTEXTS[1])]
+    for _ in range(500):
+        words = [rng.choice(WORDS) for _ in range(rng.choice([0, 3, 40, 200]))]
+        items.append((" ".join(words), rng.choice(CONTEXTS)))
+    return items
+
+
+def test_batch_matches_the_per_request_helpers(transcripts):
+    expected = [old_analyze(text, context) for text, context in transcripts]
+    assert sentiment.analyze_batch(transcripts) == expected
+    assert [sentiment.analyze(text, context) for text, context in transcripts] == expected
+
+
+def test_chunked_batches_match_one_batch(transcripts):
+    # /analyze-sentiment/batch splits large batches across processes in chunks
+    chunks = [sentiment.analyze_batch(transcripts[start:start + 64]) for start in range(0, len(transcripts), 64)]
+    assert [result for chunk in chunks for result in chunk] == sentiment.analyze_batch(transcripts)
+
+
+def test_empty_batch():
+    assert sentiment.analyze_batch([]) == []
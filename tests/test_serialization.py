@@ -0,0 +1,40 @@
+"""The standard library fallback encodes response bodies the way orjson does."""
+import json
+import math
+
+import numpy as np
+import pytest
+
+import serialization
+
+VALUES = [
+    {'rates': {'<30': 1.0, '50+': float('nan')}, 'variance': float('inf'), 'low': float('-inf')},
+    {'ai_score': np.float64(0.75), 'scores': np.array([0.5, np.nan]), 'count': np.int64(3)},
+    [1, 2.5, None, 'naïve', {'nested': [float('nan'), {'deep': float('inf')}]}],
+    {'plain': [0.1, 0.2], 'text': 'ok'},
+]
+
+
+def walk(value):
+    if isinstance(value, dict):
+        for item in value.values():
+            yield from walk(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from walk(item)
+    else:
+        yield value
+
+
+@pytest.mark.parametrize("value", VALUES)
+def test_fallback_writes_non_finite_floats_as_null(value):
+    encoded = serialization.stdlib_dumps(value)
+    decoded = json.loads(encoded, parse_constant=lambda name: pytest.fail(f"{name} in output"))
+    assert not any(isinstance(item, float) and not math.isfinite(item) for item in walk(decoded))
+
+
+@pytest.mark.parametrize("value", VALUES)
+def test_fallback_matches_orjson(value):
+    orjson = pytest.importorskip('orjson')
+    expected = orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    assert json.loads(serialization.stdlib_dumps(value)) == json.loads(expected)
@@ -0,0 +1,130 @@
+"""Each service's skill set reports what its own extractor reported before the shared matcher.
+
+The references below are the per-service extractors the matcher replaced,
+adjusted only for the intended changes:
+
+  * the ai-ml services search on word boundaries instead of substrings, so
+    'Java' is no longer found inside 'JavaScript'
+  * the ml-service no longer reads the 'js' of 'node.js', 'vue.js' or
+    'react.js' as JavaScript, since each alias is matched whole
+  * the ml-service also knows 'reactjs', 'vuejs' and 'amazon web services'
+"""
+import random
+import re
+
+import pytest
+
+from scoring_core import get_skill_matcher
+
+AI_ML_SKILLS = [
+    "Python", "JavaScript", "Java", "React", "Node.js", "SQL", "AWS", "Docker",
+    "Kubernetes", "Machine Learning", "Data Science", "Project Management",
+    "Leadership", "Communication", "Problem Solving", "Teamwork"
+]
+SIMPLE_SKILLS = AI_ML_SKILLS + ["Git", "HTML", "CSS", "TypeScript", "Angular", "Vue", "MongoDB", "PostgreSQL"]
+ML_SERVICE_PATTERNS = {
+    'python': r'\bpython\b',
+    'javascript': r'\bjavascript\b|\bjs\b',
+    'java': r'\bjava\b',
+    'react': r'\breact\b',
+    'node': r'\bnode\.?js\b',
+    'sql': r'\bsql\b',
+    'aws': r'\baws\b',
+    'docker': r'\bdocker\b',
+    'kubernetes': r'\bkubernetes\b|\bk8s\b',
+    'typescript': r'\btypescript\b|\bts\b',
+    'angular': r'\bangular\b',
+    'vue': r'\bvue\b',
+    'django': r'\bdjango\b',
+    'flask': r'\bflask\b',
+    'fastapi': r'\bfastapi\b',
+    'spring': r'\bspring\b',
+    'mongodb': r'\bmongodb\b',
+    'postgresql': r'\bpostgresql\b|\bpostgres\b',
+    'redis': r'\bredis\b',
+    'git': r'\bgit\b',
+    'linux': r'\blinux\b',
+    'azure': r'\bazure\b',
+    'gcp': r'\bgcp\b|\bgoogle cloud\b',
+}
+# Aliases the ml-service matches now that its old patterns did not; its list is uncapped
+ML_SERVICE_NEW_ALIASES = {'reactjs': 'react', 'vuejs': 'vue', 'amazon web services': 'aws'}
+
+VOCABULARY = [
+    "python", "javascript", "js", "java", "react", "react.js", "node.js", "nodejs", "sql", "aws", "docker",
+    "kubernetes", "k8s", "machine learning", "data science", "project management", "leadership",
+    "communication", "problem solving", "problem-solving", "teamwork", "git", "html", "css", "typescript",
+    "ts", "angular", "vue", "vue.js", "mongodb", "postgresql", "postgres", "django", "flask", "fastapi",
+    "spring", "redis", "linux", "azure", "gcp", "google cloud", "built", "services", "with", "and", "team",
+    "years", "of", "experience", "in", "the", "platform", "Python,", "(AWS)", "Docker.", "SQL;"
+]
+
+
+def old_names(text, skills, cap):
+    text_lower = text.lower()
+    found = [skill for skill in skills if re.search(r'(?<!\w)' + re.escape(skill.lower()) + r'(?!\w)', text_lower)]
+    return found[:cap]
+
+
+def old_ml_service_ids(text):
+    text_lower = text.lower()
+    return {skill for skill, pattern in ML_SERVICE_PATTERNS.items() if re.search(pattern, text_lower, re.IGNORECASE)}
+
+
+def expected_ml_service_ids(text):
+    found = old_ml_service_ids(text)
+    if not re.search(r'\bjavascript\b|(?<![.\w])js\b', text.lower()):
+        found.discard('javascript')
+    return found
+
+
+def texts(count=500, seed=3):
+    rng = random.Random(seed)
+    for _ in range(count):
+        words = [rng.choice(VOCABULARY) for _ in range(rng.randint(1, 40))]
+        yield " ".join(word.upper() if rng.random() < 0.1 else word for word in words)
+
+
+@pytest.mark.parametrize("skill_set, skills, cap", [
+    ('ai-ml-service', AI_ML_SKILLS, 10),
+    ('simple-ai-service', SIMPLE_SKILLS, 8),
+])
+def test_ai_ml_skill_sets_match_previous_lists(skill_set, skills, cap):
+    matcher = get_skill_matcher(skill_set=skill_set)
+    for text in texts():
+        assert matcher.extract_names(text)[:cap] == old_names(text, skills, cap), text
+
+
+def test_ml_service_skill_set_matches_previous_patterns():
+    matcher = get_skill_matcher(skill_set='ml-service')
+    for text in texts():
+        assert set(matcher.extract_ids(text)) == expected_ml_service_ids(text), text
+
+
+def test_ml_service_dotted_names_are_not_javascript():
+    assert 'javascript' in old_ml_service_ids("node.js and vue.js")
+    assert get_skill_matcher(skill_set='ml-service').extract_ids("node.js and vue.js") == ['node', 'vue']
+
+
+def test_ml_service_new_aliases():
+    matcher = get_skill_matcher(skill_set='ml-service')
+    for alias, skill_id in ML_SERVICE_NEW_ALIASES.items():
+        assert old_ml_service_ids(f"worked with {alias}") == set()
+        assert matcher.extract_ids(f"worked with {alias}") == [skill_id]
+
+
+def test_capped_lists_keep_their_skills():
+    # Every taxonomy skill present: the caps still keep the services' own leading skills
+    text = " ".join(VOCABULARY)
+    assert get_skill_matcher(skill_set='ai-ml-service').extract_names(text)[:10] == AI_ML_SKILLS[:10]
+    assert get_skill_matcher(skill_set='simple-ai-service').extract_names(text)[:8] == SIMPLE_SKILLS[:8]
+
+
+def test_java_not_found_inside_javascript():
+    text = "Senior JavaScript developer"
+    assert "Java" in [skill for skill in AI_ML_SKILLS if skill.lower() in text.lower()]
+    assert get_skill_matcher(skill_set='ai-ml-service').extract_names(text) == ["JavaScript"]
+
+
+def test_unknown_skill_set_uses_whole_taxonomy():
+    assert get_skill_matcher(skill_set='missing').skills == get_skill_matcher().skills
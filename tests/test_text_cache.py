@@ -0,0 +1,42 @@
+"""ExtractedTextStore keeps extracted text and URL validators within one size budget."""
+import os
+
+from text_cache import ExtractedTextStore
+
+
+def stored_files(directory, subdir):
+    return sorted(os.listdir(os.path.join(directory, subdir)))
+
+
+def test_url_validators_count_towards_the_budget(tmp_path):
+    store = ExtractedTextStore(str(tmp_path), max_bytes=1000)
+    for index in range(50):
+        store.put_validators(f"https://files.example/{index}.pdf", f'"etag-{index}"', None, f"{index:064x}")
+    assert store.stats()["bytes"] <= 1000
+    assert len(stored_files(tmp_path, 'urls')) < 50
+    assert store.get_validators("https://files.example/0.pdf") is None
+    assert store.get_validators("https://files.example/49.pdf").etag == '"etag-49"'
+
+
+def test_text_and_validators_share_lru_order(tmp_path):
+    store = ExtractedTextStore(str(tmp_path), max_bytes=400)
+    store.put('a-pdf', 'x' * 100)
+    store.put_validators("https://files.example/a.pdf", '"a"', None, 'a')
+    store.put('b-pdf', 'y' * 100)
+    # Reading the validators makes them the most recently used entry
+    assert store.get_validators("https://files.example/a.pdf").content_hash == 'a'
+    store.put('c-pdf', 'z' * 150)
+    assert store.get('a-pdf') is None
+    assert store.get('b-pdf') == 'y' * 100
+    assert store.get_validators("https://files.example/a.pdf") is not None
+
+
+def test_reload_indexes_both_kinds_of_entry(tmp_path):
+    store = ExtractedTextStore(str(tmp_path), max_bytes=10000)
+    store.put('a-pdf', 'resume text')
+    store.put_validators("https://files.example/a.pdf", None, 'Mon, 01 Jan 2024 00:00:00 GMT', 'a')
+    reloaded = ExtractedTextStore(str(tmp_path), max_bytes=10000)
+    assert reloaded.stats()["entries"] == 2
+    assert reloaded.stats()["bytes"] == store.stats()["bytes"]
+    assert reloaded.get('a-pdf') == 'resume text'
+    assert reloaded.get_validators("https://files.example/a.pdf").last_modified == 'Mon, 01 Jan 2024 00:00:00 GMT'
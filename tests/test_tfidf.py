@@ -0,0 +1,76 @@
+"""TfidfModel's direct weighting matches sklearn's TfidfVectorizer.transform on a fixed corpus."""
+import pytest
+
+from scoring_core.tfidf import TfidfModel, pair_similarity
+
+pytest.importorskip('sklearn')
+
+CORPUS = [
+    "Senior Python engineer building REST APIs with Django and PostgreSQL",
+    "Data scientist with Python, pandas, scikit-learn and SQL experience",
+    "Frontend developer: React, TypeScript, CSS and accessibility",
+    "DevOps engineer running Kubernetes, Docker and Terraform on AWS",
+    "Machine learning engineer, PyTorch and TensorFlow models in production on AWS",
+    "Backend developer in Go and Python, PostgreSQL, Redis and Kafka",
+    "python python python sql sql docker",
+]
+TEXTS = [
+    "Python and SQL",
+    "python python aws aws aws kubernetes",
+    "React TypeScript frontend accessibility CSS CSS",
+    "Go, Kafka, Redis; PostgreSQL!",
+    "terms outside the vocabulary only: cobol fortran",
+    "",
+]
+
+
+def sklearn_weights(model, text):
+    row = model.transform([text]).tocoo()
+    return {int(index): float(weight) for index, weight in zip(row.col, row.data)}
+
+
+@pytest.mark.parametrize("params", [{}, {"sublinear_tf": True}, {"ngram_range": (1, 2)}, {"min_df": 2}])
+def test_weights_match_vectorizer_transform(params):
+    model = TfidfModel.fit(CORPUS, **params)
+    for text in TEXTS:
+        expected = sklearn_weights(model, text)
+        weights = model.weights(text)
+        assert weights.keys() == expected.keys()
+        for index, weight in expected.items():
+            assert weights[index] == pytest.approx(weight, rel=1e-9, abs=1e-12)
+
+
+def test_similarity_matches_cosine_of_transformed_rows():
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    model = TfidfModel.fit(CORPUS)
+    job = "Python backend engineer with PostgreSQL and AWS"
+    job_vector = model.weights(job)
+    for text in TEXTS:
+        rows = model.transform([job, text])
+        expected = float(cosine_similarity(rows[0:1], rows[1:2])[0][0])
+        assert model.similarity(job, text) == pytest.approx(expected, abs=1e-9)
+        assert model.similarity_to(job_vector, text) == pytest.approx(expected, abs=1e-9)
+
+
+def test_job_vectors_are_cached_by_text():
+    model = TfidfModel.fit(CORPUS)
+    model.job_cache_size = 2
+    for job in ["python sql", "react css", "python sql", "go kafka", "react css"]:
+        model.similarity(job, "python")
+    stats = model.stats()
+    assert (stats["jobCacheHits"], stats["jobCacheMisses"], stats["jobCacheEntries"]) == (1, 4, 2)
+
+
+def test_saved_model_weights_the_same(tmp_path):
+    pytest.importorskip('joblib')
+    model = TfidfModel.fit(CORPUS, sublinear_tf=True)
+    model.save(str(tmp_path / 'tfidf.joblib'))
+    loaded = TfidfModel.load(str(tmp_path / 'tfidf.joblib'))
+    for text in TEXTS:
+        assert loaded.weights(text) == pytest.approx(model.weights(text))
+
+
+def test_pair_similarity_fallback():
+    assert pair_similarity("python sql", "python sql") == pytest.approx(1.0)
+    assert pair_similarity("python sql", "react css") == pytest.approx(0.0)
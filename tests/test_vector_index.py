@@ -0,0 +1,123 @@
+"""CandidateVectorIndex keeps IVF buckets across restarts and between processes sharing a directory."""
+import fcntl
+import multiprocessing
+import os
+
+import numpy as np
+import pytest
+
+from vector_index import CandidateVectorIndex
+
+DIM = 16
+
+
+def unit_vectors(count, seed):
+    vectors = np.random.default_rng(seed).normal(size=(count, DIM)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def expected_buckets(index):
+    rows = np.flatnonzero(index.alive[:index.row_count])
+    return rows, np.argmax(np.asarray(index.matrix[rows]) @ index.centroids.T, axis=1)
+
+
+@pytest.fixture
+def trained(tmp_path):
+    index = CandidateVectorIndex(str(tmp_path), initial_capacity=64)
+    index.upsert([f"c{number}" for number in range(200)], unit_vectors(200, seed=1))
+    index.build_ivf(nlist=8, iterations=5)
+    return index
+
+
+def test_rows_written_after_training_keep_their_buckets_after_restart(tmp_path, trained):
+    # Update existing rows, reuse a deleted row and grow past the trained rows
+    trained.upsert([f"c{number}" for number in range(20)], unit_vectors(20, seed=2))
+    trained.delete("c50")
+    trained.upsert(["new-0"], unit_vectors(1, seed=3))
+    trained.upsert([f"new-{number}" for number in range(1, 100)], unit_vectors(99, seed=4))
+    trained.flush()
+
+    reopened = CandidateVectorIndex(str(tmp_path), initial_capacity=64)
+    rows, buckets = expected_buckets(reopened)
+    assert np.array_equal(reopened.assignments[rows], buckets)
+    query = unit_vectors(1, seed=5)[0]
+    assert reopened.search(query, k=5, approximate=True, nprobe=8) == reopened.search(query, k=5)
+
+
+def test_stale_sidecar_is_rebuilt(tmp_path, trained):
+    trained.assignments[:] = 0
+    trained._assignment_map[0] = 0
+    trained.flush()
+    reopened = CandidateVectorIndex(str(tmp_path), initial_capacity=64)
+    rows, buckets = expected_buckets(reopened)
+    assert np.array_equal(reopened.assignments[rows], buckets)
+
+
+def test_instances_sharing_a_directory_see_each_other(tmp_path):
+    first = CandidateVectorIndex(str(tmp_path), initial_capacity=8)
+    second = CandidateVectorIndex(str(tmp_path), initial_capacity=8)
+    first.upsert([f"a{number}" for number in range(20)], unit_vectors(20, seed=6))
+    second.upsert([f"b{number}" for number in range(20)], unit_vectors(20, seed=7))
+    assert second.delete("a3")
+    first.build_ivf(nlist=4, iterations=3)
+
+    query = unit_vectors(1, seed=8)[0]
+    assert first.search(query, k=40) == second.search(query, k=40)
+    assert len(first.search(query, k=40)) == 39
+    assert second.search(query, k=5, approximate=True, nprobe=4) == second.search(query, k=5)
+    # Rows were allocated without collisions
+    assert len({first.rows_by_id[key] for key in first.rows_by_id}) == 39
+
+
+def exclusively_locked(directory):
+    with open(os.path.join(directory, CandidateVectorIndex.LOCK_FILE), 'a') as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_SH | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return True
+        fcntl.flock(lock_file, fcntl.LOCK_UN)
+        return False
+
+
+def test_reader_repairs_a_stale_sidecar_only_under_the_exclusive_lock(tmp_path, trained, monkeypatch):
+    reader = CandidateVectorIndex(str(tmp_path), initial_capacity=64)
+    # Another process left buckets that do not belong to the current IVF
+    trained.assignments[:] = 0
+    trained._assignment_map[0] = 0
+    trained.flush()
+
+    locks = []
+    original = reader._assign_buckets
+    monkeypatch.setattr(reader, '_assign_buckets', lambda rows: (
+        locks.append(exclusively_locked(str(tmp_path))), original(rows)
+    ))
+    query = unit_vectors(1, seed=9)[0]
+    # Exact search never touches the sidecar
+    assert reader.search(query, k=5) == trained.search(query, k=5)
+    assert locks == []
+    assert reader.search(query, k=5, approximate=True, nprobe=8) == reader.search(query, k=5)
+    assert locks == [True]
+    rows, buckets = expected_buckets(trained)
+    assert np.array_equal(trained.assignments[rows], buckets)
+
+
+def add_candidates(directory, prefix, seed):
+    index = CandidateVectorIndex(directory, initial_capacity=8)
+    index.upsert([f"{prefix}{number}" for number in range(50)], unit_vectors(50, seed=seed))
+    index.build_ivf(nlist=4, iterations=3)
+    index.flush()
+
+
+def test_writes_from_another_process_are_visible(tmp_path):
+    reader = CandidateVectorIndex(str(tmp_path), initial_capacity=8)
+    reader.upsert(["local"], unit_vectors(1, seed=10))
+    writer = multiprocessing.get_context('spawn').Process(target=add_candidates, args=(str(tmp_path), "remote", 11))
+    writer.start()
+    writer.join(60)
+    assert writer.exitcode == 0
+
+    query = unit_vectors(1, seed=12)[0]
+    assert len(reader.search(query, k=100)) == 51
+    assert reader.search(query, k=5, approximate=True, nprobe=4) == reader.search(query, k=5)
+    rows, buckets = expected_buckets(reader)
+    assert np.array_equal(reader.assignments[rows], buckets)